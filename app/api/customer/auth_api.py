@@ -0,0 +1,101 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from ...config import settings
+from ...crud.customer.auth_manager import AuthManager
+from ...exceptions.custom_exceptions import UnauthorizedException
+from ...schemas.customer.auth_schema import LoginRequest
+from ...utils.auth_tokens import is_admin_token, token_service
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> dict:
+    """
+    Dependency for authenticated routes: the verified token claims
+    ({"sub", "typ", "email", "exp", ...}). A cached token costs no DB or crypto work.
+    """
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        return token_service.verify(credentials.credentials)
+    except UnauthorizedException as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+
+
+def require_user_type(*user_types: str):
+    """Dependency factory: Depends(require_user_type("retailer"))."""
+
+    async def dependency(claims: dict = Depends(get_current_user)) -> dict:
+        if claims["typ"] not in user_types:
+            raise HTTPException(status_code=403, detail="Not allowed for this account type")
+        return claims
+
+    return dependency
+
+
+def claims_for_subject(token: Optional[str], user_type: str, user_id: int) -> dict:
+    """
+    Claims of `token` when it was issued to that user; HTTPException 401 when
+    it is missing or invalid, 403 when it belongs to someone else. For routes
+    whose path names the user, such as the live update streams.
+    """
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        claims = token_service.verify(token)
+    except UnauthorizedException as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+    if claims["typ"] != user_type or claims["sub"] != str(user_id):
+        raise HTTPException(status_code=403, detail="Not allowed for this account")
+    return claims
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Dependency for operator endpoints (profiling); they are off unless ADMIN_TOKEN is set."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+class AuthAPI:
+    def __init__(self):
+        self.router = APIRouter()
+        self.manager = AuthManager(settings.db_type)
+        self.register_routes()
+
+    def register_routes(self):
+        self.router.post("/auth/customers/login")(self.customer_login)
+        self.router.post("/auth/retailers/login")(self.retailer_login)
+        self.router.get("/auth/me")(self.me)
+        self.router.post("/auth/logout")(self.logout)
+
+    async def customer_login(self, data: LoginRequest):
+        return await self._login("customer", data)
+
+    async def retailer_login(self, data: LoginRequest):
+        return await self._login("retailer", data)
+
+    async def _login(self, user_type: str, data: LoginRequest):
+        result = await self.manager.login(user_type, data.Email, data.Password)
+        if not result["success"]:
+            raise HTTPException(status_code=401, detail=result["message"])
+        return result
+
+    async def me(self, claims: dict = Depends(get_current_user)):
+        return {
+            "UserType": claims["typ"],
+            "UserId": int(claims["sub"]),
+            "Email": claims.get("email"),
+            "ExpiresAt": claims["exp"],
+        }
+
+    async def logout(self, credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+        if credentials is None:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        try:
+            token_service.revoke(credentials.credentials)
+        except UnauthorizedException as e:
+            raise HTTPException(status_code=401, detail=str(e))
+        return {"success": True, "message": "Logged out"}
@@ -0,0 +1,39 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from ...config import settings
+from ...crud.customer.catalog_import_manager import CatalogImportManager, IMPORT_SPECS
+from ...utils.importers import IMPORT_FORMATS, detect_format
+from .auth_api import require_admin
+
+
+class CatalogImportAPI:
+    """
+    POST /catalog/import/{entity} with a CSV or NDJSON file, where entity is
+    medical-types, medicine-categories, medicines or medicine-infos.
+    Columns are the table's columns; parents may be given by name instead of
+    id (MedicalType, Category, MedicineName). Returns a per-row error report.
+    Needs the X-Admin-Token header.
+    """
+
+    def __init__(self):
+        self.router = APIRouter()
+        self.manager = CatalogImportManager(settings.db_type)
+        self.register_routes()
+
+    def register_routes(self):
+        self.router.post("/catalog/import/{entity}", dependencies=[Depends(require_admin)])(self.import_catalog)
+
+    async def import_catalog(self, entity: str, file: UploadFile = File(...), format: Optional[str] = None):
+        if entity not in IMPORT_SPECS:
+            raise HTTPException(status_code=404, detail=f"entity must be one of: {', '.join(IMPORT_SPECS)}")
+        file_format = detect_format(file.filename, format)
+        if file_format is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"format must be one of: {', '.join(IMPORT_FORMATS)} (or use a .csv / .ndjson file name)",
+            )
+
+        result = await self.manager.import_file(entity, file.file, file_format)
+        if not result["success"]:
+            raise HTTPException(status_code=500, detail=result["message"])
+        return result
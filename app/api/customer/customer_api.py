@@ -151,11 +151,7 @@ class CustomerAPI:
                 "Branch": Branch,
             }.items():
                 if value is not None:
-                    # Rename Password to PasswordHash for DB
-                    if field_name == "Password":
-                        update_data["PasswordHash"] = value
-                    else:
-                        update_data[field_name] = value
+                    update_data[field_name] = value
 
             # Handle profile picture
             if ProfilePicture:
@@ -1,4 +1,5 @@
 import os
+from datetime import date
 from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form
 from ...config import settings
 from ...crud.customer.doctor_manager import (
@@ -6,6 +7,7 @@ from ...crud.customer.doctor_manager import (
     DoctorCreate, DoctorUpdate,
     DoctorAppointmentCreate, DoctorAppointmentUpdate
 )
+from ...exceptions.custom_exceptions import InvalidSlotException, SlotAlreadyBookedException
 from ...utils.image_uploader import save_picture
 
 # --------------------------------------------------
@@ -15,12 +17,14 @@ class DoctorAPI:
     def __init__(self):
         self.router = APIRouter()
         self.manager = DoctorManager(settings.db_type)
+        self.appointment_manager = DoctorAppointmentManager(settings.db_type)
         self.register_routes()
 
     def register_routes(self):
         self.router.post("/doctors")(self.create_doctor)
         self.router.get("/doctors")(self.get_doctors)
         self.router.get("/doctors/{doctor_id}")(self.get_doctor_by_id)
+        self.router.get("/doctors/{doctor_id}/slots")(self.get_available_slots)
         self.router.put("/doctors/{doctor_id}")(self.update_doctor)
         self.router.delete("/doctors/{doctor_id}")(self.delete_doctor)
 
@@ -99,6 +103,18 @@ class DoctorAPI:
             raise HTTPException(status_code=404, detail="Doctor not found")
         return doctor
 
+    async def get_available_slots(
+        self,
+        doctor_id: int,
+        from_date: date = Query(None, alias="from", description="First day (default: today)"),
+        to_date: date = Query(None, alias="to", description="Last day (default: from + 6 days)")
+    ):
+        result = await self.appointment_manager.get_available_slots(doctor_id, from_date, to_date)
+        if result.get("success") is False:
+            status_code = 404 if result["message"] == "Doctor not found" else 400
+            raise HTTPException(status_code=status_code, detail=result["message"])
+        return result
+
     async def update_doctor(
         self,
         doctor_id: int,
@@ -204,7 +220,15 @@ class DoctorAppointmentAPI:
         self.router.delete("/doctor-appointments/{appointment_id}")(self.delete_appointment)
 
     async def create_appointment(self, data: DoctorAppointmentCreate):
-        return await self.manager.create_appointment(data)
+        try:
+            result = await self.manager.create_appointment(data)
+        except InvalidSlotException as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except SlotAlreadyBookedException as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        if not result["success"]:
+            raise HTTPException(status_code=404, detail=result["message"])
+        return result
 
     async def get_appointment_by_id(self, appointment_id: int):
         return await self.manager.get_appointment_by_id(appointment_id)
@@ -213,7 +237,12 @@ class DoctorAppointmentAPI:
         return await self.manager.get_appointments_by_doctor(doctor_id)
 
     async def update_appointment(self, appointment_id: int, data: DoctorAppointmentUpdate):
-        return await self.manager.update_appointment(appointment_id, data)
+        try:
+            return await self.manager.update_appointment(appointment_id, data)
+        except InvalidSlotException as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except SlotAlreadyBookedException as e:
+            raise HTTPException(status_code=409, detail=str(e))
 
     async def delete_appointment(self, appointment_id: int):
         return await self.manager.delete_appointment(appointment_id)
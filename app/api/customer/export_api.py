@@ -0,0 +1,69 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from ...config import settings
+from ...crud.customer.export_manager import ExportManager
+from ...utils.exporters import EXPORT_MEDIA_TYPES, csv_chunks, ndjson_chunks
+from ...utils.timezone import ist_now
+from .auth_api import require_admin
+
+
+class ExportAPI:
+    """
+    Bulk exports streamed as CSV (default) or NDJSON (?format=ndjson).
+    Rows are written to the response as they are read from the database,
+    so even a full order history is exported with flat memory.
+    All exports need the admin token.
+    """
+
+    def __init__(self):
+        self.router = APIRouter(dependencies=[Depends(require_admin)])
+        self.manager = ExportManager(settings.db_type)
+        self.register_routes()
+
+    def register_routes(self):
+        self.router.get("/export/orders")(self.export_orders)
+        self.router.get("/export/customers")(self.export_customers)
+        self.router.get("/export/medicines")(self.export_medicines)
+        self.router.get("/export/tests")(self.export_tests)
+
+    async def export_orders(
+        self,
+        format: str = "csv",
+        customer_id: Optional[int] = None,
+        retailer_id: Optional[int] = None,
+        include_archived: bool = False,
+    ):
+        _check_format(format)
+        columns, rows = await self.manager.export_orders(customer_id, retailer_id, include_archived)
+        return _response("orders", format, columns, rows)
+
+    async def export_customers(self, format: str = "csv", include_contact: bool = False):
+        _check_format(format)
+        columns, rows = self.manager.export_customers(include_contact)
+        return _response("customers", format, columns, rows)
+
+    async def export_medicines(self, format: str = "csv", category_id: Optional[int] = None):
+        _check_format(format)
+        columns, rows = self.manager.export_medicines(category_id)
+        return _response("medicines", format, columns, rows)
+
+    async def export_tests(self, format: str = "csv", lab_id: Optional[int] = None):
+        _check_format(format)
+        columns, rows = self.manager.export_tests(lab_id)
+        return _response("tests", format, columns, rows)
+
+
+def _check_format(format: str) -> None:
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_MEDIA_TYPES)}")
+
+
+def _response(name: str, format: str, columns, rows) -> StreamingResponse:
+    chunks = csv_chunks(rows, columns) if format == "csv" else ndjson_chunks(rows, columns)
+    filename = f"{name}-{ist_now():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,5 +1,5 @@
 import os
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
 from ...config import settings
 from ...crud.customer.lap_manager import (
     LabManager, TestManager, AppointmentManager,
@@ -7,6 +7,8 @@ from ...crud.customer.lap_manager import (
     TestCreate, TestUpdate,
     AppointmentCreate, AppointmentUpdate
 )
+from ...crud.customer.lab_test_catalog import LabTestCatalogManager
+from ...exceptions.custom_exceptions import SlotAlreadyBookedException
 from ...utils.image_uploader import save_picture
 
 
@@ -41,8 +43,8 @@ class LabAPI:
         State: str = Form(None),
         Country: str = Form(None),
         PostalCode: str = Form(None),
-        Latitude: str = Form(None),
-        Longitude: str = Form(None),
+        Latitude: float = Form(None),
+        Longitude: float = Form(None),
         ShopPic: UploadFile = File(None)
     ):
         try:
@@ -76,8 +78,15 @@ class LabAPI:
             raise HTTPException(status_code=404, detail="Lab not found")
         return lab
 
-    async def get_labs_by_postal(self, postal: str):
-        return await self.manager.get_labs_by_postal(postal)
+    async def get_labs_by_postal(
+        self,
+        postal: str,
+        neighbours: int = Query(
+            settings.pincode_neighbour_count, ge=0, le=20,
+            description="Also include labs in the N nearest pincodes"
+        )
+    ):
+        return await self.manager.get_labs_by_postal(postal, neighbours)
 
     async def update_lab(
         self,
@@ -93,8 +102,8 @@ class LabAPI:
         State: str = Form(None),
         Country: str = Form(None),
         PostalCode: str = Form(None),
-        Latitude: str = Form(None),
-        Longitude: str = Form(None),
+        Latitude: float = Form(None),
+        Longitude: float = Form(None),
         ShopPic: UploadFile = File(None)
     ):
         try:
@@ -155,10 +164,13 @@ class TestAPI:
     def __init__(self):
         self.router = APIRouter()
         self.manager = TestManager(settings.db_type)
+        self.catalog_manager = LabTestCatalogManager(settings.db_type)
         self.register_routes()
 
     def register_routes(self):
         self.router.post("/tests")(self.create_test)
+        # Before /tests/{test_id}, otherwise "compare" is parsed as a test id
+        self.router.get("/tests/compare")(self.compare_tests)
         self.router.get("/tests/{test_id}")(self.get_test_by_id)
         self.router.get("/tests/lab/{lab_id}")(self.get_tests_by_lab)
         self.router.put("/tests/{test_id}")(self.update_test)
@@ -167,6 +179,17 @@ class TestAPI:
     async def create_test(self, data: TestCreate):
         return await self.manager.create_test(data)
 
+    async def compare_tests(
+        self,
+        name: str = Query(..., min_length=1, description="Test name or alias, e.g. CBC"),
+        postal: str = Query(None, description="Only labs in this pincode and its neighbours"),
+        neighbours: int = Query(settings.pincode_neighbour_count, ge=0, le=20)
+    ):
+        result = await self.catalog_manager.compare(name, postal, neighbours)
+        if isinstance(result, dict):
+            raise HTTPException(status_code=500, detail=result["message"])
+        return result
+
     async def get_test_by_id(self, test_id: int):
         return await self.manager.get_test_by_id(test_id)
 
@@ -191,22 +214,49 @@ class AppointmentAPI:
 
     def register_routes(self):
         self.router.post("/appointments")(self.create_appointment)
+        self.router.get("/appointments/quote")(self.quote)
         self.router.get("/appointments/{appointment_id}")(self.get_appt_by_id)
+        self.router.get("/appointments/{appointment_id}/tests")(self.get_appt_tests)
         self.router.get("/appointments/lab/{lab_id}")(self.get_appts_by_lab)
         self.router.put("/appointments/{appointment_id}")(self.update_appt)
         self.router.delete("/appointments/{appointment_id}")(self.delete_appt)
 
     async def create_appointment(self, data: AppointmentCreate):
-        return await self.manager.create_appointment(data)
+        try:
+            result = await self.manager.create_appointment(data)
+        except SlotAlreadyBookedException as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        if not result["success"]:
+            raise HTTPException(status_code=400, detail=result["message"])
+        return result
+
+    async def quote(
+        self,
+        lab_id: int = Query(...),
+        tests: str = Query(..., description="Comma separated test ids, e.g. 1,4,7")
+    ):
+        result = await self.manager.quote(lab_id, tests)
+        if not result["success"]:
+            raise HTTPException(status_code=400, detail=result["message"])
+        return result
 
     async def get_appt_by_id(self, appointment_id: int):
         return await self.manager.get_appointment_by_id(appointment_id)
 
+    async def get_appt_tests(self, appointment_id: int):
+        return await self.manager.get_appointment_tests(appointment_id)
+
     async def get_appts_by_lab(self, lab_id: int):
         return await self.manager.get_appointments_by_lab(lab_id)
 
     async def update_appt(self, appointment_id: int, data: AppointmentUpdate):
-        return await self.manager.update_appointment(appointment_id, data)
+        try:
+            result = await self.manager.update_appointment(appointment_id, data)
+        except SlotAlreadyBookedException as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        if not result["success"] and "message" in result:
+            raise HTTPException(status_code=400, detail=result["message"])
+        return result
 
     async def delete_appt(self, appointment_id: int):
         return await self.manager.delete_appointment(appointment_id)
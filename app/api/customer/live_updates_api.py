@@ -0,0 +1,101 @@
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from ...config import settings
+from ...utils.push_hub import push_hub, customer_topic, retailer_topic
+from .auth_api import claims_for_subject
+
+
+class LiveUpdatesAPI:
+    """
+    Push channel for order status changes and new notifications, replacing
+    polling of /orders/customer/{id}, /orders/retailer/{id} and notifications.
+    Server-Sent Events and WebSocket carry the same messages:
+        {"id": 12, "event": "order.status_changed", "data": {...}, "at": "..."}
+    A "resync" message means the connection fell behind and dropped updates;
+    the client should reload its lists over REST.
+
+    Each stream needs an access token for the customer / retailer in the
+    path, as a Bearer header or, since EventSource and browser WebSockets
+    cannot set headers, as ?access_token=. Only events from writes on this
+    worker are pushed (see PushHub).
+    """
+
+    def __init__(self):
+        self.router = APIRouter()
+        self.register_routes()
+
+    def register_routes(self):
+        self.router.get("/live/customers/{customer_id}/events")(self.customer_events)
+        self.router.get("/live/retailers/{retailer_id}/events")(self.retailer_events)
+        self.router.websocket("/live/customers/{customer_id}/ws")(self.customer_ws)
+        self.router.websocket("/live/retailers/{retailer_id}/ws")(self.retailer_ws)
+
+    # ------------------------------------------------------------
+    # Server-Sent Events
+    # ------------------------------------------------------------
+    async def customer_events(self, customer_id: int, request: Request):
+        claims_for_subject(_access_token(request), "customer", customer_id)
+        return self._event_stream(request, customer_topic(customer_id))
+
+    async def retailer_events(self, retailer_id: int, request: Request):
+        claims_for_subject(_access_token(request), "retailer", retailer_id)
+        return self._event_stream(request, retailer_topic(retailer_id))
+
+    def _event_stream(self, request: Request, topic: str) -> StreamingResponse:
+        async def stream():
+            # Subscribed on first iteration: a client gone before that never holds a queue
+            subscription = push_hub.subscribe(topic)
+            try:
+                yield "retry: 3000\n\n"
+                while not await request.is_disconnected():
+                    message = await subscription.next(settings.push_heartbeat_seconds)
+                    if message is None:
+                        yield ": heartbeat\n\n"
+                        continue
+                    event_id = f"id: {message['id']}\n" if message["id"] else ""
+                    yield f"{event_id}event: {message['event']}\ndata: {json.dumps(message, default=str)}\n\n"
+            finally:
+                push_hub.unsubscribe(subscription)
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    # ------------------------------------------------------------
+    # WebSocket
+    # ------------------------------------------------------------
+    async def customer_ws(self, websocket: WebSocket, customer_id: int):
+        await self._websocket_stream(websocket, "customer", customer_id, customer_topic(customer_id))
+
+    async def retailer_ws(self, websocket: WebSocket, retailer_id: int):
+        await self._websocket_stream(websocket, "retailer", retailer_id, retailer_topic(retailer_id))
+
+    async def _websocket_stream(self, websocket: WebSocket, user_type: str, user_id: int, topic: str):
+        try:
+            claims_for_subject(_access_token(websocket), user_type, user_id)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        await websocket.accept()
+        subscription = push_hub.subscribe(topic)
+        try:
+            while True:
+                message = await subscription.next(settings.push_heartbeat_seconds)
+                # Heartbeats double as disconnect detection: a send to a closed socket fails
+                await websocket.send_text(json.dumps(message or {"event": "heartbeat"}, default=str))
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            push_hub.unsubscribe(subscription)
+
+
+def _access_token(connection) -> Optional[str]:
+    """Bearer header, else ?access_token= (Request and WebSocket alike)."""
+    authorization = connection.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:].strip()
+    return connection.query_params.get("access_token")
@@ -1,11 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from typing import Optional
 from ...config import settings
+from .auth_api import require_admin
 from ...schemas.customer.order_schema import (
     OrderCreate,
     OrderUpdate,
 )
 from ...crud.customer.order_manager import OrderManager
+from ...crud.customer.order_archive_manager import OrderArchiveManager
 from ...schemas.customer.order_schema import (
     OrderItemCreate,
     OrderItemUpdate,
@@ -18,13 +20,18 @@ class OrderAPI:
     def __init__(self):
         self.router = APIRouter()
         self.manager = OrderManager(settings.db_type)
+        self.archive_manager = OrderArchiveManager(settings.db_type)
         self.register()
 
     def register(self):
         self.router.post("/orders")(self.create)
         self.router.get("/orders/{order_id}")(self.get)
         self.router.get("/orders/customer/{customer_id}")(self.get_by_customer)
+        self.router.get("/orders/customer/{customer_id}/summary")(self.get_customer_summary)
         self.router.get("/orders/retailer/{retailer_id}")(self.get_by_retailer)
+        self.router.get("/orders/retailer/{retailer_id}/summary")(self.get_retailer_summary)
+        self.router.post("/orders/counters/rebuild", dependencies=[Depends(require_admin)])(self.rebuild_counters)
+        self.router.post("/orders/archive", dependencies=[Depends(require_admin)])(self.archive)
         self.router.put("/orders/{order_id}")(self.update)
         self.router.patch("/orders/{order_id}/status")(self.update_status)
         self.router.delete("/orders/{order_id}")(self.delete)
@@ -35,11 +42,23 @@ class OrderAPI:
     async def get(self, order_id: int):
         return await self.manager.get_order(order_id)
 
-    async def get_by_customer(self, customer_id: Optional[int] = None):
-        return await self.manager.get_orders_by_customer(customer_id)
+    async def get_by_customer(self, customer_id: Optional[int] = None, include_archived: bool = False):
+        return await self.manager.get_orders_by_customer(customer_id, include_archived)
 
-    async def get_by_retailer(self, retailer_id: Optional[int] = None):
-        return await self.manager.get_orders_by_retailer(retailer_id)
+    async def get_by_retailer(self, retailer_id: Optional[int] = None, include_archived: bool = False):
+        return await self.manager.get_orders_by_retailer(retailer_id, include_archived)
+
+    async def get_customer_summary(self, customer_id: int):
+        return await self.manager.get_customer_summary(customer_id)
+
+    async def get_retailer_summary(self, retailer_id: int):
+        return await self.manager.get_retailer_summary(retailer_id)
+
+    async def rebuild_counters(self):
+        return await self.manager.rebuild_status_counters()
+
+    async def archive(self, older_than_days: Optional[int] = None):
+        return await self.archive_manager.archive_orders(older_than_days)
 
     async def update(self, order_id: int, data: OrderUpdate):
         return await self.manager.update_order(order_id, data)
@@ -63,6 +82,8 @@ class OrderItemAPI:
     def register(self):
         self.router.post("/order-items")(self.create)
         self.router.get("/order-items/order/{order_id}")(self.get_by_order)
+        self.router.get("/order-items/totals/check", dependencies=[Depends(require_admin)])(self.check_totals)
+        self.router.post("/order-items/totals/repair", dependencies=[Depends(require_admin)])(self.repair_totals)
         self.router.put("/order-items/{item_id}")(self.update)
         self.router.delete("/order-items/{item_id}")(self.delete)
 
@@ -72,6 +93,12 @@ class OrderItemAPI:
     async def get_by_order(self, order_id: int):
         return await self.manager.get_items_by_order(order_id)
 
+    async def check_totals(self):
+        return await self.manager.check_order_totals()
+
+    async def repair_totals(self):
+        return await self.manager.check_order_totals(repair=True)
+
     async def update(self, item_id: int, data: OrderItemUpdate):
         return await self.manager.update_item(item_id, data)
 
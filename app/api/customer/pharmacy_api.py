@@ -57,9 +57,13 @@ class PharmacyAPI:
 
     async def get_nearby_by_pincode(
         self,
-        pincode: str = Query(..., description="Pincode to search nearby pharmacies")
+        pincode: str = Query(..., description="Pincode to search nearby pharmacies"),
+        neighbours: int = Query(
+            settings.pincode_neighbour_count, ge=0, le=20,
+            description="Also include the N nearest pincodes"
+        )
     ):
         try:
-            return await self.manager.get_nearby_by_pincode(pincode)
+            return await self.manager.get_nearby_by_pincode(pincode, neighbours)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
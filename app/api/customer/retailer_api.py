@@ -150,10 +150,7 @@ class RetailerAPI:
                 "Branch": Branch,
             }.items():
                 if value is not None:
-                    if field_name == "Password":
-                        update_data["PasswordHash"] = value
-                    else:
-                        update_data[field_name] = value
+                    update_data[field_name] = value
 
             # Handle shop picture replacement
             if ShopPic:
@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from ...crud.system.readiness_manager import ReadinessManager
+
+
+class HealthAPI:
+    """
+    Load balancer probes. /healthz: the process is up and its event loop
+    answers. /readyz: startup warm-up finished and the database responds
+    (503 otherwise), with warm-up results and connection pool occupancy.
+    """
+
+    def __init__(self, manager: ReadinessManager):
+        self.manager = manager
+        self.router = APIRouter()
+        self.register_routes()
+
+    def register_routes(self):
+        self.router.get("/healthz")(self.healthz)
+        self.router.get("/readyz")(self.readyz)
+
+    async def healthz(self):
+        return self.manager.liveness()
+
+    async def readyz(self):
+        report = await self.manager.readiness()
+        return JSONResponse(report, status_code=200 if report["Ready"] else 503)
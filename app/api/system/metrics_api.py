@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ...utils.metrics import registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsAPI:
+    """Prometheus scrape endpoint."""
+
+    def __init__(self):
+        self.router = APIRouter()
+        self.register_routes()
+
+    def register_routes(self):
+        self.router.get("/metrics", response_class=PlainTextResponse)(self.metrics)
+
+    async def metrics(self):
+        return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
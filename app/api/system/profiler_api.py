@@ -0,0 +1,54 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from ...config import settings
+from ...utils.profiler import SamplingProfiler
+from ..customer.auth_api import require_admin
+
+VIEWS = ("cpu", "tasks")
+
+
+class ProfilerAPI:
+    """
+    Operator endpoint: samples the running worker for N seconds while it
+    keeps serving traffic.
+        GET /admin/profile?seconds=10&view=tasks&format=collapsed
+    format=collapsed returns one "frame;frame;frame samples" line per stack
+    (feed it to flamegraph.pl or speedscope); format=json returns the top
+    functions of both views with their estimated inclusive seconds.
+    Requests can also be profiled one at a time with the X-Profile header
+    (see ProfilingMiddleware).
+    """
+
+    def __init__(self):
+        self.router = APIRouter(dependencies=[Depends(require_admin)])
+        self._lock = asyncio.Lock()
+        self.register_routes()
+
+    def register_routes(self):
+        self.router.get("/admin/profile")(self.profile)
+
+    async def profile(self, seconds: float = 10, view: str = "cpu", format: str = "collapsed", limit: int = 30):
+        if not 0 < seconds <= settings.profile_max_seconds:
+            raise HTTPException(status_code=422, detail=f"seconds must be between 0 and {settings.profile_max_seconds}")
+        if view not in VIEWS:
+            raise HTTPException(status_code=422, detail=f"view must be one of {', '.join(VIEWS)}")
+        if format not in ("collapsed", "json"):
+            raise HTTPException(status_code=422, detail="format must be collapsed or json")
+        if self._lock.locked():
+            raise HTTPException(status_code=409, detail="A profile is already being captured")
+
+        async with self._lock:
+            profiler = SamplingProfiler(
+                settings.profile_sample_interval_ms / 1000,
+                loop=asyncio.get_running_loop(),
+                exclude_task=asyncio.current_task(),
+            ).start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profiler.stop()
+
+        if format == "json":
+            return profiler.summary(limit)
+        return PlainTextResponse(SamplingProfiler.collapsed(getattr(profiler, view)))
@@ -0,0 +1,208 @@
+"""
+In-process load test of the FastAPI app against a seeded SQLite database.
+
+    python -m app.benchmarks.load_test --scale small --concurrency 16 --requests 4000 \
+        --output before.json
+    python -m app.benchmarks.load_test --scale small --concurrency 16 --requests 4000 \
+        --output after.json --compare before.json
+
+Seeds a fresh database with app.scripts.generate_data (same seed, same rows),
+points the app at it, and drives it through httpx.ASGITransport with
+`concurrency` workers, so numbers measure the app, not a network or a
+server process. Prints one JSON document with throughput and p50/p95/p99
+latency per endpoint; with --compare it also reports the change against a
+previous run.
+
+Must run in a fresh interpreter: the app's managers bind the database URL
+when app.main is imported.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+from ..config import settings
+from ..scripts.generate_data import SCALES, DataGenerator, Scale, CITIES
+from .stats import summarize
+
+
+FAILURE_PREFIX = b'{"success":false'
+
+
+class Scenario(NamedTuple):
+    name: str                                    # route template, used as the report key
+    weight: int
+    url: Callable[[random.Random, Scale], str]
+
+
+def _nearby(rng: random.Random, scale: Scale) -> str:
+    _, _, lat, lon, _ = rng.choice(CITIES)
+    return f"/pharmacies/nearby/gps?latitude={lat + rng.uniform(-0.05, 0.05):.5f}&longitude={lon + rng.uniform(-0.05, 0.05):.5f}&radius_km=5"
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("GET /orders/{order_id}", 20, lambda r, s: f"/orders/{r.randint(1, s.orders)}"),
+    Scenario("GET /orders/customer/{customer_id}", 15, lambda r, s: f"/orders/customer/{r.randint(1, s.customers)}"),
+    Scenario("GET /orders/customer/{customer_id}/summary", 10, lambda r, s: f"/orders/customer/{r.randint(1, s.customers)}/summary"),
+    Scenario("GET /orders/retailer/{retailer_id}", 5, lambda r, s: f"/orders/retailer/{r.randint(1, s.retailers)}"),
+    Scenario("GET /cart/{customer_id}", 20, lambda r, s: f"/cart/{r.randint(1, s.customers)}"),
+    Scenario("GET /customers/{customer_id}", 10, lambda r, s: f"/customers/{r.randint(1, s.customers)}"),
+    Scenario("GET /pharmacies/nearby/gps", 15, _nearby),
+    Scenario("GET /medicine-categories", 5, lambda r, s: "/medicine-categories"),
+    # Reads the doctor, then the bookings, across awaits on one shared manager
+    Scenario("GET /doctors/{doctor_id}/slots", 5, lambda r, s: f"/doctors/{r.randint(1, s.doctors)}/slots"),
+]
+
+
+def build_plan(scale: Scale, requests: int, seed: int, only: Optional[List[str]] = None) -> List[tuple]:
+    """The same (scenario, url) sequence for the same seed, so runs are comparable."""
+    rng = random.Random(f"{seed}:plan")
+    scenarios = [s for s in SCENARIOS if not only or any(o in s.name for o in only)]
+    chosen = rng.choices(scenarios, weights=[s.weight for s in scenarios], k=requests)
+    return [(s.name, s.url(rng, scale)) for s in chosen]
+
+
+def load_app(sqlite_url: str):
+    if "app.main" in sys.modules:
+        raise RuntimeError("app.main is already imported; run the load test in a fresh interpreter")
+    settings.sqlite_url = sqlite_url
+    settings.db_type = "sqlite"
+    settings.order_archive_interval_seconds = 0   # no background writes during the run
+    settings.log_level = "WARNING"
+    from ..main import app
+    return app
+
+
+async def run_load(app, plan: List[tuple], concurrency: int, warmup: int = 0) -> Dict:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    transport = httpx.ASGITransport(app=app)
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            for name, url in plan[:warmup]:
+                await client.get(url)
+
+            queue = iter(plan[warmup:])
+
+            async def worker():
+                for name, url in queue:
+                    started = time.perf_counter()
+                    try:
+                        response = await client.get(url)
+                        # Managers report most failures as 200 {"success": false, ...}
+                        failed = response.status_code >= 500 or response.content.startswith(FAILURE_PREFIX)
+                    except Exception:
+                        failed = True
+                    latencies[name].append(time.perf_counter() - started)
+                    if failed:
+                        errors[name] += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*[worker() for _ in range(concurrency)])
+            elapsed = time.perf_counter() - started
+
+    endpoints = {
+        name: {**summarize(values, elapsed), "Errors": errors.get(name, 0)}
+        for name, values in sorted(latencies.items())
+    }
+    all_values = [v for values in latencies.values() for v in values]
+    return {
+        "Seconds": round(elapsed, 3),
+        "Total": {**summarize(all_values, elapsed), "Errors": sum(errors.values())},
+        "Endpoints": endpoints,
+    }
+
+
+def compare(current: Dict, baseline: Dict) -> Dict:
+    """Percent change per endpoint (negative latency / positive throughput = faster)."""
+    def delta(new, old):
+        return round((new - old) / old * 100, 1) if old else None
+
+    result = {}
+    for name, now in current["Endpoints"].items():
+        before = baseline.get("Endpoints", {}).get(name)
+        if before:
+            result[name] = {
+                "RpsChangePct": delta(now["Rps"], before["Rps"]),
+                "P50ChangePct": delta(now["P50Ms"], before["P50Ms"]),
+                "P95ChangePct": delta(now["P95Ms"], before["P95Ms"]),
+                "P99ChangePct": delta(now["P99Ms"], before["P99Ms"]),
+            }
+    return result
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--db", help="SQLite file to seed (default: a temporary file)")
+    parser.add_argument("--reuse", action="store_true", help="use --db as is instead of reseeding it")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--only", nargs="*", help="run only scenarios whose name contains one of these")
+    parser.add_argument("--output", help="also write the report to this file")
+    parser.add_argument("--compare", help="previous report to diff against")
+    args = parser.parse_args()
+
+    scale = SCALES[args.scale]
+    workdir = None if args.db else tempfile.TemporaryDirectory(prefix="loadtest-")   # removed at exit
+    db_file = args.db or os.path.join(workdir.name, "loadtest.db")
+    sqlite_url = f"sqlite+aiosqlite:///{db_file}"
+    seed_seconds = None
+    if not args.reuse:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_file + suffix):
+                os.remove(db_file + suffix)
+        started = time.perf_counter()
+        # Fixed anchor so every run (and every commit) sees identical rows
+        DataGenerator(sqlite_url, seed=args.seed, anchor=date(2025, 1, 1)).generate(scale)
+        seed_seconds = round(time.perf_counter() - started, 2)
+
+    app = load_app(sqlite_url)
+    plan = build_plan(scale, args.requests + args.warmup, args.seed, args.only)
+    report = {
+        "Meta": {
+            "Commit": git_commit(),
+            "Scale": args.scale,
+            "Seed": args.seed,
+            "Concurrency": args.concurrency,
+            "Requests": args.requests,
+            "Python": platform.python_version(),
+            "SeedSeconds": seed_seconds,
+        },
+        **asyncio.run(run_load(app, plan, args.concurrency, args.warmup)),
+    }
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["Compare"] = compare(report, json.load(f))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
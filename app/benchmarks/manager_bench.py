@@ -0,0 +1,273 @@
+"""
+Micro-benchmarks for the CRUD manager hot paths, without HTTP in the way.
+
+    python -m app.benchmarks.manager_bench                       # small scale, memory + file
+    python -m app.benchmarks.manager_bench --check               # exit 1 on a regression
+    python -m app.benchmarks.manager_bench --update-baselines
+
+Each case calls one manager method `--repeat` times against a database seeded
+by app.scripts.generate_data, once held in memory (shared-cache SQLite, so it
+outlives the managers' connect/disconnect per call) and once file-backed.
+Queries per call are counted by the same SQLAlchemy hooks that feed /metrics,
+so they are exact; wall time uses the load test's percentiles.
+
+--check compares against baselines.json: queries per call may not grow at
+all, p50 may grow by at most --time-tolerance (wall time moves between
+machines far more than query counts do).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date
+from typing import Awaitable, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from ..config import settings
+from ..crud.customer.cart_manager import CartManager
+from ..crud.customer.medicine_manager import MedicineManager
+from ..crud.customer.order_manager import OrderManager
+from ..crud.customer.pharmacy_manager import PharmacyManager
+from ..schemas.customer.order_schema import OrderCreate, OrderItemCreate
+from ..scripts.generate_data import CITIES, SCALES, DataGenerator
+from ..utils.event_bus import event_bus
+from ..utils.metrics import RequestStats, current_request, install_sqlalchemy_hooks
+from .stats import summarize
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+MODES = ("memory", "file")
+
+
+class Fixture:
+    """Managers bound to one database plus ids that exist in it."""
+
+    def __init__(self, sqlite_url: str, ids: Dict[str, list]):
+        # Managers read settings.sqlite_url when they are built
+        previous, settings.sqlite_url = settings.sqlite_url, sqlite_url
+        try:
+            self.carts = CartManager("sqlite")
+            self.orders = OrderManager("sqlite")
+            self.pharmacies = PharmacyManager("sqlite")
+            self.medicines = MedicineManager("sqlite")
+        finally:
+            settings.sqlite_url = previous
+        self.ids = ids
+
+
+class Case(NamedTuple):
+    name: str
+    call: Callable[[Fixture, random.Random], Awaitable]
+
+
+def _new_order(fixture: Fixture, rng: random.Random):
+    customer_id, retailer_id = rng.choice(fixture.ids["customers"]), rng.choice(fixture.ids["retailers"])
+    items = [
+        OrderItemCreate(CustomerId=customer_id, RetailerId=retailer_id, MedicineId=medicine_id,
+                        MedicineName=name, Quantity=2, Price=price, TotalAmount=0)
+        for medicine_id, name, price in rng.sample(fixture.ids["medicines"], 3)
+    ]
+    order = OrderCreate(
+        CustomerId=customer_id, RetailerId=retailer_id, RetailerName=f"Retailer {retailer_id}",
+        DeliveryMode="Home Delivery", DeliveryService=None, DeliveryPartnerTrackingId=None,
+        PaymentMode="UPI", PrescriptionFileUrl=None, Items=items,
+    )
+    return fixture.orders.create_order(order)
+
+
+def _nearby(fixture: Fixture, rng: random.Random):
+    _, _, lat, lon, _ = rng.choice(CITIES)
+    return fixture.pharmacies.get_nearby_by_gps(lat + rng.uniform(-0.05, 0.05), lon + rng.uniform(-0.05, 0.05), 5)
+
+
+CASES: List[Case] = [
+    Case("CartManager.get_cart", lambda f, r: f.carts.get_cart(r.choice(f.ids["cart_customers"]))),
+    Case("OrderManager.create_order", _new_order),
+    Case("OrderManager.get_order", lambda f, r: f.orders.get_order(r.choice(f.ids["orders"]))),
+    Case("OrderManager.get_orders_by_retailer", lambda f, r: f.orders.get_orders_by_retailer(r.choice(f.ids["retailers"]))),
+    Case("PharmacyManager.get_nearby_by_gps", _nearby),
+    Case("MedicineManager.get_medicines",
+         lambda f, r: f.medicines.get_medicines({"MedicineCategoryId": r.choice(f.ids["categories"])})),
+]
+
+
+def sample_ids(conn: sqlite3.Connection, limit: int = 1000) -> Dict[str, list]:
+    column = lambda sql: [row[0] for row in conn.execute(f"{sql} LIMIT {limit}")]
+    return {
+        "customers": column("SELECT CustomerId FROM customer"),
+        "cart_customers": column("SELECT CustomerId FROM Cart"),
+        "retailers": column("SELECT RetailerId FROM Retailer"),
+        "orders": column("SELECT OrderId FROM Orders"),
+        "categories": column("SELECT MedicineCategoryId FROM MedicineCategory"),
+        "medicines": conn.execute(f"SELECT MedicineId, Name, UnitPrice FROM Medicine LIMIT {limit}").fetchall(),
+    }
+
+
+@contextmanager
+def seeded_databases(scale: str, seed: int, modes: Sequence[str]) -> Iterator[tuple]:
+    """(SQLite URL per mode, sample ids); every mode starts from the same generated rows."""
+    with tempfile.TemporaryDirectory(prefix="manager-bench-") as workdir:
+        db_file = os.path.join(workdir, "bench.db")
+        DataGenerator(f"sqlite+aiosqlite:///{db_file}", seed=seed, anchor=date(2025, 1, 1)).generate(SCALES[scale])
+        source = sqlite3.connect(db_file)
+        ids = sample_ids(source)
+        urls, keeper = {}, None
+        if "memory" in modes:
+            # The keeper connection keeps the shared in-memory database alive
+            name = f"file:manager-bench-{os.getpid()}?mode=memory&cache=shared"
+            keeper = sqlite3.connect(name, uri=True)
+            source.backup(keeper)
+            urls["memory"] = f"sqlite+aiosqlite:///{name}&uri=true"
+        source.close()
+        if "file" in modes:
+            urls["file"] = f"sqlite+aiosqlite:///{db_file}"
+        try:
+            yield urls, ids
+        finally:
+            if keeper is not None:
+                keeper.close()
+
+
+def _failed(result) -> bool:
+    return isinstance(result, dict) and result.get("success") is False
+
+
+async def run_case(case: Case, fixture: Fixture, repeat: int, warmup: int, seed: int) -> Dict:
+    rng = random.Random(f"{seed}:{case.name}")
+    for _ in range(warmup):
+        await case.call(fixture, rng)
+
+    seconds, queries, errors = [], [], 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        stats = RequestStats()
+        token = current_request.set(stats)
+        call_started = time.perf_counter()
+        try:
+            result = await case.call(fixture, rng)
+        finally:
+            seconds.append(time.perf_counter() - call_started)
+            current_request.reset(token)
+        queries.append(stats.queries)
+        errors += _failed(result)
+    elapsed = time.perf_counter() - started
+    return {
+        **summarize(seconds, elapsed),
+        "QueriesPerCall": round(sum(queries) / len(queries), 2) if queries else 0.0,
+        "MaxQueriesPerCall": max(queries, default=0),
+        "Errors": errors,
+    }
+
+
+async def run_suite(scale: str = "small", modes: Sequence[str] = MODES, repeat: int = 200, warmup: int = 5,
+                    seed: int = 42, only: Optional[List[str]] = None) -> Dict:
+    install_sqlalchemy_hooks()
+    cases = [c for c in CASES if not only or any(o in c.name for o in only)]
+    results: Dict[str, Dict] = {}
+    try:
+        with seeded_databases(scale, seed, modes) as (urls, ids):
+            for mode in modes:
+                fixture = Fixture(urls[mode], ids)
+                results[mode] = {case.name: await run_case(case, fixture, repeat, warmup, seed) for case in cases}
+    finally:
+        # create_order publishes events; drain the dispatcher before the loop closes
+        await event_bus.stop()
+    return {
+        "Meta": {"Scale": scale, "Seed": seed, "Repeat": repeat, "Python": sys.version.split()[0]},
+        "Results": results,
+    }
+
+
+# ------------------------------------------------------------
+# Baselines
+# ------------------------------------------------------------
+def to_baselines(report: Dict) -> Dict:
+    return {
+        "Meta": dict(report["Meta"]),
+        "Cases": {
+            f"{mode}/{name}": {"QueriesPerCall": r["MaxQueriesPerCall"], "P50Ms": r["P50Ms"]}
+            for mode, cases in report["Results"].items()
+            for name, r in cases.items()
+        },
+    }
+
+
+def load_baselines(path: str = BASELINES) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check(report: Dict, baselines: Dict, time_tolerance: Optional[float] = 1.0) -> List[str]:
+    """
+    Regressions against the baselines, one message each. Query counts are
+    exact; p50 may exceed the baseline by `time_tolerance` (1.0 = twice as
+    slow); None skips the timing check.
+    """
+    # Some counts follow the data (get_orders_by_retailer loads every New order),
+    # so only runs over the same generated rows are comparable
+    expected = {k: baselines.get("Meta", {}).get(k) for k in ("Scale", "Seed")}
+    actual = {k: report["Meta"][k] for k in ("Scale", "Seed")}
+    if expected != actual:
+        return [f"baselines were recorded with {expected}, this run used {actual}"]
+
+    problems = []
+    for mode, cases in report["Results"].items():
+        for name, result in cases.items():
+            key = f"{mode}/{name}"
+            if result["Errors"]:
+                problems.append(f"{key}: {result['Errors']} failed calls")
+            baseline = baselines.get("Cases", {}).get(key)
+            if baseline is None:
+                continue
+            if result["MaxQueriesPerCall"] > baseline["QueriesPerCall"]:
+                problems.append(
+                    f"{key}: {result['MaxQueriesPerCall']} queries per call, baseline {baseline['QueriesPerCall']}"
+                )
+            limit = baseline["P50Ms"] * (1 + time_tolerance) if time_tolerance is not None else None
+            if limit is not None and result["P50Ms"] > limit:
+                problems.append(f"{key}: p50 {result['P50Ms']} ms, limit {limit:.2f} ms (baseline {baseline['P50Ms']} ms)")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--mode", choices=MODES, nargs="*", default=list(MODES))
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="run only cases whose name contains one of these")
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--check", action="store_true", help="exit 1 when a case regressed")
+    parser.add_argument("--time-tolerance", type=float, default=1.0,
+                        help="allowed p50 growth as a fraction of the baseline (default 1.0 = 2x)")
+    parser.add_argument("--update-baselines", action="store_true")
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    # Manager loggers already exist by now; keep per-call INFO lines out of the timings
+    logging.disable(logging.INFO)
+    report = asyncio.run(run_suite(args.scale, args.mode, args.repeat, args.warmup, args.seed, args.only))
+    problems = check(report, load_baselines(args.baselines), args.time_tolerance) if args.check else []
+    report["Regressions"] = problems
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    if args.update_baselines:
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            f.write(json.dumps(to_baselines(report), indent=2) + "\n")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Login throughput of PasswordHasher.verify() per worker count.
+
+    python -m app.benchmarks.password_hashing --rounds 12 --logins 64
+
+For each pool size from 1 to the number of cores, runs `logins` concurrent
+verifications and prints one JSON line with logins/s, logins/s per worker
+and how late a 10 ms event-loop ticker ran meanwhile (a blocked loop shows
+up as a large MaxLoopLagMs).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from ..utils.password_hasher import PasswordHasher
+
+
+async def _ticker(stop: asyncio.Event, lags: list) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + 0.01
+        await asyncio.sleep(0.01)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run(rounds: int, logins: int, workers: int) -> dict:
+    hasher = PasswordHasher(rounds, workers)
+    stored = hasher.hash_sync("correct horse battery staple")
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *[hasher.verify("correct horse battery staple", stored) for _ in range(logins)]
+    )
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    hasher.shutdown()
+
+    assert all(r.valid for r in results)
+    return {
+        "Rounds": rounds,
+        "Workers": workers,
+        "Logins": logins,
+        "Seconds": round(elapsed, 3),
+        "LoginsPerSecond": round(logins / elapsed, 1),
+        "LoginsPerSecondPerWorker": round(logins / elapsed / workers, 1),
+        "MaxLoopLagMs": round(max(lags, default=0.0) * 1000, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    for workers in range(1, args.max_workers + 1):
+        print(json.dumps(asyncio.run(run(args.rounds, args.logins, workers))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Latency summaries shared by the benchmarks."""
+
+import math
+from typing import Dict, Sequence
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(seconds: Sequence[float], elapsed: float) -> Dict:
+    """Request count, throughput and latency percentiles in milliseconds."""
+    values = sorted(seconds)
+    ms = lambda v: round(v * 1000, 2)
+    return {
+        "Requests": len(values),
+        "Rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "MeanMs": ms(sum(values) / len(values)) if values else 0.0,
+        "P50Ms": ms(percentile(values, 50)),
+        "P95Ms": ms(percentile(values, 95)),
+        "P99Ms": ms(percentile(values, 99)),
+        "MaxMs": ms(values[-1]) if values else 0.0,
+    }
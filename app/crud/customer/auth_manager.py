@@ -0,0 +1,67 @@
+from typing import Optional
+from ...db.base.database_manager import DatabaseManager
+from ...models.customer.customer_model import Customer
+from ...models.customer.retailer_model import Retailer
+from ...utils.auth_tokens import token_service
+from ...utils.password_hasher import password_hasher
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+USER_TYPES = {
+    "customer": (Customer, "CustomerId"),
+    "retailer": (Retailer, "RetailerId"),
+}
+
+_dummy_hash: Optional[str] = None
+
+
+async def _unknown_user_hash() -> str:
+    # Unknown emails still pay for one bcrypt check, so response time
+    # does not reveal which emails are registered
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await password_hasher.hash("unknown-user")
+    return _dummy_hash
+
+
+class AuthManager:
+    def __init__(self, db_type: str):
+        self.db_manager = DatabaseManager(db_type)
+
+    async def login(self, user_type: str, email: str, password: str) -> dict:
+        model, id_column = USER_TYPES[user_type]
+        try:
+            await self.db_manager.connect()
+
+            users = await self.db_manager.read(model, {"Email": email})
+            user = users[0] if users else None
+            stored_hash = user.PasswordHash if user and user.PasswordHash else await _unknown_user_hash()
+
+            result = await password_hasher.verify(password, stored_hash)
+            if user is None or not result.valid:
+                logger.warning(f"⚠️ Failed {user_type} login for {email}")
+                return {"success": False, "message": "Invalid email or password"}
+
+            user_id = getattr(user, id_column)
+            if result.new_hash:
+                # Legacy / weaker hash: upgrade it now that we know the password
+                await self.db_manager.update(model, {id_column: user_id}, {"PasswordHash": result.new_hash})
+                logger.info("🔐 Upgraded password hash for %s %s", user_type, user_id)
+
+            token, claims = token_service.issue(user_type, user_id, email)
+            return {
+                "success": True,
+                "AccessToken": token,
+                "TokenType": "bearer",
+                "ExpiresAt": claims["exp"],
+                "UserType": user_type,
+                "UserId": user_id,
+            }
+
+        except Exception as e:
+            logger.error(f"❌ Error during {user_type} login: {e}")
+            return {"success": False, "message": str(e)}
+
+        finally:
+            await self.db_manager.disconnect()
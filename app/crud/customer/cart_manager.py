@@ -104,14 +104,20 @@ class CartManager:
 
             cart_items = await self.db.read(CartItem, {"CartId": cart_obj.CartId})
 
+            # One IN (...) query for all medicines instead of one per item
+            medicine_ids = list({item.MedicineId for item in cart_items})
+            medicines = {
+                m.MedicineId: m
+                for m in (await self.db.read(Medicine, {"MedicineId": medicine_ids}) if medicine_ids else [])
+            }
+
             enriched_list = []
             total = 0
 
             for item in cart_items:
-                med = await self.db.read(Medicine, {"MedicineId": item.MedicineId})
-                if not med:
+                med_obj = medicines.get(item.MedicineId)
+                if med_obj is None:
                     continue
-                med_obj = med[0]
 
                 old_price = item.StoredPrice
                 new_price = med_obj.UnitPrice
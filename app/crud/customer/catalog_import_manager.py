@@ -0,0 +1,256 @@
+import asyncio
+from typing import BinaryIO, Dict, List, NamedTuple, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select, insert, update as sql_update
+from ...config import settings
+from ...db.base.database_manager import DatabaseManager
+from ...models.customer.medicine_model import MedicalType, MedicineCategory, Medicine, MedicineInfo
+from ...schemas.customer.catalog_import_schema import (
+    MedicalTypeImportRow,
+    MedicineCategoryImportRow,
+    MedicineImportRow,
+    MedicineInfoImportRow,
+)
+from ...utils.importers import iter_records
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ImportSpec(NamedTuple):
+    model: type
+    schema: Type[BaseModel]
+    primary_key: str
+    key_columns: Tuple[str, ...]    # natural key used to decide insert vs update
+    name_fields: Tuple[str, ...]    # lookup-only fields, not columns
+    depends_on: Tuple[str, ...]     # entities whose id maps the resolver needs
+
+
+IMPORT_SPECS: Dict[str, ImportSpec] = {
+    "medical-types": ImportSpec(
+        MedicalType, MedicalTypeImportRow, "MedicalTypeId", ("MedicalType",), (), ()
+    ),
+    "medicine-categories": ImportSpec(
+        MedicineCategory, MedicineCategoryImportRow, "MedicineCategoryId",
+        ("MedicalTypeId", "Category"), ("MedicalType",), ("medical-types",),
+    ),
+    "medicines": ImportSpec(
+        Medicine, MedicineImportRow, "MedicineId",
+        ("Name", "Strength", "Manufacturer"), ("MedicalType", "Category"),
+        ("medical-types", "medicine-categories"),
+    ),
+    "medicine-infos": ImportSpec(
+        MedicineInfo, MedicineInfoImportRow, "MedicineInfoId",
+        ("MedicineId",), ("MedicineName",), ("medicines",),
+    ),
+}
+
+
+# Lookup-only name field -> the id column it resolves to
+NAME_COLUMNS = {"MedicalType": "MedicalTypeId", "Category": "MedicineCategoryId", "MedicineName": "MedicineId"}
+
+
+def _norm(value):
+    return " ".join(value.lower().split()) if isinstance(value, str) else value
+
+
+def natural_key(spec: ImportSpec, values: dict) -> tuple:
+    return tuple(_norm(values.get(c)) for c in spec.key_columns)
+
+
+class ImportReport:
+    def __init__(self, entity: str, max_errors: int):
+        self.entity = entity
+        self.max_errors = max_errors
+        self.rows = self.inserted = self.updated = self.failed = 0
+        self.errors: List[dict] = []
+
+    def fail(self, row_number: int, messages: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"Row": row_number, "Errors": messages})
+
+    def as_dict(self) -> dict:
+        return {
+            "success": True,
+            "Entity": self.entity,
+            "Rows": self.rows,
+            "Inserted": self.inserted,
+            "Updated": self.updated,
+            "Failed": self.failed,
+            "Errors": self.errors,
+            "ErrorsTruncated": self.failed > len(self.errors),
+        }
+
+
+class CatalogImportManager:
+    """
+    Bulk catalog import: records are streamed from the upload, validated in
+    chunks of import_chunk_size, parent names resolved against id maps loaded
+    once up front, and each chunk written with one executemany INSERT and one
+    executemany UPDATE (by primary key) in its own transaction.
+    Rows matching an existing natural key update it, so re-running an import
+    is safe. Invalid rows are skipped and listed in the report.
+    """
+
+    def __init__(self, db_type: str):
+        self.db_manager = DatabaseManager(db_type)
+
+    async def import_file(self, entity: str, binary_file: BinaryIO, format: str) -> dict:
+        spec = IMPORT_SPECS.get(entity)
+        if spec is None:
+            return {"success": False, "message": f"Unknown entity, expected one of: {', '.join(IMPORT_SPECS)}"}
+
+        report = ImportReport(entity, settings.import_max_errors)
+        try:
+            await self.db_manager.connect()
+            maps = {}
+            for name in spec.depends_on + (entity,):
+                maps[name] = await self._load_map(IMPORT_SPECS[name])
+            lookups = _name_lookups(maps)
+            if spec.model is MedicineInfo:
+                lookups["medicine_ids"] = {
+                    row["MedicineId"] async for row in self.db_manager.stream(Medicine, None, ("MedicineId",))
+                }
+
+            chunk = []
+            for row_number, record, error in iter_records(binary_file, format):
+                report.rows += 1
+                if error:
+                    report.fail(row_number, [error])
+                    continue
+                chunk.append((row_number, record))
+                if len(chunk) >= settings.import_chunk_size:
+                    await self._import_chunk(spec, maps[entity], chunk, maps, lookups, report)
+                    chunk = []
+                    await asyncio.sleep(0)  # parsing is CPU bound; let requests in
+            if chunk:
+                await self._import_chunk(spec, maps[entity], chunk, maps, lookups, report)
+
+            logger.info(
+                "✅ Imported %s: %s inserted, %s updated, %s failed",
+                entity, report.inserted, report.updated, report.failed,
+            )
+            return report.as_dict()
+
+        except Exception as e:
+            logger.error(f"❌ Catalog import of {entity} failed: {e}")
+            return {**report.as_dict(), "success": False, "message": str(e)}
+
+        finally:
+            await self.db_manager.disconnect()
+
+    async def _load_map(self, spec: ImportSpec) -> Dict[tuple, int]:
+        id_map = {}
+        columns = (spec.primary_key,) + spec.key_columns
+        async for row in self.db_manager.stream(spec.model, None, columns):
+            id_map.setdefault(natural_key(spec, row), row[spec.primary_key])
+        return id_map
+
+    async def _import_chunk(self, spec: ImportSpec, entity_map, chunk, maps, lookups, report: ImportReport) -> None:
+        inserts: Dict[tuple, Tuple[int, dict]] = {}
+        updates: Dict[tuple, Tuple[int, dict]] = {}
+
+        for row_number, record in chunk:
+            try:
+                row = spec.schema.model_validate(record)
+                values = _resolve(spec, row, maps, lookups)
+            except ValidationError as e:
+                report.fail(row_number, [
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                ])
+                continue
+            except ValueError as e:
+                report.fail(row_number, [str(e)])
+                continue
+
+            key = natural_key(spec, values)
+            existing_id = entity_map.get(key)
+            if existing_id is not None:
+                # Only the columns present in the file are changed
+                provided = set(row.model_fields_set) - set(spec.name_fields)
+                # A parent given by name changes the id it resolved to
+                provided.update(NAME_COLUMNS[f] for f in spec.name_fields if getattr(row, f))
+                changes = {c: v for c, v in values.items() if c in provided or c in spec.key_columns}
+                updates[key] = (row_number, {spec.primary_key: existing_id, **changes})
+            else:
+                inserts[key] = (row_number, values)  # a later duplicate in the chunk wins
+
+        if not inserts and not updates:
+            return
+        try:
+            session = self.db_manager.get_session()
+            async with session:
+                if inserts:
+                    await session.execute(insert(spec.model), [v for _, v in inserts.values()])
+                if updates:
+                    await session.execute(sql_update(spec.model), [v for _, v in updates.values()])
+                await session.commit()
+
+                if inserts:
+                    # One query for the new ids, so later chunks update instead of duplicating
+                    first = spec.key_columns[0]
+                    column = getattr(spec.model, first)
+                    stmt = select(
+                        getattr(spec.model, spec.primary_key),
+                        *[getattr(spec.model, c) for c in spec.key_columns],
+                    ).where(column.in_({v[first] for _, v in inserts.values()}))
+                    for row in (await session.execute(stmt)).mappings():
+                        entity_map.setdefault(natural_key(spec, row), row[spec.primary_key])
+            report.inserted += len(inserts)
+            report.updated += len(updates)
+        except Exception as e:
+            logger.error(f"❌ Catalog import chunk failed: {e}")
+            for row_number, _ in list(inserts.values()) + list(updates.values()):
+                report.fail(row_number, [f"Database error: {e}"])
+
+
+def _name_lookups(maps) -> dict:
+    """Category name -> ids across all types, medicine name -> first id."""
+    category_by_name: Dict[str, set] = {}
+    for (_, name), category_id in maps.get("medicine-categories", {}).items():
+        category_by_name.setdefault(name, set()).add(category_id)
+    medicine_by_name: Dict[str, int] = {}
+    for (name, _, _), medicine_id in maps.get("medicines", {}).items():
+        medicine_by_name.setdefault(name, medicine_id)
+    return {
+        "category_by_name": category_by_name,
+        "medicine_by_name": medicine_by_name,
+    }
+
+
+def _resolve(spec: ImportSpec, row: BaseModel, maps, lookups) -> dict:
+    """Column values for the row with parent names replaced by ids; ValueError if a name is unknown."""
+    values = row.model_dump(exclude=set(spec.name_fields))
+
+    if spec.model is MedicineCategory or spec.model is Medicine:
+        if values.get("MedicalTypeId") is None and row.MedicalType:
+            values["MedicalTypeId"] = maps["medical-types"].get((_norm(row.MedicalType),))
+            if values["MedicalTypeId"] is None:
+                raise ValueError(f"Unknown MedicalType '{row.MedicalType}'")
+        if spec.model is MedicineCategory and values.get("MedicalTypeId") is None:
+            raise ValueError("MedicalTypeId or MedicalType is required")
+
+    if spec.model is Medicine and values.get("MedicineCategoryId") is None and row.Category:
+        if values.get("MedicalTypeId") is not None:
+            category_id = maps["medicine-categories"].get((values["MedicalTypeId"], _norm(row.Category)))
+        else:
+            candidates = lookups["category_by_name"].get(_norm(row.Category), set())
+            if len(candidates) > 1:
+                raise ValueError(f"Category '{row.Category}' exists under several types; give MedicalType")
+            category_id = next(iter(candidates), None)
+        if category_id is None:
+            raise ValueError(f"Unknown Category '{row.Category}'")
+        values["MedicineCategoryId"] = category_id
+
+    if spec.model is MedicineInfo:
+        if values.get("MedicineId") is None:
+            if not row.MedicineName:
+                raise ValueError("MedicineId or MedicineName is required")
+            values["MedicineId"] = lookups["medicine_by_name"].get(_norm(row.MedicineName))
+            if values["MedicineId"] is None:
+                raise ValueError(f"Unknown MedicineName '{row.MedicineName}'")
+        elif values["MedicineId"] not in lookups["medicine_ids"]:
+            raise ValueError(f"Unknown MedicineId {values['MedicineId']}")
+
+    return values
@@ -7,6 +7,7 @@ from ...schemas.customer.customer_schema import (
     CustomerUpdate,
     CustomerRead
 )
+from ...utils.password_hasher import password_hasher
 
 logger = get_logger(__name__)
 
@@ -19,15 +20,11 @@ class CustomerManager:
         try:
             await self.db_manager.connect()
 
-            # Convert CustomerCreate -> dict and handle password hashing externally
             data = customer.dict()
-            plain_password = data.pop("Password", None)
-
-            # Your password hashing function should go here
-            data["PasswordHash"] = plain_password  # Replace later
+            data["PasswordHash"] = await password_hasher.hash(data.pop("Password"))
 
             obj = await self.db_manager.create(Customer, data)
-            logger.info(f"Created customer {obj.CustomerId}")
+            logger.info("Created customer %s", obj.CustomerId)
 
             return {
                 "success": True,
@@ -83,9 +80,10 @@ class CustomerManager:
 
             update_data = data.dict(exclude_unset=True)
 
-            # If Password is present -> rename to PasswordHash
-            if "Password" in update_data:
-                update_data["PasswordHash"] = update_data.pop("Password")
+            # If Password is present -> store its hash as PasswordHash
+            if update_data.get("Password"):
+                update_data["PasswordHash"] = await password_hasher.hash(update_data.pop("Password"))
+            update_data.pop("Password", None)
 
             rowcount = await self.db_manager.update(
                 Customer,
@@ -94,7 +92,7 @@ class CustomerManager:
             )
 
             if rowcount:
-                logger.info(f"Updated customer {customer_id}")
+                logger.info("Updated customer %s", customer_id)
                 return {
                     "success": True,
                     "message": "Customer updated successfully",
@@ -119,7 +117,7 @@ class CustomerManager:
             rowcount = await self.db_manager.delete(Customer, {"CustomerId": customer_id})
 
             if rowcount:
-                logger.info(f"Deleted customer {customer_id}")
+                logger.info("Deleted customer %s", customer_id)
                 return {
                     "success": True,
                     "message": "Customer deleted successfully",
@@ -1,6 +1,12 @@
+import asyncio
 from ...utils.timezone import ist_now
 from typing import Optional, List
 from ...db.base.database_manager import DatabaseManager
+from ...utils.event_bus import (
+    Event, EventBus, event_bus, NOTIFICATION_CREATED,
+    ORDER_CREATED, ORDER_STATUS_CHANGED, ORDER_UPDATED,
+    PRESCRIPTION_CREATED, PRESCRIPTION_STATUS_CHANGED,
+)
 from ...models.customer.customer_notification_model import CustomerNotification
 from ...schemas.customer.customer_notification_schema import CustomerNotificationCreate, CustomerNotificationUpdate
 from ...utils.logger import get_logger
@@ -20,9 +26,18 @@ class CustomerNotificationManager:
             await self.db_manager.connect()
             data = notification.dict()
             data["Date"] = ist_now()
-            await self.db_manager.create(CustomerNotification, data)
+            obj = await self.db_manager.create(CustomerNotification, data)
+            event_bus.publish(
+                NOTIFICATION_CREATED,
+                NotificationId=obj.NotificationId,
+                CustomerId=obj.CustomerId,
+                Title=obj.Title,
+                Message=obj.Message,
+                Type=obj.Type,
+                Date=obj.Date.isoformat() if obj.Date else None,
+            )
 
-            logger.info(f"✅ Notification created: {data['Title']}")
+            logger.info("✅ Notification created: %s", data['Title'])
             return {"success": True, "message": "Notification created successfully"}
         except Exception as e:
             logger.error(f"❌ Error creating notification: {e}")
@@ -67,7 +82,7 @@ class CustomerNotificationManager:
                 CustomerNotification, {"NotificationId": notification_id}, {"IsRead": True}
             )
             if rowcount:
-                logger.info(f"✅ Notification {notification_id} marked as read")
+                logger.info("✅ Notification %s marked as read", notification_id)
                 return {"success": True, "message": "Notification marked as read"}
             return {"success": False, "message": "Notification not found"}
         except Exception as e:
@@ -86,7 +101,7 @@ class CustomerNotificationManager:
                 CustomerNotification, {"NotificationId": notification_id}
             )
             if rowcount:
-                logger.info(f"🗑️ Notification {notification_id} deleted successfully")
+                logger.info("🗑️ Notification %s deleted successfully", notification_id)
                 return {"success": True, "message": "Notification deleted successfully"}
             return {"success": False, "message": "Notification not found"}
         except Exception as e:
@@ -105,7 +120,7 @@ class CustomerNotificationManager:
                 CustomerNotification, {"CustomerId": customer_id}
             )
             if rowcount:
-                logger.info(f"🧹 Deleted all notifications for Customer {customer_id}")
+                logger.info("🧹 Deleted all notifications for Customer %s", customer_id)
                 return {"success": True, "message": f"Deleted {rowcount} notifications"}
             return {"success": False, "message": "No notifications found to delete"}
         except Exception as e:
@@ -115,3 +130,116 @@ class CustomerNotificationManager:
             await self.db_manager.disconnect()
 
 
+# ------------------------------------------------------------
+# 📣 Event subscriber: order / prescription events -> notifications
+# ------------------------------------------------------------
+def build_notification(event: Event) -> Optional[dict]:
+    """CustomerNotification row for an event, or None if customers don't see it."""
+    p = event.payload
+    if not p.get("CustomerId"):
+        return None
+
+    order_ref = p.get("OrderNo") or f"#{p.get('OrderId')}"
+    if event.name == ORDER_CREATED:
+        title, message, type_ = "Order placed", f"Your order {order_ref} has been placed with {p.get('RetailerName')}.", "Order"
+    elif event.name == ORDER_STATUS_CHANGED:
+        title, message, type_ = f"Order {p['Status']}", f"Your order {order_ref} is now {p['Status']}.", "Order"
+    elif event.name == ORDER_UPDATED and p.get("DeliveryStatus"):
+        title, message, type_ = "Delivery update", f"Delivery of order {order_ref} is {p['DeliveryStatus']}.", "Order"
+    elif event.name == PRESCRIPTION_CREATED:
+        title, message, type_ = "Prescription uploaded", "We have received your prescription.", "Prescription"
+    elif event.name == PRESCRIPTION_STATUS_CHANGED:
+        title, message, type_ = f"Prescription {p['Status']}", f"Your prescription is now {p['Status']}.", "Prescription"
+    else:
+        return None
+
+    return {
+        "CustomerId": p["CustomerId"],
+        "Title": title,
+        "Message": message,
+        "Type": type_,
+        "IsRead": False,
+        "Date": event.created_at,
+    }
+
+
+class CustomerNotificationSubscriber:
+    """
+    Buffers notifications built from events and writes them with one
+    INSERT transaction per batch: when batch_size rows are waiting or
+    flush_seconds after the first buffered row, whichever comes first.
+    Every stored row is re-published as notification.created.
+    """
+
+    def __init__(self, db_type: str, batch_size: int = 100, flush_seconds: float = 0.5):
+        self.db_manager = DatabaseManager(db_type)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.bus: Optional[EventBus] = None
+        self._buffer: List[dict] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop = None
+
+    def register(self, bus: EventBus) -> None:
+        self.bus = bus
+        bus.subscribe("order.*", self.handle)
+        bus.subscribe("prescription.*", self.handle)
+
+    async def handle(self, event: Event) -> None:
+        row = build_notification(event)
+        if row is None:
+            return
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_seconds)
+        await self.flush()
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def flush(self) -> int:
+        async with self._get_lock():
+            rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            try:
+                await self.db_manager.connect()
+                notifications = [CustomerNotification(**row) for row in rows]
+                session = self.db_manager.get_session()
+                async with session:
+                    session.add_all(notifications)
+                    await session.commit()
+                logger.info("✅ %s notifications created", len(notifications))
+            except Exception as e:
+                logger.error(f"❌ Error writing {len(rows)} notifications: {e}")
+                return 0
+            finally:
+                await self.db_manager.disconnect()
+
+        if self.bus is not None:
+            for n in notifications:
+                self.bus.publish(
+                    NOTIFICATION_CREATED,
+                    NotificationId=n.NotificationId,
+                    CustomerId=n.CustomerId,
+                    Title=n.Title,
+                    Message=n.Message,
+                    Type=n.Type,
+                    Date=n.Date.isoformat() if n.Date else None,
+                )
+        return len(notifications)
+
+    async def stop(self) -> None:
+        await self.flush()
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
@@ -1,5 +1,13 @@
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from ...utils.timezone import ist_now
 from ...db.base.database_manager import DatabaseManager
+from ...exceptions.custom_exceptions import InvalidSlotException, SlotAlreadyBookedException
+from ...utils.doctor_schedule import DoctorSchedule, WEEKDAYS, date_range, parse_time_of_day
+from ...utils.slot_keys import doctor_slot_key, is_cancelled, is_slot_conflict
+from ...utils.event_bus import event_bus, APPOINTMENT_CREATED, APPOINTMENT_UPDATED, APPOINTMENT_CANCELLED
 from ...utils.logger import get_logger
 from ...models.customer.doctor_model import Doctor, DoctorAppointment
 from ...schemas.customer.doctor_schema import (
@@ -9,6 +17,47 @@ from ...schemas.customer.doctor_schema import (
 
 logger = get_logger(__name__)
 
+MAX_SLOT_RANGE_DAYS = 62
+
+# Fields that decide which slot an appointment holds
+SLOT_FIELDS = ("DoctorId", "AppointmentDate", "AppointmentTime", "AppointmentSlot", "Status")
+
+# DoctorId -> ((AvailableDays, AvailableTime, SlotDurationMinutes), DoctorSchedule)
+# Schedules are parsed once and re-parsed only when the doctor's hours change.
+_schedule_cache: Dict[int, Tuple[tuple, DoctorSchedule]] = {}
+
+
+def get_doctor_schedule(doctor) -> DoctorSchedule:
+    signature = (doctor.AvailableDays, doctor.AvailableTime, doctor.SlotDurationMinutes)
+    cached = _schedule_cache.get(doctor.DoctorId)
+    if cached and cached[0] == signature:
+        return cached[1]
+    schedule = DoctorSchedule(*signature)
+    _schedule_cache[doctor.DoctorId] = (signature, schedule)
+    return schedule
+
+
+def get_slot_key(doctor, appointment: dict) -> Optional[str]:
+    """
+    SlotKey for an appointment with this doctor; None frees the slot (cancelled).
+    Raises InvalidSlotException when an active booking has no parseable date
+    and time: a NULL key would not be covered by the unique index.
+    """
+    if is_cancelled(appointment.get("Status")):
+        return None
+    slot_key = doctor_slot_key(
+        doctor.DoctorId,
+        appointment.get("AppointmentDate"),
+        appointment.get("AppointmentTime"),
+        appointment.get("AppointmentSlot"),
+        get_doctor_schedule(doctor).slot_minutes,
+    )
+    if slot_key is None:
+        raise InvalidSlotException(
+            "AppointmentDate and AppointmentTime (or AppointmentSlot) must be a valid date and time"
+        )
+    return slot_key
+
 
 # ------------------------------------------------------
 # Doctor Manager
@@ -82,11 +131,31 @@ class DoctorAppointmentManager:
         try:
             await self.db_manager.connect()
             payload = data.dict()
+            doctors = await self.db_manager.read(Doctor, {"DoctorId": data.DoctorId})
+            if not doctors:
+                return {"success": False, "message": "Doctor not found"}
+            payload["SlotKey"] = get_slot_key(doctors[0], payload)
 
             payload["CreatedAt"] = ist_now()
             payload["UpdatedAt"] = ist_now()
 
-            obj = await self.db_manager.create(DoctorAppointment, payload)
+            # No check-then-insert: the unique SlotKey index decides the race
+            try:
+                obj = await self.db_manager.create(DoctorAppointment, payload)
+            except IntegrityError as e:
+                if not is_slot_conflict(e):
+                    raise
+                logger.warning(f"⚠️ Slot already booked: {payload['SlotKey']}")
+                raise SlotAlreadyBookedException("Slot already booked")
+            event_bus.publish(
+                APPOINTMENT_CREATED,
+                Kind="Doctor",
+                AppointmentId=obj.AppointmentId,
+                DoctorId=obj.DoctorId,
+                AppointmentDate=str(obj.AppointmentDate) if obj.AppointmentDate else None,
+                AppointmentTime=obj.AppointmentTime,
+                Status=obj.Status,
+            )
             return {"success": True, "message": "Doctor Appointment created", "Doctor Appointment Id": obj.AppointmentId}
         finally:
             await self.db_manager.disconnect()
@@ -106,14 +175,104 @@ class DoctorAppointmentManager:
         finally:
             await self.db_manager.disconnect()
 
+    async def get_available_slots(
+        self, doctor_id: int, from_date: Optional[date] = None, to_date: Optional[date] = None
+    ):
+        now = ist_now()
+        today = now.date()
+        from_date = from_date or today
+        to_date = to_date or from_date + timedelta(days=6)
+        if to_date < from_date:
+            return {"success": False, "message": "'to' must not be before 'from'"}
+        if (to_date - from_date).days >= MAX_SLOT_RANGE_DAYS:
+            return {"success": False, "message": f"Range is limited to {MAX_SLOT_RANGE_DAYS} days"}
+
+        try:
+            await self.db_manager.connect()
+            doctors = await self.db_manager.read(Doctor, {"DoctorId": doctor_id})
+            if not doctors:
+                return {"success": False, "message": "Doctor not found"}
+            schedule = get_doctor_schedule(doctors[0])
+
+            stmt = select(
+                DoctorAppointment.AppointmentDate,
+                DoctorAppointment.AppointmentTime,
+                DoctorAppointment.AppointmentSlot,
+                DoctorAppointment.Status,
+            ).where(
+                DoctorAppointment.DoctorId == doctor_id,
+                DoctorAppointment.AppointmentDate.between(from_date, to_date),
+            )
+            session = self.db_manager.get_session()
+            async with session:
+                rows = (await session.execute(stmt)).all()
+        finally:
+            await self.db_manager.disconnect()
+
+        # Booked slots as one bitmap per day
+        booked: Dict[date, int] = {}
+        for appt_date, appt_time, appt_slot, status in rows:
+            if appt_date is None or is_cancelled(status):
+                continue
+            minute = parse_time_of_day(appt_time)
+            if minute is None:
+                minute = parse_time_of_day(appt_slot)
+            if minute is not None:
+                booked[appt_date] = booked.get(appt_date, 0) | (1 << schedule.slot_index(minute))
+
+        # Slots that already started today are not bookable
+        started_today = -(-(now.hour * 60 + now.minute) // schedule.slot_minutes)
+        days = []
+        for day in date_range(from_date, to_date):
+            free = schedule.bitmap_for(day) & ~booked.get(day, 0)
+            if day < today:
+                free = 0
+            elif day == today:
+                free &= ~((1 << started_today) - 1)
+            slots = schedule.labels(free)
+            days.append({
+                "Date": day.isoformat(),
+                "Day": WEEKDAYS[day.weekday()],
+                "Slots": slots,
+                "AvailableCount": len(slots),
+            })
+
+        return {
+            "DoctorId": doctor_id,
+            "SlotDurationMinutes": schedule.slot_minutes,
+            "Days": days,
+        }
+
     async def update_appointment(self, appointment_id: int, data: DoctorAppointmentUpdate):
         try:
             await self.db_manager.connect()
             payload = data.dict(exclude_unset=True)
+            if any(field in payload for field in SLOT_FIELDS):
+                rows = await self.db_manager.read(DoctorAppointment, {"AppointmentId": appointment_id})
+                if not rows:
+                    return {"success": False}
+                merged = {f: payload.get(f, getattr(rows[0], f)) for f in SLOT_FIELDS}
+                doctors = await self.db_manager.read(Doctor, {"DoctorId": merged["DoctorId"]})
+                payload["SlotKey"] = get_slot_key(doctors[0], merged) if doctors else None
+
             payload["UpdatedAt"] = ist_now()
-            updated = await self.db_manager.update(
-                DoctorAppointment, {"AppointmentId": appointment_id}, payload
-            )
+            try:
+                updated = await self.db_manager.update(
+                    DoctorAppointment, {"AppointmentId": appointment_id}, payload
+                )
+            except IntegrityError as e:
+                if not is_slot_conflict(e):
+                    raise
+                logger.warning(f"⚠️ Slot already booked: {payload.get('SlotKey')}")
+                raise SlotAlreadyBookedException("Slot already booked")
+            if updated:
+                event_bus.publish(
+                    APPOINTMENT_CANCELLED if is_cancelled(payload.get("Status")) else APPOINTMENT_UPDATED,
+                    Kind="Doctor",
+                    AppointmentId=appointment_id,
+                    Changes=sorted(payload),
+                    Status=payload.get("Status"),
+                )
             return {"success": bool(updated)}
         finally:
             await self.db_manager.disconnect()
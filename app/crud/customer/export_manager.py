@@ -0,0 +1,100 @@
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from ...config import settings
+from ...db.base.database_manager import DatabaseManager
+from ...models.customer.customer_model import Customer
+from ...models.customer.lap_model import Test
+from ...models.customer.medicine_model import Medicine
+from ...models.customer.order_model import Order, OrdersArchive
+from ...utils.logger import get_logger
+from .order_archive_manager import archive_tables_exist
+
+logger = get_logger(__name__)
+
+# Credentials, bank details and birth dates never leave in an export;
+# contact details only when asked for (include_contact)
+CUSTOMER_EXCLUDED_COLUMNS = {"PasswordHash", "BankName", "AccountNumber", "IFSCCode", "Branch", "DateOfBirth"}
+CUSTOMER_CONTACT_COLUMNS = {"Email", "PhoneNumber"}
+
+Export = Tuple[List[str], AsyncIterator[Dict]]
+
+
+def _columns(model, excluded=()) -> List[str]:
+    return [c.name for c in model.__table__.columns if c.name not in excluded]
+
+
+class ExportManager:
+    """
+    Row streams for bulk exports. Rows come from DatabaseManager.stream()
+    (server-side cursor, export_batch_size rows per fetch) and are handed
+    on one by one, so an export never holds more than one batch in memory.
+    """
+
+    def __init__(self, db_type: str):
+        self.db_type = db_type
+
+    async def _stream(self, model, filters: Optional[Dict], columns: List[str]) -> AsyncIterator[Dict]:
+        # A DatabaseManager per export: the stream outlives the request handler
+        # and must not share an engine that other requests connect/disconnect
+        db_manager = DatabaseManager(self.db_type)
+        count = 0
+        try:
+            await db_manager.connect()
+            async for row in db_manager.stream(model, filters, columns, settings.export_batch_size):
+                count += 1
+                yield row
+            logger.info("✅ Exported %s rows from %s", count, model.__tablename__)
+        except Exception as e:
+            logger.error(f"❌ Export of {model.__tablename__} failed after {count} rows: {e}")
+            raise
+        finally:
+            await db_manager.disconnect()
+
+    async def _archive_tables_exist(self) -> bool:
+        db_manager = DatabaseManager(self.db_type)
+        try:
+            await db_manager.connect()
+            return await archive_tables_exist(db_manager)
+        finally:
+            await db_manager.disconnect()
+
+    async def export_orders(
+        self,
+        customer_id: Optional[int] = None,
+        retailer_id: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> Export:
+        # Checked before the response starts: a failing query mid-stream would
+        # leave the client with a truncated file under a 200
+        if include_archived and not await self._archive_tables_exist():
+            logger.warning("⚠️ Order archive tables are missing, exporting hot orders only")
+            include_archived = False
+        filters = {}
+        if customer_id:
+            filters["CustomerId"] = customer_id
+        if retailer_id:
+            filters["RetailerId"] = retailer_id
+        columns = _columns(Order)
+
+        async def rows():
+            async for row in self._stream(Order, filters, columns):
+                yield row
+            if include_archived:
+                async for row in self._stream(OrdersArchive, filters, columns):
+                    yield row
+
+        return columns, rows()
+
+    def export_customers(self, include_contact: bool = False) -> Export:
+        excluded = CUSTOMER_EXCLUDED_COLUMNS if include_contact else CUSTOMER_EXCLUDED_COLUMNS | CUSTOMER_CONTACT_COLUMNS
+        columns = _columns(Customer, excluded)
+        return columns, self._stream(Customer, None, columns)
+
+    def export_medicines(self, category_id: Optional[int] = None) -> Export:
+        columns = _columns(Medicine)
+        filters = {"MedicineCategoryId": category_id} if category_id else None
+        return columns, self._stream(Medicine, filters, columns)
+
+    def export_tests(self, lab_id: Optional[int] = None) -> Export:
+        columns = _columns(Test)
+        filters = {"LabId": lab_id} if lab_id else None
+        return columns, self._stream(Test, filters, columns)
@@ -0,0 +1,179 @@
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from sqlalchemy import select, update as sql_update, delete as sql_delete
+from sqlalchemy.exc import IntegrityError
+from ...config import settings
+from ...db.base.database_manager import DatabaseManager
+from ...models.customer.idempotency_model import IdempotencyKey
+from ...utils.timezone import ist_now
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PENDING = "Pending"
+DONE = "Done"
+
+# Outcomes of IdempotencyManager.claim()
+CLAIMED = "claimed"          # first request with this key: run the handler
+REPLAY = "replay"            # finished before: return the stored response
+IN_PROGRESS = "in_progress"  # another request with this key is still running
+MISMATCH = "mismatch"        # key reused with a different request body
+
+_last_purge = 0.0
+
+
+class Claim(NamedTuple):
+    outcome: str
+    record: Optional[IdempotencyKey] = None
+    claimed_at: Optional[datetime] = None   # CLAIMED: identifies this claim for renew()
+
+
+class IdempotencyManager:
+    """
+    Idempotency-Key bookkeeping. claim() is one INSERT on the primary key;
+    only when that collides is the existing row read, so first-time requests
+    pay a single write. Expired rows are overwritten on claim and purged in
+    bulk at most once per idempotency_purge_seconds.
+    """
+
+    def __init__(self, db_type: str):
+        self.db_manager = DatabaseManager(db_type)
+
+    async def claim(self, key: str, request_hash: str) -> Claim:
+        now = ist_now()
+        try:
+            await self.db_manager.connect()
+            session = self.db_manager.get_session()
+            async with session:
+                await self._purge_if_due(session, now)
+                try:
+                    session.add(IdempotencyKey(
+                        Key=key,
+                        RequestHash=request_hash,
+                        State=PENDING,
+                        CreatedAt=now,
+                        ExpiresAt=now + timedelta(seconds=settings.idempotency_pending_seconds),
+                    ))
+                    await session.commit()
+                    return Claim(CLAIMED, claimed_at=now)
+                except IntegrityError:
+                    await session.rollback()
+
+                # Expired result, or a pending claim whose worker died: take it over
+                result = await session.execute(
+                    sql_update(IdempotencyKey)
+                    .where(IdempotencyKey.Key == key, IdempotencyKey.ExpiresAt <= now)
+                    .values(
+                        RequestHash=request_hash,
+                        State=PENDING,
+                        ResponseCode=None,
+                        ResponseBody=None,
+                        ContentType=None,
+                        CreatedAt=now,
+                        ExpiresAt=now + timedelta(seconds=settings.idempotency_pending_seconds),
+                    )
+                )
+                await session.commit()
+                if result.rowcount:
+                    return Claim(CLAIMED, claimed_at=now)
+
+                existing = (await session.execute(
+                    select(IdempotencyKey).where(IdempotencyKey.Key == key)
+                )).scalar_one_or_none()
+                if existing is None:
+                    return Claim(IN_PROGRESS)  # released meanwhile; the client's next retry claims it
+
+                if existing.RequestHash != request_hash:
+                    return Claim(MISMATCH, existing)
+                if existing.State == DONE:
+                    return Claim(REPLAY, existing)
+                return Claim(IN_PROGRESS, existing)
+        finally:
+            await self.db_manager.disconnect()
+
+    async def renew(self, key: str, claimed_at: datetime) -> bool:
+        """Push a pending claim's expiry out again; False if it was released or taken over."""
+        try:
+            await self.db_manager.connect()
+            session = self.db_manager.get_session()
+            async with session:
+                result = await session.execute(
+                    sql_update(IdempotencyKey)
+                    .where(
+                        IdempotencyKey.Key == key,
+                        IdempotencyKey.State == PENDING,
+                        IdempotencyKey.CreatedAt == claimed_at,
+                    )
+                    .values(ExpiresAt=ist_now() + timedelta(seconds=settings.idempotency_pending_seconds))
+                )
+                await session.commit()
+            return bool(result.rowcount)
+        except Exception as e:
+            logger.error(f"❌ Error renewing idempotency key {key}: {e}")
+            return True  # keep trying; the claim is only lost once it expires
+        finally:
+            await self.db_manager.disconnect()
+
+    async def complete(self, key: str, status_code: int, body: str, content_type: Optional[str]) -> None:
+        try:
+            await self.db_manager.connect()
+            session = self.db_manager.get_session()
+            async with session:
+                await session.execute(
+                    sql_update(IdempotencyKey)
+                    .where(IdempotencyKey.Key == key)
+                    .values(
+                        State=DONE,
+                        ResponseCode=status_code,
+                        ResponseBody=body,
+                        ContentType=content_type,
+                        ExpiresAt=ist_now() + timedelta(seconds=settings.idempotency_ttl_seconds),
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"❌ Error storing idempotent response for {key}: {e}")
+        finally:
+            await self.db_manager.disconnect()
+
+    async def release(self, key: str) -> None:
+        """Drop a pending claim so the client can retry a failed request."""
+        try:
+            await self.db_manager.connect()
+            session = self.db_manager.get_session()
+            async with session:
+                await session.execute(
+                    sql_delete(IdempotencyKey).where(
+                        IdempotencyKey.Key == key, IdempotencyKey.State == PENDING
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"❌ Error releasing idempotency key {key}: {e}")
+        finally:
+            await self.db_manager.disconnect()
+
+    async def purge_expired(self) -> dict:
+        try:
+            await self.db_manager.connect()
+            session = self.db_manager.get_session()
+            async with session:
+                result = await session.execute(
+                    sql_delete(IdempotencyKey).where(IdempotencyKey.ExpiresAt <= ist_now())
+                )
+                await session.commit()
+            return {"success": True, "Deleted": result.rowcount}
+        except Exception as e:
+            logger.error(f"❌ Error purging idempotency keys: {e}")
+            return {"success": False, "message": str(e)}
+        finally:
+            await self.db_manager.disconnect()
+
+    async def _purge_if_due(self, session, now) -> None:
+        global _last_purge
+        if time.monotonic() - _last_purge < settings.idempotency_purge_seconds:
+            return
+        _last_purge = time.monotonic()
+        await session.execute(sql_delete(IdempotencyKey).where(IdempotencyKey.ExpiresAt <= now))
+        await session.commit()
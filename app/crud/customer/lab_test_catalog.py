@@ -0,0 +1,195 @@
+import asyncio
+import re
+import time
+from typing import Dict, List, NamedTuple, Optional
+from sqlalchemy import select
+from ...config import settings
+from ...db.base.database_manager import DatabaseManager
+from ...crud.customer.pincode_manager import PincodeManager
+from ...models.customer.lap_model import Lab, Test
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_PARENTHESES = re.compile(r"\(([^)]*)\)")
+
+
+def normalize_test_name(name: Optional[str]) -> str:
+    """'Complete Blood Count (CBC)' -> 'complete blood count cbc'"""
+    return _NON_ALNUM.sub(" ", (name or "").lower()).strip()
+
+
+def name_keys(name: Optional[str]) -> set:
+    """
+    Every name a test can be searched by: the full name, the name without
+    the parenthesised part and the parenthesised alias itself, so
+    'CBC', 'Complete Blood Count' and 'Complete Blood Count (CBC)' all match.
+    """
+    keys = {normalize_test_name(name), normalize_test_name(_PARENTHESES.sub(" ", name or ""))}
+    keys.update(normalize_test_name(alias) for alias in _PARENTHESES.findall(name or ""))
+    keys.discard("")
+    return keys
+
+
+class CatalogEntry(NamedTuple):
+    TestId: int
+    LabId: int
+    Name: str
+    Category: Optional[str]
+    Price: float
+    GstPercent: float
+    NetPrice: float
+    EstimatedReportTime: Optional[str]
+
+
+def to_entry(test) -> CatalogEntry:
+    price = test.Price or 0.0
+    gst = test.GstPercent or 0.0
+    return CatalogEntry(
+        TestId=test.TestId,
+        LabId=test.LabId,
+        Name=test.Name,
+        Category=test.Category,
+        Price=price,
+        GstPercent=gst,
+        NetPrice=round(price * (1 + gst / 100), 2),
+        EstimatedReportTime=test.EstimatedReportTime,
+    )
+
+
+class LabTestCatalog:
+    """
+    In-memory index: normalized test name -> {TestId: CatalogEntry}.
+    Built once from the Test table, then kept current by TestManager
+    (upsert/remove) and fully rebuilt after the TTL, which also picks up
+    writes made by other worker processes.
+    """
+
+    def __init__(self):
+        self.loaded_at: Optional[float] = None
+        self._entries: Dict[int, CatalogEntry] = {}
+        self._by_name: Dict[str, Dict[int, CatalogEntry]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_stale(self, ttl_seconds: int) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > ttl_seconds
+
+    def rebuild(self, entries: List[CatalogEntry]) -> None:
+        self._entries, self._by_name = {}, {}
+        for entry in entries:
+            self._add(entry)
+        self.loaded_at = time.monotonic()
+
+    def upsert(self, entry: CatalogEntry) -> None:
+        if self.loaded_at is None:
+            return  # not built yet; the first search loads everything
+        self.remove(entry.TestId)
+        self._add(entry)
+
+    def remove(self, test_id: int) -> None:
+        entry = self._entries.pop(test_id, None)
+        if entry is None:
+            return
+        for key in name_keys(entry.Name):
+            bucket = self._by_name.get(key)
+            if bucket is not None:
+                bucket.pop(test_id, None)
+                if not bucket:
+                    del self._by_name[key]
+
+    def lookup(self, name: str) -> List[CatalogEntry]:
+        return list(self._by_name.get(normalize_test_name(name), {}).values())
+
+    def _add(self, entry: CatalogEntry) -> None:
+        self._entries[entry.TestId] = entry
+        for key in name_keys(entry.Name):
+            self._by_name.setdefault(key, {})[entry.TestId] = entry
+
+
+lab_test_catalog = LabTestCatalog()
+_catalog_lock = asyncio.Lock()
+
+
+class LabTestCatalogManager:
+    def __init__(self, db_type: str):
+        self.db_manager = DatabaseManager(db_type)
+        self.pincode_manager = PincodeManager(db_type)
+
+    async def _ensure_loaded(self) -> LabTestCatalog:
+        ttl = settings.test_catalog_ttl_seconds
+        if not lab_test_catalog.is_stale(ttl):
+            return lab_test_catalog
+
+        async with _catalog_lock:
+            if not lab_test_catalog.is_stale(ttl):
+                return lab_test_catalog
+            try:
+                await self.db_manager.connect()
+                session = self.db_manager.get_session()
+                async with session:
+                    tests = (await session.execute(select(Test))).scalars().all()
+                lab_test_catalog.rebuild([to_entry(t) for t in tests])
+                logger.info("🧪 Lab test catalog loaded with %s tests", len(tests))
+            finally:
+                await self.db_manager.disconnect()
+            return lab_test_catalog
+
+    async def warm_up(self) -> int:
+        """Load the catalog now instead of on the first comparison; returns the test count."""
+        return len(await self._ensure_loaded())
+
+    async def compare(self, name: str, postal: Optional[str] = None, neighbours: int = 0):
+        """
+        Every lab offering the test, cheapest net price (Price + GST) first.
+        With a postal code only labs in it or its N nearest pincodes are kept.
+        """
+        try:
+            # First, so the finally below only ever releases this call's own hold
+            # on the shared manager (early returns included)
+            await self.db_manager.connect()
+            catalog = await self._ensure_loaded()
+            entries = catalog.lookup(name)
+            if not entries:
+                return []
+
+            filters = {"LabId": list({e.LabId for e in entries})}
+            distance_by_pincode = None
+            if postal:
+                distance_by_pincode = dict(
+                    await self.pincode_manager.get_nearby_pincodes(postal, neighbours)
+                )
+                filters["PostalCode"] = list(distance_by_pincode)
+
+            labs = {lab.LabId: lab for lab in await self.db_manager.read(Lab, filters)}
+
+            result = []
+            for e in entries:
+                lab = labs.get(e.LabId)
+                if lab is None:
+                    continue
+                row = {
+                    "TestId": e.TestId,
+                    "TestName": e.Name,
+                    "Category": e.Category,
+                    "LabId": e.LabId,
+                    "LabName": lab.Name,
+                    "City": lab.City,
+                    "PostalCode": lab.PostalCode,
+                    "Price": e.Price,
+                    "GstPercent": e.GstPercent,
+                    "NetPrice": e.NetPrice,
+                    "EstimatedReportTime": e.EstimatedReportTime,
+                }
+                if distance_by_pincode is not None:
+                    row["DistanceKm"] = round(distance_by_pincode.get(lab.PostalCode, 0.0), 2)
+                result.append(row)
+            result.sort(key=lambda x: (x["NetPrice"], x.get("DistanceKm", 0.0), x["LabId"]))
+            return result
+        except Exception as e:
+            logger.error(f"❌ Error comparing test prices: {e}")
+            return {"success": False, "message": str(e)}
+        finally:
+            await self.db_manager.disconnect()
@@ -1,8 +1,18 @@
 from ...utils.timezone import ist_now
 from typing import List, Optional
+from sqlalchemy import update as sql_update, delete as sql_delete
+from sqlalchemy.exc import IntegrityError
 from ...db.base.database_manager import DatabaseManager
+from ...crud.customer.pincode_manager import PincodeManager
+from ...crud.customer.lab_test_catalog import lab_test_catalog, to_entry
+from ...exceptions.custom_exceptions import SlotAlreadyBookedException
+from ...utils.id_generator import get_id_generator
+from ...utils.geo import parse_latitude, parse_longitude, normalize_gps_payload
+from ...utils.slot_keys import lab_slot_key, is_cancelled, is_slot_conflict
+from ...utils.event_bus import event_bus, APPOINTMENT_CREATED, APPOINTMENT_UPDATED, APPOINTMENT_CANCELLED
+from ...utils.lab_pricing import SelectedTestsError, format_selected_tests, parse_selected_tests, price_tests
 from ...utils.logger import get_logger
-from ...models.customer.lap_model import Lab, Test, Appointment
+from ...models.customer.lap_model import Lab, Test, Appointment, AppointmentTest
 from ...schemas.customer.lap_schema import (
     LabCreate, LabUpdate,
     TestCreate, TestUpdate,
@@ -12,17 +22,42 @@ from ...schemas.customer.lap_schema import (
 logger = get_logger(__name__)
 
 
+def _normalize_lab_coordinates(payload: dict) -> dict:
+    if "Latitude" in payload:
+        payload["Latitude"] = parse_latitude(payload["Latitude"])
+    if "Longitude" in payload:
+        payload["Longitude"] = parse_longitude(payload["Longitude"])
+    return payload
+
+
+# Fields that decide which slot a lab appointment holds
+SLOT_FIELDS = ("LabId", "AppointmentDate", "TimeSlot", "BookingStatus")
+
+# Fields that change the price, and the totals that are always computed server-side
+PRICING_FIELDS = ("LabId", "SelectedTests")
+PRICE_FIELDS = ("TotalAmount", "TotalGst", "NetPayable")
+
+
+def _get_slot_key(appointment: dict) -> Optional[str]:
+    if is_cancelled(appointment.get("BookingStatus")):
+        return None
+    return lab_slot_key(
+        appointment.get("LabId"), appointment.get("AppointmentDate"), appointment.get("TimeSlot")
+    )
+
+
 # ============================================
 # LAB MANAGER
 # ============================================
 class LabManager:
     def __init__(self, db_type: str):
         self.db_manager = DatabaseManager(db_type)
+        self.pincode_manager = PincodeManager(db_type)
 
     async def create_lab(self, data: LabCreate):
         try:
             await self.db_manager.connect()
-            payload = data.dict()
+            payload = _normalize_lab_coordinates(data.dict())
             payload["CreatedAt"] = ist_now()
             payload["UpdatedAt"] = ist_now()
             obj = await self.db_manager.create(Lab, payload)
@@ -45,17 +80,22 @@ class LabManager:
         finally:
             await self.db_manager.disconnect()
 
-    async def get_labs_by_postal(self, postal: str):
+    async def get_labs_by_postal(self, postal: str, neighbours: int = 0):
         try:
+            # Requested pincode + its N nearest pincodes, nearest first
+            nearby = await self.pincode_manager.get_nearby_pincodes(postal, neighbours)
+            distance_by_pincode = dict(nearby)
+
             await self.db_manager.connect()
-            return await self.db_manager.read(Lab, {"PostalCode": postal})
+            labs = await self.db_manager.read(Lab, {"PostalCode": list(distance_by_pincode)})
+            return sorted(labs, key=lambda lab: distance_by_pincode.get(lab.PostalCode, 0.0))
         finally:
             await self.db_manager.disconnect()
 
     async def update_lab(self, lab_id: int, data: LabUpdate):
         try:
             await self.db_manager.connect()
-            payload = data.dict(exclude_unset=True)
+            payload = _normalize_lab_coordinates(data.dict(exclude_unset=True))
             payload["UpdatedAt"] = ist_now()
             updated = await self.db_manager.update(Lab, {"LabId": lab_id}, payload)
             return {"success": bool(updated)}
@@ -85,6 +125,7 @@ class TestManager:
             payload["CreatedAt"] = ist_now()
             payload["UpdatedAt"] = ist_now()
             obj = await self.db_manager.create(Test, payload)
+            lab_test_catalog.upsert(to_entry(obj))
             return {"success": True, "message": "Test created", "Test Id": obj.TestId}
         finally:
             await self.db_manager.disconnect()
@@ -110,6 +151,10 @@ class TestManager:
             payload = data.dict(exclude_unset=True)
             payload["UpdatedAt"] = ist_now()
             updated = await self.db_manager.update(Test, {"TestId": test_id}, payload)
+            if updated:
+                rows = await self.db_manager.read(Test, {"TestId": test_id})
+                if rows:
+                    lab_test_catalog.upsert(to_entry(rows[0]))
             return {"success": bool(updated)}
         finally:
             await self.db_manager.disconnect()
@@ -118,6 +163,7 @@ class TestManager:
         try:
             await self.db_manager.connect()
             deleted = await self.db_manager.delete(Test, {"TestId": test_id})
+            lab_test_catalog.remove(test_id)
             return {"success": bool(deleted)}
         finally:
             await self.db_manager.disconnect()
@@ -130,17 +176,113 @@ class AppointmentManager:
     def __init__(self, db_type: str):
         self.db_manager = DatabaseManager(db_type)
 
+    async def _price_selected_tests(self, lab_id: int, selected_tests: Optional[str]) -> dict:
+        """
+        Server-side totals for SelectedTests: one IN query for all the tests,
+        whatever their number. Raises SelectedTestsError for unknown ids or
+        tests the lab does not offer.
+        """
+        test_ids = parse_selected_tests(selected_tests)
+        tests = []
+        if test_ids:
+            tests = await self.db_manager.read(Test, {"TestId": test_ids, "LabId": lab_id})
+        found = {t.TestId: t for t in tests}
+        missing = [i for i in test_ids if i not in found]
+        if missing:
+            raise SelectedTestsError(f"Tests not offered by lab {lab_id}: {missing}")
+
+        pricing = price_tests([found[i] for i in test_ids])
+        pricing["SelectedTests"] = format_selected_tests(test_ids) or None
+        return pricing
+
+    async def _save(self, payload: dict, lines: Optional[list], appointment_id: Optional[int] = None):
+        """
+        Insert (appointment_id=None) or update the appointment and replace its
+        AppointmentTest rows in one transaction. lines=None keeps existing rows.
+        """
+        session = self.db_manager.get_session()
+        async with session:
+            if appointment_id is None:
+                obj = Appointment(**payload)
+                session.add(obj)
+                await session.flush()
+                appointment_id = obj.AppointmentId
+            else:
+                result = await session.execute(
+                    sql_update(Appointment)
+                    .where(Appointment.AppointmentId == appointment_id)
+                    .values(**payload)
+                )
+                if not result.rowcount:
+                    return None
+                if lines is not None:
+                    await session.execute(
+                        sql_delete(AppointmentTest).where(AppointmentTest.AppointmentId == appointment_id)
+                    )
+            if lines:
+                now = ist_now()
+                session.add_all([
+                    AppointmentTest(AppointmentId=appointment_id, CreatedAt=now, **line) for line in lines
+                ])
+            await session.commit()
+            return appointment_id
+
+    async def quote(self, lab_id: int, selected_tests: str):
+        try:
+            await self.db_manager.connect()
+            pricing = await self._price_selected_tests(lab_id, selected_tests)
+            return {"success": True, "LabId": lab_id, **pricing}
+        except SelectedTestsError as e:
+            return {"success": False, "message": str(e)}
+        finally:
+            await self.db_manager.disconnect()
+
     async def create_appointment(self, data: AppointmentCreate):
         try:
             await self.db_manager.connect()
-            payload = data.dict()
+            payload = normalize_gps_payload(data.dict())
             if not payload.get("AppointmentNo"):
-                payload["AppointmentNo"] = f"APPT-{int(ist_now().timestamp())}"
+                payload["AppointmentNo"] = get_id_generator().next_code("APPT")
+
+            # Totals are always computed here; client supplied amounts are ignored
+            try:
+                pricing = await self._price_selected_tests(payload["LabId"], payload.get("SelectedTests"))
+            except SelectedTestsError as e:
+                return {"success": False, "message": str(e)}
+            lines = pricing.pop("Tests")
+            payload.update(pricing)
+
+            payload["SlotKey"] = _get_slot_key(payload)
 
             payload["CreatedAt"] = ist_now()
             payload["UpdatedAt"] = ist_now()
-            obj = await self.db_manager.create(Appointment, payload)
-            return {"success": True, "message": "Appointment created", "Appointment Id": obj.AppointmentId}
+            try:
+                appointment_id = await self._save(payload, lines)
+            except IntegrityError as e:
+                if not is_slot_conflict(e):
+                    raise
+                logger.warning(f"⚠️ Slot already booked: {payload['SlotKey']}")
+                raise SlotAlreadyBookedException("Slot already booked")
+            event_bus.publish(
+                APPOINTMENT_CREATED,
+                Kind="Lab",
+                AppointmentId=appointment_id,
+                AppointmentNo=payload["AppointmentNo"],
+                LabId=payload["LabId"],
+                AppointmentDate=str(payload["AppointmentDate"]) if payload.get("AppointmentDate") else None,
+                TimeSlot=payload.get("TimeSlot"),
+                BookingStatus=payload.get("BookingStatus"),
+                NetPayable=payload["NetPayable"],
+            )
+            return {
+                "success": True,
+                "message": "Appointment created",
+                "Appointment Id": appointment_id,
+                "AppointmentNo": payload["AppointmentNo"],
+                "TotalAmount": payload["TotalAmount"],
+                "TotalGst": payload["TotalGst"],
+                "NetPayable": payload["NetPayable"],
+            }
         finally:
             await self.db_manager.disconnect()
 
@@ -152,6 +294,13 @@ class AppointmentManager:
         finally:
             await self.db_manager.disconnect()
 
+    async def get_appointment_tests(self, appointment_id: int):
+        try:
+            await self.db_manager.connect()
+            return await self.db_manager.read(AppointmentTest, {"AppointmentId": appointment_id})
+        finally:
+            await self.db_manager.disconnect()
+
     async def get_appointments_by_lab(self, lab_id: int):
         try:
             await self.db_manager.connect()
@@ -162,9 +311,46 @@ class AppointmentManager:
     async def update_appointment(self, appointment_id: int, data: AppointmentUpdate):
         try:
             await self.db_manager.connect()
-            payload = data.dict(exclude_unset=True)
+            payload = normalize_gps_payload(data.dict(exclude_unset=True))
+            for field in PRICE_FIELDS:
+                payload.pop(field, None)
+
+            lines = None
+            if any(field in payload for field in SLOT_FIELDS + PRICING_FIELDS):
+                rows = await self.db_manager.read(Appointment, {"AppointmentId": appointment_id})
+                if not rows:
+                    return {"success": False}
+                current = rows[0]
+                payload["SlotKey"] = _get_slot_key(
+                    {f: payload.get(f, getattr(current, f)) for f in SLOT_FIELDS}
+                )
+                if any(field in payload for field in PRICING_FIELDS):
+                    try:
+                        pricing = await self._price_selected_tests(
+                            payload.get("LabId", current.LabId),
+                            payload.get("SelectedTests", current.SelectedTests),
+                        )
+                    except SelectedTestsError as e:
+                        return {"success": False, "message": str(e)}
+                    lines = pricing.pop("Tests")
+                    payload.update(pricing)
+
             payload["UpdatedAt"] = ist_now()
-            updated = await self.db_manager.update(Appointment, {"AppointmentId": appointment_id}, payload)
+            try:
+                updated = await self._save(payload, lines, appointment_id)
+            except IntegrityError as e:
+                if not is_slot_conflict(e):
+                    raise
+                logger.warning(f"⚠️ Slot already booked: {payload.get('SlotKey')}")
+                raise SlotAlreadyBookedException("Slot already booked")
+            if updated:
+                event_bus.publish(
+                    APPOINTMENT_CANCELLED if is_cancelled(payload.get("BookingStatus")) else APPOINTMENT_UPDATED,
+                    Kind="Lab",
+                    AppointmentId=appointment_id,
+                    Changes=sorted(payload),
+                    BookingStatus=payload.get("BookingStatus"),
+                )
             return {"success": bool(updated)}
         finally:
             await self.db_manager.disconnect()
@@ -172,7 +358,15 @@ class AppointmentManager:
     async def delete_appointment(self, appointment_id: int):
         try:
             await self.db_manager.connect()
-            deleted = await self.db_manager.delete(Appointment, {"AppointmentId": appointment_id})
-            return {"success": bool(deleted)}
+            session = self.db_manager.get_session()
+            async with session:
+                await session.execute(
+                    sql_delete(AppointmentTest).where(AppointmentTest.AppointmentId == appointment_id)
+                )
+                result = await session.execute(
+                    sql_delete(Appointment).where(Appointment.AppointmentId == appointment_id)
+                )
+                await session.commit()
+            return {"success": bool(result.rowcount)}
         finally:
             await self.db_manager.disconnect()
@@ -0,0 +1,146 @@
+import asyncio
+from datetime import timedelta
+from typing import Optional
+from sqlalchemy import select, insert, inspect, literal, func, delete as sql_delete, DateTime
+from ...config import settings
+from ...db.base.database_manager import DatabaseManager
+from ...models.customer.order_model import Order, OrderItem, OrdersArchive, OrderItemArchive
+from ...utils.timezone import ist_now
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVABLE_STATUSES = ("Delivered", "Cancelled")
+
+ORDER_COLUMNS = [c.name for c in Order.__table__.columns]
+ORDER_ITEM_COLUMNS = [c.name for c in OrderItem.__table__.columns]
+
+
+async def archive_tables_exist(db_manager: DatabaseManager) -> bool:
+    """
+    OrdersArchive / OrderItemArchive are only created when archiving is set up
+    (TableCreator.create_order_archive_tables); callers skip them until then.
+    db_manager must be connected.
+    """
+    async with db_manager.db.engine.connect() as conn:
+        return await conn.run_sync(lambda sync_conn: all(
+            inspect(sync_conn).has_table(model.__tablename__) for model in (OrdersArchive, OrderItemArchive)
+        ))
+
+
+class OrderArchiveManager:
+    """
+    Moves Delivered / Cancelled orders older than order_archive_after_days
+    from Orders / OrderItem into OrdersArchive / OrderItemArchive.
+    Each batch is copied and deleted in one transaction, so an order is
+    always in exactly one of the two places. Status counters are not
+    touched: archived orders still count in the dashboard summaries.
+    """
+
+    def __init__(self, db_type: str):
+        self.db_manager = DatabaseManager(db_type)
+
+    async def archive_orders(
+        self,
+        older_than_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None,
+    ) -> dict:
+        older_than_days = settings.order_archive_after_days if older_than_days is None else older_than_days
+        batch_size = batch_size or settings.order_archive_batch_size
+        cutoff = ist_now() - timedelta(days=older_than_days)
+
+        archived, batches = 0, 0
+        try:
+            await self.db_manager.connect()
+            if not await archive_tables_exist(self.db_manager):
+                logger.warning("⚠️ Order archive tables are missing, skipping archival")
+                return {"success": False, "message": "Order archive tables are missing", "Archived": 0}
+            while max_batches is None or batches < max_batches:
+                moved = await self._archive_batch(cutoff, batch_size)
+                archived += moved
+                batches += 1
+                if moved < batch_size:
+                    break
+                await asyncio.sleep(0)  # let request handlers in between batches
+
+            if archived:
+                logger.info("✅ Archived %s orders in %s batches", archived, batches)
+            return {"success": True, "Archived": archived}
+
+        except Exception as e:
+            logger.error(f"❌ Error archiving orders: {e}")
+            return {"success": False, "message": str(e), "Archived": archived}
+
+        finally:
+            await self.db_manager.disconnect()
+
+    async def _archive_batch(self, cutoff, batch_size: int) -> int:
+        session = self.db_manager.get_session()
+        async with session:
+            order_ids = (await session.execute(
+                select(Order.OrderId)
+                .where(
+                    Order.Status.in_(ARCHIVABLE_STATUSES),
+                    func.coalesce(Order.UpdatedAt, Order.OrderDateTime) < cutoff,
+                )
+                .order_by(Order.OrderId)
+                .limit(batch_size)
+            )).scalars().all()
+            if not order_ids:
+                return 0
+
+            await session.execute(
+                insert(OrdersArchive).from_select(
+                    ORDER_COLUMNS + ["ArchivedAt"],
+                    select(
+                        *[Order.__table__.c[name] for name in ORDER_COLUMNS],
+                        literal(ist_now(), DateTime),
+                    ).where(Order.OrderId.in_(order_ids)),
+                )
+            )
+            await session.execute(
+                insert(OrderItemArchive).from_select(
+                    ORDER_ITEM_COLUMNS,
+                    select(*[OrderItem.__table__.c[name] for name in ORDER_ITEM_COLUMNS])
+                    .where(OrderItem.OrderId.in_(order_ids)),
+                )
+            )
+            await session.execute(sql_delete(OrderItem).where(OrderItem.OrderId.in_(order_ids)))
+            await session.execute(sql_delete(Order).where(Order.OrderId.in_(order_ids)))
+            await session.commit()
+            return len(order_ids)
+
+
+class OrderArchiveJob:
+    """
+    Runs OrderArchiveManager.archive_orders() every interval_seconds in the
+    background. Off by default: every worker runs its own job, so enable it
+    (ORDER_ARCHIVE_INTERVAL_SECONDS) on one process only, or call
+    POST /orders/archive from a scheduler.
+    """
+
+    def __init__(self, db_type: str, interval_seconds: float):
+        self.manager = OrderArchiveManager(db_type)
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0 or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.manager.archive_orders()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
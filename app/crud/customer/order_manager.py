@@ -1,9 +1,16 @@
 from typing import Optional, Dict, Any
+from sqlalchemy import select, func, literal, insert, union_all, update as sql_update, delete as sql_delete
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from ...utils.timezone import ist_now
 from ...utils.logger import get_logger
+from ...utils.id_generator import get_id_generator
+from ...utils.event_bus import (
+    event_bus, ORDER_CREATED, ORDER_UPDATED, ORDER_STATUS_CHANGED, ORDER_DELETED
+)
 from ...db.base.database_manager import DatabaseManager
+from .order_archive_manager import archive_tables_exist
 
-from ...models.customer.order_model import Order, OrderItem
+from ...models.customer.order_model import Order, OrderItem, OrderStatusCounter, OrdersArchive, OrderItemArchive
 from ...models.customer.customer_model import Customer
 from ...schemas.customer.order_schema import (
     OrderCreate,
@@ -22,6 +29,99 @@ from ...schemas.customer.order_schema import (
 
 logger = get_logger(__name__)
 
+DEFAULT_ORDER_STATUS = "New"
+COUNTER_OWNERS = (("Customer", Order.CustomerId), ("Retailer", Order.RetailerId))
+
+
+async def bump_status_counters(session, customer_id: int, retailer_id: int, status: Optional[str], delta: int):
+    """Add delta to the customer's and the retailer's counter for status (upsert)."""
+    status = status or DEFAULT_ORDER_STATUS
+    rows = [
+        {"OwnerType": "Customer", "OwnerId": customer_id, "Status": status, "Count": delta},
+        {"OwnerType": "Retailer", "OwnerId": retailer_id, "Status": status, "Count": delta},
+    ]
+    dialect = session.bind.dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(OrderStatusCounter).values(rows)
+        stmt = stmt.on_duplicate_key_update(Count=OrderStatusCounter.Count + stmt.inserted.Count)
+    else:
+        stmt = (postgresql if dialect == "postgresql" else sqlite).insert(OrderStatusCounter).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["OwnerType", "OwnerId", "Status"],
+            set_={"Count": OrderStatusCounter.Count + stmt.excluded.Count},
+        )
+    await session.execute(stmt)
+
+
+def customer_counts(counts: Dict[str, int]) -> Dict[str, int]:
+    """Customer dashboard figures from OrderStatusCounter counts per status."""
+    return {
+        "TotalOrders": sum(counts.values()),
+        "Delivered": counts.get("Delivered", 0),
+        "InTransit": counts.get("InTransit", 0),
+        "Placed": counts.get("New", 0) + counts.get("Pending", 0),
+    }
+
+
+def retailer_counts(counts: Dict[str, int]) -> Dict[str, int]:
+    """Retailer dashboard figures from OrderStatusCounter counts per status."""
+    total = sum(counts.values())
+    return {
+        "TotalOrders": total,
+        "New": counts.get("New", 0),
+        "Accepted": total - counts.get("New", 0) - counts.get("Cancelled", 0),
+        "Pending": counts.get("Pending", 0),
+        "InTransit": counts.get("InTransit", 0),
+        "Delivered": counts.get("Delivered", 0),
+        "Cancelled": counts.get("Cancelled", 0),
+    }
+
+
+# Counter moves are computed from the (owners, status) an update read; the
+# UPDATE only applies while the row still has those, else it is re-read
+COUNTER_KEY_RETRIES = 10
+
+
+def counter_key_unchanged(order: Order) -> list:
+    """WHERE terms: the row still has the owners and status read into `order`."""
+    return [
+        Order.OrderId == order.OrderId,
+        Order.CustomerId.is_not_distinct_from(order.CustomerId),
+        Order.RetailerId.is_not_distinct_from(order.RetailerId),
+        Order.Status.is_not_distinct_from(order.Status),
+    ]
+
+
+TOTAL_TOLERANCE = 0.01
+
+
+def item_total(price: Optional[float], quantity: Optional[int]) -> float:
+    return round((price or 0) * (quantity or 0), 2)
+
+
+def line_unchanged(item: OrderItem) -> list:
+    """WHERE terms: the line still has the order, price, quantity and total read into `item`."""
+    return [
+        OrderItem.OrderItemId == item.OrderItemId,
+        OrderItem.OrderId == item.OrderId,
+        OrderItem.Price.is_not_distinct_from(item.Price),
+        OrderItem.Quantity.is_not_distinct_from(item.Quantity),
+        OrderItem.TotalAmount.is_not_distinct_from(item.TotalAmount),
+    ]
+
+
+async def apply_total_delta(session, order_id: int, delta: float) -> int:
+    """Orders.TotalAmount += delta in the caller's transaction; returns the rowcount."""
+    result = await session.execute(
+        sql_update(Order)
+        .where(Order.OrderId == order_id)
+        .values(
+            TotalAmount=func.coalesce(Order.TotalAmount, 0) + delta,
+            UpdatedAt=ist_now(),
+        )
+    )
+    return result.rowcount
+
 
 class OrderManager:
     def __init__(self, db_type: str):
@@ -36,39 +136,54 @@ class OrderManager:
 
             order_data = order.dict(exclude={"Items"})
             order_data["OrderDateTime"] = ist_now()
-
-            new_order = await self.db_manager.create(Order, order_data)
-            order_id = new_order.OrderId
-
-            total_amount = 0.0
-
-            # ---- Create items ----
-            if order.Items:
-                for item in order.Items:
-                    item_data = item.dict()
-                    item_data["OrderId"] = order_id
-                    item_data["TotalAmount"] = (item.Price or 0) * (item.Quantity or 0)
-
-                    total_amount += item_data["TotalAmount"]
-
-                    await self.db_manager.create(OrderItem, item_data)
-
-            # ---- Update totals ----
-            await self.db_manager.update(
-                Order,
-                {"OrderId": order_id},
-                {
-                    "TotalAmount": total_amount,
-                    "UpdatedAt": ist_now(),
-                },
+            order_data["OrderNo"] = get_id_generator().next_code("ORD")
+
+            # Order, items, total and status counters commit together
+            session = self.db_manager.get_session()
+            async with session:
+                new_order = Order(**order_data)
+                session.add(new_order)
+                await session.flush()
+                order_id = new_order.OrderId
+
+                total_amount = 0.0
+
+                # ---- Create items ----
+                if order.Items:
+                    for item in order.Items:
+                        item_data = item.dict()
+                        item_data["OrderId"] = order_id
+                        item_data["TotalAmount"] = item_total(item.Price, item.Quantity)
+
+                        total_amount += item_data["TotalAmount"]
+
+                        session.add(OrderItem(**item_data))
+
+                # ---- Totals + counters ----
+                new_order.TotalAmount = total_amount
+                new_order.UpdatedAt = ist_now()
+                await bump_status_counters(
+                    session, new_order.CustomerId, new_order.RetailerId, new_order.Status, 1
+                )
+                await session.commit()
+
+            logger.info("✅ Order %s created with items", order_id)
+            event_bus.publish(
+                ORDER_CREATED,
+                OrderId=order_id,
+                OrderNo=new_order.OrderNo,
+                CustomerId=new_order.CustomerId,
+                RetailerId=new_order.RetailerId,
+                RetailerName=new_order.RetailerName,
+                Status=new_order.Status,
+                TotalAmount=total_amount,
             )
 
-            logger.info(f"✅ Order {order_id} created with items")
-
             return {
                 "success": True,
                 "message": "Order created successfully",
                 "OrderId": order_id,
+                "OrderNo": new_order.OrderNo,
             }
 
         except Exception as e:
@@ -85,14 +200,19 @@ class OrderManager:
         try:
             await self.db_manager.connect()
 
+            order_table, item_table = Order, OrderItem
             orders = await self.db_manager.read(Order, {"OrderId": order_id})
+            if not orders and await archive_tables_exist(self.db_manager):
+                # Delivered / Cancelled orders move to the archive after a while
+                order_table, item_table = OrdersArchive, OrderItemArchive
+                orders = await self.db_manager.read(OrdersArchive, {"OrderId": order_id})
             if not orders:
                 return {"success": False, "message": "Order not found"}
 
             order = orders[0]
 
             items = await self.db_manager.read(
-                OrderItem, {"OrderId": order_id}
+                item_table, {"OrderId": order_id}
             )
 
             order_schema = OrderRead.from_orm(order).dict()
@@ -100,6 +220,8 @@ class OrderManager:
                 Customer, {"CustomerId": order.CustomerId}
             )
             order_schema["Items"] = [item.__dict__ for item in items]
+            if order_table is OrdersArchive:
+                order_schema["Archived"] = True
 
             return order_schema
 
@@ -113,31 +235,22 @@ class OrderManager:
     # ------------------------------------------------------------
     # 🟢 Get Orders by Customer (SAME COUNTS)
     # ------------------------------------------------------------
-    async def get_orders_by_customer(self, customer_id: Optional[int] = None) -> Dict[str, Any]:
+    async def get_orders_by_customer(
+        self, customer_id: Optional[int] = None, include_archived: bool = False
+    ) -> Dict[str, Any]:
         try:
             await self.db_manager.connect()
 
             query = {"CustomerId": customer_id} if customer_id else None
             result = await self.db_manager.read(Order, query)
+            if include_archived and await archive_tables_exist(self.db_manager):
+                result = list(result) + list(await self.db_manager.read(OrdersArchive, query))
 
             orders = [OrderRead.from_orm(o).dict() for o in result]
 
-            total_orders = len(orders)
-
-            delivered = sum(1 for o in orders if o.get("Status") == "Delivered")
-            in_transit = sum(1 for o in orders if o.get("Status") == "InTransit")
-            placed = sum(
-                1 for o in orders
-                if o.get("Status") in ("New", "Pending")
-            )
-
-            return {
-                "TotalOrders": total_orders,
-                "Delivered": delivered,
-                "InTransit": in_transit,
-                "Placed": placed,
-                "Data": orders
-            }
+            # Counts include archived orders, the same as the summary endpoint
+            counts = customer_counts(await self._status_counts("Customer", customer_id))
+            return {**counts, "Data": orders}
 
         except Exception as e:
             logger.error(f"❌ Error fetching customer orders: {e}")
@@ -149,49 +262,118 @@ class OrderManager:
     # ------------------------------------------------------------
     # 🟢 Get Orders by Retailer (SAME COUNTS + NewOrders)
     # ------------------------------------------------------------
-    async def get_orders_by_retailer(self, retailer_id: Optional[int] = None) -> Dict[str, Any]:
+    async def get_orders_by_retailer(
+        self, retailer_id: Optional[int] = None, include_archived: bool = False
+    ) -> Dict[str, Any]:
         try:
             await self.db_manager.connect()
 
             query = {"RetailerId": retailer_id} if retailer_id else None
             result = await self.db_manager.read(Order, query)
+            if include_archived and await archive_tables_exist(self.db_manager):
+                result = list(result) + list(await self.db_manager.read(OrdersArchive, query))
 
             orders = [OrderRead.from_orm(o).dict() for o in result]
 
-            new_orders = [
-                await self.get_order(o.get("OrderId"))
-                for o in orders
-                if o.get("Status") == "New"
-            ]
+            # New orders with their items and customer, as get_order returns them,
+            # read with one IN query each instead of one get_order per order
+            new_orders = [o for o in orders if o.get("Status") == "New"]
+            if new_orders:
+                items_by_order: Dict[int, list] = {}
+                for item in await self.db_manager.read(
+                    OrderItem, {"OrderId": [o["OrderId"] for o in new_orders]}
+                ):
+                    items_by_order.setdefault(item.OrderId, []).append(item.__dict__)
+                customers = {
+                    c.CustomerId: c for c in await self.db_manager.read(
+                        Customer, {"CustomerId": list({o["CustomerId"] for o in new_orders})}
+                    )
+                }
+                new_orders = [
+                    {
+                        **o,
+                        "Customer": [customers[o["CustomerId"]]] if o["CustomerId"] in customers else [],
+                        "Items": items_by_order.get(o["OrderId"], []),
+                    }
+                    for o in new_orders
+                ]
+
+            counts = retailer_counts(await self._status_counts("Retailer", retailer_id))
+            return {**counts, "NewOrders": new_orders, "AllOrders": orders}
 
-            total_orders = len(orders)
+        except Exception as e:
+            logger.error(f"❌ Error fetching retailer orders: {e}")
+            return {"success": False, "message": str(e)}
+
+        finally:
+            await self.db_manager.disconnect()
 
-            delivered = sum(1 for o in orders if o.get("Status") == "Delivered")
-            cancelled = sum(1 for o in orders if o.get("Status") == "Cancelled")
-            in_transit = sum(1 for o in orders if o.get("Status") == "InTransit")
-            pending = sum(1 for o in orders if o.get("Status") == "Pending")
-            new = sum(1 for o in orders if o.get("Status") == "New")
-            accepted = sum(
-                1 for o in orders
-                if o.get("Status") not in ("New", "Cancelled")
+    # ------------------------------------------------------------
+    # 📊 Dashboard summaries (OrderStatusCounter, no order scan)
+    # ------------------------------------------------------------
+    async def _status_counts(self, owner_type: str, owner_id: Optional[int]) -> Dict[str, int]:
+        """Orders per status for one owner, or for all of them when owner_id is None."""
+        try:
+            await self.db_manager.connect()
+            stmt = (
+                select(OrderStatusCounter.Status, func.sum(OrderStatusCounter.Count))
+                .where(OrderStatusCounter.OwnerType == owner_type)
+                .group_by(OrderStatusCounter.Status)
             )
+            if owner_id:
+                stmt = stmt.where(OrderStatusCounter.OwnerId == owner_id)
+            session = self.db_manager.get_session()
+            async with session:
+                return {status: count for status, count in (await session.execute(stmt)).all()}
+        finally:
+            await self.db_manager.disconnect()
 
-            return {
-                "TotalOrders": total_orders,
-                "New": new,
-                "Accepted": accepted,
-                "Pending": pending,
-                "InTransit": in_transit,
-                "Delivered": delivered,
-                "Cancelled": cancelled,
-                "NewOrders": new_orders,
-                "AllOrders": orders
-            }
+    async def get_customer_summary(self, customer_id: int) -> Dict[str, Any]:
+        try:
+            return customer_counts(await self._status_counts("Customer", customer_id))
+        except Exception as e:
+            logger.error(f"❌ Error fetching customer order summary: {e}")
+            return {"success": False, "message": str(e)}
 
+    async def get_retailer_summary(self, retailer_id: int) -> Dict[str, Any]:
+        try:
+            return retailer_counts(await self._status_counts("Retailer", retailer_id))
         except Exception as e:
-            logger.error(f"❌ Error fetching retailer orders: {e}")
+            logger.error(f"❌ Error fetching retailer order summary: {e}")
             return {"success": False, "message": str(e)}
 
+    async def rebuild_status_counters(self) -> dict:
+        """Reconciliation: recompute every counter from Orders + OrdersArchive in one transaction."""
+        try:
+            await self.db_manager.connect()
+            session = self.db_manager.get_session()
+            async with session:
+                await session.execute(sql_delete(OrderStatusCounter))
+                all_orders = select(Order.CustomerId, Order.RetailerId, Order.Status)
+                if await archive_tables_exist(self.db_manager):
+                    # Archived orders keep counting
+                    all_orders = union_all(
+                        all_orders,
+                        select(OrdersArchive.CustomerId, OrdersArchive.RetailerId, OrdersArchive.Status),
+                    )
+                all_orders = all_orders.subquery()
+                for owner_type, owner_column in COUNTER_OWNERS:
+                    owner_column = all_orders.c[owner_column.key]
+                    status = func.coalesce(all_orders.c.Status, DEFAULT_ORDER_STATUS)
+                    counts = select(
+                        literal(owner_type), owner_column, status, func.count()
+                    ).group_by(owner_column, status)
+                    await session.execute(
+                        insert(OrderStatusCounter).from_select(
+                            ["OwnerType", "OwnerId", "Status", "Count"], counts
+                        )
+                    )
+                await session.commit()
+            logger.info("✅ Order status counters rebuilt")
+            return {"success": True, "message": "Order status counters rebuilt"}
+        except Exception as e:
+            logger.error(f"❌ Error rebuilding order status counters: {e}")
+            return {"success": False, "message": str(e)}
         finally:
             await self.db_manager.disconnect()
 
@@ -202,16 +384,46 @@ class OrderManager:
         try:
             await self.db_manager.connect()
 
-            rowcount = await self.db_manager.update(
-                Order,
-                {"OrderId": order_id},
-                data.dict(exclude_unset=True),
+            # TotalAmount is the sum of the line totals, kept by the item writes
+            changes = data.dict(exclude_unset=True, exclude={"TotalAmount"})
+            session = self.db_manager.get_session()
+            async with session:
+                for _ in range(COUNTER_KEY_RETRIES):
+                    order = (await session.execute(
+                        select(Order).where(Order.OrderId == order_id)
+                    )).scalar_one_or_none()
+                    if order is None:
+                        return {"success": False, "message": "Order not found"}
+                    before = (order.CustomerId, order.RetailerId, order.Status)
+                    if not changes:
+                        break
+                    result = await session.execute(
+                        sql_update(Order).where(*counter_key_unchanged(order)).values(**changes)
+                    )
+                    if result.rowcount:
+                        await session.refresh(order)
+                        break
+                    await session.rollback()  # changed since it was read: read it again
+                else:
+                    return {"success": False, "message": "Order is being updated concurrently, please retry"}
+                after = (order.CustomerId, order.RetailerId, order.Status)
+                if before != after:
+                    await bump_status_counters(session, *before, -1)
+                    await bump_status_counters(session, *after, 1)
+                await session.commit()
+
+            event_bus.publish(
+                ORDER_UPDATED,
+                OrderId=order_id,
+                OrderNo=order.OrderNo,
+                CustomerId=order.CustomerId,
+                RetailerId=order.RetailerId,
+                Changes=sorted(changes),
+                Status=order.Status,
+                DeliveryStatus=changes.get("DeliveryStatus"),
+                PaymentStatus=changes.get("PaymentStatus"),
             )
-
-            if rowcount:
-                return {"success": True, "message": "Order updated"}
-
-            return {"success": False, "message": "Order not found"}
+            return {"success": True, "message": "Order updated"}
 
         except Exception as e:
             logger.error(f"❌ Error updating order: {e}")
@@ -233,22 +445,49 @@ class OrderManager:
             # if status not in allowed_status:
             #     return {"success": False, "message": "Invalid status value"}
 
-            rowcount = await self.db_manager.update(
-                Order,
-                {"OrderId": order_id},
-                {
-                    "Status": status,
-                    "UpdatedAt": ist_now()
-                }
-            )
-
-            if rowcount:
-                return {
-                    "success": True,
-                    "message": f"Order status updated to {status}"
-                }
-
-            return {"success": False, "message": "Order not found"}
+            changed = False
+            session = self.db_manager.get_session()
+            async with session:
+                for _ in range(COUNTER_KEY_RETRIES):
+                    order = (await session.execute(
+                        select(Order).where(Order.OrderId == order_id)
+                    )).scalar_one_or_none()
+                    if order is None:
+                        return {"success": False, "message": "Order not found"}
+                    previous_status = order.Status
+                    if previous_status == status:
+                        break
+
+                    # Applies only while the row still has the status the counters move from
+                    result = await session.execute(
+                        sql_update(Order)
+                        .where(*counter_key_unchanged(order))
+                        .values(Status=status, UpdatedAt=ist_now())
+                    )
+                    if result.rowcount:
+                        await bump_status_counters(session, order.CustomerId, order.RetailerId, previous_status, -1)
+                        await bump_status_counters(session, order.CustomerId, order.RetailerId, status, 1)
+                        await session.commit()
+                        changed = True
+                        break
+                    await session.rollback()  # changed since it was read: read it again
+                else:
+                    return {"success": False, "message": "Order is being updated concurrently, please retry"}
+
+            if changed:
+                event_bus.publish(
+                    ORDER_STATUS_CHANGED,
+                    OrderId=order_id,
+                    OrderNo=order.OrderNo,
+                    CustomerId=order.CustomerId,
+                    RetailerId=order.RetailerId,
+                    PreviousStatus=previous_status,
+                    Status=status,
+                )
+            return {
+                "success": True,
+                "message": f"Order status updated to {status}"
+            }
 
         except Exception as e:
             logger.error(f"❌ Error updating order status: {e}")
@@ -265,15 +504,34 @@ class OrderManager:
         try:
             await self.db_manager.connect()
 
-            await self.db_manager.delete(
-                OrderItem, {"OrderId": order_id}
-            )
-
-            rowcount = await self.db_manager.delete(
-                Order, {"OrderId": order_id}
-            )
-
-            if rowcount:
+            deleted = False
+            session = self.db_manager.get_session()
+            async with session:
+                for _ in range(COUNTER_KEY_RETRIES):
+                    order = (await session.execute(
+                        select(Order).where(Order.OrderId == order_id)
+                    )).scalar_one_or_none()
+                    if order is None:
+                        break
+
+                    result = await session.execute(sql_delete(Order).where(*counter_key_unchanged(order)))
+                    if result.rowcount:
+                        await session.execute(sql_delete(OrderItem).where(OrderItem.OrderId == order_id))
+                        await bump_status_counters(session, order.CustomerId, order.RetailerId, order.Status, -1)
+                        await session.commit()
+                        deleted = True
+                        break
+                    await session.rollback()  # changed since it was read: read it again
+                else:
+                    return {"success": False, "message": "Order is being updated concurrently, please retry"}
+
+            if deleted:
+                event_bus.publish(
+                    ORDER_DELETED,
+                    OrderId=order_id,
+                    CustomerId=order.CustomerId,
+                    RetailerId=order.RetailerId,
+                )
                 return {"success": True, "message": "Order deleted"}
 
             return {"success": False, "message": "Order not found"}
@@ -289,6 +547,13 @@ class OrderManager:
 
 
 class OrderItemManager:
+    """
+    Order lines. Orders.TotalAmount is kept current by applying each line's
+    change as a delta in the same transaction as the line write, so editing
+    a large order costs the same for the 1st and the 500th line.
+    check_order_totals() verifies (and optionally repairs) totals in bulk.
+    """
+
     def __init__(self, db_type: str):
         self.db_manager = DatabaseManager(db_type)
 
@@ -297,28 +562,21 @@ class OrderItemManager:
     # ------------------------------------------------------------
     async def create_item(self, item: OrderItemCreate) -> dict:
         try:
+            if item.OrderId is None:
+                return {"success": False, "message": "OrderId is required"}
+
             await self.db_manager.connect()
 
             data = item.dict()
-            data["TotalAmount"] = (item.Price or 0) * (item.Quantity or 0)
-
-            new_item = await self.db_manager.create(OrderItem, data)
-
-            # ---- Update order total ----
-            items = await self.db_manager.read(
-                OrderItem, {"OrderId": item.OrderId}
-            )
-
-            total_amount = sum(i.TotalAmount for i in items)
+            data["TotalAmount"] = item_total(item.Price, item.Quantity)
 
-            await self.db_manager.update(
-                Order,
-                {"OrderId": item.OrderId},
-                {
-                    "TotalAmount": total_amount,
-                    "UpdatedAt": ist_now()
-                }
-            )
+            session = self.db_manager.get_session()
+            async with session:
+                if not await apply_total_delta(session, item.OrderId, data["TotalAmount"]):
+                    return {"success": False, "message": "Order not found"}
+                new_item = OrderItem(**data)
+                session.add(new_item)
+                await session.commit()
 
             return {
                 "success": True,
@@ -362,16 +620,39 @@ class OrderItemManager:
         try:
             await self.db_manager.connect()
 
-            count = await self.db_manager.update(
-                OrderItem,
-                {"OrderItemId": item_id},
-                data.dict(exclude_unset=True)
-            )
-
-            if count:
-                return {"success": True, "message": "Order item updated"}
-
-            return {"success": False, "message": "Order item not found"}
+            # The line total is always derived from Price * Quantity
+            changes = data.dict(exclude_unset=True, exclude={"TotalAmount"})
+
+            session = self.db_manager.get_session()
+            async with session:
+                for _ in range(COUNTER_KEY_RETRIES):
+                    item = (await session.execute(
+                        select(OrderItem).where(OrderItem.OrderItemId == item_id)
+                    )).scalar_one_or_none()
+                    if item is None:
+                        return {"success": False, "message": "Order item not found"}
+
+                    new_total = item_total(
+                        changes.get("Price", item.Price), changes.get("Quantity", item.Quantity)
+                    )
+                    delta = new_total - (item.TotalAmount or 0)
+
+                    # The delta is only right while the line still has the values it was computed from
+                    result = await session.execute(
+                        sql_update(OrderItem)
+                        .where(*line_unchanged(item))
+                        .values(**changes, TotalAmount=new_total)
+                    )
+                    if result.rowcount:
+                        if delta:
+                            await apply_total_delta(session, item.OrderId, delta)
+                        await session.commit()
+                        break
+                    await session.rollback()  # changed since it was read: read it again
+                else:
+                    return {"success": False, "message": "Order item is being updated concurrently, please retry"}
+
+            return {"success": True, "message": "Order item updated"}
 
         except Exception as e:
             logger.error(f"❌ Update order item failed: {e}")
@@ -387,38 +668,90 @@ class OrderItemManager:
         try:
             await self.db_manager.connect()
 
-            item = await self.db_manager.read(
-                OrderItem, {"OrderItemId": item_id}
-            )
-            if not item:
-                return {"success": False, "message": "Order item not found"}
+            session = self.db_manager.get_session()
+            async with session:
+                item = (await session.execute(
+                    select(OrderItem).where(OrderItem.OrderItemId == item_id)
+                )).scalar_one_or_none()
+                if item is None:
+                    return {"success": False, "message": "Order item not found"}
 
-            order_id = item[0].OrderId
+                result = await session.execute(sql_delete(OrderItem).where(*line_unchanged(item)))
+                if not result.rowcount:
+                    return {"success": False, "message": "Order item is being updated concurrently, please retry"}
+                await apply_total_delta(session, item.OrderId, -(item.TotalAmount or 0))
+                await session.commit()
 
-            await self.db_manager.delete(
-                OrderItem, {"OrderItemId": item_id}
-            )
+            return {"success": True, "message": "Order item deleted"}
 
-            # ---- Recalculate order total ----
-            items = await self.db_manager.read(
-                OrderItem, {"OrderId": order_id}
-            )
+        except Exception as e:
+            logger.error(f"❌ Delete order item failed: {e}")
+            return {"success": False, "message": str(e)}
 
-            total_amount = sum(i.TotalAmount for i in items)
+        finally:
+            await self.db_manager.disconnect()
 
-            await self.db_manager.update(
-                Order,
-                {"OrderId": order_id},
-                {
-                    "TotalAmount": total_amount,
-                    "UpdatedAt": ist_now()
-                }
-            )
+    # ------------------------------------------------------------
+    # 🧮 Verify / Repair Order Totals
+    # ------------------------------------------------------------
+    async def check_order_totals(self, repair: bool = False, order_ids: Optional[list] = None) -> dict:
+        """
+        Compare every order's TotalAmount with the sum of its lines in one
+        grouped query. With repair=True the mismatched orders are reset to
+        the line sum by one set-based UPDATE in the same transaction, which
+        recomputes the sum itself rather than writing the values just read.
+        """
+        try:
+            await self.db_manager.connect()
 
-            return {"success": True, "message": "Order item deleted"}
+            line_sums = (
+                select(OrderItem.OrderId, func.sum(OrderItem.TotalAmount).label("LineTotal"))
+                .group_by(OrderItem.OrderId)
+                .subquery()
+            )
+            expected = func.coalesce(line_sums.c.LineTotal, 0)
+            query = (
+                select(Order.OrderId, Order.TotalAmount, expected)
+                .outerjoin(line_sums, line_sums.c.OrderId == Order.OrderId)
+                .where(func.abs(func.coalesce(Order.TotalAmount, 0) - expected) > TOTAL_TOLERANCE)
+            )
+            if order_ids:
+                query = query.where(Order.OrderId.in_(order_ids))
+
+            repaired = 0
+            session = self.db_manager.get_session()
+            async with session:
+                mismatched = [
+                    {"OrderId": order_id, "TotalAmount": total, "ExpectedTotal": round(expected_total, 2)}
+                    for order_id, total, expected_total in (await session.execute(query)).all()
+                ]
+                if repair and mismatched:
+                    line_total = func.round(func.coalesce(
+                        select(func.sum(OrderItem.TotalAmount))
+                        .where(OrderItem.OrderId == Order.OrderId)
+                        .scalar_subquery(), 0
+                    ), 2)
+                    stmt = (
+                        sql_update(Order)
+                        .where(func.abs(func.coalesce(Order.TotalAmount, 0) - line_total) > TOTAL_TOLERANCE)
+                        .values(TotalAmount=line_total, UpdatedAt=ist_now())
+                    )
+                    if order_ids:
+                        stmt = stmt.where(Order.OrderId.in_(order_ids))
+                    repaired = (await session.execute(stmt.execution_options(synchronize_session=False))).rowcount
+                    await session.commit()
+
+            if mismatched:
+                action = "repaired" if repair else "found"
+                logger.warning(f"⚠️ {len(mismatched)} order totals out of sync {action}")
+            return {
+                "success": True,
+                "Mismatched": mismatched,
+                "Repaired": repaired,
+            }
 
         except Exception as e:
-            logger.error(f"❌ Delete order item failed: {e}")
+            logger.error(f"❌ Order total check failed: {e}")
             return {"success": False, "message": str(e)}
 
         finally:
@@ -1,7 +1,9 @@
-from math import radians, sin, cos, sqrt, atan2
+from sqlalchemy import select
 from ...db.base.database_manager import DatabaseManager
+from ...crud.customer.pincode_manager import PincodeManager
 from ...models.customer.pharmacy_model import Pharmacy
 from ...schemas.customer.pharmacy_schema import PharmacyCreate, PharmacyUpdate
+from ...utils.geo import bounding_box, haversine_km, normalize_gps_payload
 from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -9,15 +11,7 @@ logger = get_logger(__name__)
 class PharmacyManager:
     def __init__(self, db_type: str):
         self.db_manager = DatabaseManager(db_type)
-
-    # Haversine formula to calculate distance in km
-    def _calculate_distance_km(self, lat1, lon1, lat2, lon2):
-        R = 6371
-        dlat = radians(lat2 - lat1)
-        dlon = radians(lon2 - lon1)
-        a = sin(dlat/2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1 - a))
-        return R * c
+        self.pincode_manager = PincodeManager(db_type)
 
     # --------------------------
     # CRUD
@@ -25,8 +19,8 @@ class PharmacyManager:
     async def create_pharmacy(self, pharmacy: PharmacyCreate):
         try:
             await self.db_manager.connect()
-            await self.db_manager.create(Pharmacy, pharmacy.dict())
-            logger.info(f"✅ Pharmacy created: {pharmacy.Name}")
+            await self.db_manager.create(Pharmacy, normalize_gps_payload(pharmacy.dict()))
+            logger.info("✅ Pharmacy created: %s", pharmacy.Name)
             return {"success": True, "message": "Pharmacy created successfully"}
         except Exception as e:
             logger.error(f"❌ Error creating pharmacy: {e}")
@@ -48,10 +42,11 @@ class PharmacyManager:
         try:
             await self.db_manager.connect()
             rowcount = await self.db_manager.update(
-                Pharmacy, {"PharmacyId": pharmacy_id}, pharmacy.dict(exclude_unset=True)
+                Pharmacy, {"PharmacyId": pharmacy_id},
+                normalize_gps_payload(pharmacy.dict(exclude_unset=True))
             )
             if rowcount:
-                logger.info(f"✅ Pharmacy {pharmacy_id} updated")
+                logger.info("✅ Pharmacy %s updated", pharmacy_id)
                 return {"success": True, "message": "Pharmacy updated successfully"}
             return {"success": False, "message": "Pharmacy not found"}
         except Exception as e:
@@ -65,7 +60,7 @@ class PharmacyManager:
             await self.db_manager.connect()
             rowcount = await self.db_manager.delete(Pharmacy, {"PharmacyId": pharmacy_id})
             if rowcount:
-                logger.info(f"🗑️ Pharmacy {pharmacy_id} deleted")
+                logger.info("🗑️ Pharmacy %s deleted", pharmacy_id)
                 return {"success": True, "message": "Pharmacy deleted successfully"}
             return {"success": False, "message": "Pharmacy not found"}
         except Exception as e:
@@ -80,20 +75,28 @@ class PharmacyManager:
     async def get_nearby_by_gps(self, latitude: float, longitude: float, radius_km: float = 5):
         try:
             await self.db_manager.connect()
-            pharmacies = await self.db_manager.read(Pharmacy, {})
-            nearby = []
 
+            # Bounding box on the numeric Latitude/Longitude index, exact distance after
+            min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+            stmt = select(Pharmacy).where(
+                Pharmacy.Latitude.between(min_lat, max_lat),
+                Pharmacy.Longitude.between(min_lon, max_lon),
+            )
+            session = self.db_manager.get_session()
+            async with session:
+                pharmacies = (await session.execute(stmt)).scalars().all()
+
+            nearby = []
             for p in pharmacies:
-                if not p.GPSLocation:
-                    continue
-                lat_str, lon_str = p.GPSLocation.split(" ")
-                distance = self._calculate_distance_km(latitude, longitude, float(lat_str), float(lon_str))
+                distance = haversine_km(latitude, longitude, p.Latitude, p.Longitude)
                 if distance <= radius_km:
                     nearby.append({
                         "PharmacyId": p.PharmacyId,
                         "Name": p.Name,
                         "Address": p.Address,
                         "GPSLocation": p.GPSLocation,
+                        "Latitude": p.Latitude,
+                        "Longitude": p.Longitude,
                         "Pincode": p.Pincode,
                         "ImgUrl": p.ImgUrl,
                         "Contact": p.Contact,
@@ -112,10 +115,16 @@ class PharmacyManager:
     # --------------------------
     # Nearby by Pincode
     # --------------------------
-    async def get_nearby_by_pincode(self, pincode: str):
+    async def get_nearby_by_pincode(self, pincode: str, neighbours: int = 0):
         try:
             await self.db_manager.connect()
-            pharmacies = await self.db_manager.read(Pharmacy, {"Pincode": pincode})
+            # Requested pincode + its N nearest pincodes, fetched with one IN query
+            nearby = await self.pincode_manager.get_nearby_pincodes(pincode, neighbours)
+            distance_by_pincode = dict(nearby)
+
+            pharmacies = await self.db_manager.read(
+                Pharmacy, {"Pincode": list(distance_by_pincode)}
+            )
             result = []
             for p in pharmacies:
                 result.append({
@@ -123,11 +132,15 @@ class PharmacyManager:
                     "Name": p.Name,
                     "Address": p.Address,
                     "GPSLocation": p.GPSLocation,
+                    "Latitude": p.Latitude,
+                    "Longitude": p.Longitude,
                     "Pincode": p.Pincode,
                     "ImgUrl": p.ImgUrl,
                     "Contact": p.Contact,
-                    "Email": p.Email
+                    "Email": p.Email,
+                    "DistanceKm": round(distance_by_pincode.get(p.Pincode, 0.0), 2)
                 })
+            result.sort(key=lambda x: x["DistanceKm"])
             return result
         except Exception as e:
             logger.error(f"❌ Error fetching nearby pharmacies by Pincode: {e}")
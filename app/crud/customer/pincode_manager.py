@@ -0,0 +1,92 @@
+import asyncio
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from ...db.base.database_manager import DatabaseManager
+from ...models.customer.pincode_model import PincodeNeighbour
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Pincode -> ((NeighbourPincode, DistanceKm), ...) ordered by Rank.
+# Loaded once per process from the precomputed PincodeNeighbour table.
+# Pincode strings are interned, so the full graph stays small in memory.
+_neighbour_index: Optional[Dict[str, Tuple[Tuple[str, float], ...]]] = None
+_index_lock = asyncio.Lock()
+# After a failed load, searches fall back to exact pincode matches and the
+# load is retried no sooner than this (doubling per failure, up to 5 minutes)
+INDEX_RETRY_SECONDS = 5.0
+INDEX_RETRY_MAX_SECONDS = 300.0
+_retry_at = 0.0
+_retry_delay = INDEX_RETRY_SECONDS
+
+
+class PincodeManager:
+    def __init__(self, db_type: str):
+        self.db_manager = DatabaseManager(db_type)
+
+    async def _load_index(self, raise_errors: bool = False) -> Dict[str, Tuple[Tuple[str, float], ...]]:
+        global _neighbour_index, _retry_at, _retry_delay
+        if _neighbour_index is not None:
+            return _neighbour_index
+        if not raise_errors and time.monotonic() < _retry_at:
+            return {}
+
+        async with _index_lock:
+            if _neighbour_index is not None:
+                return _neighbour_index
+
+            grouped: Dict[str, list] = {}
+            try:
+                await self.db_manager.connect()
+                stmt = select(
+                    PincodeNeighbour.Pincode,
+                    PincodeNeighbour.NeighbourPincode,
+                    PincodeNeighbour.DistanceKm,
+                ).order_by(PincodeNeighbour.Pincode, PincodeNeighbour.Rank)
+                session = self.db_manager.get_session()
+                async with session:
+                    for pincode, neighbour, distance in (await session.execute(stmt)).all():
+                        grouped.setdefault(sys.intern(pincode), []).append(
+                            (sys.intern(neighbour), distance)
+                        )
+                logger.info("📍 Pincode neighbour index loaded for %s pincodes", len(grouped))
+            except Exception as e:
+                # Missing table / database down: not cached, retried after a back-off
+                _retry_at = time.monotonic() + _retry_delay
+                logger.error(f"❌ Error loading pincode neighbour index, retrying in {_retry_delay:.0f}s: {e}")
+                _retry_delay = min(_retry_delay * 2, INDEX_RETRY_MAX_SECONDS)
+                if raise_errors:
+                    raise
+                return {}
+            finally:
+                await self.db_manager.disconnect()
+
+            _neighbour_index = {k: tuple(v) for k, v in grouped.items()}
+            _retry_delay = INDEX_RETRY_SECONDS
+            return _neighbour_index
+
+    async def warm_up(self) -> int:
+        """Load the neighbour index now instead of on the first search; returns the pincode count."""
+        return len(await self._load_index(raise_errors=True))
+
+    async def get_nearby_pincodes(self, pincode: str, limit: int) -> List[Tuple[str, float]]:
+        """
+        [(pincode, distance_km), ...] ordered by centroid distance,
+        starting with the requested pincode itself at 0 km.
+        """
+        pincode = (pincode or "").strip()
+        nearby = [(pincode, 0.0)]
+        if limit <= 0:
+            return nearby
+        index = await self._load_index()
+        nearby.extend(index.get(pincode, ())[:limit])
+        return nearby
+
+    @staticmethod
+    def reload() -> None:
+        """Drop the in-memory index; it is reloaded on the next search."""
+        global _neighbour_index, _retry_at
+        _neighbour_index = None
+        _retry_at = 0.0
@@ -3,6 +3,7 @@ from ...db.base.database_manager import DatabaseManager
 from ...models.customer.prescription_model import Prescription
 from ...schemas.customer.prescription_schema import PrescriptionCreate, PrescriptionUpdate
 from ...utils.logger import get_logger
+from ...utils.event_bus import event_bus, PRESCRIPTION_CREATED, PRESCRIPTION_STATUS_CHANGED
 
 logger = get_logger(__name__)
 
@@ -19,7 +20,13 @@ class PrescriptionManager:
             data = prescription.dict()
             data["UploadedAt"] = ist_now()
             new_record = await self.db_manager.create(Prescription, data)
-            logger.info(f"✅ Prescription uploaded for CustomerId {data['CustomerId']}")
+            logger.info("✅ Prescription uploaded for CustomerId %s", data['CustomerId'])
+            event_bus.publish(
+                PRESCRIPTION_CREATED,
+                PrescriptionId=new_record.PrescriptionId,
+                CustomerId=new_record.CustomerId,
+                Status=new_record.Status,
+            )
             return {
                 "success": True,
                 "message": "Prescription uploaded successfully",
@@ -87,12 +94,25 @@ class PrescriptionManager:
     async def update_prescription(self, prescription_id: int, update: dict):
         try:
             await self.db_manager.connect()
+            previous = None
+            if "Status" in update:
+                rows = await self.db_manager.read(Prescription, {"PrescriptionId": prescription_id})
+                previous = rows[0] if rows else None
+
             rowcount = await self.db_manager.update(
                 Prescription,
                 {"PrescriptionId": prescription_id},
                 update
             )
             if rowcount:
+                if previous is not None and previous.Status != update["Status"]:
+                    event_bus.publish(
+                        PRESCRIPTION_STATUS_CHANGED,
+                        PrescriptionId=prescription_id,
+                        CustomerId=previous.CustomerId,
+                        PreviousStatus=previous.Status,
+                        Status=update["Status"],
+                    )
                 return {"success": True, "message": "Prescription updated"}
 
             return {"success": False, "message": "Prescription not found"}
@@ -111,7 +131,7 @@ class PrescriptionManager:
             await self.db_manager.connect()
             rowcount = await self.db_manager.delete(Prescription, {"PrescriptionId": prescription_id})
             if rowcount:
-                logger.info(f"🗑️ Prescription {prescription_id} deleted")
+                logger.info("🗑️ Prescription %s deleted", prescription_id)
                 return {"success": True, "message": "Prescription deleted"}
             return {"success": False, "message": "Prescription not found"}
         except Exception as e:
@@ -3,14 +3,10 @@ from ...utils.logger import get_logger
 from ...db.base.database_manager import DatabaseManager
 from ...models.customer.retailer_model import Retailer
 from ...schemas.customer.retailer_schema import RetailerCreate, RetailerUpdate, RetailerRead
-import hashlib
+from ...utils.password_hasher import password_hasher
 
 logger = get_logger(__name__)
 
-def hash_password(password: str) -> str:
-    """Simple SHA256 hash. Replace with your secure hashing method."""
-    return hashlib.sha256(password.encode()).hexdigest()
-
 
 class RetailerManager:
     def __init__(self, db_type: str):
@@ -20,9 +16,9 @@ class RetailerManager:
         try:
             await self.db_manager.connect()
             data = retailer.dict()
-            data["PasswordHash"] = hash_password(data.pop("Password"))
+            data["PasswordHash"] = await password_hasher.hash(data.pop("Password"))
             obj = await self.db_manager.create(Retailer, data)
-            logger.info(f"Created retailer {obj.RetailerId}")
+            logger.info("Created retailer %s", obj.RetailerId)
             return {
                 "success": True,
                 "message": "Retailer created successfully",
@@ -71,13 +67,14 @@ class RetailerManager:
         try:
             await self.db_manager.connect()
             update_data = data.dict(exclude_unset=True)
-            if "Password" in update_data:
-                update_data["PasswordHash"] = hash_password(update_data.pop("Password"))
+            if update_data.get("Password"):
+                update_data["PasswordHash"] = await password_hasher.hash(update_data.pop("Password"))
+            update_data.pop("Password", None)
             rowcount = await self.db_manager.update(
                 Retailer, {"RetailerId": retailer_id}, update_data
             )
             if rowcount:
-                logger.info(f"Updated retailer {retailer_id}, rows affected: {rowcount}")
+                logger.info("Updated retailer %s, rows affected: %s", retailer_id, rowcount)
                 return {
                     "success": True,
                     "message": "Retailer updated successfully",
@@ -99,7 +96,7 @@ class RetailerManager:
             await self.db_manager.connect()
             rowcount = await self.db_manager.delete(Retailer, {"RetailerId": retailer_id})
             if rowcount:
-                logger.info(f"Deleted retailer {retailer_id}, rows affected: {rowcount}")
+                logger.info("Deleted retailer %s, rows affected: %s", retailer_id, rowcount)
                 return {
                     "success": True,
                     "message": "Retailer deleted successfully",
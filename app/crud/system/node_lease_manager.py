@@ -0,0 +1,152 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import select, update as sql_update, delete as sql_delete
+from sqlalchemy.exc import IntegrityError
+
+from ...config import settings
+from ...db.base.database_manager import DatabaseManager
+from ...models.customer.node_lease_model import NodeIdLease
+from ...utils.id_generator import MAX_NODE_ID, revoke_node_id, use_node_id
+from ...utils.timezone import ist_now
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class NodeLeaseManager:
+    """
+    Gives each worker process its own id generator node from NodeIdLease.
+
+    claim() takes the first node from NODE_ID (default 0) upwards that has no
+    row or an expired one: one INSERT on the primary key, or a takeover
+    UPDATE guarded by ExpiresAt, so two workers can never hold one node.
+    The lease is renewed every lease_seconds / 3. Ids are only issued while
+    the lease is known to be held (see use_node_id()); a renewal that finds
+    the row owned by another process stops ids and claims a new node.
+    """
+
+    def __init__(self, db_type: str, lease_seconds: int):
+        self.db_manager = DatabaseManager(db_type)
+        self.enabled = lease_seconds > 0 and db_type.lower() not in ("mongodb", "mongo")
+        self.lease_seconds = lease_seconds
+        self.node_id: Optional[int] = None
+        self.owner: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def claim(self) -> int:
+        # Built here, not in __init__: a worker forked from a preloaded app has its own pid
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        first = settings.node_id or 0
+        try:
+            await self.db_manager.connect()
+            session = self.db_manager.get_session()
+            async with session:
+                leased = set((await session.execute(
+                    select(NodeIdLease.NodeId).where(NodeIdLease.ExpiresAt > ist_now())
+                )).scalars().all())
+                for offset in range(MAX_NODE_ID + 1):
+                    node_id = (first + offset) % (MAX_NODE_ID + 1)
+                    if node_id not in leased and await self._try_claim(session, node_id):
+                        self.node_id = node_id
+                        logger.info("🆔 Leased id generator node %s as %s", node_id, self.owner)
+                        return node_id
+        finally:
+            await self.db_manager.disconnect()
+        raise RuntimeError(f"No free id generator node: all {MAX_NODE_ID + 1} are leased")
+
+    async def _try_claim(self, session, node_id: int) -> bool:
+        started, now = time.monotonic(), ist_now()
+        expires = now + timedelta(seconds=self.lease_seconds)
+        try:
+            session.add(NodeIdLease(NodeId=node_id, Owner=self.owner, ExpiresAt=expires))
+            await session.commit()
+            claimed = True
+        except IntegrityError:
+            await session.rollback()
+            # A worker that died without releasing: take its node over
+            result = await session.execute(
+                sql_update(NodeIdLease)
+                .where(NodeIdLease.NodeId == node_id, NodeIdLease.ExpiresAt <= now)
+                .values(Owner=self.owner, ExpiresAt=expires)
+            )
+            await session.commit()
+            claimed = bool(result.rowcount)
+        if claimed:
+            use_node_id(node_id, started + self.lease_seconds)
+        return claimed
+
+    async def renew(self) -> bool:
+        """Extend the lease; False when another process owns the node now (a new one is claimed)."""
+        started = time.monotonic()
+        try:
+            await self.db_manager.connect()
+            session = self.db_manager.get_session()
+            async with session:
+                result = await session.execute(
+                    sql_update(NodeIdLease)
+                    .where(NodeIdLease.NodeId == self.node_id, NodeIdLease.Owner == self.owner)
+                    .values(ExpiresAt=ist_now() + timedelta(seconds=self.lease_seconds))
+                )
+                await session.commit()
+        finally:
+            await self.db_manager.disconnect()
+
+        if result.rowcount:
+            use_node_id(self.node_id, started + self.lease_seconds)
+            return True
+        revoke_node_id()
+        logger.error("❌ Id generator node %s was taken over by another process; leasing a new one",
+                     self.node_id)
+        await self.claim()
+        return False
+
+    async def release(self) -> None:
+        revoke_node_id()
+        if self.node_id is None:
+            return
+        try:
+            await self.db_manager.connect()
+            session = self.db_manager.get_session()
+            async with session:
+                await session.execute(
+                    sql_delete(NodeIdLease)
+                    .where(NodeIdLease.NodeId == self.node_id, NodeIdLease.Owner == self.owner)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"❌ Error releasing id generator node {self.node_id}: {e}")
+        finally:
+            await self.db_manager.disconnect()
+        self.node_id = None
+
+    async def start(self) -> None:
+        """Lease a node (raises when none is free) and keep renewing it in the background."""
+        if not self.enabled:
+            return
+        await self.claim()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.renew()
+            except Exception as e:
+                # The local deadline stops ids if this keeps failing past the lease
+                logger.error(f"❌ Error renewing id generator node {self.node_id}: {e}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.release()
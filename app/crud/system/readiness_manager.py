@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Dict
+
+from ...config import settings
+from ...crud.customer.lab_test_catalog import LabTestCatalogManager
+from ...crud.customer.pincode_manager import PincodeManager
+from ...db.base.database_manager import DatabaseManager
+from ...db.base.engine_registry import engine_registry
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ReadinessManager:
+    """
+    Startup warm-up and the state behind /healthz and /readyz.
+
+    warm_up() runs in the app lifespan before the first request: it opens
+    the database's pooled connections, runs a trivial query, and loads the
+    pincode neighbour index and lab test catalog that the first searches
+    would otherwise load. The worker is ready once the database answers;
+    a cache that failed to load is reported but does not block readiness,
+    since searches still load it lazily.
+    """
+
+    def __init__(self, db_type: str):
+        self.db_manager = DatabaseManager(db_type)
+        self.pincode_manager = PincodeManager(db_type)
+        self.catalog_manager = LabTestCatalogManager(db_type)
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.warmed_up = False
+        self._started = time.monotonic()
+
+    async def _step(self, name: str, work: Awaitable) -> bool:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(work, settings.warmup_timeout_seconds)
+            self.steps[name] = {"Ok": True, "Result": result}
+        except Exception as e:
+            logger.error("❌ Warm-up step %s failed: %s", name, e or type(e).__name__)
+            self.steps[name] = {"Ok": False, "Error": str(e) or type(e).__name__}
+        self.steps[name]["Ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return self.steps[name]["Ok"]
+
+    async def warm_up(self) -> bool:
+        started = time.perf_counter()
+        await self._step("Connections", self.db_manager.warm_up(settings.db_warm_connections))
+        database_ok = await self._step("Database", self.db_manager.ping())
+        await self._step("PincodeIndex", self.pincode_manager.warm_up())
+        await self._step("LabTestCatalog", self.catalog_manager.warm_up())
+        self.warmed_up = True
+        logger.info("🔥 Warm-up finished in %.0f ms: %s", (time.perf_counter() - started) * 1000,
+                    {name: step["Ok"] for name, step in self.steps.items()})
+        return database_ok
+
+    def liveness(self) -> Dict[str, Any]:
+        return {"Status": "ok", "UptimeSeconds": round(time.monotonic() - self._started, 1)}
+
+    async def readiness(self) -> Dict[str, Any]:
+        """Ready = warm-up done and the database answers a trivial query within the timeout."""
+        ready, error = self.warmed_up, None if self.warmed_up else "warming up"
+        if ready:
+            try:
+                await asyncio.wait_for(self.db_manager.ping(), settings.readiness_timeout_seconds)
+            except Exception as e:
+                ready, error = False, str(e) or type(e).__name__
+        return {
+            "Ready": ready,
+            "Error": error,
+            "WarmUp": self.steps,
+            "Pools": engine_registry.stats(),
+        }
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Dict, List
+
+from sqlalchemy import inspect
+
+from ...config import settings
+from ...db.base.database_manager import DatabaseManager
+from ...models.customer.sql_base import Base
+from ...scripts.create_tables import TableCreator
+from ...utils.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): workers migrate unserialized
+    fcntl = None
+
+logger = get_logger(__name__)
+
+
+class SchemaManager:
+    """
+    Brings the database up to the models before the first request.
+
+    ensure() runs in the app lifespan: on SQLite it applies the pending
+    TableCreator migrations (one worker at a time, under a file lock next to
+    the database), then compares every mapped table with the live schema.
+    A mapped column missing from an existing table would fail every query
+    on that table, so the worker refuses to start; a missing table only
+    disables its feature and is logged.
+    """
+
+    def __init__(self, db_type: str):
+        self.db_type = db_type.lower()
+        self.db_manager = DatabaseManager(db_type)
+
+    async def ensure(self) -> Dict[str, List[str]]:
+        if self.db_type in ("mongodb", "mongo"):
+            return {"Applied": [], "MissingTables": []}
+
+        applied = []
+        if self.db_type in ("sqlite", "sqlite3") and settings.db_migrate_on_startup:
+            applied = await asyncio.to_thread(self._migrate_sqlite)
+            if applied:
+                logger.info("🛠️ Applied schema migrations: %s", applied)
+
+        try:
+            await self.db_manager.connect()
+            async with self.db_manager.db.engine.connect() as conn:
+                missing_tables, missing_columns = await conn.run_sync(self._compare)
+        finally:
+            await self.db_manager.disconnect()
+
+        if missing_tables:
+            logger.warning("⚠️ Tables missing from the database: %s", missing_tables)
+        if missing_columns:
+            raise RuntimeError(
+                f"Database schema is behind the models, missing columns: {missing_columns}. "
+                "Run app/scripts/create_tables.py or start with DB_MIGRATE_ON_STARTUP=true."
+            )
+        return {"Applied": applied, "MissingTables": missing_tables}
+
+    @staticmethod
+    def _migrate_sqlite() -> List[str]:
+        creator = TableCreator(settings.sqlite_url)
+        with open(f"{creator.db_file}.migrate.lock", "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            return creator.migrate_schema(settings.pincode_csv_path)
+
+    @staticmethod
+    def _compare(conn):
+        inspector = inspect(conn)
+        existing = set(inspector.get_table_names())
+        missing_tables, missing_columns = [], []
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing:
+                missing_tables.append(table.name)
+                continue
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            missing_columns.extend(f"{table.name}.{c.name}" for c in table.columns if c.name not in columns)
+        return missing_tables, missing_columns
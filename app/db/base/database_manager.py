@@ -2,25 +2,32 @@
 
 from ..base.database_factory import get_database
 from ..base.idatabase import IDatabase
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 
 class DatabaseManager:
     def __init__(self, db_type: str):
         self.db: IDatabase = get_database(db_type)
-        self._session = None  # for SQL: session; for Mongo: db handle
 
     async def connect(self) -> None:
         await self.db.connect()
-        self._session = self.db.get_session()
 
     async def disconnect(self) -> None:
         await self.db.disconnect()
-        self._session = None
+
+    async def warm_up(self, connections: int) -> int:
+        return await self.db.warm_up(connections)
+
+    async def ping(self) -> None:
+        await self.db.ping()
 
     def get_session(self) -> Any:
-        if not self._session:
-            raise RuntimeError("Database session not initialized. Did you forget to connect?")
-        return self._session
+        """
+        A new session per call (SQL) or the database handle (Mongo). Nothing
+        is kept on the manager: one instance serves concurrent requests, each
+        with its own connect()/disconnect(), and a stored session would be
+        shared by all of them and dropped by whichever disconnects first.
+        """
+        return self.db.get_session()
 
     # CRUD wrappers
     async def create(self, table_or_collection: Any, data: Dict) -> Any:
@@ -30,6 +37,11 @@ class DatabaseManager:
         self, table_or_collection: Any, filters: Optional[Dict] = None) -> List[Any]:
         return await self.db.read(table_or_collection, filters)
 
+    def stream(
+        self, table_or_collection: Any, filters: Optional[Dict] = None,
+        columns: Optional[Sequence[str]] = None, batch_size: int = 1000) -> AsyncIterator[Dict]:
+        return self.db.stream(table_or_collection, filters, columns, batch_size)
+
     async def update(
         self, table_or_collection: Any, filters: Dict, updates: Dict) -> Any:
         return await self.db.update(table_or_collection, filters, updates)
@@ -0,0 +1,172 @@
+# app/db/base/engine_registry.py
+
+import asyncio
+import re
+from typing import Any, Dict, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from ...config import settings
+from ...utils.metrics import MongoCommandMetrics
+
+
+class _Shared:
+    __slots__ = ("resource", "session_factory", "users", "pinned")
+
+    def __init__(self, resource: Any, session_factory: Any = None):
+        self.resource = resource
+        self.session_factory = session_factory
+        self.users = 0
+        self.pinned = False
+
+
+def _is_memory(url: str) -> bool:
+    return ":memory:" in url or "mode=memory" in url
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    # In-memory SQLite uses a StaticPool (the one connection is the database), which takes no sizes
+    if _is_memory(url):
+        return {}
+    return {"pool_size": settings.db_pool_size, "max_overflow": settings.db_max_overflow}
+
+
+def _redact(url: str) -> str:
+    return re.sub(r"//[^/@]*@", "//***@", url)
+
+
+class EngineRegistry:
+    """
+    One SQLAlchemy engine (or Motor client) per URL, shared by every
+    database object pointing at it, so its connection pool outlives a
+    single manager call.
+
+    connect()/disconnect() acquire and release it. The last release closes
+    it, unless warm_up() pinned it: the app lifespan pins the backend it
+    serves so pooled connections stay open between requests, and closes
+    everything with close_all() at shutdown. Scripts and tests that never
+    pin still get a clean close once their calls are done.
+    """
+
+    def __init__(self):
+        self._shared: Dict[str, _Shared] = {}
+
+    # ------------------------------------------------------------
+    # Acquire / release
+    # ------------------------------------------------------------
+    def acquire_engine(self, url: str) -> Tuple[AsyncEngine, Any]:
+        shared = self._shared.get(url)
+        if shared is None:
+            engine = create_async_engine(url, future=True, echo=False, **_engine_options(url))
+            factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+            shared = self._shared[url] = _Shared(engine, factory)
+        shared.users += 1
+        return shared.resource, shared.session_factory
+
+    def acquire_client(self, uri: str) -> Any:
+        shared = self._shared.get(uri)
+        if shared is None:
+            client = AsyncIOMotorClient(uri, event_listeners=[MongoCommandMetrics()])
+            shared = self._shared[uri] = _Shared(client)
+        shared.users += 1
+        return shared.resource
+
+    async def release(self, url: str) -> None:
+        shared = self._shared.get(url)
+        if shared is None:
+            return
+        shared.users = max(shared.users - 1, 0)
+        if shared.users == 0 and not shared.pinned:
+            await self._close(url)
+
+    async def _close(self, url: str) -> None:
+        shared = self._shared.pop(url, None)
+        if shared is None:
+            return
+        if isinstance(shared.resource, AsyncEngine):
+            await shared.resource.dispose()
+        else:
+            shared.resource.close()
+
+    async def close_all(self) -> None:
+        for url in list(self._shared):
+            await self._close(url)
+
+    # ------------------------------------------------------------
+    # Warm-up and health
+    # ------------------------------------------------------------
+    async def warm_up(self, url: str, connections: int) -> int:
+        """
+        Pin the engine for `url` and open up to `connections` pooled
+        connections at once, so the first requests after a deploy skip the
+        connect. Returns how many were opened.
+        """
+        engine, _ = self._pin(url, self.acquire_engine)
+
+        if _is_memory(url):
+            connections = 1
+        else:
+            connections = max(0, min(connections, settings.db_pool_size))
+
+        async def open_one():
+            conn = await engine.connect()
+            await conn.execute(text("SELECT 1"))
+            return conn
+
+        opened = await asyncio.gather(*[open_one() for _ in range(connections)])
+        for conn in opened:
+            await conn.close()   # back into the pool, still connected
+        return len(opened)
+
+    async def ping(self, url: str) -> None:
+        """One trivial round trip; raises if the database is unreachable."""
+        engine, _ = self.acquire_engine(url)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            await self.release(url)
+
+    async def warm_up_client(self, uri: str) -> None:
+        """Pin the Motor client for `uri`; the ping opens its first pooled connection."""
+        client = self._pin(uri, self.acquire_client)
+        await client.admin.command("ping")
+
+    async def ping_client(self, uri: str) -> None:
+        client = self.acquire_client(uri)
+        try:
+            await client.admin.command("ping")
+        finally:
+            await self.release(uri)
+
+    def _pin(self, url: str, acquire):
+        acquired = acquire(url)
+        shared = self._shared[url]
+        if shared.pinned:
+            shared.users -= 1   # the pin already holds it
+        shared.pinned = True
+        return acquired
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per URL (passwords hidden): users, whether it is pinned, and pool occupancy."""
+        result = {}
+        for url, shared in self._shared.items():
+            entry: Dict[str, Any] = {"Users": shared.users, "Pinned": shared.pinned}
+            if isinstance(shared.resource, AsyncEngine):
+                pool = shared.resource.pool
+                entry["Pool"] = type(pool).__name__
+                for key, method in (("Size", "size"), ("CheckedIn", "checkedin"),
+                                    ("CheckedOut", "checkedout"), ("Overflow", "overflow")):
+                    if hasattr(pool, method):
+                        entry[key] = getattr(pool, method)()
+            result[_redact(url)] = entry
+        return result
+
+    def is_open(self, url: str) -> bool:
+        return url in self._shared
+
+
+engine_registry = EngineRegistry()
@@ -1,7 +1,7 @@
 # app/database/base/idatabase.py
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
 
 class IDatabase(ABC):
     @abstractmethod
@@ -14,6 +14,14 @@ class IDatabase(ABC):
         """Tear down / close connection."""
         pass
 
+    async def warm_up(self, connections: int) -> int:
+        """Open up to N pooled connections ahead of traffic; returns how many were opened."""
+        return 0
+
+    async def ping(self) -> None:
+        """One trivial round trip to the server; raises when it is unreachable."""
+        raise NotImplementedError
+
     @abstractmethod
     def get_session(self) -> Any:
         """
@@ -31,6 +39,17 @@ class IDatabase(ABC):
         self, table_or_collection: Any, filters: Optional[Dict] = None) -> List[Dict]:
         pass
 
+    @abstractmethod
+    def stream(
+        self, table_or_collection: Any, filters: Optional[Dict] = None,
+        columns: Optional[Sequence[str]] = None, batch_size: int = 1000) -> AsyncIterator[Dict]:
+        """
+        Yield matching rows one at a time as plain dicts, fetched batch_size at
+        a time from a server-side cursor, so memory stays flat however many
+        rows match. columns limits the fields fetched (default: all).
+        """
+        pass
+
     @abstractmethod
     async def update(
         self, table_or_collection: Any, filters: Dict, updates: Dict) -> Any:
@@ -1,8 +1,8 @@
 # app/database/mongodb_database.py
 
-from typing import Any, Dict, List, Optional
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 
+from ..base.engine_registry import engine_registry
 from ..base.idatabase import IDatabase
 
 
@@ -12,14 +12,29 @@ class MongoDBDatabase(IDatabase):
         self.db_name = db_name
         self.client = None
         self.db = None
+        self._users = 0
 
     async def connect(self) -> None:
-        self.client = AsyncIOMotorClient(self.uri)
+        # Shared Motor client and pool (see EngineRegistry)
+        self.client = engine_registry.acquire_client(self.uri)
         self.db = self.client[self.db_name]
+        self._users += 1
 
     async def disconnect(self) -> None:
-        if self.client:
-            self.client.close()
+        if self._users == 0:
+            return
+        self._users -= 1
+        if self._users == 0:
+            self.client = None
+            self.db = None
+        await engine_registry.release(self.uri)
+
+    async def warm_up(self, connections: int) -> int:
+        await engine_registry.warm_up_client(self.uri)
+        return 1
+
+    async def ping(self) -> None:
+        await engine_registry.ping_client(self.uri)
 
     def get_session(self) -> Any:
         if not self.db:
@@ -34,10 +49,26 @@ class MongoDBDatabase(IDatabase):
     async def read(
         self, collection_name: str, filters: Optional[Dict] = None) -> List[Dict]:
         coll = self.db[collection_name]
-        cursor = coll.find(filters or {})
+        query = {
+            k: {"$in": list(v)} if isinstance(v, (list, tuple, set)) else v
+            for k, v in (filters or {}).items()
+        }
+        cursor = coll.find(query)
         docs = await cursor.to_list(length=100)  # or more or customizable
         return docs
 
+    async def stream(
+        self, collection_name: str, filters: Optional[Dict] = None,
+        columns: Optional[Sequence[str]] = None, batch_size: int = 1000) -> AsyncIterator[Dict]:
+        coll = self.db[collection_name]
+        query = {
+            k: {"$in": list(v)} if isinstance(v, (list, tuple, set)) else v
+            for k, v in (filters or {}).items()
+        }
+        projection = {c: 1 for c in columns} if columns else None
+        async for doc in coll.find(query, projection, batch_size=batch_size):
+            yield doc
+
     async def update(
         self, collection_name: str, filters: Dict, updates: Dict) -> Any:
         coll = self.db[collection_name]
@@ -1,10 +1,10 @@
 # app/database/sql/postgres_database.py
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import text
-from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, select
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 
+from ..base.engine_registry import engine_registry
 from ..base.idatabase import IDatabase
 
 
@@ -14,17 +14,27 @@ class PostgresDatabase(IDatabase):
         self.db_url = db_url
         self.engine = None
         self.SessionLocal = None
+        self._users = 0
 
     async def connect(self) -> None:
-        self.engine = create_async_engine(self.db_url, future=True, echo=False)
-        self.SessionLocal = sessionmaker(
-            bind=self.engine, class_=AsyncSession, expire_on_commit=False
-        )
+        # Shared, pooled engine (see EngineRegistry); nested and concurrent calls each hold it
+        self.engine, self.SessionLocal = engine_registry.acquire_engine(self.db_url)
+        self._users += 1
 
     async def disconnect(self) -> None:
-        if self.engine:
-            await self.engine.dispose()
+        if self._users == 0:
+            return
+        self._users -= 1
+        if self._users == 0:
             self.engine = None
+            self.SessionLocal = None
+        await engine_registry.release(self.db_url)
+
+    async def warm_up(self, connections: int) -> int:
+        return await engine_registry.warm_up(self.db_url, connections)
+
+    async def ping(self) -> None:
+        await engine_registry.ping(self.db_url)
 
     def get_session(self) -> AsyncSession:
         if not self.SessionLocal:
@@ -45,10 +55,34 @@ class PostgresDatabase(IDatabase):
         query = session.query(table_or_collection)
         if filters:
             for k, v in filters.items():
-                query = query.filter(getattr(table_or_collection, k) == v)
+                column = getattr(table_or_collection, k)
+                # list / tuple / set values -> single IN (...) query
+                if isinstance(v, (list, tuple, set)):
+                    query = query.filter(column.in_(list(v)))
+                else:
+                    query = query.filter(column == v)
         result = await session.execute(query)
         return result.scalars().all()
 
+    async def stream(
+        self, table_or_collection: Any, filters: Optional[Dict] = None,
+        columns: Optional[Sequence[str]] = None, batch_size: int = 1000
+    ) -> AsyncIterator[Dict]:
+        table = table_or_collection.__table__
+        stmt = select(*[table.c[c] for c in columns]) if columns else select(table)
+        if filters:
+            for k, v in filters.items():
+                column = table.c[k]
+                if isinstance(v, (list, tuple, set)):
+                    stmt = stmt.where(column.in_(list(v)))
+                else:
+                    stmt = stmt.where(column == v)
+        # Own session: the caller may keep iterating after other work used get_session()
+        async with self.SessionLocal() as session:
+            result = await session.stream(stmt.execution_options(yield_per=batch_size))
+            async for row in result.mappings():
+                yield dict(row)
+
     async def update(
         self, table_or_collection: Any, filters: Dict, updates: Dict) -> int:
         session = self.get_session()
@@ -1,10 +1,10 @@
 # app/database/sql/sqlite_database.py
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text, select, update as sql_update, delete as sql_delete
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 
+from ..base.engine_registry import engine_registry
 from ..base.idatabase import IDatabase
 
 
@@ -13,25 +13,32 @@ class SQLiteDatabase(IDatabase):
         self.db_url = db_url
         self.engine = None
         self.SessionLocal = None
-        self._session: AsyncSession = None
+        self._users = 0
 
     async def connect(self) -> None:
-        self.engine = create_async_engine(self.db_url, future=True, echo=False)
-        self.SessionLocal = sessionmaker(
-            bind=self.engine, class_=AsyncSession, expire_on_commit=False
-        )
+        # Shared, pooled engine (see EngineRegistry); nested and concurrent calls each hold it
+        self.engine, self.SessionLocal = engine_registry.acquire_engine(self.db_url)
+        self._users += 1
 
     async def disconnect(self) -> None:
-        if self.engine:
-            await self.engine.dispose()
+        if self._users == 0:
+            return
+        self._users -= 1
+        if self._users == 0:
             self.engine = None
             self.SessionLocal = None
+        await engine_registry.release(self.db_url)
+
+    async def warm_up(self, connections: int) -> int:
+        return await engine_registry.warm_up(self.db_url, connections)
+
+    async def ping(self) -> None:
+        await engine_registry.ping(self.db_url)
 
     def get_session(self) -> AsyncSession:
         if not self.SessionLocal:
             raise RuntimeError("Database not connected")
-        self._session = self.SessionLocal()
-        return self._session
+        return self.SessionLocal()
 
     async def create(self, table_or_collection: Any, data: Dict) -> Any:
         session = self.get_session()
@@ -50,10 +57,34 @@ class SQLiteDatabase(IDatabase):
             stmt = select(table_or_collection)
             if filters:
                 for k, v in filters.items():
-                    stmt = stmt.where(getattr(table_or_collection, k) == v)
+                    column = getattr(table_or_collection, k)
+                    # list / tuple / set values -> single IN (...) query
+                    if isinstance(v, (list, tuple, set)):
+                        stmt = stmt.where(column.in_(list(v)))
+                    else:
+                        stmt = stmt.where(column == v)
             result = await session.execute(stmt)
             return result.scalars().all()
 
+    async def stream(
+        self, table_or_collection: Any, filters: Optional[Dict] = None,
+        columns: Optional[Sequence[str]] = None, batch_size: int = 1000
+    ) -> AsyncIterator[Dict]:
+        table = table_or_collection.__table__
+        stmt = select(*[table.c[c] for c in columns]) if columns else select(table)
+        if filters:
+            for k, v in filters.items():
+                column = table.c[k]
+                if isinstance(v, (list, tuple, set)):
+                    stmt = stmt.where(column.in_(list(v)))
+                else:
+                    stmt = stmt.where(column == v)
+        # Own session: the caller may keep iterating after other work used get_session()
+        async with self.SessionLocal() as session:
+            result = await session.stream(stmt.execution_options(yield_per=batch_size))
+            async for row in result.mappings():
+                yield dict(row)
+
     async def update(
         self, table_or_collection: Any, filters: Dict, updates: Dict
     ) -> int:
@@ -14,4 +14,10 @@ class NotFoundException(Exception):
     pass
 
 class UnauthorizedException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class SlotAlreadyBookedException(Exception):
+    pass
+
+class InvalidSlotException(Exception):
+    pass
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,10 +12,68 @@ from .api.customer.customer_notification_api import CustomerNotificationAPI
 from .api.customer.lap_api import LabAPI, TestAPI, AppointmentAPI
 from .api.customer.doctor_api import DoctorAPI, DoctorAppointmentAPI
 from .api.customer.retailer_api import RetailerAPI
+from .api.customer.pharmacy_api import PharmacyAPI
+from .api.customer.live_updates_api import LiveUpdatesAPI
+from .api.customer.export_api import ExportAPI
+from .api.customer.catalog_import_api import CatalogImportAPI
+from .api.customer.auth_api import AuthAPI
+from .api.system.health_api import HealthAPI
+from .api.system.metrics_api import MetricsAPI
+from .api.system.profiler_api import ProfilerAPI
+from .config import settings
+from .crud.customer.customer_notification_manager import CustomerNotificationSubscriber
+from .crud.customer.order_archive_manager import OrderArchiveJob
+from .crud.system.node_lease_manager import NodeLeaseManager
+from .crud.system.readiness_manager import ReadinessManager
+from .crud.system.schema_manager import SchemaManager
+from .db.base.engine_registry import engine_registry
+from .middleware.idempotency import IdempotencyMiddleware
+from .middleware.metrics import MetricsMiddleware
+from .middleware.profiling import ProfilingMiddleware
+from .middleware.request_id import RequestIdMiddleware
+from .utils.event_bus import event_bus
+from .utils.push_hub import push_hub
+from .utils.password_hasher import password_hasher
+from .utils.logger import start_logging, stop_logging
 
 
 
-app = FastAPI(title="Medical App API list")
+notification_subscriber = CustomerNotificationSubscriber(
+    settings.db_type, settings.notification_batch_size, settings.notification_flush_seconds
+)
+order_archive_job = OrderArchiveJob(settings.db_type, settings.order_archive_interval_seconds)
+readiness_manager = ReadinessManager(settings.db_type)
+schema_manager = SchemaManager(settings.db_type)
+node_lease_manager = NodeLeaseManager(settings.db_type, settings.node_lease_seconds)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_logging()
+    # Migrate an older database first; raises (no startup) if mapped columns are still missing
+    await schema_manager.ensure()
+    # This worker's own id generator node; raises if none is free
+    await node_lease_manager.start()
+    # Open pooled connections and load caches before traffic; /readyz reports the outcome
+    await readiness_manager.warm_up()
+    notification_subscriber.register(event_bus)
+    push_hub.register(event_bus)
+    event_bus.start()
+    order_archive_job.start()
+    yield
+    await order_archive_job.stop()
+    # Deliver pending events first, then write the notifications they produced
+    await event_bus.drain()
+    await notification_subscriber.stop()
+    await event_bus.stop()
+    password_hasher.shutdown()
+    await node_lease_manager.stop()
+    await engine_registry.close_all()
+    # Last: flush the log records the shutdown steps above produced
+    stop_logging()
+
+
+app = FastAPI(title="Medical App API list", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +83,14 @@ app.add_middleware(
     allow_headers=["*"],          # allow all headers
 )
 
+app.add_middleware(IdempotencyMiddleware)
+# Per-request cProfile with X-Profile + X-Admin-Token
+app.add_middleware(ProfilingMiddleware)
+# Outside the idempotency layer, so replayed responses are timed too
+app.add_middleware(MetricsMiddleware)
+# Outermost of all, so every log line of a request carries its id
+app.add_middleware(RequestIdMiddleware)
+
 app.mount("/Images", StaticFiles(directory="Images"), name="Images")
 
 
@@ -44,6 +111,16 @@ appointment_api = AppointmentAPI()
 doctor_api = DoctorAPI()
 doctor_appointment_api = DoctorAppointmentAPI()
 retailer_api = RetailerAPI()
+pharmacy_api = PharmacyAPI()
+live_updates_api = LiveUpdatesAPI()
+export_api = ExportAPI()
+catalog_import_api = CatalogImportAPI()
+auth_api = AuthAPI()
+
+# System
+metrics_api = MetricsAPI()
+health_api = HealthAPI(readiness_manager)
+profiler_api = ProfilerAPI()
 
 
 # Customer
@@ -58,11 +135,21 @@ app.include_router(prescription.router, tags=["Prescription"])
 app.include_router(customer_api.router, tags=["Customer"])
 # app.include_router(customer_notification_api.router, tags=["Customer Notifications"])
 app.include_router(lab_api.router, tags=["Lap"])
-# app.include_router(test_api.router, tags=["Test"])
-# app.include_router(appointment_api.router, tags=["Appoinment"])
+app.include_router(test_api.router, tags=["Test"])
+app.include_router(appointment_api.router, tags=["Appoinment"])
 app.include_router(doctor_api.router, tags=["Doctor"])
-# app.include_router(doctor_appointment_api.router, tags=["Doctor Appoinment"])
+app.include_router(doctor_appointment_api.router, tags=["Doctor Appoinment"])
 app.include_router(retailer_api.router, tags=["Retailer"])
+app.include_router(pharmacy_api.router, tags=["Pharmacy"])
+app.include_router(live_updates_api.router, tags=["Live Updates"])
+app.include_router(export_api.router, tags=["Export"])
+app.include_router(catalog_import_api.router, tags=["Catalog Import"])
+app.include_router(auth_api.router, tags=["Auth"])
+
+# System
+app.include_router(metrics_api.router, tags=["System"])
+app.include_router(health_api.router, tags=["System"])
+app.include_router(profiler_api.router, tags=["System"])
 
 
 
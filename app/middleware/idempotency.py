@@ -0,0 +1,159 @@
+# app/middleware/idempotency.py
+
+import asyncio
+import hashlib
+import json
+from typing import Iterable
+
+from ..config import settings
+from ..crud.customer.idempotency_manager import (
+    IdempotencyManager, CLAIMED, REPLAY, IN_PROGRESS, MISMATCH
+)
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 200
+
+
+class IdempotencyMiddleware:
+    """
+    Makes POSTs to the configured paths safe to retry.
+    A request carrying an Idempotency-Key header is claimed before the route
+    runs; a retry with the same key and body gets the stored response back
+    (header Idempotent-Replayed: true) without touching the managers, a retry
+    while the first attempt is still running gets 409, and reusing a key for
+    a different body gets 422. Only successful responses are stored: any
+    other status, an exception or a {"success": false} result releases the
+    key so the client can retry. While the route runs the claim is renewed
+    every third of idempotency_pending_seconds, so a slow request is never
+    taken over; the expiry only frees claims whose worker died.
+    Requests without the header are passed through unchanged.
+    """
+
+    def __init__(self, app, paths: Iterable[str] = None, db_type: str = None):
+        self.app = app
+        self.paths = set(paths if paths is not None else settings.idempotency_paths)
+        self.db_type = db_type or settings.db_type
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        header = dict(scope["headers"]).get(HEADER)
+        if not header:
+            return await self.app(scope, receive, send)
+        if len(header) > MAX_KEY_LENGTH:
+            return await _send_json(send, 400, {"detail": "Idempotency-Key is too long"})
+
+        body, messages = await _read_body(receive)
+        key = f"POST {scope['path']} {header.decode('latin-1')}"
+        request_hash = hashlib.sha256(body).hexdigest()
+
+        manager = IdempotencyManager(self.db_type)
+        try:
+            claim = await manager.claim(key, request_hash)
+        except Exception as e:
+            # Never block writes on the idempotency store
+            logger.error(f"❌ Idempotency claim failed, running request without it: {e}")
+            return await self.app(scope, _replay(messages, receive), send)
+
+        if claim.outcome == REPLAY:
+            record = claim.record
+            return await _send(
+                send, record.ResponseCode, record.ResponseBody.encode("utf-8"),
+                record.ContentType or "application/json", replayed=True,
+            )
+        if claim.outcome == IN_PROGRESS:
+            return await _send_json(
+                send, 409, {"detail": "A request with this Idempotency-Key is still being processed"},
+                extra_headers=[(b"retry-after", b"1")],
+            )
+        if claim.outcome == MISMATCH:
+            return await _send_json(send, 422, {"detail": "Idempotency-Key was already used for a different request"})
+
+        # CLAIMED: run the route and keep what it sends
+        status = {"code": 500, "content_type": None}
+        chunks = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                status["content_type"] = dict(message.get("headers", [])).get(b"content-type", b"").decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        keep_claim = asyncio.get_running_loop().create_task(_keep_claim(manager, key, claim.claimed_at))
+        try:
+            await self.app(scope, _replay(messages, receive), capture)
+        except Exception:
+            await manager.release(key)
+            raise
+        finally:
+            keep_claim.cancel()
+
+        response_body = b"".join(chunks)
+        if _is_failure(status["code"], response_body):
+            await manager.release(key)
+        else:
+            await manager.complete(key, status["code"], response_body.decode("utf-8", "replace"), status["content_type"])
+
+
+async def _keep_claim(manager: IdempotencyManager, key: str, claimed_at) -> None:
+    while True:
+        await asyncio.sleep(settings.idempotency_pending_seconds / 3)
+        if not await manager.renew(key, claimed_at):
+            logger.warning("⚠️ Idempotency claim on %s was lost while its request ran", key)
+            return
+
+
+def _is_failure(status_code: int, body: bytes) -> bool:
+    # 4xx (a 409 slot conflict, a 404 doctor) wrote nothing; a retry may succeed
+    if not 200 <= status_code < 300:
+        return True
+    # Managers report failures as {"success": False, ...} with a 200
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and payload.get("success") is False
+
+
+async def _read_body(receive):
+    messages, body = [], b""
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            break
+    return body, messages
+
+
+def _replay(messages, receive):
+    """The already-read body first, then the real channel (disconnect detection)."""
+    pending = list(messages)
+
+    async def replay():
+        if pending:
+            return pending.pop(0)
+        return await receive()
+
+    return replay
+
+
+async def _send(send, status_code: int, body: bytes, content_type: str, replayed: bool = False, extra_headers=()):
+    headers = [(b"content-type", content_type.encode("latin-1")), (b"content-length", str(len(body)).encode())]
+    if replayed:
+        headers.append((b"idempotent-replayed", b"true"))
+    headers.extend(extra_headers)
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send, status_code: int, payload: dict, extra_headers=()):
+    await _send(send, status_code, json.dumps(payload).encode("utf-8"), "application/json", extra_headers=extra_headers)
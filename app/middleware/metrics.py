@@ -0,0 +1,57 @@
+# app/middleware/metrics.py
+
+import time
+
+from ..utils.metrics import (
+    RequestStats, current_request, install_sqlalchemy_hooks,
+    http_requests_total, http_request_duration_seconds, http_requests_in_progress,
+    db_queries_per_request, db_time_per_request_seconds, db_rows_total,
+)
+from ..utils.query_guard import check_query_budget
+
+
+class MetricsMiddleware:
+    """
+    Records latency and status per route template ("/orders/{order_id}",
+    not the raw path, so label cardinality stays bounded) together with the
+    number of SQL/Mongo queries, rows and database time each request caused.
+    Query counts come from engine/command listeners that add to a
+    per-request context variable, and are checked against the route's
+    query budget once the request is done.
+    """
+
+    def __init__(self, app, skip_paths=("/metrics", "/healthz", "/readyz")):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+        install_sqlalchemy_hooks()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.dec()
+            current_request.reset(token)
+            route = stats.route
+            method = scope["method"]
+            http_requests_total.inc(method, route, str(status["code"]))
+            http_request_duration_seconds.observe(elapsed, method, route)
+            db_queries_per_request.observe(stats.queries, route)
+            db_time_per_request_seconds.observe(stats.db_seconds, route)
+            if stats.rows:
+                db_rows_total.inc(route, amount=stats.rows)
+        check_query_budget(method, route, stats.queries)
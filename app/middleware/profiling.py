@@ -0,0 +1,80 @@
+# app/middleware/profiling.py
+
+import cProfile
+import time
+
+from ..utils.auth_tokens import is_admin_token
+from ..utils.profiler import pstats_dump, pstats_report
+
+HEADER = b"x-profile"
+ADMIN_HEADER = b"x-admin-token"
+FORMATS = {
+    "pstats": "text/plain; charset=utf-8",
+    "prof": "application/octet-stream",
+}
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request with cProfile when it carries
+    X-Profile: pstats (text report, slowest cumulative first) or
+    X-Profile: prof (binary stats for pstats/snakeviz) together with a valid
+    X-Admin-Token. The route's response is discarded and the profile is
+    returned instead; its status is kept in X-Profiled-Status.
+    Any other request is passed through untouched.
+
+    cProfile sees the whole event loop thread while enabled, so concurrent
+    requests show up too, coroutine times only cover time on the CPU, and
+    sync (def) routes running in the threadpool are not seen; use the
+    sampling profiler for wall-clock await time and worker threads.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        fmt = headers.get(HEADER, b"").decode("latin-1").lower()
+        if fmt not in FORMATS or not is_admin_token(headers.get(ADMIN_HEADER, b"").decode("latin-1")):
+            return await self.app(scope, receive, send)
+        if self._busy:
+            return await _respond(send, 409, b"Another request is being profiled", FORMATS["pstats"])
+
+        status = {"code": 500}
+
+        async def discard(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+
+        self._busy = True
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profile.disable()
+            self._busy = False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        body = pstats_dump(profile) if fmt == "prof" else pstats_report(profile).encode("utf-8")
+        await _respond(send, 200, body, FORMATS[fmt], [
+            (b"x-profiled-status", str(status["code"]).encode()),
+            (b"x-profile-wall-ms", f"{elapsed_ms:.1f}".encode()),
+        ])
+
+
+async def _respond(send, status: int, body: bytes, content_type: str, extra_headers=()):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"content-length", str(len(body)).encode()),
+            *extra_headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
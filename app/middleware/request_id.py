@@ -0,0 +1,39 @@
+# app/middleware/request_id.py
+
+import re
+import uuid
+
+from ..utils.logger import request_id_var
+
+HEADER = b"x-request-id"
+_VALID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+
+class RequestIdMiddleware:
+    """
+    Gives every request an id for log correlation: the caller's X-Request-ID
+    when it is a sane token, otherwise a new one. It is put in the logging
+    context variable and echoed back in the X-Request-ID response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        incoming = dict(scope["headers"]).get(HEADER, b"").decode("latin-1")
+        request_id = incoming if _VALID.fullmatch(incoming) else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(HEADER, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
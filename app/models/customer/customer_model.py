@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, Boolean, Date, Float, UniqueConstraint
+    Column, Integer, String, Boolean, Date, Float, Index, UniqueConstraint
 )
 from .sql_base import Base
 
@@ -38,3 +38,6 @@ class Customer(Base):
     IFSCCode = Column(String(50), nullable=True)
     Branch = Column(String(255), nullable=True)
 
+    __table_args__ = (
+        Index("ix_Customer_Latitude_Longitude", "Latitude", "Longitude"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Index
 from ...utils.timezone import ist_now
 from .sql_base import Base
 
@@ -69,5 +69,13 @@ class DoctorAppointment(Base):
     ReasonForVisit = Column(String, nullable=True)
     Notes = Column(String, nullable=True)
 
+    # "DR:<DoctorId>:<date>:<hhmm>", NULL once cancelled. The unique index makes
+    # the insert itself the reservation, so concurrent bookings cannot both win.
+    SlotKey = Column(String, nullable=True)
+
     CreatedAt = Column(DateTime, default=ist_now)
     UpdatedAt = Column(DateTime, default=ist_now)
+
+    __table_args__ = (
+        Index("ux_DoctorAppointment_SlotKey", "SlotKey", unique=True),
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from ...utils.timezone import ist_now
+from .sql_base import Base
+
+
+# -------------------------------------------------
+# Idempotency-Key claims and the response they produced
+# -------------------------------------------------
+class IdempotencyKey(Base):
+    __tablename__ = "IdempotencyKey"
+
+    Key = Column(String(255), primary_key=True)       # "<METHOD> <path> <Idempotency-Key header>"
+    RequestHash = Column(String(64), nullable=False)   # sha256 of the request body
+    State = Column(String(10), nullable=False, default="Pending")  # Pending / Done
+    ResponseCode = Column(Integer, nullable=True)
+    ResponseBody = Column(Text, nullable=True)
+    ContentType = Column(String, nullable=True)
+    CreatedAt = Column(DateTime, default=ist_now)
+    ExpiresAt = Column(DateTime, nullable=False, index=True)
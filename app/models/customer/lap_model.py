@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, Index
 from ...utils.timezone import ist_now
 from .sql_base import Base
 
@@ -21,13 +21,17 @@ class Lab(Base):
     State = Column(String, nullable=True)
     Country = Column(String, nullable=True)
     PostalCode = Column(String, nullable=True)
-    Latitude = Column(String, nullable=True)
-    Longitude = Column(String, nullable=True)
+    Latitude = Column(Float, nullable=True)
+    Longitude = Column(Float, nullable=True)
     ShopPic = Column(String, nullable=True)
 
     CreatedAt = Column(DateTime, default=ist_now)
     UpdatedAt = Column(DateTime, default=ist_now)
 
+    __table_args__ = (
+        Index("ix_Lab_Latitude_Longitude", "Latitude", "Longitude"),
+    )
+
 
 # -------------------------
 # Test Model
@@ -65,6 +69,8 @@ class Appointment(Base):
     Email = Column(String, nullable=True)
     Address = Column(String, nullable=True)
     GPSLocation = Column(String, nullable=True)
+    Latitude = Column(Float, nullable=True)      # parsed from GPSLocation on write
+    Longitude = Column(Float, nullable=True)
 
     AppointmentDate = Column(Date, nullable=True)
     TimeSlot = Column(String, nullable=True)
@@ -78,5 +84,32 @@ class Appointment(Base):
     PaymentStatus = Column(String, nullable=True)
     BookingStatus = Column(String, nullable=True)
 
+    # "LAB:<LabId>:<date>:<slot>", NULL once cancelled; unique per slot
+    SlotKey = Column(String, nullable=True)
+
     CreatedAt = Column(DateTime, default=ist_now)
     UpdatedAt = Column(DateTime, default=ist_now)
+
+    __table_args__ = (
+        Index("ux_Appointment_SlotKey", "SlotKey", unique=True),
+    )
+
+
+# -------------------------
+# Appointment Test (one row per selected test)
+# -------------------------
+class AppointmentTest(Base):
+    __tablename__ = "AppointmentTest"
+
+    AppointmentTestId = Column(Integer, primary_key=True, index=True)
+    AppointmentId = Column(Integer, nullable=False, index=True)
+    TestId = Column(Integer, nullable=False)
+
+    # Price snapshot at booking time
+    TestName = Column(String, nullable=True)
+    Price = Column(Float, nullable=False, default=0.0)
+    GstPercent = Column(Float, nullable=True, default=0.0)
+    GstAmount = Column(Float, nullable=True, default=0.0)
+    NetPrice = Column(Float, nullable=True, default=0.0)
+
+    CreatedAt = Column(DateTime, default=ist_now)
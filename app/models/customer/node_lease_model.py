@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from .sql_base import Base
+
+
+# -------------------------------------------------
+# Id generator nodes leased by running worker processes
+# -------------------------------------------------
+class NodeIdLease(Base):
+    __tablename__ = "NodeIdLease"
+
+    NodeId = Column(Integer, primary_key=True, autoincrement=False)  # 0-1023
+    Owner = Column(String(100), nullable=False)       # "<host>:<pid>:<random>"
+    ExpiresAt = Column(DateTime, nullable=False)
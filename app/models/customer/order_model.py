@@ -1,12 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Index
 from ...utils.timezone import ist_now
 from .sql_base import Base
 
 
-class Order(Base):
-    __tablename__ = "Orders"
+class OrderColumns:
+    """Columns shared by Orders and OrdersArchive."""
 
     OrderId = Column(Integer, primary_key=True, index=True)
+    OrderNo = Column(String, nullable=True)  # "ORD-<snowflake id>"
     CustomerId = Column(Integer, nullable=False)
     RetailerId = Column(Integer, nullable=False)
     RetailerName = Column(String, nullable=False)
@@ -37,8 +38,19 @@ class Order(Base):
     UpdatedAt = Column(DateTime, default=ist_now, onupdate=ist_now)
 
 
-class OrderItem(Base):
-    __tablename__ = "OrderItem"
+class Order(OrderColumns, Base):
+    __tablename__ = "Orders"
+
+    __table_args__ = (
+        Index("ux_Orders_OrderNo", "OrderNo", unique=True),
+        Index("ix_Orders_Status_UpdatedAt", "Status", "UpdatedAt"),
+        # Never reuse an id that may already be in OrdersArchive
+        {"sqlite_autoincrement": True},
+    )
+
+
+class OrderItemColumns:
+    """Columns shared by OrderItem and OrderItemArchive."""
 
     OrderItemId = Column(Integer, primary_key=True, index=True)
     OrderId = Column(Integer, nullable=False)
@@ -52,3 +64,46 @@ class OrderItem(Base):
     Price = Column(Float, nullable=False)    
 
     TotalAmount = Column(Float, nullable=False)      # (UnitPrice * Quantity) + GST
+
+
+class OrderItem(OrderItemColumns, Base):
+    __tablename__ = "OrderItem"
+
+    __table_args__ = {"sqlite_autoincrement": True}
+
+
+# -------------------------------------------------
+# Cold storage: Delivered / Cancelled orders moved out of the hot tables by
+# OrderArchiveManager. Same columns and ids as the hot tables.
+# -------------------------------------------------
+class OrdersArchive(OrderColumns, Base):
+    __tablename__ = "OrdersArchive"
+
+    ArchivedAt = Column(DateTime, default=ist_now)
+
+    __table_args__ = (
+        Index("ix_OrdersArchive_CustomerId", "CustomerId"),
+        Index("ix_OrdersArchive_RetailerId", "RetailerId"),
+    )
+
+
+class OrderItemArchive(OrderItemColumns, Base):
+    __tablename__ = "OrderItemArchive"
+
+    __table_args__ = (
+        Index("ix_OrderItemArchive_OrderId", "OrderId"),
+    )
+
+
+class OrderStatusCounter(Base):
+    """
+    Orders per (Customer|Retailer, owner id, status), maintained in the same
+    transaction as every order write so dashboard summaries are one
+    primary-key range read. OrderManager.rebuild_status_counters() recomputes it.
+    """
+    __tablename__ = "OrderStatusCounter"
+
+    OwnerType = Column(String, primary_key=True)   # "Customer" / "Retailer"
+    OwnerId = Column(Integer, primary_key=True)
+    Status = Column(String, primary_key=True)
+    Count = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Float, Index
 from .sql_base import Base
 
 class Pharmacy(Base):
@@ -7,8 +7,14 @@ class Pharmacy(Base):
     PharmacyId = Column(Integer, primary_key=True, index=True)
     Name = Column(String, nullable=False)
     Address = Column(String, nullable=True)
-    GPSLocation = Column(String, nullable=True)  # "lat,lon" format
+    GPSLocation = Column(String, nullable=True)  # "lat lon" format
+    Latitude = Column(Float, nullable=True)      # parsed from GPSLocation on write
+    Longitude = Column(Float, nullable=True)
     Pincode = Column(String, nullable=True)
     ImgUrl = Column(String, nullable=True)
     Contact = Column(String, nullable=True)
     Email = Column(String, nullable=True)
+
+    __table_args__ = (
+        Index("ix_Pharmacy_Latitude_Longitude", "Latitude", "Longitude"),
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Float
+from .sql_base import Base
+
+
+# -------------------------------------------------
+# Pincode centroid (one row per pincode)
+# -------------------------------------------------
+class PincodeCentroid(Base):
+    __tablename__ = "PincodeCentroid"
+
+    Pincode = Column(String(10), primary_key=True)
+    District = Column(String, nullable=True)
+    State = Column(String, nullable=True)
+    Latitude = Column(Float, nullable=False)
+    Longitude = Column(Float, nullable=False)
+
+
+# -------------------------------------------------
+# Precomputed nearest pincodes, ranked by centroid distance
+# -------------------------------------------------
+class PincodeNeighbour(Base):
+    __tablename__ = "PincodeNeighbour"
+
+    Pincode = Column(String(10), primary_key=True)
+    NeighbourPincode = Column(String(10), primary_key=True)
+    Rank = Column(Integer, nullable=False)          # 1 = nearest
+    DistanceKm = Column(Float, nullable=False)
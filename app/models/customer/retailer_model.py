@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Integer, String, Float, Index
 from .sql_base import Base
 
 class Retailer(Base):
@@ -30,3 +30,7 @@ class Retailer(Base):
     AccountNumber = Column(String, nullable=True)
     IFSCCode = Column(String, nullable=True)
     Branch = Column(String, nullable=True)
+
+    __table_args__ = (
+        Index("ix_Retailer_Latitude_Longitude", "Latitude", "Longitude"),
+    )
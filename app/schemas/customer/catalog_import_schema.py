@@ -0,0 +1,49 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+# ============================================================
+# Bulk catalog import rows
+# Parents can be given by id or by name (MedicalType / Category /
+# MedicineName); names are resolved by CatalogImportManager.
+# ============================================================
+class MedicalTypeImportRow(BaseModel):
+    MedicalType: str = Field(min_length=1)
+    ImgUrl: Optional[str] = None
+
+
+class MedicineCategoryImportRow(BaseModel):
+    Category: str = Field(min_length=1)
+    MedicalTypeId: Optional[int] = None
+    MedicalType: Optional[str] = None
+    ImgUrl: Optional[str] = None
+
+
+class MedicineImportRow(BaseModel):
+    Name: str = Field(min_length=1)
+    UnitPrice: float = Field(ge=0)
+    MedicalTypeId: Optional[int] = None
+    MedicalType: Optional[str] = None
+    MedicineCategoryId: Optional[int] = None
+    Category: Optional[str] = None
+    GenericName: Optional[str] = None
+    DosageForm: Optional[str] = None
+    Strength: Optional[str] = None
+    Manufacturer: Optional[str] = None
+    PrescriptionRequired: Optional[bool] = False
+    Size: Optional[int] = None
+    TherapeuticClass: Optional[str] = None
+    ImgUrl: Optional[str] = None
+
+
+class MedicineInfoImportRow(BaseModel):
+    MedicineId: Optional[int] = None
+    MedicineName: Optional[str] = None
+    QuickFacts: Optional[str] = None
+    AlternateMedicines: Optional[str] = None
+    SideEffects: Optional[str] = None
+    HowWorks: Optional[str] = None
+    Notes: Optional[str] = None
+    Uses: Optional[str] = None
+    Precautions: Optional[str] = None
+    GeneralGuide: Optional[str] = None
@@ -34,8 +34,7 @@ class CustomerCreate(CustomerBase):
 
 
 class CustomerUpdate(CustomerBase):
-    # Password: Optional[str]
-    pass
+    Password: Optional[str] = None   # plain password, hashed by the manager
 
 
 class CustomerRead(CustomerBase):
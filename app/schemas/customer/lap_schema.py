@@ -20,8 +20,8 @@ class LabBase(BaseModel):
     State: Optional[str]
     Country: Optional[str]
     PostalCode: Optional[str]
-    Latitude: Optional[str]
-    Longitude: Optional[str]
+    Latitude: Optional[float]
+    Longitude: Optional[float]
     ShopPic: Optional[str]
 
     class Config:
@@ -88,6 +88,8 @@ class AppointmentBase(BaseModel):
     Email: Optional[str]
     Address: Optional[str]
     GPSLocation: Optional[str]
+    Latitude: Optional[float] = None
+    Longitude: Optional[float] = None
 
     AppointmentDate: Optional[date]
     TimeSlot: Optional[str]
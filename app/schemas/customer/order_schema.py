@@ -17,7 +17,7 @@ class OrderItemBase(BaseModel):
 
 
 class OrderItemCreate(OrderItemBase):
-    pass
+    OrderId: Optional[int] = None   # required for /order-items, set by the manager for nested items
 
 
 class OrderItemUpdate(OrderItemBase):
@@ -71,6 +71,7 @@ class OrderUpdate(OrderBase):
 
 class OrderRead(OrderBase):
     OrderId: int
+    OrderNo: Optional[str] = None
     # Items: Optional[List[OrderItemRead]]
 
     class Config:
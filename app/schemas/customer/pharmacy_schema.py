@@ -5,6 +5,8 @@ class PharmacyBase(BaseModel):
     Name: Optional[str]
     Address: Optional[str]
     GPSLocation: Optional[str]
+    Latitude: Optional[float] = None
+    Longitude: Optional[float] = None
     Pincode: Optional[str]
     ImgUrl: Optional[str]
     Contact: Optional[str]
@@ -20,6 +22,8 @@ class PharmacyUpdate(BaseModel):
     Name: Optional[str]
     Address: Optional[str]
     GPSLocation: Optional[str]
+    Latitude: Optional[float] = None
+    Longitude: Optional[float] = None
     Pincode: Optional[str]
     ImgUrl: Optional[str]
     Contact: Optional[str]
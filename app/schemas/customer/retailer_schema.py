@@ -37,7 +37,7 @@ class RetailerCreate(RetailerBase):
 
 
 class RetailerUpdate(RetailerBase):
-    pass
+    Password: Optional[str] = None   # plain password, hashed by the manager
 
 
 class RetailerRead(RetailerBase):
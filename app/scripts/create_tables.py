@@ -1,6 +1,14 @@
+import csv
+import heapq
+import os
 import sqlite3
+from math import cos, radians
 from sqlite3 import Connection
 
+from ..config import settings
+from ..utils.geo import haversine_km, parse_gps_location, parse_latitude, parse_longitude
+from ..utils.slot_keys import doctor_slot_key, is_cancelled, lab_slot_key
+
 class TableCreator:
     def __init__(self, sqlite_url: str):
         # Parse file path from SQLAlchemy-style URL
@@ -167,6 +175,7 @@ class TableCreator:
         sql = """
         CREATE TABLE IF NOT EXISTS Orders (
             OrderId INTEGER PRIMARY KEY AUTOINCREMENT,
+            OrderNo TEXT,
             CustomerId INTEGER NOT NULL,
             RetailerId INTEGER NOT NULL,
             RetailerName TEXT NOT NULL,
@@ -201,6 +210,47 @@ class TableCreator:
         self._execute(sql, "Orders")
 
 
+    def create_order_status_counter_table(self):
+        sql = """
+        CREATE TABLE IF NOT EXISTS OrderStatusCounter (
+            OwnerType TEXT NOT NULL,      -- Customer / Retailer
+            OwnerId INTEGER NOT NULL,
+            Status TEXT NOT NULL,
+            Count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (OwnerType, OwnerId, Status)
+        );
+        """
+        self._execute(sql, "OrderStatusCounter")
+
+    def rebuild_order_status_counters(self):
+        # Same as OrderManager.rebuild_status_counters(), for a first fill from the CLI
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("BEGIN;")
+            cur.execute("DELETE FROM OrderStatusCounter;")
+            source = "Orders"
+            if self._table_exists("OrdersArchive"):
+                # Archived orders keep counting
+                source = (
+                    "(SELECT CustomerId, RetailerId, Status FROM Orders "
+                    "UNION ALL SELECT CustomerId, RetailerId, Status FROM OrdersArchive)"
+                )
+            for owner_type, column in (("Customer", "CustomerId"), ("Retailer", "RetailerId")):
+                cur.execute(
+                    f"INSERT INTO OrderStatusCounter (OwnerType, OwnerId, Status, Count) "
+                    f"SELECT ?, {column}, COALESCE(Status, 'New'), COUNT(*) FROM {source} "
+                    f"GROUP BY {column}, COALESCE(Status, 'New');",
+                    (owner_type,),
+                )
+            conn.commit()
+            print("✅ Order status counters rebuilt.")
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Error rebuilding order status counters: {e}")
+        finally:
+            conn.close()
+
     def create_order_item_table(self):
         sql = """
         CREATE TABLE IF NOT EXISTS OrderItem (
@@ -217,6 +267,54 @@ class TableCreator:
         """
         self._execute(sql, "OrderItem")
 
+    def create_order_archive_tables(self):
+        # Same columns as Orders / OrderItem; ids are copied, not generated
+        self._execute("""
+        CREATE TABLE IF NOT EXISTS OrdersArchive (
+            OrderId INTEGER PRIMARY KEY,
+            OrderNo TEXT,
+            CustomerId INTEGER NOT NULL,
+            RetailerId INTEGER NOT NULL,
+            RetailerName TEXT NOT NULL,
+            OrderDateTime DATETIME,
+            ExpectedDelivery DATETIME,
+            DeliveryMode TEXT,
+            DeliveryService TEXT,
+            DeliveryPartnerTrackingId TEXT,
+            DeliveryStatus TEXT,
+            PaymentMode TEXT,
+            PaymentStatus TEXT,
+            PrescriptionFileUrl TEXT,
+            PrescriptionVerified BOOLEAN,
+            TotalAmount REAL,
+            Status TEXT,
+            CreatedAt DATETIME,
+            UpdatedAt DATETIME,
+            ArchivedAt DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        """, "OrdersArchive")
+        self._execute("""
+        CREATE TABLE IF NOT EXISTS OrderItemArchive (
+            OrderItemId INTEGER PRIMARY KEY,
+            OrderId INTEGER NOT NULL,
+            CustomerId INTEGER NOT NULL,
+            RetailerId INTEGER NOT NULL,
+            MedicineId INTEGER NOT NULL,
+            MedicineName TEXT NOT NULL,
+            Quantity INTEGER NOT NULL,
+            Price REAL NOT NULL,
+            TotalAmount REAL NOT NULL
+        );
+        """, "OrderItemArchive")
+        for sql, name in (
+            ("CREATE INDEX IF NOT EXISTS ix_OrdersArchive_CustomerId ON OrdersArchive (CustomerId);", "ix_OrdersArchive_CustomerId"),
+            ("CREATE INDEX IF NOT EXISTS ix_OrdersArchive_RetailerId ON OrdersArchive (RetailerId);", "ix_OrdersArchive_RetailerId"),
+            ("CREATE INDEX IF NOT EXISTS ix_OrderItemArchive_OrderId ON OrderItemArchive (OrderId);", "ix_OrderItemArchive_OrderId"),
+            # Archiver scan: terminal orders by age
+            ("CREATE INDEX IF NOT EXISTS ix_Orders_Status_UpdatedAt ON Orders (Status, UpdatedAt);", "ix_Orders_Status_UpdatedAt"),
+        ):
+            self._execute(sql, f"Index {name}")
+
 
 
     # ------------------------------------------------------------------
@@ -240,7 +338,10 @@ class TableCreator:
 
     
     def create_lab_table(self):
-        sql = """
+        self._execute(self._create_lab_sql(), "Lab")
+
+    def _create_lab_sql(self) -> str:
+        return """
         CREATE TABLE IF NOT EXISTS Lab (
             LabId INTEGER PRIMARY KEY AUTOINCREMENT,
             Name TEXT NOT NULL,
@@ -255,15 +356,14 @@ class TableCreator:
             State TEXT,
             Country TEXT,
             PostalCode TEXT,
-            Latitude TEXT,
-            Longitude TEXT,
+            Latitude REAL,
+            Longitude REAL,
             ShopPic TEXT,
 
             CreatedAt TEXT,
             UpdatedAt TEXT
         );
         """
-        self._execute(sql, "Lab")
 
     
     def create_test_table(self):
@@ -299,6 +399,8 @@ class TableCreator:
             Email TEXT,
             Address TEXT,
             GPSLocation TEXT,
+            Latitude REAL,
+            Longitude REAL,
 
             AppointmentDate TEXT,
             TimeSlot TEXT,
@@ -311,6 +413,7 @@ class TableCreator:
             PaymentMethod TEXT,
             PaymentStatus TEXT,
             BookingStatus TEXT,
+            SlotKey TEXT,
 
             CreatedAt TEXT,
             UpdatedAt TEXT
@@ -318,6 +421,30 @@ class TableCreator:
         """
         self._execute(sql, "Appointment")
 
+    def create_appointment_test_table(self):
+        sql = """
+        CREATE TABLE IF NOT EXISTS AppointmentTest (
+            AppointmentTestId INTEGER PRIMARY KEY AUTOINCREMENT,
+            AppointmentId INTEGER NOT NULL,
+            TestId INTEGER NOT NULL,
+
+            TestName TEXT,
+            Price REAL NOT NULL DEFAULT 0,
+            GstPercent REAL DEFAULT 0,
+            GstAmount REAL DEFAULT 0,
+            NetPrice REAL DEFAULT 0,
+
+            CreatedAt TEXT,
+
+            FOREIGN KEY (AppointmentId) REFERENCES Appointment(AppointmentId)
+        );
+        """
+        self._execute(sql, "AppointmentTest")
+        self._execute(
+            "CREATE INDEX IF NOT EXISTS ix_AppointmentTest_AppointmentId ON AppointmentTest (AppointmentId);",
+            "Index ix_AppointmentTest_AppointmentId",
+        )
+
     def create_doctor_table(self):
         sql = """
         CREATE TABLE IF NOT EXISTS Doctor (
@@ -380,6 +507,7 @@ class TableCreator:
 
             ReasonForVisit TEXT,
             Notes TEXT,
+            SlotKey TEXT,
 
             CreatedAt TEXT,
             UpdatedAt TEXT,
@@ -424,6 +552,443 @@ class TableCreator:
         self._execute(sql, "Retailer")
 
 
+    def create_pharmacy_table(self):
+        sql = """
+        CREATE TABLE IF NOT EXISTS Pharmacy (
+            PharmacyId INTEGER PRIMARY KEY AUTOINCREMENT,
+            Name TEXT NOT NULL,
+            Address TEXT,
+            GPSLocation TEXT,
+            Latitude REAL,
+            Longitude REAL,
+            Pincode TEXT,
+            ImgUrl TEXT,
+            Contact TEXT,
+            Email TEXT
+        );
+        """
+        self._execute(sql, "Pharmacy")
+
+    def create_idempotency_key_table(self):
+        sql = """
+        CREATE TABLE IF NOT EXISTS IdempotencyKey (
+            Key TEXT PRIMARY KEY,           -- "<METHOD> <path> <Idempotency-Key header>"
+            RequestHash TEXT NOT NULL,
+            State TEXT NOT NULL DEFAULT 'Pending',   -- Pending / Done
+            ResponseCode INTEGER,
+            ResponseBody TEXT,
+            ContentType TEXT,
+            CreatedAt TEXT,
+            ExpiresAt TEXT NOT NULL
+        );
+        """
+        self._execute(sql, "IdempotencyKey")
+        self._execute(
+            "CREATE INDEX IF NOT EXISTS ix_IdempotencyKey_ExpiresAt ON IdempotencyKey (ExpiresAt);",
+            "Index ix_IdempotencyKey_ExpiresAt",
+        )
+
+
+    def create_node_lease_table(self):
+        sql = """
+        CREATE TABLE IF NOT EXISTS NodeIdLease (
+            NodeId INTEGER PRIMARY KEY,     -- id generator node, 0-1023
+            Owner TEXT NOT NULL,            -- "<host>:<pid>:<random>"
+            ExpiresAt TEXT NOT NULL
+        );
+        """
+        self._execute(sql, "NodeIdLease")
+
+    # ------------------------------------------------------------------
+    # Pincode proximity graph
+    # ------------------------------------------------------------------
+    def create_pincode_tables(self):
+        self._execute("""
+        CREATE TABLE IF NOT EXISTS PincodeCentroid (
+            Pincode TEXT PRIMARY KEY,
+            District TEXT,
+            State TEXT,
+            Latitude REAL NOT NULL,
+            Longitude REAL NOT NULL
+        );
+        """, "PincodeCentroid")
+        self._execute("""
+        CREATE TABLE IF NOT EXISTS PincodeNeighbour (
+            Pincode TEXT NOT NULL,
+            NeighbourPincode TEXT NOT NULL,
+            Rank INTEGER NOT NULL,
+            DistanceKm REAL NOT NULL,
+            PRIMARY KEY (Pincode, NeighbourPincode)
+        );
+        """, "PincodeNeighbour")
+
+    PINCODE_COLUMNS = {
+        "pincode": ("pincode", "pin", "postalcode", "postal_code"),
+        "latitude": ("latitude", "lat"),
+        "longitude": ("longitude", "lon", "lng", "long"),
+        "district": ("district", "districtname", "district_name"),
+        "state": ("state", "statename", "state_name"),
+    }
+
+    def load_pincodes(self, csv_path: str, neighbours: int = 20, chunk_size: int = 1000):
+        """
+        Loads pincode centroids from a local CSV and precomputes each pincode's
+        `neighbours` nearest pincodes into PincodeNeighbour.
+        Several rows per pincode (one per post office) are averaged into one centroid.
+        """
+        self.create_pincode_tables()
+
+        centroids = {}
+        with open(csv_path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            headers = {h.strip().lower(): h for h in (reader.fieldnames or [])}
+            cols = {
+                key: next((headers[a] for a in aliases if a in headers), None)
+                for key, aliases in self.PINCODE_COLUMNS.items()
+            }
+            if not (cols["pincode"] and cols["latitude"] and cols["longitude"]):
+                raise ValueError("CSV needs pincode, latitude and longitude columns")
+
+            for row in reader:
+                pincode = (row[cols["pincode"]] or "").strip()
+                lat = parse_latitude(row[cols["latitude"]])
+                lon = parse_longitude(row[cols["longitude"]])
+                if not pincode or lat is None or lon is None:
+                    continue
+                entry = centroids.setdefault(pincode, [0.0, 0.0, 0, None, None])
+                entry[0] += lat
+                entry[1] += lon
+                entry[2] += 1
+                entry[3] = entry[3] or (row[cols["district"]] if cols["district"] else None)
+                entry[4] = entry[4] or (row[cols["state"]] if cols["state"] else None)
+
+        points = {p: (e[0] / e[2], e[1] / e[2]) for p, e in centroids.items()}
+        neighbour_rows = self._nearest_pincodes(points, neighbours)
+
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("BEGIN;")
+            centroid_rows = [
+                (p, e[3], e[4], points[p][0], points[p][1]) for p, e in centroids.items()
+            ]
+            for i in range(0, len(centroid_rows), chunk_size):
+                cur.executemany(
+                    "INSERT OR REPLACE INTO PincodeCentroid "
+                    "(Pincode, District, State, Latitude, Longitude) VALUES (?, ?, ?, ?, ?);",
+                    centroid_rows[i:i + chunk_size],
+                )
+            cur.execute("DELETE FROM PincodeNeighbour;")
+            for i in range(0, len(neighbour_rows), chunk_size):
+                cur.executemany(
+                    "INSERT INTO PincodeNeighbour "
+                    "(Pincode, NeighbourPincode, Rank, DistanceKm) VALUES (?, ?, ?, ?);",
+                    neighbour_rows[i:i + chunk_size],
+                )
+            conn.commit()
+            print(f"✅ Loaded {len(centroid_rows)} pincodes, {len(neighbour_rows)} neighbour links.")
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Error loading pincodes: {e}")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _nearest_pincodes(points: dict, k: int, cell_deg: float = 0.25, max_ring: int = 40):
+        """k nearest neighbours per pincode using a lat/lon grid instead of all pairs."""
+        grid = {}
+        for pincode, (lat, lon) in points.items():
+            grid.setdefault((int(lat // cell_deg), int(lon // cell_deg)), []).append(pincode)
+
+        rows = []
+        for pincode, (lat, lon) in points.items():
+            cx, cy = int(lat // cell_deg), int(lon // cell_deg)
+            # Lower bound (km) for anything outside ring r, conservative for longitude
+            km_per_ring = cell_deg * 111.0 * max(cos(radians(abs(lat) + cell_deg)), 0.1)
+            candidates = []
+            ring = 0
+            while ring <= max_ring:
+                for dx in range(-ring, ring + 1):
+                    for dy in range(-ring, ring + 1):
+                        if max(abs(dx), abs(dy)) != ring:
+                            continue
+                        for other in grid.get((cx + dx, cy + dy), ()):
+                            if other != pincode:
+                                o_lat, o_lon = points[other]
+                                candidates.append((haversine_km(lat, lon, o_lat, o_lon), other))
+                if len(candidates) >= k:
+                    kth = heapq.nsmallest(k, candidates)[-1][0]
+                    if ring * km_per_ring >= kth:
+                        break
+                ring += 1
+            for rank, (distance, other) in enumerate(heapq.nsmallest(k, candidates), start=1):
+                rows.append((pincode, other, rank, round(distance, 3)))
+        return rows
+
+
+    # ------------------------------------------------------------------
+    # Coordinates: numeric Latitude/Longitude + (lat, lon) indexes
+    # ------------------------------------------------------------------
+    COORDINATE_TABLES = ("Customer", "Retailer", "Pharmacy", "Lab", "Appointment")
+
+    def create_coordinate_indexes(self):
+        for table in self.COORDINATE_TABLES:
+            if not self._table_exists(table):
+                continue
+            sql = f"CREATE INDEX IF NOT EXISTS ix_{table}_Latitude_Longitude ON {table} (Latitude, Longitude);"
+            self._execute(sql, f"Index ix_{table}_Latitude_Longitude")
+
+    def migrate_coordinates(self, chunk_size: int = 1000):
+        """
+        Moves every geo-bearing table onto numeric Latitude/Longitude columns:
+        - Pharmacy / Appointment: add REAL columns, backfill from GPSLocation.
+        - Lab: Latitude/Longitude were TEXT, rebuild the table with REAL columns.
+        Rows are processed in chunks of `chunk_size`, so the migration can run
+        on a live database without loading whole tables into memory.
+        """
+        for table in ("Pharmacy", "Appointment"):
+            if not self._table_exists(table):
+                continue
+            self.add_column_if_not_exists(table, "Latitude", "REAL")
+            self.add_column_if_not_exists(table, "Longitude", "REAL")
+            self._backfill_from_gps_location(table, chunk_size)
+
+        if self._table_exists("Lab") and self._column_type("Lab", "Latitude") != "REAL":
+            self._rebuild_lab_with_numeric_coordinates(chunk_size)
+
+        self.create_coordinate_indexes()
+
+    def _backfill_from_gps_location(self, table: str, chunk_size: int):
+        pk = f"{table}Id"
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor()
+            last_id, updated = 0, 0
+            while True:
+                cur.execute(
+                    f"SELECT {pk}, GPSLocation FROM {table} "
+                    f"WHERE {pk} > ? AND Latitude IS NULL AND GPSLocation IS NOT NULL "
+                    f"ORDER BY {pk} LIMIT ?;",
+                    (last_id, chunk_size),
+                )
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                params = []
+                for row_id, gps_location in rows:
+                    lat, lon = parse_gps_location(gps_location)
+                    if lat is not None:
+                        params.append((lat, lon, row_id))
+                cur.executemany(
+                    f"UPDATE {table} SET Latitude = ?, Longitude = ? WHERE {pk} = ?;", params
+                )
+                conn.commit()
+                updated += len(params)
+            print(f"✅ Backfilled coordinates for {updated} rows in '{table}'.")
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Error backfilling coordinates in '{table}': {e}")
+        finally:
+            conn.close()
+
+    def _rebuild_lab_with_numeric_coordinates(self, chunk_size: int):
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor()
+            columns = [c[1] for c in cur.execute("PRAGMA table_info(Lab);").fetchall()]
+            lat_idx, lon_idx = columns.index("Latitude"), columns.index("Longitude")
+            cols_str = ", ".join(columns)
+            placeholders = ", ".join("?" for _ in columns)
+
+            # Single transaction: either the whole table is converted or nothing is
+            cur.execute("BEGIN;")
+            cur.execute("ALTER TABLE Lab RENAME TO Lab_old;")
+            cur.execute(self._create_lab_sql())
+            last_id, copied = 0, 0
+            while True:
+                cur.execute(
+                    f"SELECT {cols_str} FROM Lab_old WHERE LabId > ? ORDER BY LabId LIMIT ?;",
+                    (last_id, chunk_size),
+                )
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                converted = []
+                for row in rows:
+                    row = list(row)
+                    row[lat_idx] = parse_latitude(row[lat_idx])
+                    row[lon_idx] = parse_longitude(row[lon_idx])
+                    converted.append(row)
+                cur.executemany(f"INSERT INTO Lab ({cols_str}) VALUES ({placeholders});", converted)
+                copied += len(converted)
+            cur.execute("DROP TABLE Lab_old;")
+            conn.commit()
+            print(f"✅ Lab rebuilt with numeric coordinates ({copied} rows).")
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Error converting Lab coordinates: {e}")
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Appointment slot keys (unique index = atomic slot reservation)
+    # ------------------------------------------------------------------
+    SLOT_KEY_TABLES = ("DoctorAppointment", "Appointment")
+
+    def create_slot_key_indexes(self):
+        for table in self.SLOT_KEY_TABLES:
+            if not self._table_exists(table):
+                continue
+            sql = f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{table}_SlotKey ON {table} (SlotKey);"
+            self._execute(sql, f"Index ux_{table}_SlotKey")
+
+    def migrate_slot_keys(self):
+        """
+        Adds SlotKey to both appointment tables, backfills it for active
+        bookings and creates the unique indexes. Existing double bookings keep
+        the earliest appointment on the slot; the later ones get a NULL key
+        and are reported so they can be rescheduled by hand.
+        """
+        if self._table_exists("DoctorAppointment"):
+            self.add_column_if_not_exists("DoctorAppointment", "SlotKey", "TEXT")
+            rows = self._fetchall(
+                "SELECT a.AppointmentId, a.DoctorId, a.AppointmentDate, a.AppointmentTime, "
+                "a.AppointmentSlot, a.Status, d.SlotDurationMinutes "
+                "FROM DoctorAppointment a LEFT JOIN Doctor d ON d.DoctorId = a.DoctorId "
+                "ORDER BY a.AppointmentId;"
+            )
+            keys = [
+                (row[0], None if is_cancelled(row[5])
+                 else doctor_slot_key(row[1], row[2], row[3], row[4], row[6]))
+                for row in rows
+            ]
+            self._backfill_slot_keys("DoctorAppointment", keys)
+
+        if self._table_exists("Appointment"):
+            self.add_column_if_not_exists("Appointment", "SlotKey", "TEXT")
+            rows = self._fetchall(
+                "SELECT AppointmentId, LabId, AppointmentDate, TimeSlot, BookingStatus "
+                "FROM Appointment ORDER BY AppointmentId;"
+            )
+            keys = [
+                (row[0], None if is_cancelled(row[4]) else lab_slot_key(row[1], row[2], row[3]))
+                for row in rows
+            ]
+            self._backfill_slot_keys("Appointment", keys)
+
+        self.create_slot_key_indexes()
+
+    def _backfill_slot_keys(self, table: str, keys: list):
+        seen, params, duplicates = set(), [], []
+        for appointment_id, key in keys:
+            if key is not None and key in seen:
+                duplicates.append(appointment_id)
+                key = None
+            elif key is not None:
+                seen.add(key)
+            params.append((key, appointment_id))
+
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor()
+            cur.executemany(f"UPDATE {table} SET SlotKey = ? WHERE AppointmentId = ?;", params)
+            conn.commit()
+            print(f"✅ Backfilled SlotKey for {len(seen)} rows in '{table}'.")
+            if duplicates:
+                print(f"⚠️ Double-booked appointments left without a slot in '{table}': {duplicates}")
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Error backfilling SlotKey in '{table}': {e}")
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Order numbers
+    # ------------------------------------------------------------------
+    def migrate_order_numbers(self):
+        # Existing orders keep a NULL OrderNo; new ones get "ORD-<snowflake id>"
+        self.add_column_if_not_exists("Orders", "OrderNo", "TEXT")
+        self._execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_Orders_OrderNo ON Orders (OrderNo);",
+            "Index ux_Orders_OrderNo",
+        )
+
+    # ------------------------------------------------------------------
+    # Pending migrations (run by the app at startup, see SchemaManager)
+    # ------------------------------------------------------------------
+    def migrate_schema(self, pincode_csv_path: str = None) -> list:
+        """
+        Applies whichever of the migrations above this database still lacks
+        and returns their names. Every step checks for its table or column
+        first, so running this on each start is a no-op once the database is
+        current; a database from before a feature shipped gets the columns
+        the models now map instead of failing every query that reads them.
+        """
+        applied = []
+        if self._table_exists("Orders") and self._column_type("Orders", "OrderNo") is None:
+            self.migrate_order_numbers()
+            applied.append("OrderNumbers")
+
+        if self._table_exists("Orders") and not (
+            self._table_exists("OrdersArchive") and self._table_exists("OrderItemArchive")
+        ):
+            self.create_order_archive_tables()
+            applied.append("OrderArchive")
+
+        if not self._table_exists("OrderStatusCounter"):
+            self.create_order_status_counter_table()
+            if self._table_exists("Orders"):
+                self.rebuild_order_status_counters()
+            applied.append("OrderStatusCounters")
+
+        if not (self._table_exists("PincodeCentroid") and self._table_exists("PincodeNeighbour")):
+            self.create_pincode_tables()
+            if pincode_csv_path and os.path.exists(pincode_csv_path):
+                self.load_pincodes(pincode_csv_path)
+            applied.append("Pincodes")
+
+        if self._table_exists("Appointment") and not self._table_exists("AppointmentTest"):
+            self.create_appointment_test_table()
+            applied.append("AppointmentTests")
+
+        if not self._table_exists("IdempotencyKey"):
+            self.create_idempotency_key_table()
+            applied.append("IdempotencyKeys")
+
+        if not self._table_exists("NodeIdLease"):
+            self.create_node_lease_table()
+            applied.append("NodeIdLeases")
+
+        if any(
+            self._table_exists(table) and self._column_type(table, "Latitude") != "REAL"
+            for table in ("Pharmacy", "Lab", "Appointment")
+        ):
+            self.migrate_coordinates()
+            applied.append("Coordinates")
+
+        if any(
+            self._table_exists(table) and self._column_type(table, "SlotKey") is None
+            for table in self.SLOT_KEY_TABLES
+        ):
+            self.migrate_slot_keys()
+            applied.append("SlotKeys")
+        return applied
+
+    def _table_exists(self, table: str) -> bool:
+        rows = self._fetchall(
+            f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}';"
+        )
+        return bool(rows)
+
+    def _column_type(self, table: str, column: str):
+        for col in self._fetchall(f"PRAGMA table_info({table});"):
+            if col[1] == column:
+                return (col[2] or "").upper()
+        return None
+
+
 
 
     def add_column_if_not_exists(self, table: str, column: str, datatype: str):
@@ -590,15 +1155,19 @@ class TableCreator:
 
         self.create_order_table()
         self.create_order_item_table()
+        # self.create_order_archive_tables()
                 
         # # self.create_lab_table()
         # # self.create_test_table()
         # # self.create_appointment_table()
+        # self.create_appointment_test_table()
 
         # # self.create_doctor_table()
         # # self.create_doctor_appointment_table()
 
         # self.create_retailer_table()
+        # self.create_pharmacy_table()
+        self.migrate_schema(settings.pincode_csv_path)
 
 
         # self.add_column_if_not_exists("RetailerOrders", "RetailerName", "TEXT")
@@ -0,0 +1,829 @@
+"""
+Deterministic synthetic data for scale testing, load tests and benchmarks.
+
+    python -m app.scripts.generate_data --scale large --db ./bench.db
+    python -m app.scripts.generate_data --scale small --orders 100000 --anchor 2025-01-01
+
+or from code:
+
+    DataGenerator("sqlite+aiosqlite:///./bench.db", seed=42).generate(SCALES["small"])
+
+Fills every table in app/models/customer with referentially consistent
+rows: customers, retailers, pharmacies, labs and doctors live around 20
+Indian cities in generated pincode cells (with PincodeCentroid /
+PincodeNeighbour filled from them), orders reference real customers,
+retailers and medicines, and totals, status counters and slot keys agree
+with what the managers would have written.
+
+Every table gets its own random stream derived from the seed, so the same
+seed and anchor date always produce the same rows, and changing one count
+does not reshuffle the other tables. Rows are bulk-loaded with sqlite3
+executemany in large transactions, with secondary indexes built after the
+load, bypassing the ORM.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sqlite3
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import bcrypt
+from sqlalchemy import create_engine
+
+from ..models.customer.sql_base import Base
+from ..models.customer.customer_model import Customer
+from ..models.customer.customer_notification_model import CustomerNotification
+from ..models.customer.retailer_model import Retailer
+from ..models.customer.medicine_model import MedicalType, MedicineCategory, Medicine, MedicineInfo
+from ..models.customer.pharmacy_model import Pharmacy
+from ..models.customer.pincode_model import PincodeCentroid, PincodeNeighbour
+from ..models.customer.cart_model import Cart, CartItem
+from ..models.customer.order_model import (
+    Order, OrderItem, OrderStatusCounter, OrdersArchive, OrderItemArchive
+)
+from ..models.customer.prescription_model import Prescription
+from ..models.customer.lap_model import Lab, Test, Appointment, AppointmentTest
+from ..models.customer.doctor_model import Doctor, DoctorAppointment
+from ..models.customer.idempotency_model import IdempotencyKey
+from ..utils.lab_pricing import format_selected_tests, price_tests
+from ..utils.doctor_schedule import parse_days, parse_ranges
+from ..utils.slot_keys import doctor_slot_key, is_cancelled, lab_slot_key
+from .create_tables import TableCreator
+
+DEFAULT_PASSWORD = "Password@123"   # every generated customer / retailer can log in with it
+BCRYPT_SALT_ALPHABET = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+
+class Scale(NamedTuple):
+    customers: int
+    retailers: int
+    medicines: int
+    pharmacies: int
+    orders: int
+    labs: int = 0
+    lab_appointments: int = 0
+    doctors: int = 0
+    doctor_appointments: int = 0
+    max_items_per_order: int = 4
+    cart_share: float = 0.3             # customers with a non-empty cart
+    medicine_info_share: float = 0.5    # medicines with a MedicineInfo row
+    prescription_share: float = 0.2     # orders with an uploaded prescription
+    pincodes_per_city: int = 60
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(customers=50, retailers=5, medicines=200, pharmacies=50, orders=500,
+                  labs=10, lab_appointments=100, doctors=10, doctor_appointments=100, pincodes_per_city=10),
+    "small": Scale(customers=2_000, retailers=50, medicines=5_000, pharmacies=1_000, orders=20_000,
+                   labs=200, lab_appointments=5_000, doctors=300, doctor_appointments=5_000),
+    "medium": Scale(customers=50_000, retailers=500, medicines=50_000, pharmacies=10_000, orders=250_000,
+                    labs=2_000, lab_appointments=50_000, doctors=3_000, doctor_appointments=50_000),
+    "large": Scale(customers=200_000, retailers=2_000, medicines=200_000, pharmacies=50_000, orders=1_000_000,
+                   labs=5_000, lab_appointments=200_000, doctors=10_000, doctor_appointments=200_000,
+                   pincodes_per_city=120),
+}
+
+# Created and filled, in dependency order; IdempotencyKey and the archive tables are created empty
+TABLES = (
+    PincodeCentroid, PincodeNeighbour, Customer, Retailer, MedicalType, MedicineCategory, Medicine,
+    MedicineInfo, Pharmacy, Cart, CartItem, Order, OrderItem, OrderStatusCounter, OrdersArchive,
+    OrderItemArchive, CustomerNotification, Prescription, Lab, Test, Appointment, AppointmentTest,
+    Doctor, DoctorAppointment, IdempotencyKey,
+)
+
+# (city, state, latitude, longitude, pincode prefix)
+CITIES: Sequence[Tuple[str, str, float, float, str]] = (
+    ("Mumbai", "Maharashtra", 19.0760, 72.8777, "400"),
+    ("Delhi", "Delhi", 28.6139, 77.2090, "110"),
+    ("Bengaluru", "Karnataka", 12.9716, 77.5946, "560"),
+    ("Chennai", "Tamil Nadu", 13.0827, 80.2707, "600"),
+    ("Kolkata", "West Bengal", 22.5726, 88.3639, "700"),
+    ("Hyderabad", "Telangana", 17.3850, 78.4867, "500"),
+    ("Pune", "Maharashtra", 18.5204, 73.8567, "411"),
+    ("Ahmedabad", "Gujarat", 23.0225, 72.5714, "380"),
+    ("Jaipur", "Rajasthan", 26.9124, 75.7873, "302"),
+    ("Lucknow", "Uttar Pradesh", 26.8467, 80.9462, "226"),
+    ("Kochi", "Kerala", 9.9312, 76.2673, "682"),
+    ("Chandigarh", "Chandigarh", 30.7333, 76.7794, "160"),
+    ("Bhopal", "Madhya Pradesh", 23.2599, 77.4126, "462"),
+    ("Patna", "Bihar", 25.5941, 85.1376, "800"),
+    ("Indore", "Madhya Pradesh", 22.7196, 75.8577, "452"),
+    ("Nagpur", "Maharashtra", 21.1458, 79.0882, "440"),
+    ("Coimbatore", "Tamil Nadu", 11.0168, 76.9558, "641"),
+    ("Visakhapatnam", "Andhra Pradesh", 17.6868, 83.2185, "530"),
+    ("Guwahati", "Assam", 26.1445, 91.7362, "781"),
+    ("Bhubaneswar", "Odisha", 20.2961, 85.8245, "751"),
+)
+# Bigger cities get proportionally more people and shops
+CITY_WEIGHTS = (20, 20, 14, 10, 10, 10, 7, 6, 4, 4, 3, 3, 3, 3, 3, 3, 2, 2, 2, 2)
+
+FIRST_NAMES = (
+    "Aarav", "Vivaan", "Aditya", "Arjun", "Sai", "Reyansh", "Ishaan", "Kabir", "Rohan", "Vikram",
+    "Ananya", "Diya", "Aadhya", "Saanvi", "Isha", "Kavya", "Meera", "Priya", "Riya", "Sneha",
+)
+LAST_NAMES = (
+    "Sharma", "Verma", "Patel", "Reddy", "Iyer", "Nair", "Gupta", "Singh", "Kumar", "Das",
+    "Mehta", "Joshi", "Rao", "Menon", "Chatterjee", "Banerjee", "Khan", "Pillai", "Shah", "Bose",
+)
+STREETS = ("MG Road", "Station Road", "Gandhi Nagar", "Park Street", "Nehru Marg", "Temple Road", "Ring Road", "Lake View")
+BANKS = (("State Bank of India", "SBIN"), ("HDFC Bank", "HDFC"), ("ICICI Bank", "ICIC"), ("Axis Bank", "UTIB"))
+
+MEDICAL_TYPES = {
+    "Allopathy": ("Pain Relief", "Antibiotics", "Diabetes", "Cardiac", "Vitamins", "Cold & Cough", "Gastro", "Skin Care"),
+    "Ayurveda": ("Immunity", "Digestive Care", "Hair Care", "Joint Care"),
+    "Homeopathy": ("Allergy", "Sleep", "Stress"),
+    "Personal Care": ("Baby Care", "Oral Care", "Hygiene"),
+}
+MOLECULES = (
+    "Paracetamol", "Ibuprofen", "Amoxicillin", "Azithromycin", "Metformin", "Atorvastatin", "Amlodipine",
+    "Pantoprazole", "Cetirizine", "Montelukast", "Losartan", "Omeprazole", "Levothyroxine", "Vitamin D3",
+    "Diclofenac", "Ciprofloxacin", "Glimepiride", "Telmisartan", "Rosuvastatin", "Domperidone",
+)
+FORMS = ("Tablet", "Capsule", "Syrup", "Injection", "Ointment", "Drops")
+STRENGTHS = ("5 mg", "10 mg", "50 mg", "100 mg", "250 mg", "500 mg", "650 mg", "1 g")
+MANUFACTURERS = ("Sun Pharma", "Cipla", "Dr. Reddy's", "Lupin", "Zydus", "Mankind", "Alkem", "Torrent", "Glenmark", "Intas")
+
+# (name, category, typical price, report time, preparation)
+LAB_TESTS = (
+    ("Complete Blood Count (CBC)", "Haematology", 350, "12 hours", None),
+    ("Lipid Profile", "Biochemistry", 600, "24 hours", "10-12 hours fasting"),
+    ("HbA1c", "Diabetes", 450, "24 hours", None),
+    ("Fasting Blood Sugar (FBS)", "Diabetes", 120, "6 hours", "8 hours fasting"),
+    ("Thyroid Profile (T3 T4 TSH)", "Hormones", 550, "24 hours", None),
+    ("Liver Function Test (LFT)", "Biochemistry", 700, "24 hours", None),
+    ("Kidney Function Test (KFT)", "Biochemistry", 750, "24 hours", None),
+    ("Vitamin D (25-OH)", "Vitamins", 1200, "48 hours", None),
+    ("Vitamin B12", "Vitamins", 900, "48 hours", None),
+    ("Urine Routine", "Pathology", 200, "12 hours", "First morning sample"),
+    ("C-Reactive Protein (CRP)", "Immunology", 500, "24 hours", None),
+    ("Dengue NS1 Antigen", "Infectious Disease", 800, "24 hours", None),
+)
+LAB_SLOTS = tuple(f"{h % 12 or 12:02d}:00 {'AM' if h < 12 else 'PM'} - {(h + 1) % 12 or 12:02d}:00 {'AM' if h + 1 < 12 else 'PM'}"
+                  for h in range(7, 19))
+SPECIALIZATIONS = (
+    "General Physician", "Paediatrician", "Cardiologist", "Dermatologist", "Gynaecologist",
+    "Orthopaedic", "ENT Specialist", "Psychiatrist", "Diabetologist", "Dentist",
+)
+DOCTOR_HOURS = (("Mon-Sat", "10:00 AM - 01:00 PM, 05:00 PM - 08:00 PM"), ("Mon-Fri", "09:00 AM - 02:00 PM"),
+                ("Tue-Sun", "04:00 PM - 09:00 PM"))
+
+# (status, delivery status, payment status, weight)
+ORDER_STATES = (
+    ("New", "Pending", "Pending", 8),
+    ("Confirmed", "Pending", "Paid", 7),
+    ("Shipped", "Shipped", "Paid", 15),
+    ("Delivered", "Delivered", "Paid", 60),
+    ("Cancelled", "Pending", "Failed", 10),
+)
+
+
+def _rng(seed: int, table: str) -> random.Random:
+    return random.Random(f"{seed}:{table}")
+
+
+def _dt(value: datetime) -> str:
+    """The text form SQLAlchemy's SQLite DateTime type reads back."""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+class LabTest(NamedTuple):
+    """The Test columns price_tests reads."""
+    TestId: int
+    Name: str
+    Price: float
+    GstPercent: float
+
+
+class GeoPoint(NamedTuple):
+    city: str
+    state: str
+    latitude: float
+    longitude: float
+    pincode: str
+
+
+class DataGenerator:
+    def __init__(self, sqlite_url: str, seed: int = 42, anchor: Optional[date] = None, chunk_size: int = 10_000):
+        if not sqlite_url.startswith("sqlite+aiosqlite:///"):
+            raise ValueError("Invalid SQLite URL format")
+        self.sqlite_url = sqlite_url
+        self.db_file = sqlite_url.replace("sqlite+aiosqlite:///", "")
+        self.seed = seed
+        # Dates are spread over the year before the anchor; pass one for byte-identical output
+        anchor = anchor or date.today()
+        self.anchor = datetime(anchor.year, anchor.month, anchor.day)
+        self.chunk_size = chunk_size
+        self._password_hash: Optional[str] = None
+        self._medicine_prices: List[Tuple[int, str, float]] = []
+        self._retailer_names: List[str] = []
+        self._pincodes: List[List[Tuple[str, float, float]]] = []   # per city: (pincode, lat, lon)
+
+    # ------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------
+    def generate(self, scale: Scale) -> Dict[str, int]:
+        tables = [t.__table__ for t in TABLES]
+        engine = create_engine(f"sqlite:///{self.db_file}")
+        Base.metadata.create_all(engine, tables=tables)
+        indexes = [index for table in tables for index in table.indexes]
+
+        counts: Dict[str, int] = {}
+        conn = sqlite3.connect(self.db_file)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")
+            # Appending to tables without secondary indexes and building each index
+            # once at the end is several times faster than maintaining them per row
+            for index in indexes:
+                conn.execute(f'DROP INDEX IF EXISTS "{index.name}"')
+            conn.commit()
+
+            counts.update(self._load_pincodes(conn, scale))
+            counts["customer"] = self._load(conn, Customer, self._customers(scale.customers))
+            counts["Retailer"] = self._load(conn, Retailer, self._retailers(scale.retailers))
+            counts.update(self._load_catalog(conn, scale))
+            counts["Pharmacy"] = self._load(conn, Pharmacy, self._pharmacies(scale.pharmacies))
+            counts.update(self._load_carts(conn, scale))
+            counts.update(self._load_orders(conn, scale))
+            counts.update(self._load_labs(conn, scale))
+            counts.update(self._load_doctors(conn, scale))
+        finally:
+            conn.close()
+
+        for index in indexes:
+            index.create(engine, checkfirst=True)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+        engine.dispose()
+        return counts
+
+    # ------------------------------------------------------------
+    # Bulk loading
+    # ------------------------------------------------------------
+    def _load(self, conn: sqlite3.Connection, model, rows: Iterable[dict]) -> int:
+        """executemany in chunks; rows are dicts keyed by column name."""
+        table = model.__table__
+        columns = [c.name for c in table.columns]
+        quoted = ", ".join(f'"{c}"' for c in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f'INSERT INTO "{table.name}" ({quoted}) VALUES ({placeholders})'
+        count, chunk = 0, []
+        for row in rows:
+            chunk.append(tuple(row.get(c) for c in columns))
+            if len(chunk) >= self.chunk_size:
+                conn.executemany(sql, chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            conn.executemany(sql, chunk)
+            count += len(chunk)
+        conn.commit()
+        return count
+
+    # ------------------------------------------------------------
+    # Shared helpers
+    # ------------------------------------------------------------
+    @property
+    def password_hash(self) -> str:
+        if self._password_hash is None:
+            # Minimum bcrypt cost: generated accounts must be cheap to create and log in to.
+            # The salt comes from the seed so reruns stay byte-identical
+            rng = _rng(self.seed, "password")
+            salt = "$2b$04$" + "".join(rng.choice(BCRYPT_SALT_ALPHABET) for _ in range(21)) + rng.choice(".Oeu")
+            self._password_hash = bcrypt.hashpw(DEFAULT_PASSWORD.encode(), salt.encode()).decode()
+        return self._password_hash
+
+    def point(self, rng: random.Random, spread_km: float = 1.5) -> GeoPoint:
+        """A location near the centroid of a pincode of a (population weighted) city."""
+        city_index = rng.choices(range(len(CITIES)), weights=CITY_WEIGHTS)[0]
+        city, state, _, _, _ = CITIES[city_index]
+        pincode, lat, lon = rng.choice(self._pincodes[city_index])
+        # ~1 degree latitude = 111 km
+        lat += rng.uniform(-spread_km, spread_km) / 111.0
+        lon += rng.uniform(-spread_km, spread_km) / 111.0
+        return GeoPoint(city, state, round(lat, 6), round(lon, 6), pincode)
+
+    @staticmethod
+    def person(rng: random.Random) -> str:
+        return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    @staticmethod
+    def phone(rng: random.Random) -> str:
+        return f"+91{rng.choice('6789')}{rng.randint(0, 999_999_999):09d}"
+
+    @staticmethod
+    def address(rng: random.Random) -> str:
+        return f"{rng.randint(1, 450)}, {rng.choice(STREETS)}"
+
+    def moment(self, rng: random.Random, days: int = 365) -> datetime:
+        return self.anchor - timedelta(seconds=rng.randint(0, days * 86400))
+
+    def _bank(self, rng: random.Random) -> dict:
+        bank, ifsc = rng.choice(BANKS)
+        return {
+            "BankName": bank,
+            "AccountNumber": f"{rng.randint(10**10, 10**12 - 1)}",
+            "IFSCCode": f"{ifsc}0{rng.randint(0, 999_999):06d}",
+            "Branch": rng.choice(STREETS),
+        }
+
+    # ------------------------------------------------------------
+    # Pincodes: N cells per city scattered over ~15 km, nearest neighbours precomputed
+    # ------------------------------------------------------------
+    def _load_pincodes(self, conn: sqlite3.Connection, scale: Scale) -> Dict[str, int]:
+        rng = _rng(self.seed, "pincode")
+        centroids, points = [], {}
+        self._pincodes = []
+        for city, state, lat, lon, prefix in CITIES:
+            cells = []
+            for number in rng.sample(range(1, 1000), scale.pincodes_per_city):
+                pincode = f"{prefix}{number:03d}"
+                point = (round(lat + rng.uniform(-15, 15) / 111.0, 6), round(lon + rng.uniform(-15, 15) / 111.0, 6))
+                cells.append((pincode, *point))
+                points[pincode] = point
+                centroids.append({
+                    "Pincode": pincode, "District": city, "State": state,
+                    "Latitude": point[0], "Longitude": point[1],
+                })
+            self._pincodes.append(cells)
+
+        neighbours = (
+            {"Pincode": p, "NeighbourPincode": n, "Rank": rank, "DistanceKm": km}
+            for p, n, rank, km in TableCreator._nearest_pincodes(points, 20)
+        )
+        return {
+            "PincodeCentroid": self._load(conn, PincodeCentroid, centroids),
+            "PincodeNeighbour": self._load(conn, PincodeNeighbour, neighbours),
+        }
+
+    # ------------------------------------------------------------
+    # People
+    # ------------------------------------------------------------
+    def _customers(self, count: int) -> Iterator[dict]:
+        rng = _rng(self.seed, "customer")
+        for customer_id in range(1, count + 1):
+            point = self.point(rng)
+            yield {
+                "CustomerId": customer_id,
+                "FullName": self.person(rng),
+                "DateOfBirth": (date(1950, 1, 1) + timedelta(days=rng.randint(0, 20000))).isoformat(),
+                "Gender": rng.choice(("Male", "Female")),
+                "Email": f"customer{customer_id}@example.com",
+                "PasswordHash": self.password_hash,
+                "PhoneNumber": self.phone(rng),
+                "AddressLine1": self.address(rng),
+                "City": point.city,
+                "State": point.state,
+                "Country": "India",
+                "PostalCode": point.pincode,
+                "Latitude": point.latitude,
+                "Longitude": point.longitude,
+                **self._bank(rng),
+            }
+
+    def _retailers(self, count: int) -> Iterator[dict]:
+        rng = _rng(self.seed, "retailer")
+        for retailer_id in range(1, count + 1):
+            point = self.point(rng)
+            shop = f"{rng.choice(LAST_NAMES)} Medicals {point.city}"
+            self._retailer_names.append(shop)
+            yield {
+                "RetailerId": retailer_id,
+                "ShopName": shop,
+                "OwnerName": self.person(rng),
+                "GSTNumber": f"{rng.randint(1, 37):02d}ABCDE{rng.randint(1000, 9999)}F1Z{rng.randint(1, 9)}",
+                "LicenseNumber": f"DL-{rng.randint(100000, 999999)}",
+                "PhoneNumber": self.phone(rng),
+                "Email": f"retailer{retailer_id}@example.com",
+                "PasswordHash": self.password_hash,
+                "AddressLine1": self.address(rng),
+                "City": point.city,
+                "State": point.state,
+                "Country": "India",
+                "PostalCode": point.pincode,
+                "Latitude": point.latitude,
+                "Longitude": point.longitude,
+                **self._bank(rng),
+            }
+
+    # ------------------------------------------------------------
+    # Catalog
+    # ------------------------------------------------------------
+    def _load_catalog(self, conn: sqlite3.Connection, scale: Scale) -> Dict[str, int]:
+        types, categories = [], []
+        for type_id, (medical_type, names) in enumerate(MEDICAL_TYPES.items(), start=1):
+            types.append({"MedicalTypeId": type_id, "MedicalType": medical_type})
+            for name in names:
+                categories.append({
+                    "MedicineCategoryId": len(categories) + 1, "MedicalTypeId": type_id, "Category": name,
+                })
+        return {
+            "MedicalType": self._load(conn, MedicalType, types),
+            "MedicineCategory": self._load(conn, MedicineCategory, categories),
+            "Medicine": self._load(conn, Medicine, self._medicines(scale.medicines, categories)),
+            "MedicineInfo": self._load(conn, MedicineInfo, self._medicine_infos(scale.medicine_info_share)),
+        }
+
+    def _medicines(self, count: int, categories: List[dict]) -> Iterator[dict]:
+        rng = _rng(self.seed, "medicine")
+        for medicine_id in range(1, count + 1):
+            category = rng.choice(categories)
+            molecule = rng.choice(MOLECULES)
+            brand = f"{molecule[:4].title()}{rng.choice(('cip', 'zen', 'max', 'vit', 'nol', 'fen'))}-{medicine_id}"
+            price = round(rng.lognormvariate(4.2, 0.8), 2)   # median ~ Rs 65
+            self._medicine_prices.append((medicine_id, brand, price))
+            yield {
+                "MedicineId": medicine_id,
+                "MedicalTypeId": category["MedicalTypeId"],
+                "MedicineCategoryId": category["MedicineCategoryId"],
+                "Name": brand,
+                "GenericName": molecule,
+                "DosageForm": rng.choice(FORMS),
+                "Strength": rng.choice(STRENGTHS),
+                "Manufacturer": rng.choice(MANUFACTURERS),
+                "PrescriptionRequired": rng.random() < 0.35,
+                "Size": rng.choice((10, 15, 30, 60, 100)),
+                "UnitPrice": price,
+            }
+
+    def _medicine_infos(self, share: float) -> Iterator[dict]:
+        rng = _rng(self.seed, "medicine-info")
+        info_id = 0
+        for medicine_id, name, _ in self._medicine_prices:
+            if rng.random() >= share:
+                continue
+            info_id += 1
+            alternatives = rng.sample(self._medicine_prices, min(2, len(self._medicine_prices)))
+            yield {
+                "MedicineInfoId": info_id,
+                "MedicineId": medicine_id,
+                "QuickFacts": f"{name} is usually taken {rng.choice(('once', 'twice', 'three times'))} a day.",
+                "AlternateMedicines": ", ".join(a[1] for a in alternatives),
+                "SideEffects": rng.choice(("Nausea, headache", "Dizziness", "Stomach upset", "Drowsiness")),
+                "HowWorks": "Acts on the underlying cause and relieves symptoms.",
+                "Uses": rng.choice(("Fever and pain", "Bacterial infections", "Blood sugar control", "Allergy relief")),
+                "Precautions": "Consult your doctor if you are pregnant or breastfeeding.",
+                "GeneralGuide": "Take with water after food unless advised otherwise.",
+            }
+
+    # ------------------------------------------------------------
+    # Pharmacies
+    # ------------------------------------------------------------
+    def _pharmacies(self, count: int) -> Iterator[dict]:
+        rng = _rng(self.seed, "pharmacy")
+        for pharmacy_id in range(1, count + 1):
+            point = self.point(rng)
+            yield {
+                "PharmacyId": pharmacy_id,
+                "Name": f"{rng.choice(LAST_NAMES)} {rng.choice(('Pharmacy', 'Chemists', 'Medical Store', 'Drug House'))}",
+                "Address": f"{self.address(rng)}, {point.city} {point.pincode}",
+                "GPSLocation": f"{point.latitude} {point.longitude}",
+                "Latitude": point.latitude,
+                "Longitude": point.longitude,
+                "Pincode": point.pincode,
+                "Contact": self.phone(rng),
+                "Email": f"pharmacy{pharmacy_id}@example.com",
+            }
+
+    # ------------------------------------------------------------
+    # Carts and orders
+    # ------------------------------------------------------------
+    def _load_carts(self, conn: sqlite3.Connection, scale: Scale) -> Dict[str, int]:
+        rng = _rng(self.seed, "cart")
+        carts, items = [], []
+        for customer_id in range(1, scale.customers + 1):
+            if rng.random() >= scale.cart_share or not self._medicine_prices:
+                continue
+            cart_id = len(carts) + 1
+            carts.append({"CartId": cart_id, "CustomerId": customer_id, "CreatedAt": _dt(self.moment(rng, 30))})
+            for medicine_id, _, price in rng.sample(self._medicine_prices, min(rng.randint(1, 5), len(self._medicine_prices))):
+                # Some stored prices are stale, like real carts after a price change
+                stored = price if rng.random() < 0.8 else round(price * rng.uniform(0.9, 1.1), 2)
+                items.append({
+                    "CartItemId": len(items) + 1, "CartId": cart_id, "MedicineId": medicine_id,
+                    "Quantity": rng.randint(1, 3), "StoredPrice": stored,
+                })
+        return {"Cart": self._load(conn, Cart, carts), "CartItem": self._load(conn, CartItem, items)}
+
+    def _load_orders(self, conn: sqlite3.Connection, scale: Scale) -> Dict[str, int]:
+        if not (scale.customers and scale.retailers and self._medicine_prices):
+            return {"Orders": 0, "OrderItem": 0, "OrderStatusCounter": 0, "CustomerNotification": 0, "Prescription": 0}
+        rng = _rng(self.seed, "order")
+        # Separate stream, so notifications and prescriptions never change the orders themselves
+        extra = _rng(self.seed, "order-extra")
+        states, weights = ORDER_STATES, [s[3] for s in ORDER_STATES]
+        counters: Counter = Counter()
+        items: List[dict] = []
+        notifications: List[dict] = []
+        prescriptions: List[dict] = []
+        prescription_ids = itertools.count(1)
+
+        def orders() -> Iterator[dict]:
+            for order_id in range(1, scale.orders + 1):
+                customer_id = rng.randint(1, scale.customers)
+                retailer_id = rng.randint(1, scale.retailers)
+                status, delivery, payment, _ = rng.choices(states, weights=weights)[0]
+                ordered_at = self.moment(rng)
+                total = 0.0
+                for medicine_id, name, price in rng.sample(
+                    self._medicine_prices, min(rng.randint(1, scale.max_items_per_order), len(self._medicine_prices))
+                ):
+                    quantity = rng.randint(1, 4)
+                    line_total = round(price * quantity, 2)
+                    total += line_total
+                    items.append({
+                        "OrderId": order_id, "CustomerId": customer_id, "RetailerId": retailer_id,
+                        "MedicineId": medicine_id, "MedicineName": name, "Quantity": quantity,
+                        "Price": price, "TotalAmount": line_total,
+                    })
+                counters[("Customer", customer_id, status)] += 1
+                counters[("Retailer", retailer_id, status)] += 1
+                updated_at = ordered_at + timedelta(hours=rng.randint(0, 96))
+                order_no = f"ORD-{self.seed}-{order_id:09d}"
+                notifications.append({
+                    "NotificationId": order_id,
+                    "CustomerId": customer_id,
+                    "Title": f"Order {status}",
+                    "Message": f"Your order {order_no} is {status.lower()}.",
+                    "Type": "Order",
+                    "IsRead": extra.random() < 0.7,
+                    "Date": _dt(updated_at),
+                })
+                if extra.random() < scale.prescription_share:
+                    prescriptions.append({
+                        "PrescriptionId": next(prescription_ids),
+                        "CustomerId": customer_id,
+                        "OrderId": order_id,
+                        "DoctorName": f"Dr. {self.person(extra)}",
+                        "DocumentUrl": f"/uploads/prescriptions/{order_no}.jpg",
+                        "Status": "Completed" if delivery == "Delivered" else "Pending",
+                        "Verified": delivery == "Delivered",
+                        "UploadedAt": _dt(ordered_at),
+                    })
+                yield {
+                    "OrderId": order_id,
+                    "OrderNo": order_no,
+                    "CustomerId": customer_id,
+                    "RetailerId": retailer_id,
+                    "RetailerName": self._retailer_names[retailer_id - 1] if self._retailer_names else f"Retailer {retailer_id}",
+                    "OrderDateTime": _dt(ordered_at),
+                    "ExpectedDelivery": _dt(ordered_at + timedelta(days=rng.randint(1, 5))),
+                    "DeliveryMode": rng.choice(("Home Delivery", "Store Pickup")),
+                    "DeliveryStatus": delivery,
+                    "PaymentMode": rng.choice(("UPI", "Card", "COD", "NetBanking")),
+                    "PaymentStatus": payment,
+                    "PrescriptionVerified": rng.random() < 0.5,
+                    "TotalAmount": round(total, 2),
+                    "Status": status,
+                    "CreatedAt": _dt(ordered_at),
+                    "UpdatedAt": _dt(updated_at),
+                }
+
+        loaded: Counter = Counter()
+        chunk: List[dict] = []
+
+        def flush() -> None:
+            loaded["Orders"] += self._load(conn, Order, chunk)
+            for model, rows in ((OrderItem, items), (CustomerNotification, notifications),
+                                (Prescription, prescriptions)):
+                loaded[model.__tablename__] += self._load(conn, model, rows)
+                rows.clear()
+            chunk.clear()
+
+        for order in orders():
+            chunk.append(order)
+            if len(chunk) >= self.chunk_size:
+                flush()
+        flush()
+
+        counter_rows = (
+            {"OwnerType": owner, "OwnerId": owner_id, "Status": status, "Count": n}
+            for (owner, owner_id, status), n in sorted(counters.items())
+        )
+        return {
+            **loaded,
+            "OrderStatusCounter": self._load(conn, OrderStatusCounter, counter_rows),
+        }
+
+    # ------------------------------------------------------------
+    # Labs and lab appointments
+    # ------------------------------------------------------------
+    def _load_labs(self, conn: sqlite3.Connection, scale: Scale) -> Dict[str, int]:
+        rng = _rng(self.seed, "lab")
+        labs, tests = [], []
+        catalog: Dict[int, List[LabTest]] = {}
+        for lab_id in range(1, scale.labs + 1):
+            point = self.point(rng)
+            created_at = _dt(self.moment(rng, 720))
+            labs.append({
+                "LabId": lab_id,
+                "Name": f"{rng.choice(LAST_NAMES)} {rng.choice(('Diagnostics', 'Pathology Lab', 'Labs', 'Health Checkup Centre'))}",
+                "Contact": self.phone(rng),
+                "Email": f"lab{lab_id}@example.com",
+                "Timings": "07:00 AM - 07:00 PM",
+                "Reviews": f"{rng.uniform(3.0, 5.0):.1f}",
+                "AddressLine1": self.address(rng),
+                "City": point.city,
+                "State": point.state,
+                "Country": "India",
+                "PostalCode": point.pincode,
+                "Latitude": point.latitude,
+                "Longitude": point.longitude,
+                "CreatedAt": created_at,
+                "UpdatedAt": created_at,
+            })
+            catalog[lab_id] = []
+            for name, category, price, report_time, preparation in rng.sample(LAB_TESTS, rng.randint(4, len(LAB_TESTS))):
+                test = LabTest(len(tests) + 1, name, float(round(price * rng.uniform(0.8, 1.3))), rng.choice((0.0, 0.0, 5.0)))
+                catalog[lab_id].append(test)
+                tests.append({
+                    **test._asdict(),
+                    "LabId": lab_id,
+                    "Preparation": preparation,
+                    "Category": category,
+                    "EstimatedReportTime": report_time,
+                    "CreatedAt": created_at,
+                    "UpdatedAt": created_at,
+                })
+        counts = {"Lab": self._load(conn, Lab, labs), "Test": self._load(conn, Test, tests)}
+
+        appointments, lines, taken = [], [], set()
+        rng = _rng(self.seed, "lab-appointment")
+        for appointment_id in range(1, (scale.lab_appointments if labs else 0) + 1):
+            lab_id = rng.randint(1, scale.labs)
+            # Past and upcoming bookings around the anchor
+            day = (self.anchor + timedelta(days=rng.randint(-180, 30))).date()
+            slot = rng.choice(LAB_SLOTS)
+            status = rng.choices(("Confirmed", "Completed", "Cancelled"), weights=(3, 6, 1))[0]
+            slot_key = None if is_cancelled(status) else lab_slot_key(lab_id, day, slot)
+            if slot_key in taken:
+                # One booking per lab slot, as the unique SlotKey index enforces
+                status, slot_key = "Cancelled", None
+            taken.add(slot_key)
+            selected = rng.sample(catalog[lab_id], rng.randint(1, min(3, len(catalog[lab_id]))))
+            priced = price_tests(selected)
+            point = self.point(rng)
+            booked_at = _dt(datetime.combine(day, datetime.min.time()) - timedelta(hours=rng.randint(2, 240)))
+            appointments.append({
+                "AppointmentId": appointment_id,
+                "AppointmentNo": f"LAB-{self.seed}-{appointment_id:09d}",
+                "LabId": lab_id,
+                "PatientName": self.person(rng),
+                "PatientAge": rng.randint(1, 90),
+                "PatientGender": rng.choice(("Male", "Female")),
+                "ContactNumber": self.phone(rng),
+                "Address": f"{self.address(rng)}, {point.city} {point.pincode}",
+                "GPSLocation": f"{point.latitude} {point.longitude}",
+                "Latitude": point.latitude,
+                "Longitude": point.longitude,
+                "AppointmentDate": day.isoformat(),
+                "TimeSlot": slot,
+                "SelectedTests": format_selected_tests([t.TestId for t in selected]),
+                "SampleCollectionMode": rng.choice(("Home Collection", "Lab Visit")),
+                "TotalAmount": priced["TotalAmount"],
+                "TotalGst": priced["TotalGst"],
+                "NetPayable": priced["NetPayable"],
+                "PaymentMethod": rng.choice(("UPI", "Card", "Cash")),
+                "PaymentStatus": "Refunded" if status == "Cancelled" else rng.choice(("Paid", "Paid", "Pending")),
+                "BookingStatus": status,
+                "SlotKey": slot_key,
+                "CreatedAt": booked_at,
+                "UpdatedAt": booked_at,
+            })
+            for line in priced["Tests"]:
+                lines.append({
+                    "AppointmentTestId": len(lines) + 1, "AppointmentId": appointment_id,
+                    **line, "CreatedAt": booked_at,
+                })
+        counts["Appointment"] = self._load(conn, Appointment, appointments)
+        counts["AppointmentTest"] = self._load(conn, AppointmentTest, lines)
+        return counts
+
+    # ------------------------------------------------------------
+    # Doctors and doctor appointments
+    # ------------------------------------------------------------
+    def _load_doctors(self, conn: sqlite3.Connection, scale: Scale) -> Dict[str, int]:
+        rng = _rng(self.seed, "doctor")
+        doctors, schedules = [], {}
+        for doctor_id in range(1, scale.doctors + 1):
+            point = self.point(rng)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            days, hours = rng.choice(DOCTOR_HOURS)
+            schedules[doctor_id] = (parse_days(days), parse_ranges(hours))
+            created_at = _dt(self.moment(rng, 720))
+            doctors.append({
+                "DoctorId": doctor_id,
+                "FirstName": first,
+                "LastName": last,
+                "Gender": rng.choice(("Male", "Female")),
+                "DateOfBirth": (date(1955, 1, 1) + timedelta(days=rng.randint(0, 14000))).isoformat(),
+                "Email": f"doctor{doctor_id}@example.com",
+                "MobileNumber": self.phone(rng),
+                "Specialization": rng.choice(SPECIALIZATIONS),
+                "Qualifications": rng.choice(("MBBS", "MBBS, MD", "MBBS, MS", "BDS", "MBBS, DNB")),
+                "ExperienceYears": rng.randint(1, 35),
+                "LicenseNumber": f"MCI-{rng.randint(10000, 99999)}",
+                "ClinicName": f"{last} Clinic",
+                "ClinicAddress": self.address(rng),
+                "City": point.city,
+                "State": point.state,
+                "Country": "India",
+                "PostalCode": point.pincode,
+                "ConsultationFee": float(rng.choice((300, 400, 500, 600, 800, 1000))),
+                "AvailableDays": days,
+                "AvailableTime": hours,
+                "SlotDurationMinutes": 15,
+                "Reviews": f"{rng.uniform(3.0, 5.0):.1f}",
+                "Status": "Active" if rng.random() < 0.95 else "Inactive",
+                "CreatedAt": created_at,
+                "UpdatedAt": created_at,
+            })
+        counts = {"Doctor": self._load(conn, Doctor, doctors)}
+
+        appointments, taken = [], set()
+        rng = _rng(self.seed, "doctor-appointment")
+        for appointment_id in range(1, (scale.doctor_appointments if doctors else 0) + 1):
+            doctor_id = rng.randint(1, scale.doctors)
+            weekdays, ranges = schedules[doctor_id]
+            # A working day and a 15 minute slot inside the doctor's hours; a few tries
+            # to find a free one, then the booking is recorded as cancelled
+            for _ in range(5):
+                day = (self.anchor + timedelta(days=rng.randint(-180, 30))).date()
+                while day.weekday() not in weekdays:
+                    day += timedelta(days=1)
+                start, end = rng.choice(ranges)
+                minute = start + 15 * rng.randrange(max((end - start) // 15, 1))
+                time_text = f"{minute // 60:02d}:{minute % 60:02d}"
+                slot_key = doctor_slot_key(doctor_id, day, time_text, slot_minutes=15)
+                if slot_key not in taken:
+                    break
+            status = rng.choices(("Confirmed", "Completed", "Cancelled"), weights=(3, 6, 1))[0]
+            if is_cancelled(status) or slot_key in taken:
+                status, slot_key = "Cancelled", None
+            taken.add(slot_key)
+            booked_at = _dt(datetime.combine(day, datetime.min.time()) - timedelta(hours=rng.randint(2, 240)))
+            appointments.append({
+                "AppointmentId": appointment_id,
+                "DoctorId": doctor_id,
+                "PatientName": self.person(rng),
+                "MobileNumber": self.phone(rng),
+                "Age": rng.randint(1, 90),
+                "Gender": rng.choice(("Male", "Female")),
+                "AppointmentMode": rng.choices(("Clinic", "Video", "Home"), weights=(6, 3, 1))[0],
+                "AppointmentDate": day.isoformat(),
+                "AppointmentSlot": "Morning" if minute < 12 * 60 else "Evening",
+                "AppointmentTime": time_text,
+                "Status": status,
+                "PaymentStatus": "Refunded" if status == "Cancelled" else rng.choice(("Paid", "Pending")),
+                "PaymentMethod": rng.choice(("UPI", "Card", "Cash")),
+                "ReasonForVisit": rng.choice(("Fever", "Follow-up", "Routine checkup", "Skin rash", "Back pain", "Cough")),
+                "SlotKey": slot_key,
+                "CreatedAt": booked_at,
+                "UpdatedAt": booked_at,
+            })
+        counts["DoctorAppointment"] = self._load(conn, DoctorAppointment, appointments)
+        return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--db", default="./bench.db", help="SQLite file to create")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=date(2025, 1, 1),
+                        help="dates are spread over the year before this day (YYYY-MM-DD)")
+    parser.add_argument("--force", action="store_true", help="replace --db if it exists")
+    for field, kind in Scale.__annotations__.items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=kind, dest=field,
+                            help=f"override the preset's {field}")
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        if not args.force:
+            parser.error(f"{args.db} exists; pass --force to replace it")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+
+    overrides = {f: getattr(args, f) for f in Scale._fields if getattr(args, f, None) is not None}
+    scale = SCALES[args.scale]._replace(**overrides)
+    started = time.perf_counter()
+    counts = DataGenerator(f"sqlite+aiosqlite:///{args.db}", seed=args.seed, anchor=args.anchor).generate(scale)
+    print(json.dumps({
+        "Db": args.db,
+        "Seed": args.seed,
+        "Anchor": args.anchor.isoformat(),
+        "Scale": scale._asdict(),
+        "Rows": counts,
+        "Seconds": round(time.perf_counter() - started, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
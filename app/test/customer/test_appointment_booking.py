@@ -0,0 +1,145 @@
+import asyncio
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.api.customer.doctor_api import DoctorAppointmentAPI
+from app.crud.customer.doctor_manager import DoctorAppointmentManager
+from app.crud.customer.lap_manager import AppointmentManager
+from app.exceptions.custom_exceptions import SlotAlreadyBookedException
+from app.models.customer.doctor_model import Doctor, DoctorAppointment
+from app.models.customer.lap_model import Appointment
+from app.schemas.customer.doctor_schema import DoctorAppointmentCreate, DoctorAppointmentUpdate
+from app.schemas.customer.lap_schema import AppointmentCreate
+
+PARALLEL_BOOKINGS = 20
+BOOKING_DATE = date(2030, 1, 7)
+
+
+@pytest.fixture
+def db(sqlite_db):
+    engine = sqlite_db(Doctor, DoctorAppointment, Appointment, name="booking.db")
+    with Session(engine) as session:
+        session.add(Doctor(DoctorId=1, FirstName="Asha", LastName="Rao", SlotDurationMinutes=15))
+        session.commit()
+    return engine
+
+
+async def _book_all(make_manager, payloads):
+    # One manager per booking, like requests landing on separate workers
+    async def book(payload):
+        try:
+            return await make_manager().create_appointment(payload)
+        except SlotAlreadyBookedException:
+            return None
+
+    return await asyncio.gather(*(book(p) for p in payloads))
+
+
+def test_parallel_doctor_bookings_for_same_slot_have_one_winner(db, schema):
+    # 10:00 and 10:05 fall in the same 15 minute slot
+    payloads = [
+        schema(DoctorAppointmentCreate, DoctorId=1, PatientName=f"Patient {i}",
+                AppointmentDate=BOOKING_DATE, AppointmentTime="10:00 AM" if i % 2 else "10:05")
+        for i in range(PARALLEL_BOOKINGS)
+    ]
+    results = asyncio.run(_book_all(lambda: DoctorAppointmentManager("sqlite"), payloads))
+
+    assert len([r for r in results if r and r["success"]]) == 1
+    assert results.count(None) == PARALLEL_BOOKINGS - 1
+
+
+def test_cancelled_doctor_appointment_frees_the_slot(db, schema):
+    manager = DoctorAppointmentManager("sqlite")
+    payload = schema(DoctorAppointmentCreate, DoctorId=1, AppointmentDate=BOOKING_DATE,
+                      AppointmentTime="11:30 AM")
+    first = asyncio.run(manager.create_appointment(payload))
+
+    with pytest.raises(SlotAlreadyBookedException):
+        asyncio.run(manager.create_appointment(payload))
+
+    asyncio.run(manager.update_appointment(
+        first["Doctor Appointment Id"], DoctorAppointmentUpdate.model_construct(Status="Cancelled")
+    ))
+    assert asyncio.run(manager.create_appointment(payload))["success"]
+
+
+def test_parallel_lab_bookings_for_same_slot_have_one_winner(db, schema):
+    payloads = [
+        schema(AppointmentCreate, LabId=3, PatientName=f"Patient {i}",
+                AppointmentDate=BOOKING_DATE, TimeSlot="7:00 AM - 8:00 AM" if i % 2 else "7:00AM-8:00AM")
+        for i in range(PARALLEL_BOOKINGS)
+    ]
+    results = asyncio.run(_book_all(lambda: AppointmentManager("sqlite"), payloads))
+
+    assert len([r for r in results if r and r["success"]]) == 1
+    assert results.count(None) == PARALLEL_BOOKINGS - 1
+
+
+def test_parallel_bookings_through_one_shared_manager(db, schema):
+    # The API classes hold one manager for every request
+    manager = DoctorAppointmentManager("sqlite")
+    payloads = [
+        schema(DoctorAppointmentCreate, DoctorId=1, PatientName=f"Patient {i}",
+               AppointmentDate=BOOKING_DATE, AppointmentTime=f"{9 + i % 4}:00 AM")
+        for i in range(PARALLEL_BOOKINGS)
+    ]
+    results = asyncio.run(_book_all(lambda: manager, payloads))
+
+    assert len([r for r in results if r and r["success"]]) == 4
+    assert results.count(None) == PARALLEL_BOOKINGS - 4
+
+
+def test_other_integrity_errors_are_not_reported_as_booked_slots(db, schema):
+    manager = DoctorAppointmentManager("sqlite")
+    created = asyncio.run(manager.create_appointment(
+        schema(DoctorAppointmentCreate, DoctorId=1, AppointmentDate=BOOKING_DATE, AppointmentTime="9:00 AM")
+    ))
+
+    # DoctorId is NOT NULL; only the SlotKey index means the slot is taken
+    with pytest.raises(IntegrityError):
+        asyncio.run(manager.update_appointment(
+            created["Doctor Appointment Id"], DoctorAppointmentUpdate.model_construct(DoctorId=None)
+        ))
+
+
+def test_booked_slot_is_a_conflict_over_http(db, schema):
+    app = FastAPI()
+    app.include_router(DoctorAppointmentAPI().router)
+    client = TestClient(app)
+    body = schema(DoctorAppointmentCreate, DoctorId=1, AppointmentDate=BOOKING_DATE,
+                  AppointmentTime="4:00 PM").model_dump(mode="json")
+
+    assert client.post("/doctor-appointments", json=body).status_code == 200
+    response = client.post("/doctor-appointments", json=body)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Slot already booked"
+
+
+def test_unparseable_date_or_time_is_rejected_instead_of_booked_without_a_slot(db, schema):
+    app = FastAPI()
+    app.include_router(DoctorAppointmentAPI().router)
+    client = TestClient(app)
+
+    def body(**values):
+        return schema(DoctorAppointmentCreate, DoctorId=1, **values).model_dump(mode="json")
+
+    for bad in (body(AppointmentDate=BOOKING_DATE, AppointmentTime="after lunch"),
+                body(AppointmentTime="10:00 AM")):
+        assert client.post("/doctor-appointments", json=bad).status_code == 400
+    created = client.post("/doctor-appointments", json=body(AppointmentDate=BOOKING_DATE, AppointmentTime="10:00 AM"))
+    appointment_id = created.json()["Doctor Appointment Id"]
+
+    moved = client.put(f"/doctor-appointments/{appointment_id}",
+                       json=body(AppointmentDate=BOOKING_DATE, AppointmentTime="soon"))
+    assert moved.status_code == 400
+    # A cancellation frees the slot whatever the time says
+    cancelled = client.put(f"/doctor-appointments/{appointment_id}",
+                           json=body(AppointmentDate=BOOKING_DATE, AppointmentTime="soon", Status="Cancelled"))
+    assert cancelled.json() == {"success": True}
+    with Session(db) as session:
+        assert session.get(DoctorAppointment, appointment_id).SlotKey is None
@@ -0,0 +1,50 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+
+from app.api.customer.auth_api import AuthAPI
+from app.models.customer.customer_model import Customer
+from app.models.customer.retailer_model import Retailer
+from app.utils.password_hasher import legacy_sha256, password_hasher
+
+
+@pytest.fixture
+def client(sqlite_db, monkeypatch):
+    engine = sqlite_db(Customer, Retailer, name="auth.db")
+    address = {"AddressLine1": "1 Main St", "City": "Chennai", "State": "TN", "Country": "India", "PostalCode": "600001"}
+    with engine.begin() as conn:
+        conn.execute(insert(Retailer).values(Email="shop@example.com", PasswordHash=legacy_sha256("shop-pass"), **address))
+        conn.execute(insert(Customer).values(Email="cust@example.com", PasswordHash="plain-pass", **address))
+    monkeypatch.setattr(password_hasher, "rounds", 4)
+
+    app = FastAPI()
+    app.include_router(AuthAPI().router)
+    return TestClient(app), engine
+
+
+def test_login_upgrades_legacy_hash_and_token_authenticates(client):
+    client, engine = client
+    response = client.post("/auth/retailers/login", json={"Email": "shop@example.com", "Password": "shop-pass"})
+    assert response.status_code == 200
+    token = response.json()["AccessToken"]
+
+    with engine.connect() as conn:
+        stored = conn.execute(select(Retailer.PasswordHash)).scalar_one()
+    assert stored.startswith("$2b$04$")
+
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/auth/me", headers=headers).json()["UserType"] == "retailer"
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+    # The upgraded hash keeps working
+    assert client.post("/auth/retailers/login", json={"Email": "shop@example.com", "Password": "shop-pass"}).status_code == 200
+
+
+def test_bad_credentials_are_rejected(client):
+    client, _ = client
+    assert client.post("/auth/customers/login", json={"Email": "cust@example.com", "Password": "nope"}).status_code == 401
+    assert client.post("/auth/customers/login", json={"Email": "nobody@example.com", "Password": "x"}).status_code == 401
+    assert client.post("/auth/customers/login", json={"Email": "cust@example.com", "Password": "plain-pass"}).status_code == 200
+    assert client.get("/auth/me").status_code == 401
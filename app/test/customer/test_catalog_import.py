@@ -0,0 +1,130 @@
+import asyncio
+import io
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.customer.catalog_import_api import CatalogImportAPI
+from app.config import settings
+from app.crud.customer.catalog_import_manager import CatalogImportManager
+from app.models.customer.medicine_model import MedicalType, MedicineCategory, Medicine, MedicineInfo
+
+
+@pytest.fixture
+def engine(sqlite_db, monkeypatch):
+    monkeypatch.setattr(settings, "import_chunk_size", 3)
+    return sqlite_db(MedicalType, MedicineCategory, Medicine, MedicineInfo, name="catalog.db")
+
+
+def _import(entity, content, format="csv"):
+    manager = CatalogImportManager("sqlite")
+    return asyncio.run(manager.import_file(entity, io.BytesIO(content.encode("utf-8")), format))
+
+
+def _rows(engine, model):
+    with Session(engine) as session:
+        return session.execute(select(model)).scalars().all()
+
+
+def test_names_resolve_to_ids_and_reimport_updates(engine):
+    _import("medical-types", "MedicalType\nAllopathy\nAyurveda\n")
+    _import("medicine-categories", "MedicalType,Category\nAllopathy,Pain Relief\nAyurveda,Pain Relief\n")
+
+    csv_text = (
+        "Name,Strength,Manufacturer,UnitPrice,MedicalType,Category\n"
+        "Paracetamol,500mg,Cipla,12.5,Allopathy,Pain Relief\n"
+        "Paracetamol,650mg,Cipla,15,allopathy,pain relief\n"
+        "Ibuprofen,200mg,Sun,20,Allopathy,Pain Relief\n"
+        "Aspirin,75mg,Bayer,8,Allopathy,Pain Relief\n"
+        "Paracetamol,500mg,Cipla,13,Allopathy,Pain Relief\n"   # same SKU in a later chunk -> update
+    )
+    report = _import("medicines", csv_text)
+    assert (report["Inserted"], report["Updated"], report["Failed"]) == (4, 1, 0)
+
+    medicines = _rows(engine, Medicine)
+    allopathy_pain = [c for c in _rows(engine, MedicineCategory) if c.MedicalTypeId == 1][0]
+    assert len(medicines) == 4
+    assert {m.MedicineCategoryId for m in medicines} == {allopathy_pain.MedicineCategoryId}
+    assert [m.UnitPrice for m in medicines if m.Strength == "500mg"] == [13.0]
+
+    # Only the columns present in the file change on update
+    report = _import("medicines", json.dumps({"Name": "Aspirin", "Strength": "75mg",
+                                              "Manufacturer": "Bayer", "UnitPrice": 9}) + "\n", "ndjson")
+    assert report["Updated"] == 1
+    aspirin = [m for m in _rows(engine, Medicine) if m.Name == "Aspirin"][0]
+    assert (aspirin.UnitPrice, aspirin.MedicineCategoryId) == (9.0, allopathy_pain.MedicineCategoryId)
+
+
+def test_invalid_rows_are_reported_and_skipped(engine):
+    _import("medical-types", "MedicalType\nAllopathy\n")
+    csv_text = (
+        "Name,UnitPrice,MedicalType,Category\n"
+        "Good,10,Allopathy,\n"
+        ",10,Allopathy,\n"
+        "Cheap,-1,Allopathy,\n"
+        "Mystery,5,Homeopathy,\n"
+        "Lost,5,,Vitamins\n"
+    )
+    report = _import("medicines", csv_text)
+
+    assert (report["Rows"], report["Inserted"], report["Failed"]) == (5, 1, 4)
+    assert [e["Row"] for e in report["Errors"]] == [3, 4, 5, 6]
+    assert "Unknown MedicalType 'Homeopathy'" in report["Errors"][2]["Errors"]
+    assert "Unknown Category 'Vitamins'" in report["Errors"][3]["Errors"]
+
+    report = _import("medicine-infos", '{"MedicineName": "good", "Uses": "Fever"}\nnot json\n{"MedicineId": 99}\n', "ndjson")
+    assert (report["Inserted"], report["Failed"]) == (1, 2)
+    assert _rows(engine, MedicineInfo)[0].Uses == "Fever"
+
+
+def test_reimport_moves_a_medicine_to_the_category_named_in_the_file(engine):
+    _import("medical-types", "MedicalType\nAllopathy\n")
+    _import("medicine-categories", "MedicalType,Category\nAllopathy,Pain\nAllopathy,Fever\n")
+    header = "Name,Strength,Manufacturer,UnitPrice,MedicalType,Category\n"
+    _import("medicines", header + "Para,500,Cipla,1,Allopathy,Pain\n")
+
+    report = _import("medicines", header + "Para,500,Cipla,2,Allopathy,Fever\n")
+
+    # The resolved id was dropped as "not in the file": Updated: 1, still Pain
+    assert report["Updated"] == 1
+    fever = [c.MedicineCategoryId for c in _rows(engine, MedicineCategory) if c.Category == "Fever"]
+    assert [(m.UnitPrice, m.MedicineCategoryId) for m in _rows(engine, Medicine)] == [(2.0, fever[0])]
+
+
+def test_parallel_imports_on_one_manager_each_write_their_rows(engine):
+    _import("medical-types", "MedicalType\nAllopathy\n")
+    manager = CatalogImportManager("sqlite")
+    files = [
+        "Name,UnitPrice,MedicalType\n" + "".join(f"Batch{b}-{i},{i},Allopathy\n" for i in range(10))
+        for b in range(4)
+    ]
+
+    async def run():
+        return await asyncio.gather(*[
+            manager.import_file("medicines", io.BytesIO(content.encode("utf-8")), "csv") for content in files
+        ])
+
+    # Imports used to share the manager's session; two reported success with every row failed
+    reports = asyncio.run(run())
+
+    assert [(r["success"], r["Inserted"], r["Failed"]) for r in reports] == [(True, 10, 0)] * 4
+    assert len(_rows(engine, Medicine)) == 40
+
+
+def test_catalog_import_needs_the_admin_token(engine, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    app = FastAPI()
+    app.include_router(CatalogImportAPI().router)
+    client = TestClient(app)
+    upload = {"file": ("types.csv", b"MedicalType\nAllopathy\n", "text/csv")}
+
+    assert client.post("/catalog/import/medical-types", files=upload).status_code == 403
+    assert client.post("/catalog/import/medical-types", files=upload,
+                       headers={"X-Admin-Token": "wrong"}).status_code == 403
+    response = client.post("/catalog/import/medical-types", files=upload, headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200 and response.json()["success"]
+    assert [t.MedicalType for t in _rows(engine, MedicalType)] == ["Allopathy"]
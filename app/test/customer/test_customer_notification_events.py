@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.customer.customer_notification_manager import CustomerNotificationSubscriber
+from app.crud.customer.order_manager import OrderManager
+from app.models.customer.customer_notification_model import CustomerNotification
+from app.models.customer.order_model import Order, OrderStatusCounter
+from app.utils import event_bus as event_bus_module
+from app.utils.event_bus import EventBus, NOTIFICATION_CREATED, ORDER_STATUS_CHANGED
+
+
+@pytest.fixture
+def db(sqlite_db, monkeypatch):
+    engine = sqlite_db(Order, OrderStatusCounter, CustomerNotification, name="events.db")
+    with Session(engine) as session:
+        session.add(Order(OrderId=1, OrderNo="ORD-1", CustomerId=7, RetailerId=3, RetailerName="City Pharma"))
+        session.commit()
+    bus = EventBus()
+    monkeypatch.setattr(event_bus_module, "event_bus", bus)
+    monkeypatch.setattr("app.crud.customer.order_manager.event_bus", bus)
+    return engine, bus
+
+
+def _notifications(engine):
+    with Session(engine) as session:
+        return session.execute(select(CustomerNotification)).scalars().all()
+
+
+def test_status_change_creates_notification(db):
+    engine, bus = db
+    subscriber = CustomerNotificationSubscriber("sqlite", batch_size=10, flush_seconds=0.01)
+    published = []
+
+    async def record(event):
+        published.append(event.payload)
+
+    async def run():
+        subscriber.register(bus)
+        bus.subscribe(NOTIFICATION_CREATED, record)
+        await OrderManager("sqlite").update_order_status(1, "Shipped")
+        await bus.drain()
+        await subscriber.stop()
+        await bus.stop()
+
+    asyncio.run(run())
+    rows = _notifications(engine)
+    assert [(n.CustomerId, n.Title, n.Message) for n in rows] == [
+        (7, "Order Shipped", "Your order ORD-1 is now Shipped.")
+    ]
+    assert published[0]["NotificationId"] == rows[0].NotificationId
+
+
+def test_notifications_are_written_in_batches(db, monkeypatch):
+    engine, bus = db
+    subscriber = CustomerNotificationSubscriber("sqlite", batch_size=3, flush_seconds=60)
+    flushed = []
+    original_flush = subscriber.flush
+
+    async def counting_flush():
+        count = await original_flush()
+        if count:
+            flushed.append(count)
+        return count
+
+    monkeypatch.setattr(subscriber, "flush", counting_flush)
+
+    async def run():
+        subscriber.register(bus)
+        for i in range(7):
+            bus.publish(ORDER_STATUS_CHANGED, OrderId=i, CustomerId=7, Status="Packed")
+        await bus.drain()
+        await subscriber.stop()
+        await bus.stop()
+
+    asyncio.run(run())
+    assert flushed == [3, 3, 1]
+    assert len(_notifications(engine)) == 7
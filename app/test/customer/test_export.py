@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app.api.customer.export_api import ExportAPI
+from app.config import settings
+from app.models.customer.customer_model import Customer
+from app.models.customer.order_model import Order, OrderItemArchive, OrdersArchive
+
+
+@pytest.fixture
+def client(sqlite_db, monkeypatch):
+    engine = sqlite_db(Customer, Order, OrdersArchive, OrderItemArchive, name="export.db")
+    with engine.begin() as conn:
+        conn.execute(insert(Customer), [
+            {"Email": f"c{i}@example.com", "PasswordHash": "secret-hash", "AddressLine1": "1 Main St",
+             "City": "Chennai", "State": "TN", "Country": "India", "PostalCode": "600001",
+             "AccountNumber": "00112233", "IFSCCode": "SBIN0001", "BankName": "SBI", "PhoneNumber": "98400"}
+            for i in range(2500)
+        ])
+        conn.execute(insert(Order), [
+            {"CustomerId": 1, "RetailerId": 9, "RetailerName": "City Pharma", "Status": "New"},
+            {"CustomerId": 2, "RetailerId": 9, "RetailerName": "City Pharma", "Status": "New"},
+        ])
+        conn.execute(insert(OrdersArchive), [
+            {"OrderId": 100, "CustomerId": 1, "RetailerId": 9, "RetailerName": "City Pharma", "Status": "Delivered"},
+        ])
+    monkeypatch.setattr(settings, "export_batch_size", 100)
+    monkeypatch.setattr(settings, "admin_token", "secret")
+
+    app = FastAPI()
+    app.include_router(ExportAPI().router)
+    return TestClient(app, headers={"X-Admin-Token": "secret"})
+
+
+def test_customers_csv_streams_every_row_without_credentials_or_bank_details(client):
+    response = client.get("/export/customers")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2500
+    for column in ("PasswordHash", "AccountNumber", "IFSCCode", "BankName", "DateOfBirth", "Email", "PhoneNumber"):
+        assert column not in rows[0]
+    for value in ("secret-hash", "00112233", "SBIN0001", "c1@example.com"):
+        assert value not in response.text
+
+    contact = list(csv.DictReader(io.StringIO(client.get("/export/customers?include_contact=true").text)))
+    assert (contact[1]["Email"], contact[1]["PhoneNumber"]) == ("c1@example.com", "98400")
+    assert "AccountNumber" not in contact[0]
+
+
+def test_exports_need_the_admin_token(client):
+    for path in ("/export/customers", "/export/orders", "/export/medicines", "/export/tests"):
+        assert client.get(path, headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+
+def test_orders_ndjson_with_archive_and_filters(client):
+    response = client.get("/export/orders", params={"format": "ndjson", "retailer_id": 9, "include_archived": True})
+    orders = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(o["OrderId"] for o in orders) == [1, 2, 100]
+
+    response = client.get("/export/orders", params={"format": "ndjson", "customer_id": 2})
+    assert [json.loads(line)["OrderId"] for line in response.text.splitlines()] == [2]
+
+    assert client.get("/export/orders", params={"format": "xml"}).status_code == 400
+
+
+def test_orders_export_without_archive_tables_skips_the_archive(sqlite_db, monkeypatch):
+    engine = sqlite_db(Order, name="no-archive.db")
+    with engine.begin() as conn:
+        conn.execute(insert(Order), {"CustomerId": 1, "RetailerId": 9, "RetailerName": "City Pharma"})
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    app = FastAPI()
+    app.include_router(ExportAPI().router)
+    client = TestClient(app, headers={"X-Admin-Token": "secret"})
+
+    response = client.get("/export/orders", params={"format": "ndjson", "include_archived": True})
+
+    assert response.status_code == 200
+    assert [json.loads(line)["OrderId"] for line in response.text.splitlines()] == [1]
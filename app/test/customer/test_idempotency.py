@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.models.customer.idempotency_model import IdempotencyKey
+
+
+@pytest.fixture
+def client(sqlite_db):
+    sqlite_db(IdempotencyKey, name="idempotency.db")
+
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, paths=["/orders", "/appointments"], db_type="sqlite")
+    app.state.writes = []
+
+    @app.post("/orders")
+    async def create_order(payload: dict):
+        app.state.writes.append(payload)
+        if payload.get("fail"):
+            return {"success": False, "message": "Out of stock"}
+        return {"success": True, "OrderId": len(app.state.writes)}
+
+    @app.post("/appointments")
+    async def create_appointment(payload: dict):
+        app.state.writes.append(payload)
+        await asyncio.sleep(payload.get("seconds", 0))
+        if len(app.state.writes) == 1 and payload.get("taken"):
+            raise HTTPException(status_code=409, detail="Slot already booked")
+        return {"success": True, "AppointmentId": len(app.state.writes)}
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_retry_with_same_key_replays_stored_response(client):
+    headers = {"Idempotency-Key": "k-1"}
+    first = client.post("/orders", json={"CustomerId": 1}, headers=headers)
+    retry = client.post("/orders", json={"CustomerId": 1}, headers=headers)
+
+    assert first.json() == retry.json() == {"success": True, "OrderId": 1}
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert len(client.app.state.writes) == 1
+
+
+def test_key_reused_for_different_body_is_rejected(client):
+    client.post("/orders", json={"CustomerId": 1}, headers={"Idempotency-Key": "k-2"})
+    response = client.post("/orders", json={"CustomerId": 2}, headers={"Idempotency-Key": "k-2"})
+
+    assert response.status_code == 422
+    assert len(client.app.state.writes) == 1
+
+
+def test_failed_attempt_releases_key_and_requests_without_key_pass_through(client):
+    headers = {"Idempotency-Key": "k-3"}
+    client.post("/orders", json={"fail": True}, headers=headers)
+    client.post("/orders", json={"fail": True}, headers=headers)
+    client.post("/orders", json={"CustomerId": 1})
+    client.post("/orders", json={"CustomerId": 1})
+
+    assert len(client.app.state.writes) == 4
+
+
+def test_error_statuses_are_not_replayed(client):
+    headers = {"Idempotency-Key": "k-4"}
+    conflict = client.post("/appointments", json={"taken": True}, headers=headers)
+    retry = client.post("/appointments", json={"taken": True}, headers=headers)
+
+    assert conflict.status_code == 409
+    assert retry.json() == {"success": True, "AppointmentId": 2}
+
+
+def test_slow_request_keeps_its_claim_past_the_pending_timeout(client, monkeypatch):
+    monkeypatch.setattr(settings, "idempotency_pending_seconds", 0.3)
+    headers = {"Idempotency-Key": "k-5"}
+
+    async def run():
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            slow = asyncio.create_task(http.post("/appointments", json={"seconds": 1.0}, headers=headers))
+            await asyncio.sleep(0.7)   # well past the 0.3 s pending timeout
+            retry = await http.post("/appointments", json={"seconds": 1.0}, headers=headers)
+            return await slow, retry
+
+    # The retry used to take the expired claim over and book a second time
+    slow, retry = asyncio.run(run())
+
+    assert slow.json() == {"success": True, "AppointmentId": 1}
+    assert retry.status_code == 409
+    assert len(client.app.state.writes) == 1
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.api.customer.lap_api import AppointmentAPI
+from app.crud.customer.lap_manager import AppointmentManager
+from app.models.customer.lap_model import Appointment, AppointmentTest, Lab, Test
+from app.schemas.customer.lap_schema import AppointmentCreate, AppointmentUpdate
+
+
+@pytest.fixture
+def manager(sqlite_db):
+    engine = sqlite_db(Lab, Test, Appointment, AppointmentTest, name="pricing.db")
+    with Session(engine) as session:
+        session.add_all([Lab(LabId=1, Name="City Diagnostics"), Lab(LabId=2, Name="Metro Labs")])
+        session.add_all([
+            Test(TestId=i, LabId=1, Name=f"Test {i}", Price=100 * i, GstPercent=18) for i in range(1, 11)
+        ])
+        session.add(Test(TestId=11, LabId=2, Name="Other lab", Price=50, GstPercent=0))
+        session.commit()
+    return AppointmentManager("sqlite")
+
+
+@pytest.fixture
+def book(manager, schema):
+    def create(selected_tests, **values):
+        payload = schema(AppointmentCreate, LabId=1, AppointmentDate=date(2030, 1, 7),
+                         SelectedTests=selected_tests, **values)
+        return asyncio.run(manager.create_appointment(payload))
+    return create
+
+
+def test_totals_are_computed_server_side(manager, book):
+    result = book("1, 2", TotalAmount=1, NetPayable=1)
+
+    assert (result["TotalAmount"], result["TotalGst"], result["NetPayable"]) == (300.0, 54.0, 354.0)
+    lines = asyncio.run(manager.get_appointment_tests(result["Appointment Id"]))
+    assert sorted((l.TestId, l.NetPrice) for l in lines) == [(1, 118.0), (2, 236.0)]
+
+
+def test_tests_of_another_lab_are_rejected(book):
+    result = book("1,11")
+
+    assert not result["success"]
+    assert "11" in result["message"]
+
+
+def test_pricing_query_count_does_not_grow_with_selection(manager):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        if 'FROM "Test"' in statement:
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        asyncio.run(manager.quote(1, "1"))
+        single = len(statements)
+        asyncio.run(manager.quote(1, ",".join(str(i) for i in range(1, 11))))
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+
+    assert single == 1
+    assert len(statements) == 2
+
+
+def test_changing_selection_replaces_lines(manager, book):
+    appointment_id = book("1,2")["Appointment Id"]
+
+    asyncio.run(manager.update_appointment(
+        appointment_id, AppointmentUpdate.model_construct(SelectedTests="3")
+    ))
+
+    lines = asyncio.run(manager.get_appointment_tests(appointment_id))
+    appointment = asyncio.run(manager.get_appointment_by_id(appointment_id))
+    assert [l.TestId for l in lines] == [3]
+    assert appointment.NetPayable == 354.0
+
+
+def test_concurrent_bookings_quotes_and_lines_over_one_api(manager, schema):
+    app = FastAPI()
+    app.include_router(AppointmentAPI().router)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Pricing awaits reads before the save opens its session
+            bookings = await asyncio.gather(*[
+                client.post("/appointments", json=schema(
+                    AppointmentCreate, LabId=1, AppointmentDate=date(2030, 1, 7),
+                    TimeSlot=f"{7 + i}:00 AM", SelectedTests=f"{1 + i % 10}",
+                ).model_dump(mode="json"))
+                for i in range(12)
+            ])
+            quotes = await asyncio.gather(*[
+                client.get("/appointments/quote", params={"lab_id": 1, "tests": "1,2"}) for _ in range(12)
+            ])
+            lines = await client.get(f"/appointments/{bookings[0].json()['Appointment Id']}/tests")
+            return bookings, quotes, lines
+
+    bookings, quotes, lines = asyncio.run(run())
+
+    assert [r.status_code for r in bookings] == [200] * 12
+    assert {r.json()["NetPayable"] for r in quotes} == {354.0}
+    assert [line["TestId"] for line in lines.json()] == [1]
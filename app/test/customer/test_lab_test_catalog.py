@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.crud.customer import lab_test_catalog as catalog_module
+from app.crud.customer.lab_test_catalog import LabTestCatalog, LabTestCatalogManager, to_entry
+from app.crud.customer.lap_manager import TestManager
+from app.models.customer.lap_model import Lab, Test
+from app.schemas.customer.lap_schema import TestUpdate
+
+
+@pytest.fixture
+def catalog(sqlite_db, monkeypatch):
+    engine = sqlite_db(Lab, Test, name="catalog.db")
+    with Session(engine) as session:
+        session.add_all([
+            Lab(LabId=1, Name="City Diagnostics", PostalCode="560001"),
+            Lab(LabId=2, Name="Metro Labs", PostalCode="560002"),
+            Test(TestId=1, LabId=1, Name="Complete Blood Count (CBC)", Price=300, GstPercent=18),
+            Test(TestId=2, LabId=2, Name="CBC", Price=330, GstPercent=5),
+            Test(TestId=3, LabId=2, Name="Lipid Profile", Price=500, GstPercent=0),
+        ])
+        session.commit()
+    monkeypatch.setattr(catalog_module, "lab_test_catalog", LabTestCatalog())
+    monkeypatch.setattr("app.crud.customer.lap_manager.lab_test_catalog", catalog_module.lab_test_catalog)
+    return LabTestCatalogManager("sqlite")
+
+
+def test_compare_matches_aliases_and_ranks_by_net_price(catalog):
+    result = asyncio.run(catalog.compare("cbc"))
+
+    assert [r["TestId"] for r in result] == [2, 1]
+    assert [r["NetPrice"] for r in result] == [346.5, 354.0]
+
+
+def test_compare_filters_by_postal(catalog):
+    result = asyncio.run(catalog.compare("Complete blood count", postal="560001"))
+
+    assert [r["LabName"] for r in result] == ["City Diagnostics"]
+
+
+def test_unmatched_compare_keeps_a_concurrent_hold_on_the_shared_engine(catalog):
+    async def run():
+        # Another request on the same manager, mid-read
+        await catalog.db_manager.connect()
+        try:
+            assert await catalog.compare("no such test") == []
+            assert catalog.db_manager.db.SessionLocal is not None
+            return await catalog.db_manager.read(Lab, {"LabId": 1})
+        finally:
+            await catalog.db_manager.disconnect()
+
+    assert [lab.Name for lab in asyncio.run(run())] == ["City Diagnostics"]
+
+
+def test_catalog_follows_test_updates_and_deletes(catalog):
+    asyncio.run(catalog.compare("cbc"))  # build the index
+    manager = TestManager("sqlite")
+
+    asyncio.run(manager.update_test(1, TestUpdate.model_construct(Price=250)))
+    assert [r["TestId"] for r in asyncio.run(catalog.compare("cbc"))] == [1, 2]
+
+    asyncio.run(manager.delete_test(1))
+    assert [r["TestId"] for r in asyncio.run(catalog.compare("cbc"))] == [2]
+
+
+def test_unloaded_catalog_ignores_upserts():
+    catalog = LabTestCatalog()
+    catalog.upsert(to_entry(Test(TestId=9, LabId=1, Name="CBC", Price=1)))
+
+    assert catalog.lookup("cbc") == []
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.crud.customer.order_archive_manager import OrderArchiveManager
+from app.crud.customer.order_manager import OrderManager
+from app.models.customer.customer_model import Customer
+from app.models.customer.order_model import (
+    Order, OrderItem, OrderStatusCounter, OrdersArchive, OrderItemArchive
+)
+from app.schemas.customer.order_schema import OrderCreate, OrderItemCreate
+from app.utils.timezone import ist_now
+
+
+@pytest.fixture
+def engine(sqlite_db):
+    return sqlite_db(Customer, Order, OrderItem, OrderStatusCounter, OrdersArchive, OrderItemArchive,
+                     name="orders.db")
+
+
+@pytest.fixture
+def create_orders(schema):
+    def create(manager, count):
+        item = schema(OrderItemCreate, CustomerId=1, RetailerId=9, MedicineId=1,
+                      MedicineName="Paracetamol", Quantity=2, Price=10.0, TotalAmount=0)
+        order = schema(OrderCreate, CustomerId=1, RetailerId=9, RetailerName="City Pharma", Items=[item])
+        return [asyncio.run(manager.create_order(order))["OrderId"] for _ in range(count)]
+    return create
+
+
+def _age(engine, order_ids, days):
+    with engine.begin() as conn:
+        conn.execute(
+            update(Order).where(Order.OrderId.in_(order_ids)).values(UpdatedAt=ist_now() - timedelta(days=days))
+        )
+
+
+def test_only_old_terminal_orders_are_archived_in_batches(engine, create_orders):
+    manager = OrderManager("sqlite")
+    ids = create_orders(manager, 5)
+    for order_id in ids[:3]:
+        asyncio.run(manager.update_order_status(order_id, "Delivered"))
+    asyncio.run(manager.update_order_status(ids[3], "Cancelled"))
+    _age(engine, ids, days=200)
+    _age(engine, [ids[3]], days=1)  # recently cancelled: stays hot
+
+    result = asyncio.run(OrderArchiveManager("sqlite").archive_orders(older_than_days=90, batch_size=2))
+    assert result == {"success": True, "Archived": 3}
+
+    hot = asyncio.run(manager.get_orders_by_customer(1))
+    assert sorted(o["OrderId"] for o in hot["Data"]) == [ids[3], ids[4]]
+    # Only the rows are hot; the counts still include the archived orders, like the summary
+    summary = asyncio.run(manager.get_customer_summary(1))
+    assert {k: hot[k] for k in summary} == summary
+    assert (summary["TotalOrders"], summary["Delivered"]) == (5, 3)
+    retailer = asyncio.run(manager.get_orders_by_retailer(9))
+    assert len(retailer["AllOrders"]) == 2
+    assert {k: retailer[k] for k in ("TotalOrders", "Delivered", "Cancelled")} == {
+        "TotalOrders": 5, "Delivered": 3, "Cancelled": 1,
+    }
+    everything = asyncio.run(manager.get_orders_by_customer(1, include_archived=True))
+    assert sorted(o["OrderId"] for o in everything["Data"]) == ids
+
+    archived = asyncio.run(manager.get_order(ids[0]))
+    assert archived["Archived"] is True
+    assert archived["Status"] == "Delivered"
+    assert [i["MedicineName"] for i in archived["Items"]] == ["Paracetamol"]
+
+
+def test_archiving_keeps_status_counters_and_rebuild_counts_archive(engine, create_orders):
+    manager = OrderManager("sqlite")
+    ids = create_orders(manager, 2)
+    asyncio.run(manager.update_order_status(ids[0], "Delivered"))
+    _age(engine, ids, days=200)
+    before = asyncio.run(manager.get_retailer_summary(9))
+
+    asyncio.run(OrderArchiveManager("sqlite").archive_orders(older_than_days=90))
+    assert asyncio.run(manager.get_retailer_summary(9)) == before
+
+    asyncio.run(manager.rebuild_status_counters())
+    assert asyncio.run(manager.get_retailer_summary(9)) == before
+    assert before["Delivered"] == 1 and before["TotalOrders"] == 2
+
+
+def test_orders_work_without_archive_tables(sqlite_db, create_orders):
+    sqlite_db(Customer, Order, OrderItem, OrderStatusCounter, name="no-archive.db")
+    manager = OrderManager("sqlite")
+    ids = create_orders(manager, 2)
+
+    result = asyncio.run(OrderArchiveManager("sqlite").archive_orders(older_than_days=0))
+    assert result == {"success": False, "message": "Order archive tables are missing", "Archived": 0}
+
+    assert asyncio.run(manager.get_order(404)) == {"success": False, "message": "Order not found"}
+    everything = asyncio.run(manager.get_orders_by_customer(1, include_archived=True))
+    assert sorted(o["OrderId"] for o in everything["Data"]) == ids
+    assert asyncio.run(manager.rebuild_status_counters())["success"] is True
+    assert asyncio.run(manager.get_retailer_summary(9))["TotalOrders"] == 2
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.api.customer.order_api import OrderItemAPI
+from app.config import settings
+from app.crud.customer.order_manager import OrderItemManager, OrderManager
+from app.models.customer.customer_model import Customer
+from app.models.customer.order_model import Order, OrderItem, OrderStatusCounter
+from app.schemas.customer.order_schema import OrderCreate, OrderItemCreate, OrderItemUpdate, OrderUpdate
+
+
+@pytest.fixture
+def engine(sqlite_db):
+    return sqlite_db(Customer, Order, OrderItem, OrderStatusCounter, name="orders.db")
+
+
+@pytest.fixture
+def item(schema):
+    def build(order_id, quantity, price):
+        return schema(OrderItemCreate, OrderId=order_id, CustomerId=1, RetailerId=9, MedicineId=1,
+                      MedicineName="Paracetamol", Quantity=quantity, Price=price, TotalAmount=0)
+    return build
+
+
+def _total(order_id):
+    return asyncio.run(OrderManager("sqlite").get_order(order_id))["TotalAmount"]
+
+
+def test_item_writes_move_the_order_total_by_delta(engine, schema, item):
+    orders, items = OrderManager("sqlite"), OrderItemManager("sqlite")
+    order_id = asyncio.run(orders.create_order(
+        schema(OrderCreate, CustomerId=1, RetailerId=9, RetailerName="City Pharma", Items=[item(None, 2, 10.0)])
+    ))["OrderId"]
+    assert _total(order_id) == 20.0
+
+    item_id = asyncio.run(items.create_item(item(order_id, 3, 5.5)))["OrderItemId"]
+    assert _total(order_id) == 36.5
+
+    asyncio.run(items.update_item(item_id, OrderItemUpdate.model_construct(Quantity=1, TotalAmount=999)))
+    assert _total(order_id) == 25.5
+
+    asyncio.run(items.delete_item(item_id))
+    assert _total(order_id) == 20.0
+    assert asyncio.run(items.check_order_totals())["Mismatched"] == []
+
+
+def test_order_update_cannot_overwrite_the_total(engine, schema, item):
+    orders = OrderManager("sqlite")
+    order_id = asyncio.run(orders.create_order(
+        schema(OrderCreate, CustomerId=1, RetailerId=9, RetailerName="City Pharma", Items=[item(None, 2, 10.0)])
+    ))["OrderId"]
+
+    result = asyncio.run(orders.update_order(order_id, OrderUpdate.model_construct(TotalAmount=1.0, PaymentStatus="Paid")))
+
+    assert result["success"]
+    order = asyncio.run(orders.get_order(order_id))
+    assert (order["TotalAmount"], order["PaymentStatus"]) == (20.0, "Paid")
+    assert asyncio.run(OrderItemManager("sqlite").check_order_totals())["Mismatched"] == []
+
+
+def test_item_for_missing_order_is_rejected(engine, item):
+    result = asyncio.run(OrderItemManager("sqlite").create_item(item(404, 1, 10.0)))
+    assert result == {"success": False, "message": "Order not found"}
+
+
+def test_check_order_totals_reports_and_repairs_drift(engine, schema, item):
+    orders, items = OrderManager("sqlite"), OrderItemManager("sqlite")
+    order_id = asyncio.run(orders.create_order(
+        schema(OrderCreate, CustomerId=1, RetailerId=9, RetailerName="City Pharma", Items=[item(None, 2, 10.0)])
+    ))["OrderId"]
+
+    with engine.begin() as conn:
+        conn.execute(update(Order).where(Order.OrderId == order_id).values(TotalAmount=5.0))
+
+    report = asyncio.run(items.check_order_totals())
+    assert report["Mismatched"] == [{"OrderId": order_id, "TotalAmount": 5.0, "ExpectedTotal": 20.0}]
+    assert report["Repaired"] == 0
+
+    assert asyncio.run(items.check_order_totals(repair=True))["Repaired"] == 1
+    assert _total(order_id) == 20.0
+    assert asyncio.run(items.check_order_totals())["Mismatched"] == []
+
+
+def test_concurrent_line_edits_keep_the_order_total(engine, schema, item):
+    orders, items = OrderManager("sqlite"), OrderItemManager("sqlite")
+    order_id = asyncio.run(orders.create_order(
+        schema(OrderCreate, CustomerId=1, RetailerId=9, RetailerName="City Pharma", Items=[item(None, 2, 10.0)])
+    ))["OrderId"]
+    item_id = asyncio.run(items.create_item(item(order_id, 1, 5.0)))["OrderItemId"]
+
+    async def run():
+        return await asyncio.gather(*[
+            items.update_item(item_id, OrderItemUpdate.model_construct(Quantity=q)) if i % 2
+            else items.update_item(item_id, OrderItemUpdate.model_construct(Price=float(q)))
+            for i, q in enumerate(range(1, 21))
+        ])
+
+    # Each edit used to apply a delta against the line total it read, even
+    # after another edit had changed it
+    results = asyncio.run(run())
+
+    assert [r for r in results if not r["success"]] == []
+    assert asyncio.run(items.check_order_totals())["Mismatched"] == []
+
+
+def test_total_repair_needs_the_admin_token(engine, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    app = FastAPI()
+    app.include_router(OrderItemAPI().router)
+    client = TestClient(app)
+
+    assert client.post("/order-items/totals/repair").status_code == 403
+    response = client.post("/order-items/totals/repair", headers={"X-Admin-Token": "secret"})
+    assert response.json() == {"success": True, "Mismatched": [], "Repaired": 0}
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.api.customer.order_api import OrderAPI
+from app.config import settings
+from app.crud.customer.order_manager import OrderManager
+from app.middleware.metrics import MetricsMiddleware
+from app.models.customer.customer_model import Customer
+from app.models.customer.order_model import Order, OrderItem, OrderStatusCounter, OrdersArchive
+from app.schemas.customer.order_schema import OrderCreate, OrderItemCreate, OrderUpdate
+
+
+@pytest.fixture
+def manager(sqlite_db):
+    sqlite_db(Customer, Order, OrderItem, OrderStatusCounter, OrdersArchive, name="orders.db")
+    return OrderManager("sqlite")
+
+
+@pytest.fixture
+def order(schema):
+    def build(customer_id, retailer_id):
+        item = schema(OrderItemCreate, CustomerId=customer_id, RetailerId=retailer_id, MedicineId=1,
+                      MedicineName="Paracetamol", Quantity=2, Price=10.0, TotalAmount=0)
+        return schema(OrderCreate, CustomerId=customer_id, RetailerId=retailer_id,
+                      RetailerName="City Pharma", Items=[item])
+    return build
+
+
+def _counters(manager):
+    async def read():
+        await manager.db_manager.connect()
+        try:
+            session = manager.db_manager.get_session()
+            async with session:
+                rows = (await session.execute(select(OrderStatusCounter))).scalars().all()
+                return {(r.OwnerType, r.OwnerId, r.Status): r.Count for r in rows if r.Count}
+        finally:
+            await manager.db_manager.disconnect()
+    return asyncio.run(read())
+
+
+def test_counters_follow_order_writes_and_match_rebuild(manager, order):
+    ids = [asyncio.run(manager.create_order(order(c, 9)))["OrderId"] for c in (1, 1, 2)]
+    asyncio.run(manager.update_order_status(ids[0], "Delivered"))
+    asyncio.run(manager.update_order_status(ids[0], "Delivered"))  # no-op, counted once
+    asyncio.run(manager.update_order_status(ids[1], "Cancelled"))
+    asyncio.run(manager.delete_order(ids[2]))
+
+    assert asyncio.run(manager.get_retailer_summary(9)) == {
+        "TotalOrders": 2, "New": 0, "Accepted": 1, "Pending": 0,
+        "InTransit": 0, "Delivered": 1, "Cancelled": 1,
+    }
+    assert asyncio.run(manager.get_customer_summary(1))["Delivered"] == 1
+
+    incremental = _counters(manager)
+    asyncio.run(manager.rebuild_status_counters())
+    assert _counters(manager) == incremental
+
+
+def test_order_total_is_written_with_the_order(manager, order):
+    order_id = asyncio.run(manager.create_order(order(1, 9)))["OrderId"]
+
+    created = asyncio.run(manager.get_order(order_id))
+    assert created["TotalAmount"] == 20.0
+    assert len(created["Items"]) == 1
+
+
+def test_concurrent_status_and_owner_changes_keep_counters_exact(manager, order):
+    order_id = asyncio.run(manager.create_order(order(1, 9)))["OrderId"]
+    statuses = ["Accepted", "InTransit", "Delivered", "Cancelled"]
+
+    async def run():
+        return await asyncio.gather(*[
+            manager.update_order_status(order_id, statuses[i % 4]) if i % 5
+            else manager.update_order(order_id, OrderUpdate.model_construct(RetailerId=9 + i % 2))
+            for i in range(20)
+        ])
+
+    # Each update used to move the counters from the status it read, even
+    # when another request changed it in between
+    results = asyncio.run(run())
+
+    assert [r for r in results if not r["success"]] == []
+    incremental = _counters(manager)
+    assert sum(incremental.values()) == 2
+    asyncio.run(manager.rebuild_status_counters())
+    assert _counters(manager) == incremental
+
+
+def test_retailer_dashboard_reads_new_orders_in_a_fixed_number_of_queries(manager, order):
+    for retailer_id, count in ((8, 1), (9, 6)):
+        for c in range(count):
+            asyncio.run(manager.create_order(order(1 + c % 2, retailer_id)))
+    delivered = asyncio.run(manager.create_order(order(1, 9)))["OrderId"]
+    asyncio.run(manager.update_order_status(delivered, "Delivered"))
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(OrderAPI().router)
+
+    # The suite-wide query budget for this route raises if the reads grow per order
+    with TestClient(app) as client:
+        small = client.get("/orders/retailer/8").json()
+        large = client.get("/orders/retailer/9").json()
+
+    assert len(small["NewOrders"]) == 1
+    assert len(large["NewOrders"]) == 6 and len(large["AllOrders"]) == 7
+    assert {o["CustomerId"] for o in large["NewOrders"]} == {1, 2}
+    assert all([i["MedicineName"] for i in o["Items"]] == ["Paracetamol"] for o in large["NewOrders"])
+    assert {k: large[k] for k in ("TotalOrders", "New", "Delivered")} == {"TotalOrders": 7, "New": 6, "Delivered": 1}
+
+
+def test_rebuilding_counters_needs_the_admin_token(manager, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    app = FastAPI()
+    app.include_router(OrderAPI().router)
+    client = TestClient(app)
+
+    assert client.post("/orders/counters/rebuild").status_code == 403
+    response = client.post("/orders/counters/rebuild", headers={"X-Admin-Token": "secret"})
+    assert response.json()["success"] is True
@@ -0,0 +1,145 @@
+import asyncio
+import sqlite3
+from math import cos, degrees, radians
+
+import pytest
+from sqlalchemy import insert, text
+
+from app.crud.customer.pharmacy_manager import PharmacyManager
+from app.models.customer.pharmacy_model import Pharmacy
+from app.scripts.create_tables import TableCreator
+from app.utils.geo import EARTH_RADIUS_KM, bounding_box, haversine_km
+
+RADIUS_KM = 5.0
+
+
+def offset(lat, lon, north_km=0.0, east_km=0.0):
+    """A point north_km / east_km from (lat, lon) along the meridian / parallel."""
+    return (lat + degrees(north_km / EARTH_RADIUS_KM),
+            lon + degrees(east_km / (EARTH_RADIUS_KM * cos(radians(lat)))))
+
+
+def nearby_names(lat, lon, radius_km=RADIUS_KM):
+    result = asyncio.run(PharmacyManager("sqlite").get_nearby_by_gps(lat, lon, radius_km))
+    return {p["Name"] for p in result}
+
+
+@pytest.mark.parametrize("lat, lon", [(12.9716, 77.5946), (34.08, 74.79), (60.0, 10.0), (0.0, 0.0)])
+def test_bounding_box_encloses_the_circle(lat, lon):
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, RADIUS_KM)
+
+    # Box edges sit exactly one radius north/south; east/west is never closer than a radius
+    assert haversine_km(lat, lon, max_lat, lon) == pytest.approx(RADIUS_KM)
+    assert haversine_km(lat, lon, min_lat, lon) == pytest.approx(RADIUS_KM)
+    assert haversine_km(lat, lon, lat, max_lon) >= RADIUS_KM * 0.999
+    assert haversine_km(lat, lon, lat, min_lon) >= RADIUS_KM * 0.999
+
+
+def test_bounding_box_near_the_pole_spans_every_longitude():
+    assert bounding_box(90.0, 0.0, RADIUS_KM)[2:] == (-180.0, 180.0)
+
+
+@pytest.mark.parametrize("lat, lon", [(12.9716, 77.5946), (60.0, 10.0)])
+def test_radius_filter_on_the_box_edges(sqlite_db, lat, lon):
+    engine = sqlite_db(Pharmacy, name="nearby.db")
+    points = {
+        "North inside": offset(lat, lon, north_km=4.99),
+        "North outside": offset(lat, lon, north_km=5.01),
+        "East inside": offset(lat, lon, east_km=4.99),
+        "West inside": offset(lat, lon, east_km=-4.99),
+        "West outside": offset(lat, lon, east_km=-5.05),
+        "Box corner": offset(lat, lon, north_km=4.0, east_km=4.0),   # in the box, 5.66 km away
+    }
+    with engine.begin() as conn:
+        conn.execute(insert(Pharmacy), [
+            {"Name": name, "Latitude": p_lat, "Longitude": p_lon} for name, (p_lat, p_lon) in points.items()
+        ])
+
+    assert nearby_names(lat, lon) == {"North inside", "East inside", "West inside"}
+
+
+def test_radius_straddling_a_meridian(sqlite_db):
+    engine = sqlite_db(Pharmacy, name="meridian.db")
+    with engine.begin() as conn:
+        conn.execute(insert(Pharmacy), [
+            {"Name": "West of 77", "Latitude": 12.97, "Longitude": 76.99},
+            {"Name": "On 77", "Latitude": 12.97, "Longitude": 77.0},
+            {"Name": "East of 77", "Latitude": 12.97, "Longitude": 77.01},
+            {"Name": "Far east", "Latitude": 12.97, "Longitude": 77.1},
+        ])
+
+    result = asyncio.run(PharmacyManager("sqlite").get_nearby_by_gps(12.97, 77.0, 2.0))
+
+    assert [p["Name"] for p in result][0] == "On 77"
+    assert {p["Name"] for p in result} == {"West of 77", "On 77", "East of 77"}
+    assert result[1]["DistanceKm"] == result[2]["DistanceKm"] == 1.08
+
+
+def test_null_and_text_coordinates_are_skipped(sqlite_db):
+    engine = sqlite_db(Pharmacy, name="dirty.db")
+    with engine.begin() as conn:
+        conn.execute(insert(Pharmacy), [
+            {"Name": "Clean", "Latitude": 12.9716, "Longitude": 77.5946},
+            {"Name": "No coordinates", "Latitude": None, "Longitude": None},
+            {"Name": "No longitude", "Latitude": 12.9716, "Longitude": None},
+        ])
+        # Rows written before the REAL columns: numeric text is stored as REAL, the rest stays text
+        conn.execute(text(
+            "INSERT INTO Pharmacy (Name, Latitude, Longitude) VALUES "
+            "('Numeric text', '12.9720', '77.5950'), ('Garbage', 'n/a', '77.5946'), ('Blank', '', '');"
+        ))
+
+    assert nearby_names(12.9716, 77.5946) == {"Clean", "Numeric text"}
+
+
+def test_migration_moves_old_tables_onto_numeric_coordinates(tmp_path):
+    db_file = tmp_path / "old.db"
+    creator = TableCreator(f"sqlite+aiosqlite:///{db_file}")
+    with sqlite3.connect(db_file) as conn:
+        # Lab as it was created before the REAL columns
+        conn.execute(creator._create_lab_sql().replace(" REAL", " TEXT"))
+        conn.executescript("""
+            CREATE TABLE Pharmacy (PharmacyId INTEGER PRIMARY KEY, Name TEXT NOT NULL, GPSLocation TEXT);
+            INSERT INTO Pharmacy (PharmacyId, Name, GPSLocation) VALUES
+                (1, 'Space', '12.9716 77.5946'), (2, 'Comma', '12.9716,77.5946'),
+                (3, 'Garbage', 'near the bus stand'), (4, 'Empty', NULL);
+            INSERT INTO Lab (LabId, Name, Latitude, Longitude) VALUES
+                (1, 'Text', '12.9716', ' 77.5946 '), (2, 'Blank', '', ''),
+                (3, 'Out of range', '91', '77.5946'), (4, 'Null', NULL, NULL);
+        """)
+
+    creator.migrate_coordinates(chunk_size=2)
+    creator.migrate_coordinates(chunk_size=2)   # second run is a no-op
+
+    with sqlite3.connect(db_file) as conn:
+        pharmacies = conn.execute("SELECT PharmacyId, Latitude, Longitude FROM Pharmacy ORDER BY 1;").fetchall()
+        labs = conn.execute(
+            "SELECT LabId, Latitude, typeof(Latitude), Longitude FROM Lab ORDER BY 1;"
+        ).fetchall()
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(Pharmacy);")}
+
+    assert pharmacies == [(1, 12.9716, 77.5946), (2, 12.9716, 77.5946), (3, None, None), (4, None, None)]
+    assert labs == [(1, 12.9716, "real", 77.5946), (2, None, "null", None),
+                    (3, None, "null", 77.5946), (4, None, "null", None)]
+    assert "ix_Pharmacy_Latitude_Longitude" in indexes
+
+
+def test_failed_pincode_lookup_keeps_a_concurrent_hold_on_the_shared_engine(sqlite_db, monkeypatch):
+    sqlite_db(Pharmacy, name="shared.db")
+    manager = PharmacyManager("sqlite")
+
+    async def unavailable(pincode, neighbours):
+        raise RuntimeError("pincode index unavailable")
+
+    monkeypatch.setattr(manager.pincode_manager, "get_nearby_pincodes", unavailable)
+
+    async def run():
+        await manager.db_manager.connect()
+        try:
+            assert (await manager.get_nearby_by_pincode("560001"))["success"] is False
+            assert manager.db_manager.db.SessionLocal is not None
+            return await manager.db_manager.read(Pharmacy, None)
+        finally:
+            await manager.db_manager.disconnect()
+
+    assert asyncio.run(run()) == []
@@ -0,0 +1,101 @@
+import asyncio
+import heapq
+import random
+
+import pytest
+from sqlalchemy import insert
+
+from app.config import settings
+from app.crud.customer import pincode_manager as pincode_module
+from app.crud.customer.pharmacy_manager import PharmacyManager
+from app.crud.customer.pincode_manager import PincodeManager
+from app.models.customer.pharmacy_model import Pharmacy
+from app.models.customer.pincode_model import PincodeNeighbour
+from app.scripts.create_tables import TableCreator
+from app.utils.geo import haversine_km
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    # The neighbour index is process-wide; keep it out of other tests
+    monkeypatch.setattr(pincode_module, "_neighbour_index", None)
+    monkeypatch.setattr(pincode_module, "_retry_at", 0.0)
+    monkeypatch.setattr(pincode_module, "_retry_delay", pincode_module.INDEX_RETRY_SECONDS)
+
+
+def brute_force(points, k):
+    rows = []
+    for pincode, (lat, lon) in points.items():
+        distances = [(haversine_km(lat, lon, *points[o]), o) for o in points if o != pincode]
+        rows.extend((pincode, o, rank) for rank, (_, o) in enumerate(heapq.nsmallest(k, distances), start=1))
+    return rows
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_grid_search_matches_all_pairs(seed):
+    rng = random.Random(seed)
+    # A dense city, a sparse hill state far north, and points on grid cell edges
+    points = {f"56{i:04d}": (12.9 + rng.uniform(-0.3, 0.3), 77.6 + rng.uniform(-0.3, 0.3)) for i in range(150)}
+    points.update({f"19{i:04d}": (rng.uniform(32, 35), rng.uniform(74, 78)) for i in range(40)})
+    points.update({f"11{i:04d}": (28.5 + 0.25 * (i % 3), 77.0 + 0.25 * (i // 3)) for i in range(9)})
+
+    rows = TableCreator._nearest_pincodes(points, k=5)
+
+    assert [(p, o, r) for p, o, r, _ in rows] == brute_force(points, 5)
+    distances = {(p, o): d for p, o, _, d in rows}
+    assert all(d == round(haversine_km(*points[p], *points[o]), 3) for (p, o), d in distances.items())
+
+
+def test_sparse_points_search_beyond_the_first_rings():
+    # Neighbours several grid cells away, east-west where degrees are shortest
+    points = {"A": (34.0, 70.0), "B": (40.0, 70.0), "C": (34.0, 76.9), "D": (28.0, 73.0)}
+
+    rows = TableCreator._nearest_pincodes(points, k=2)
+
+    assert [(p, o, r) for p, o, r, _ in rows] == brute_force(points, 2)
+
+
+def test_loaded_csv_drives_the_pharmacy_neighbour_search(sqlite_db, tmp_path):
+    engine = sqlite_db(Pharmacy, name="pincodes.db")
+    csv_path = tmp_path / "pincodes.csv"
+    csv_path.write_text(
+        "Pincode,Latitude,Longitude,District,State\n"
+        "560001,12.9716,77.5946,Bengaluru,Karnataka\n"
+        "560001,12.9730,77.5960,Bengaluru,Karnataka\n"   # second post office, averaged
+        "560002,12.9600,77.5800,Bengaluru,Karnataka\n"
+        "560100,12.8400,77.6700,Bengaluru,Karnataka\n"
+        "600001,13.0827,80.2707,Chennai,Tamil Nadu\n"
+    )
+    TableCreator(settings.sqlite_url).load_pincodes(str(csv_path), neighbours=2)
+    with engine.begin() as conn:
+        conn.execute(insert(Pharmacy), [
+            {"Name": "Far", "Pincode": "600001"},
+            {"Name": "Next door", "Pincode": "560002"},
+            {"Name": "Local", "Pincode": "560001"},
+            {"Name": "Suburb", "Pincode": "560100"},
+        ])
+
+    nearby = asyncio.run(PharmacyManager("sqlite").get_nearby_by_pincode("560001", neighbours=1))
+
+    assert [p["Name"] for p in nearby] == ["Local", "Next door"]
+    assert nearby[0]["DistanceKm"] == 0.0 and 1.0 < nearby[1]["DistanceKm"] < 3.0
+
+
+def test_failed_index_load_is_not_cached(sqlite_db, monkeypatch):
+    engine = sqlite_db(Pharmacy, name="no-pincodes.db")
+    manager = PincodeManager("sqlite")
+
+    # No PincodeNeighbour table yet: exact matches only, and warm-up reports it
+    assert asyncio.run(manager.get_nearby_pincodes("560001", 3)) == [("560001", 0.0)]
+    with pytest.raises(Exception):
+        asyncio.run(manager.warm_up())
+
+    PincodeNeighbour.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(PincodeNeighbour), {
+            "Pincode": "560001", "NeighbourPincode": "560002", "Rank": 1, "DistanceKm": 1.9,
+        })
+    # Still backing off, then loads once the retry time has passed
+    assert asyncio.run(manager.get_nearby_pincodes("560001", 3)) == [("560001", 0.0)]
+    monkeypatch.setattr(pincode_module, "_retry_at", 0.0)
+    assert asyncio.run(manager.get_nearby_pincodes("560001", 3)) == [("560001", 0.0), ("560002", 1.9)]
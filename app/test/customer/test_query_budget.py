@@ -0,0 +1,80 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.api.customer.cart_api import CartAPI
+from app.config import settings
+from app.middleware.metrics import MetricsMiddleware
+from app.models.customer.cart_model import Cart, CartItem
+from app.models.customer.medicine_model import Medicine
+from app.utils.query_guard import QueryBudgetExceeded, parameters_shape
+
+
+@pytest.fixture
+def engine(sqlite_db):
+    # Budgets and the "raise" action come from the suite-wide conftest
+    return sqlite_db(Cart, CartItem, Medicine, name="cart.db")
+
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(CartAPI().router)
+    return TestClient(app)
+
+
+def _seed_cart(engine, customer_id, item_count):
+    with engine.begin() as conn:
+        conn.execute(Cart.__table__.insert(), {"CartId": customer_id, "CustomerId": customer_id})
+        for i in range(item_count):
+            medicine_id = customer_id * 100 + i
+            conn.execute(Medicine.__table__.insert(), {"MedicineId": medicine_id, "Name": f"M{i}", "UnitPrice": 10.0})
+            conn.execute(CartItem.__table__.insert(), {
+                "CartId": customer_id, "MedicineId": medicine_id, "Quantity": 1, "StoredPrice": 10.0,
+            })
+
+
+def test_get_cart_query_count_does_not_grow_with_items(engine):
+    _seed_cart(engine, 1, 1)
+    _seed_cart(engine, 2, 25)
+
+    with _client() as client:
+        small = client.get("/cart/1").json()
+        large = client.get("/cart/2").json()
+
+    assert len(small["Items"]) == 1
+    assert len(large["Items"]) == 25
+    assert large["TotalAmount"] == 250.0
+
+
+def test_n_plus_one_endpoint_fails_its_budget(engine):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/cart/{customer_id}")
+    def get_cart(customer_id: int):
+        with engine.connect() as conn:
+            items = conn.execute(text("SELECT MedicineId FROM CartItem")).all()
+            for (medicine_id,) in items:
+                conn.execute(text("SELECT * FROM Medicine WHERE MedicineId = :id"), {"id": medicine_id}).all()
+        return {"Items": len(items)}
+
+    _seed_cart(engine, 1, 5)
+    with TestClient(app) as client, pytest.raises(QueryBudgetExceeded, match="ran 6 queries, budget is 3"):
+        client.get("/cart/1")
+
+
+def test_slow_queries_are_logged_with_route_and_parameter_shape_only(engine, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "slow_query_ms", 0)
+    _seed_cart(engine, 1, 2)
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.query_guard"), _client() as client:
+        client.get("/cart/1")
+
+    slow = [r.getMessage() for r in caplog.records if "Slow query" in r.getMessage()]
+    assert any("route=/cart/{customer_id}" in m and "FROM \"CartItem\"" in m for m in slow)
+    assert parameters_shape({"CustomerId": 7, "Email": "a@b.c"}) == "{CustomerId: int, Email: str}"
+    assert parameters_shape([(1, 2.0), (3, 4.0)], executemany=True) == "2 x (int, float)"
@@ -0,0 +1,60 @@
+import time
+
+import jwt
+import pytest
+
+from app.exceptions.custom_exceptions import UnauthorizedException
+from app.utils.auth_tokens import TokenService
+
+
+def test_verified_claims_are_cached_until_expiry():
+    service = TokenService({"k1": "secret-one"}, ttl_seconds=60)
+    token, claims = service.issue("customer", 7, "a@example.com")
+
+    first = service.verify(token)
+    assert (first["sub"], first["typ"], first["email"]) == ("7", "customer", "a@example.com")
+    assert service.verify(token) is first          # cache hit, no decode
+    assert service.cache_info()["Size"] == 1
+
+    expired = jwt.encode({**claims, "exp": int(time.time()) - 1}, "secret-one", headers={"kid": "k1"})
+    with pytest.raises(UnauthorizedException, match="expired"):
+        service.verify(expired)
+
+
+def test_key_rotation_keeps_old_tokens_until_key_removed():
+    service = TokenService({"k1": "secret-one"})
+    old_token, _ = service.issue("retailer", 3)
+    service.add_key("k2", "secret-two", activate=True)
+    new_token, _ = service.issue("retailer", 3)
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+    assert service.verify(old_token)["sub"] == "3"
+
+    service.remove_key("k1")
+    with pytest.raises(UnauthorizedException, match="Unknown signing key"):
+        service.verify(old_token)
+    assert service.verify(new_token)["sub"] == "3"
+
+    forged = jwt.encode({"sub": "1", "jti": "x", "exp": int(time.time()) + 60, "iss": "medical-app"},
+                        "guess", headers={"kid": "k2"})
+    with pytest.raises(UnauthorizedException, match="Invalid token"):
+        service.verify(forged)
+
+
+def test_revoked_token_is_rejected():
+    service = TokenService({"k1": "secret-one"})
+    token, _ = service.issue("customer", 1)
+    service.verify(token)
+    service.revoke(token)
+
+    with pytest.raises(UnauthorizedException, match="revoked"):
+        service.verify(token)
+
+
+def test_missing_keys_refuse_startup_outside_development():
+    with pytest.raises(RuntimeError, match="JWT_KEYS"):
+        TokenService({}, allow_random_key=False)
+
+    service = TokenService({})
+    token, _ = service.issue("customer", 1)
+    assert service.verify(token)["sub"] == "1"
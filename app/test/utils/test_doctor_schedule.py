@@ -0,0 +1,115 @@
+import asyncio
+from datetime import date, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.customer.doctor_api import DoctorAPI
+from app.models.customer.doctor_model import Doctor, DoctorAppointment
+from app.utils.doctor_schedule import DoctorSchedule, parse_available_time, parse_days, parse_ranges
+
+MONDAY = date(2030, 1, 7)
+
+
+def hm(text: str) -> int:
+    hours, minutes = text.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Monday, Wednesday", {0, 2}),
+    ("Mon-Fri", {0, 1, 2, 3, 4}),
+    ("Mon to Sat", {0, 1, 2, 3, 4, 5}),
+    ("Fri - Mon", {4, 5, 6, 0}),               # wraps over the weekend
+    ("Tue / Thu | sat", {1, 3, 5}),
+    ("Monday – Wednesday", {0, 1, 2}),         # en dash from a map listing
+    ("Funday, Someday", set()),
+    ("", set()),
+    (None, set()),
+])
+def test_parse_days(text, expected):
+    assert parse_days(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Meridian forms
+    ("9 AM - 5 PM", [("09:00", "17:00")]),
+    ("9:30 am to 1:15 pm", [("09:30", "13:15")]),
+    ("9.30 a.m. – 1 p.m.", [("09:30", "13:00")]),
+    ("10:00 - 11:30 AM", [("10:00", "11:30")]),   # start shares the end meridian
+    ("5:00 - 8:00 PM", [("17:00", "20:00")]),
+    ("10:00 - 1:00 PM", [("10:00", "13:00")]),    # unless that puts it after the end
+    ("9 AM - 5", [("09:00", "17:00")]),
+    # Bare hours: an end below the start is in the afternoon
+    ("9 - 5", [("09:00", "17:00")]),
+    ("10:00 - 1:00", [("10:00", "13:00")]),
+    ("9 - 9", [("09:00", "21:00")]),
+    ("12 - 4", [("12:00", "16:00")]),
+    ("09:00 - 17:00", [("09:00", "17:00")]),
+    # Past midnight only when written that way
+    ("6 PM - 12 AM", [("18:00", "24:00")]),
+    ("22:00 - 00:00", [("22:00", "24:00")]),
+    ("20:00 - 02:00", [("20:00", "24:00")]),
+    ("24 hours", [("00:00", "24:00")]),
+    ("Open 24 Hours", [("00:00", "24:00")]),
+    # Multiple ranges
+    ("10:00 AM - 01:00 PM, 05:00 PM - 08:00 PM", [("10:00", "13:00"), ("17:00", "20:00")]),
+    ("9 - 1 and 4 - 7", [("09:00", "13:00"), ("16:00", "19:00")]),
+    # Malformed
+    ("Closed", []),
+    ("by appointment", []),
+    ("", []),
+    ("14:00 - 12:00", []),
+    ("25:00 - 26:00", []),
+    ("9:75 - 10", []),
+    ("13 PM - 2 PM", []),
+])
+def test_parse_ranges(text, expected):
+    assert parse_ranges(text) == [(hm(start), hm(end)) for start, end in expected]
+
+
+def test_per_day_hours_override_shared_days():
+    hours = parse_available_time("Mon-Sat", "Monday: 10 AM - 1 PM | Saturday: 9 - 12 | Sunday: 9 - 5")
+
+    assert hours == {0: [(hm("10:00"), hm("13:00"))], 5: [(hm("09:00"), hm("12:00"))]}
+
+
+def test_bare_hours_schedule_ends_in_the_afternoon():
+    schedule = DoctorSchedule("Monday, Wednesday", "9 - 5", 30)
+
+    slots = schedule.labels(schedule.bitmap_for(MONDAY))
+    assert slots[0] == "09:00" and slots[-1] == "16:30" and len(slots) == 16
+    assert schedule.bitmap_for(MONDAY + timedelta(days=1)) == 0
+
+
+def test_concurrent_slot_requests_on_one_api(sqlite_db):
+    engine = sqlite_db(Doctor, DoctorAppointment, name="slots.db")
+    with engine.begin() as conn:
+        conn.execute(Doctor.__table__.insert(), [
+            {"DoctorId": i, "FirstName": "Asha", "LastName": "Rao", "AvailableDays": "Mon-Fri",
+             "AvailableTime": "9 - 5", "SlotDurationMinutes": 30}
+            for i in (1, 2)
+        ])
+        conn.execute(DoctorAppointment.__table__.insert(), {
+            "DoctorId": 1, "AppointmentDate": MONDAY, "AppointmentTime": "10:00 AM", "Status": "Booked",
+        })
+
+    app = FastAPI()
+    app.include_router(DoctorAPI().router)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*[
+                client.get(f"/doctors/{1 + i % 2}/slots", params={"from": MONDAY.isoformat(), "to": MONDAY.isoformat()})
+                for i in range(30)
+            ])
+
+    responses = asyncio.run(run())
+
+    assert [r.status_code for r in responses] == [200] * 30
+    for i, response in enumerate(responses):
+        day = response.json()["Days"][0]
+        assert day["AvailableCount"] == (15 if i % 2 == 0 else 16)
+        assert ("10:00" in day["Slots"]) == (i % 2 == 1)
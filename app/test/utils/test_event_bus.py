@@ -0,0 +1,62 @@
+import asyncio
+
+from app.utils.event_bus import EventBus
+
+
+def test_handlers_receive_exact_wildcard_and_catch_all_subscriptions():
+    bus, received = EventBus(), []
+
+    async def record(tag):
+        async def handler(event):
+            received.append((tag, event.name))
+        return handler
+
+    async def run():
+        bus.subscribe("order.created", await record("exact"))
+        bus.subscribe("order.*", await record("entity"))
+        bus.subscribe("*", await record("all"))
+        bus.publish("order.created", OrderId=1)
+        bus.publish("prescription.created", PrescriptionId=2)
+        await bus.stop()
+
+    asyncio.run(run())
+    assert received == [
+        ("exact", "order.created"), ("entity", "order.created"), ("all", "order.created"),
+        ("all", "prescription.created"),
+    ]
+
+
+def test_failing_handler_does_not_block_others():
+    bus, received = EventBus(), []
+
+    async def broken(event):
+        raise RuntimeError("boom")
+
+    async def healthy(event):
+        received.append(event.payload["OrderId"])
+
+    async def run():
+        bus.subscribe("order.*", broken)
+        bus.subscribe("order.*", healthy)
+        for i in range(3):
+            bus.publish("order.status_changed", OrderId=i)
+        await bus.stop()
+
+    asyncio.run(run())
+    assert received == [0, 1, 2]
+
+
+def test_full_queue_drops_instead_of_blocking_publisher():
+    bus, received = EventBus(max_queue_size=2), []
+
+    async def handler(event):
+        received.append(event.payload["n"])
+
+    async def run():
+        bus.subscribe("*", handler)
+        for n in range(5):
+            bus.publish("order.created", n=n)  # dispatcher has not run yet
+        await bus.stop()
+
+    asyncio.run(run())
+    assert received == [0, 1]
@@ -0,0 +1,47 @@
+import sqlite3
+from datetime import date
+
+from app.scripts.generate_data import SCALES, TABLES, DataGenerator
+
+
+def _generate(path, seed=42):
+    DataGenerator(f"sqlite+aiosqlite:///{path}", seed=seed, anchor=date(2025, 1, 1)).generate(SCALES["tiny"])
+    return sqlite3.connect(path)
+
+
+def _dump(conn):
+    return {
+        model.__tablename__: conn.execute(f'SELECT * FROM "{model.__tablename__}" ORDER BY 1, 2').fetchall()
+        for model in TABLES
+    }
+
+
+def test_same_seed_and_anchor_give_identical_rows(tmp_path):
+    first = _dump(_generate(tmp_path / "a.db"))
+    assert first == _dump(_generate(tmp_path / "b.db"))
+    assert first["Orders"] != _dump(_generate(tmp_path / "c.db", seed=7))["Orders"]
+
+
+def test_rows_reference_each_other(tmp_path):
+    conn = _generate(tmp_path / "data.db")
+    scalar = lambda sql: conn.execute(sql).fetchone()[0]
+
+    assert scalar("SELECT COUNT(*) FROM Orders") == SCALES["tiny"].orders
+    assert scalar("SELECT COUNT(*) FROM OrderItem WHERE MedicineId NOT IN (SELECT MedicineId FROM Medicine)") == 0
+    assert scalar("SELECT COUNT(*) FROM Orders WHERE CustomerId NOT IN (SELECT CustomerId FROM customer)") == 0
+    assert scalar("SELECT COUNT(*) FROM Prescription WHERE OrderId NOT IN (SELECT OrderId FROM Orders)") == 0
+    assert scalar("SELECT COUNT(*) FROM customer WHERE PostalCode NOT IN (SELECT Pincode FROM PincodeCentroid)") == 0
+    assert scalar("SELECT COUNT(*) FROM AppointmentTest WHERE TestId NOT IN (SELECT TestId FROM Test)") == 0
+    # Order totals and status counters agree with their lines, as the managers write them
+    assert scalar("""
+        SELECT COUNT(*) FROM Orders o
+        WHERE abs(o.TotalAmount - (SELECT SUM(TotalAmount) FROM OrderItem i WHERE i.OrderId = o.OrderId)) > 0.01
+    """) == 0
+    assert scalar("SELECT SUM(Count) FROM OrderStatusCounter WHERE OwnerType = 'Customer'") == SCALES["tiny"].orders
+    assert scalar("""
+        SELECT COUNT(*) FROM Appointment a
+        WHERE abs(a.NetPayable - (SELECT SUM(NetPrice) FROM AppointmentTest t WHERE t.AppointmentId = a.AppointmentId)) > 0.01
+    """) == 0
+    # Cancelled bookings release their slot
+    assert scalar("SELECT COUNT(*) FROM DoctorAppointment WHERE Status = 'Cancelled' AND SlotKey IS NOT NULL") == 0
+    assert scalar("SELECT COUNT(*) FROM PincodeNeighbour WHERE Rank = 1") == scalar("SELECT COUNT(*) FROM PincodeCentroid")
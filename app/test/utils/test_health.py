@@ -0,0 +1,98 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.system.health_api import HealthAPI
+from app.config import settings
+from app.crud.customer import lab_test_catalog as catalog_module, pincode_manager as pincode_module
+from app.crud.customer.cart_manager import CartManager
+from app.crud.customer.doctor_manager import DoctorAppointmentManager
+from app.crud.customer.lab_test_catalog import LabTestCatalog
+from app.crud.system.readiness_manager import ReadinessManager
+from app.db.base.engine_registry import engine_registry
+from app.models.customer.cart_model import Cart, CartItem
+from app.models.customer.doctor_model import Doctor, DoctorAppointment
+from app.models.customer.lap_model import Test
+from app.models.customer.medicine_model import Medicine
+from app.models.customer.pincode_model import PincodeNeighbour
+
+
+@pytest.fixture
+def sqlite_url(sqlite_db, monkeypatch):
+    engine = sqlite_db(Cart, CartItem, Medicine, Test, PincodeNeighbour, Doctor, DoctorAppointment, name="health.db")
+    with engine.begin() as conn:
+        conn.execute(Test.__table__.insert(), {"TestId": 1, "LabId": 1, "Name": "Lipid Profile", "Price": 600.0})
+        conn.execute(Doctor.__table__.insert(), {
+            "DoctorId": 1, "FirstName": "Asha", "LastName": "Rao", "AvailableDays": "Mon-Sat",
+            "AvailableTime": "9 AM - 1 PM", "SlotDurationMinutes": 30,
+        })
+        conn.execute(PincodeNeighbour.__table__.insert(), {
+            "Pincode": "560001", "NeighbourPincode": "560002", "Rank": 1, "DistanceKm": 1.2,
+        })
+    # Warm-up fills process-wide caches; keep them out of other tests
+    monkeypatch.setattr(catalog_module, "lab_test_catalog", LabTestCatalog())
+    monkeypatch.setattr(pincode_module, "_neighbour_index", None)
+    return settings.sqlite_url
+
+
+def test_concurrent_calls_share_one_engine_and_close_it_after(sqlite_url):
+    manager = CartManager("sqlite")
+
+    async def run():
+        results = await asyncio.gather(*[manager.get_cart(customer_id) for customer_id in range(1, 41)])
+        return results, engine_registry.is_open(sqlite_url)
+
+    results, still_open = asyncio.run(run())
+
+    # One request's disconnect used to dispose the engine under the others
+    assert all(r.get("success", True) for r in results)
+    assert not still_open
+
+
+def test_concurrent_calls_on_one_manager_each_get_their_own_session(sqlite_url):
+    # One manager instance serves every request, as the API classes hold it
+    manager = DoctorAppointmentManager("sqlite")
+
+    async def run():
+        return await asyncio.gather(*[manager.get_available_slots(1) for _ in range(20)])
+
+    # Sessions used to live on the manager, and the first disconnect dropped
+    # the one a call awaiting its doctor lookup was about to use
+    results = asyncio.run(run())
+
+    assert all(r["DoctorId"] == 1 and len(r["Days"]) == 7 for r in results)
+    assert not engine_registry.is_open(sqlite_url)
+
+
+def test_readyz_reports_warm_up_and_pool(sqlite_url):
+    manager = ReadinessManager("sqlite")
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await manager.warm_up()
+        yield
+        await engine_registry.close_all()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(HealthAPI(manager).router)
+
+    cold = TestClient(app)   # no lifespan yet
+    assert cold.get("/healthz").status_code == 200
+    assert cold.get("/readyz").status_code == 503
+
+    with TestClient(app) as client:
+        response = client.get("/readyz")
+        body = response.json()
+
+    assert response.status_code == 200
+    assert body["Ready"] is True
+    assert body["WarmUp"]["Connections"]["Result"] == settings.db_warm_connections
+    assert body["WarmUp"]["PincodeIndex"]["Result"] == 1
+    assert body["WarmUp"]["LabTestCatalog"]["Result"] == 1
+    pool = body["Pools"][sqlite_url]
+    assert pool["Pinned"] is True
+    assert pool["CheckedIn"] >= settings.db_warm_connections
+    assert not engine_registry.is_open(sqlite_url)
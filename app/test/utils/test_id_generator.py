@@ -0,0 +1,96 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.crud.system.node_lease_manager import NodeLeaseManager
+from app.models.customer.node_lease_model import NodeIdLease
+from app.utils import id_generator
+from app.utils.id_generator import MAX_SEQUENCE, SnowflakeGenerator, get_id_generator, use_node_id
+from app.utils.timezone import ist_now
+
+
+@pytest.fixture
+def leases(sqlite_db, monkeypatch):
+    # The leased generator is process-wide; keep it out of other tests
+    monkeypatch.setattr(id_generator, "_generator", None)
+    monkeypatch.setattr(id_generator, "_lease", None)
+    monkeypatch.setattr(settings, "node_id", 5)
+    return sqlite_db(NodeIdLease, name="leases.db")
+
+
+def test_ids_are_unique_and_increasing_under_burst():
+    generator = SnowflakeGenerator(node_id=7)
+    ids = [generator.next_id() for _ in range(50_000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_sequence_overflow_moves_to_next_millisecond():
+    generator = SnowflakeGenerator(node_id=1)
+    ids = [generator.next_id() for _ in range(3 * (MAX_SEQUENCE + 1))]
+
+    timestamps = [SnowflakeGenerator.decode(i)[0] for i in ids]
+    assert len(set(ids)) == len(ids)
+    assert max(timestamps) - min(timestamps) >= 2
+
+
+def test_threads_and_nodes_never_collide():
+    generators = [SnowflakeGenerator(node_id=n) for n in (1, 2)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        batches = list(pool.map(
+            lambda i: [generators[i % 2].next_id() for _ in range(5_000)], range(8)
+        ))
+
+    ids = [i for batch in batches for i in batch]
+    assert len(set(ids)) == len(ids)
+    assert {SnowflakeGenerator.decode(i)[1] for i in ids} == {1, 2}
+
+
+def test_workers_sharing_node_id_lease_distinct_nodes(leases):
+    workers = [NodeLeaseManager("sqlite", 60) for _ in range(3)]
+
+    async def run():
+        return await asyncio.gather(*[worker.claim() for worker in workers])
+
+    # All three start with NODE_ID=5, which used to give them one node
+    assert sorted(asyncio.run(run())) == [5, 6, 7]
+    assert SnowflakeGenerator.decode(get_id_generator().next_id())[1] in {5, 6, 7}
+
+    asyncio.run(workers[0].release())
+    with leases.connect() as conn:
+        assert sorted(conn.execute(select(NodeIdLease.NodeId)).scalars()) == [6, 7]
+
+
+def test_lost_lease_stops_ids_and_leases_a_new_node(leases):
+    stalled, other = NodeLeaseManager("sqlite", 60), NodeLeaseManager("sqlite", 60)
+    assert asyncio.run(stalled.claim()) == 5
+
+    # The first worker stalls past its lease, and another takes the node over
+    with leases.begin() as conn:
+        conn.execute(update(NodeIdLease).values(ExpiresAt=ist_now() - timedelta(seconds=1)))
+    assert asyncio.run(other.claim()) == 5
+
+    assert asyncio.run(stalled.renew()) is False
+    assert stalled.node_id == 6
+    with leases.connect() as conn:
+        owners = dict(conn.execute(select(NodeIdLease.NodeId, NodeIdLease.Owner)).all())
+    assert owners == {5: other.owner, 6: stalled.owner}
+
+
+def test_no_ids_after_the_lease_lapses_or_in_a_forked_child(leases, monkeypatch):
+    use_node_id(3, time.monotonic() + 60)
+    assert get_id_generator().node_id == 3
+
+    use_node_id(3, time.monotonic() - 1)
+    with pytest.raises(RuntimeError, match="expired"):
+        get_id_generator()
+
+    monkeypatch.setattr(id_generator, "_lease", (-1, time.monotonic() + 60))
+    with pytest.raises(RuntimeError, match="Forked"):
+        get_id_generator()
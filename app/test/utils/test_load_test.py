@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+
+from app.benchmarks.load_test import SCENARIOS, build_plan
+from app.benchmarks.stats import percentile, summarize
+from app.scripts.generate_data import SCALES
+
+
+def test_percentiles_use_nearest_rank():
+    values = [i / 1000 for i in range(1, 101)]   # 1..100 ms
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    summary = summarize(values, elapsed=2.0)
+    assert summary["Requests"] == 100
+    assert summary["Rps"] == 50.0
+    assert summary["P95Ms"] == 95.0
+
+
+def test_request_plan_is_reproducible():
+    first = build_plan(SCALES["tiny"], 200, seed=7)
+    assert first == build_plan(SCALES["tiny"], 200, seed=7)
+    assert first != build_plan(SCALES["tiny"], 200, seed=8)
+    assert {name for name, _ in first} == {s.name for s in SCENARIOS}
+
+
+def test_load_test_reports_every_endpoint(tmp_path):
+    output = tmp_path / "report.json"
+    subprocess.run(
+        [sys.executable, "-m", "app.benchmarks.load_test", "--scale", "tiny", "--requests", "80",
+         "--warmup", "0", "--concurrency", "1", "--db", str(tmp_path / "load.db"), "--output", str(output)],
+        check=True, capture_output=True, timeout=120,
+    )
+
+    report = json.loads(output.read_text())
+    assert report["Total"]["Requests"] == 80
+    assert report["Total"]["Errors"] == 0
+    for endpoint in report["Endpoints"].values():
+        assert endpoint["P50Ms"] <= endpoint["P95Ms"] <= endpoint["P99Ms"]
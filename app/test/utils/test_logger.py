@@ -0,0 +1,76 @@
+import json
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.request_id import RequestIdMiddleware
+from app.utils.logger import (
+    JsonFormatter, RequestIdFilter, SamplingFilter, get_logger, request_id_var, start_logging, stop_logging,
+)
+
+
+def _record(level=logging.INFO, msg="Order %s created", args=(7,)):
+    return logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_includes_request_id_and_lazy_message():
+    record = _record()
+    token = request_id_var.set("req-1")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Order 7 created"
+    assert entry["request_id"] == "req-1"
+    assert entry["level"] == "INFO"
+
+
+def test_sampling_drops_info_but_never_warnings():
+    sampler = SamplingFilter(0.0)
+    assert not sampler.filter(_record(logging.INFO))
+    assert sampler.filter(_record(logging.WARNING))
+    assert SamplingFilter(1.0).filter(_record(logging.INFO))
+
+
+def test_get_logger_writes_through_a_queue_handler():
+    logger = get_logger("app.test.queue")
+    assert [type(h).__name__ for h in logger.handlers] == ["_NonBlockingQueueHandler"]
+
+
+def test_stop_logging_flushes_and_start_logging_resumes():
+    logger = get_logger("app.test.flush")
+    log_queue = logger.handlers[0].queue
+    try:
+        stop_logging()
+        logger.warning("after shutdown")
+        assert log_queue.qsize() == 1
+
+        stop_logging()                  # e.g. at exit: writes what was queued since
+        assert log_queue.empty()
+
+        start_logging()                 # next lifespan in the same process
+        logger.warning("after restart")
+        stop_logging()
+        assert log_queue.empty()
+    finally:
+        start_logging()
+
+
+def test_request_id_is_propagated_to_context_and_response():
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/ping")
+    async def ping():
+        return {"RequestId": request_id_var.get()}
+
+    with TestClient(app) as client:
+        given = client.get("/ping", headers={"X-Request-ID": "abc-123"})
+        generated = client.get("/ping", headers={"X-Request-ID": "bad id\n"})
+
+    assert given.headers["x-request-id"] == given.json()["RequestId"] == "abc-123"
+    assert generated.headers["x-request-id"] == generated.json()["RequestId"]
+    assert len(generated.json()["RequestId"]) == 32
@@ -0,0 +1,23 @@
+import asyncio
+
+from app.benchmarks.manager_bench import CASES, check, run_suite, to_baselines
+
+
+def test_every_case_runs_in_both_modes_and_gates_on_query_count():
+    report = asyncio.run(run_suite(scale="tiny", repeat=3, warmup=1))
+
+    for mode in ("memory", "file"):
+        assert set(report["Results"][mode]) == {c.name for c in CASES}
+        for result in report["Results"][mode].values():
+            assert result["Errors"] == 0
+            assert result["MaxQueriesPerCall"] >= 1
+
+    baselines = to_baselines(report)
+    assert check(report, baselines, time_tolerance=None) == []
+
+    baselines["Cases"]["memory/CartManager.get_cart"]["QueriesPerCall"] -= 1
+    problems = check(report, baselines, time_tolerance=None)
+    assert len(problems) == 1 and problems[0].startswith("memory/CartManager.get_cart:")
+
+    baselines["Meta"]["Scale"] = "large"
+    assert "baselines were recorded" in check(report, baselines)[0]
@@ -0,0 +1,87 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.api.system.metrics_api import MetricsAPI
+from app.middleware.metrics import MetricsMiddleware
+from app.utils.metrics import (
+    _rows_of, Histogram, MetricsRegistry, RequestStats, current_request, install_sqlalchemy_hooks,
+    db_queries_per_request, http_requests_total,
+)
+
+
+def test_histogram_renders_cumulative_prometheus_buckets():
+    registry = MetricsRegistry()
+    latency = registry.register(Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 3.0):
+        latency.observe(value, "/orders/{order_id}")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/orders/{order_id}",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/orders/{order_id}",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/orders/{order_id}",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/orders/{order_id}"} 3' in lines
+
+
+def test_engine_hooks_count_queries_of_the_current_request():
+    install_sqlalchemy_hooks()
+    engine = create_engine("sqlite://")
+    stats = RequestStats()
+    token = current_request.set(stats)
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1), (2), (3)"))
+            conn.execute(text("SELECT x FROM t")).all()
+    finally:
+        current_request.reset(token)
+        engine.dispose()
+
+    assert stats.queries == 3
+    assert stats.rows == 3   # rows affected by the INSERT
+    assert stats.db_seconds > 0
+
+
+def test_row_counts_are_unknown_when_the_driver_hides_them():
+    class Cursor:
+        rowcount = -1
+
+    class Buffered(Cursor):
+        _rows = [(1,), (2,)]
+
+    class Unsized(Cursor):
+        _rows = iter([(1,)])
+
+    assert _rows_of(Buffered(), "SELECT") == 2
+    assert _rows_of(Cursor(), "SELECT") is None
+    assert _rows_of(Unsized(), "SELECT") is None
+    assert _rows_of(object(), "UPDATE") is None
+
+
+def test_requests_are_labelled_by_route_template_and_exposed_on_metrics():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(MetricsAPI().router)
+    engine = create_engine("sqlite://")
+
+    @app.get("/things/{thing_id}")
+    def get_thing(thing_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1")).all()
+            conn.execute(text("SELECT 2")).all()
+        return {"ThingId": thing_id}
+
+    before = http_requests_total.value("GET", "/things/{thing_id}", "200")
+    queries_before = db_queries_per_request.count("/things/{thing_id}")
+    with TestClient(app) as client:
+        client.get("/things/1")
+        client.get("/things/2")
+        client.get("/missing")
+        response = client.get("/metrics")
+
+    assert http_requests_total.value("GET", "/things/{thing_id}", "200") == before + 2
+    assert db_queries_per_request.count("/things/{thing_id}") == queries_before + 2
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in response.text
+    assert "/things/1" not in response.text
@@ -0,0 +1,28 @@
+import asyncio
+
+from app.utils.password_hasher import PasswordHasher, legacy_sha256
+
+
+def test_hash_and_verify_roundtrip():
+    hasher = PasswordHasher(rounds=4, workers=2)
+    stored = asyncio.run(hasher.hash("s3cret"))
+
+    assert stored.startswith("$2b$04$")
+    assert asyncio.run(hasher.verify("s3cret", stored)) == (True, None)
+    assert asyncio.run(hasher.verify("wrong", stored)) == (False, None)
+    assert asyncio.run(hasher.verify("", stored)).valid is False
+    hasher.shutdown()
+
+
+def test_legacy_and_weaker_hashes_are_upgraded_on_verify():
+    hasher = PasswordHasher(rounds=5, workers=1)
+
+    for stored in (legacy_sha256("s3cret"), "s3cret", PasswordHasher(rounds=4).hash_sync("s3cret")):
+        result = asyncio.run(hasher.verify("s3cret", stored))
+        assert result.valid
+        assert result.new_hash.startswith("$2b$05$")
+        assert asyncio.run(hasher.verify("s3cret", result.new_hash)) == (True, None)
+
+    assert asyncio.run(hasher.verify("wrong", legacy_sha256("s3cret"))) == (False, None)
+    assert asyncio.run(hasher.verify("wrong", "s3cret")) == (False, None)
+    hasher.shutdown()
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.system.profiler_api import ProfilerAPI
+from app.config import settings
+from app.middleware.profiling import ProfilingMiddleware
+from app.utils.profiler import SamplingProfiler
+
+
+async def slow_manager_call():
+    await asyncio.sleep(0.2)
+
+
+def test_sampler_records_suspended_task_await_chains():
+    async def run():
+        task = asyncio.create_task(slow_manager_call())
+        profiler = SamplingProfiler(0.01, loop=asyncio.get_running_loop(), exclude_task=asyncio.current_task())
+        profiler.start()
+        await task
+        return profiler.stop()
+
+    profiler = asyncio.run(run())
+    assert profiler.samples > 0
+    assert any(stack.startswith("app/test/utils/test_profiler.py:slow_manager_call;tasks.py:sleep")
+               for stack in profiler.tasks)
+    top = {row["Function"] for row in profiler.summary()["Tasks"]}
+    assert "app/test/utils/test_profiler.py:slow_manager_call" in top
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(ProfilerAPI().router)
+
+    @app.get("/busy")
+    async def busy():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return {"success": True}
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_profile_endpoint_requires_admin_token(client):
+    assert client.get("/admin/profile?seconds=0.05").status_code == 403
+    assert client.get("/admin/profile?seconds=0.05", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    response = client.get("/admin/profile?seconds=0.05&format=json", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    assert response.json()["Samples"] > 0
+
+
+def test_x_profile_header_returns_pstats_for_one_request(client):
+    plain = client.get("/busy", headers={"X-Profile": "pstats"})
+    assert plain.json() == {"success": True}   # no admin token: not profiled
+
+    profiled = client.get("/busy", headers={"X-Profile": "pstats", "X-Admin-Token": "s3cret"})
+    assert profiled.headers["x-profiled-status"] == "200"
+    assert "function calls" in profiled.text
+    assert "busy" in profiled.text
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.customer.live_updates_api import LiveUpdatesAPI
+from app.config import settings
+from app.utils.auth_tokens import token_service
+from app.utils.event_bus import Event
+from app.utils.push_hub import PushHub, customer_topic, push_hub, retailer_topic
+from app.utils.timezone import ist_now
+
+
+def _event(name, **payload):
+    return Event(name, payload, ist_now())
+
+
+def test_events_are_routed_to_customer_and_retailer_topics():
+    hub = PushHub()
+
+    async def run():
+        customer = hub.subscribe(customer_topic(7))
+        retailer = hub.subscribe(retailer_topic(3))
+        other = hub.subscribe(customer_topic(8))
+        await hub.handle(_event("order.status_changed", OrderId=1, CustomerId=7, RetailerId=3, Status="Shipped"))
+        return [await s.next(0.01) for s in (customer, retailer, other)]
+
+    customer, retailer, other = asyncio.run(run())
+    assert customer["event"] == retailer["event"] == "order.status_changed"
+    assert customer["data"]["Status"] == "Shipped"
+    assert other is None
+
+
+def test_slow_connection_drops_oldest_and_asks_for_resync():
+    hub = PushHub(max_queue_size=2)
+
+    async def run():
+        subscription = hub.subscribe(customer_topic(7))
+        for i in range(5):
+            await hub.handle(_event("notification.created", NotificationId=i, CustomerId=7))
+        return [await subscription.next(0.01) for _ in range(4)]
+
+    resync, first, second, empty = asyncio.run(run())
+    assert resync == {"id": None, "event": "resync", "data": {"Dropped": 3}}
+    assert [first["data"]["NotificationId"], second["data"]["NotificationId"]] == [3, 4]
+    assert empty is None
+
+
+def test_websocket_sends_heartbeats(monkeypatch):
+    monkeypatch.setattr(settings, "push_heartbeat_seconds", 0.01)
+    app = FastAPI()
+    app.include_router(LiveUpdatesAPI().router)
+
+    token, _ = token_service.issue("customer", 7)
+
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/live/customers/7/ws?access_token={token}") as ws:
+            assert ws.receive_json() == {"event": "heartbeat"}
+
+
+def test_streams_need_a_token_for_the_user_in_the_path():
+    app = FastAPI()
+    app.include_router(LiveUpdatesAPI().router)
+    customer_7, _ = token_service.issue("customer", 7)
+    retailer_7, _ = token_service.issue("retailer", 7)
+    client = TestClient(app)
+
+    assert client.get("/live/customers/7/events").status_code == 401
+    assert client.get("/live/customers/7/events", params={"access_token": "forged"}).status_code == 401
+    assert client.get("/live/customers/8/events", headers={"Authorization": f"Bearer {customer_7}"}).status_code == 403
+    assert client.get("/live/retailers/7/events", params={"access_token": customer_7}).status_code == 403
+
+    for path in ("/live/customers/7/ws", f"/live/customers/8/ws?access_token={customer_7}",
+                 f"/live/customers/7/ws?access_token={retailer_7}"):
+        with pytest.raises(WebSocketDisconnect) as closed:
+            with client.websocket_connect(path) as ws:
+                ws.receive_json()
+        assert closed.value.code == 1008
+
+
+def test_event_stream_subscribes_only_once_iterated():
+    api = LiveUpdatesAPI()
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    before = push_hub.connection_count()
+
+    async def run():
+        # Client gone before the first chunk: the body is closed unstarted
+        abandoned = api._event_stream(request, customer_topic(7))
+        assert push_hub.connection_count() == before
+        await abandoned.body_iterator.aclose()
+
+        served = api._event_stream(request, customer_topic(7))
+        assert await served.body_iterator.__anext__() == "retry: 3000\n\n"
+        assert push_hub.connection_count() == before + 1
+        await served.body_iterator.aclose()
+
+    asyncio.run(run())
+    assert push_hub.connection_count() == before
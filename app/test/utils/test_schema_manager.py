@@ -0,0 +1,72 @@
+import asyncio
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.config import settings
+from app.crud.customer.order_archive_manager import OrderArchiveManager
+from app.crud.customer.order_manager import OrderManager
+from app.crud.system.schema_manager import SchemaManager
+from app.models.customer.lap_model import AppointmentTest
+from app.models.customer.order_model import Order, OrderItemArchive, OrderStatusCounter, OrdersArchive
+from app.scripts.create_tables import TableCreator
+
+SHIPPED_DB = Path(__file__).resolve().parents[3] / "medical.db"
+
+
+@pytest.fixture
+def shipped_db(tmp_path, monkeypatch):
+    """A copy of the database checked in at the repo root, from before OrderNo and the counters."""
+    db_file = tmp_path / "medical.db"
+    shutil.copy(SHIPPED_DB, db_file)
+    monkeypatch.setattr(settings, "sqlite_url", f"sqlite+aiosqlite:///{db_file}")
+    monkeypatch.setattr(settings, "pincode_csv_path", str(tmp_path / "no-pincodes.csv"))
+    return db_file
+
+
+def columns(db_file, table):
+    with sqlite3.connect(db_file) as conn:
+        return {row[1] for row in conn.execute(f"PRAGMA table_info({table});")}
+
+
+def test_startup_migrates_an_old_database_and_orders_read_again(shipped_db):
+    assert "OrderNo" not in columns(shipped_db, "Orders")
+
+    report = asyncio.run(SchemaManager("sqlite").ensure())
+
+    assert {"OrderNumbers", "OrderArchive", "OrderStatusCounters", "Pincodes"} <= set(report["Applied"])
+    assert "OrderNo" in columns(shipped_db, "Orders")
+    for model in (Order, OrderStatusCounter, OrdersArchive, OrderItemArchive):
+        assert model.__tablename__ not in report["MissingTables"]
+
+    with sqlite3.connect(shipped_db) as conn:
+        customer_id, orders = conn.execute(
+            "SELECT CustomerId, COUNT(*) FROM Orders GROUP BY CustomerId ORDER BY CustomerId LIMIT 1;"
+        ).fetchone()
+    result = asyncio.run(OrderManager("sqlite").get_orders_by_customer(customer_id))
+    assert result["TotalOrders"] == orders
+
+    archived = asyncio.run(OrderArchiveManager("sqlite").archive_orders(older_than_days=0, max_batches=1))
+    assert archived["success"], archived
+
+    # Already current: the next start applies nothing
+    assert asyncio.run(SchemaManager("sqlite").ensure())["Applied"] == []
+
+
+def test_startup_refuses_when_mapped_columns_are_missing(shipped_db, monkeypatch):
+    monkeypatch.setattr(settings, "db_migrate_on_startup", False)
+
+    with pytest.raises(RuntimeError, match="Orders.OrderNo"):
+        asyncio.run(SchemaManager("sqlite").ensure())
+
+
+def test_startup_adds_appointment_test_lines_next_to_existing_appointments(shipped_db):
+    TableCreator(settings.sqlite_url).create_appointment_table()
+
+    report = asyncio.run(SchemaManager("sqlite").ensure())
+
+    assert "AppointmentTests" in report["Applied"]
+    assert AppointmentTest.__tablename__ not in report["MissingTables"]
+    assert "TestId" in columns(shipped_db, "AppointmentTest")
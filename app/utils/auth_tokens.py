@@ -0,0 +1,161 @@
+# app/utils/auth_tokens.py
+
+import hmac
+import secrets
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import jwt
+
+from ..config import settings
+from ..exceptions.custom_exceptions import UnauthorizedException
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenService:
+    """
+    Signed access tokens (JWT) with key ids and an LRU cache of verified claims.
+
+    Tokens are signed with the active key and carry its id in the `kid`
+    header; any configured key verifies. To rotate: add the new key to
+    JWT_KEYS, point JWT_ACTIVE_KID at it, and drop the old key once tokens
+    signed with it have expired (jwt_ttl_seconds).
+
+    A verified token's claims are cached, so repeat requests with the same
+    token cost a dict lookup and an expiry check instead of a signature check.
+
+    Revocations (logout) are held in this process only: under several
+    workers a revoked token is still accepted by the others until it
+    expires, so the TTL bounds how long a logged-out token stays usable.
+
+    Without keys a random per-process key is generated, which only works
+    with a single worker and invalidates every token on restart; pass
+    allow_random_key=False (APP_ENV other than development) to refuse instead.
+    """
+
+    def __init__(
+        self,
+        keys: Dict[str, str],
+        active_kid: Optional[str] = None,
+        algorithm: str = "HS256",
+        ttl_seconds: int = 3600,
+        issuer: str = "medical-app",
+        cache_size: int = 10000,
+        allow_random_key: bool = True,
+    ):
+        if not keys:
+            if not allow_random_key:
+                raise RuntimeError("JWT_KEYS is not set; refusing to start with a random signing key")
+            kid = f"dev-{secrets.token_hex(4)}"
+            keys = {kid: secrets.token_urlsafe(32)}
+            logger.warning(f"⚠️ JWT_KEYS not set, signing with a random per-process key '{kid}'")
+        self.keys = dict(keys)
+        self.active_kid = active_kid or next(iter(self.keys))
+        if self.active_kid not in self.keys:
+            raise ValueError(f"Active JWT key '{self.active_kid}' is not in JWT_KEYS")
+        self.algorithm = algorithm
+        self.ttl_seconds = ttl_seconds
+        self.issuer = issuer
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}   # jti -> exp
+
+    # ------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------
+    def add_key(self, kid: str, secret: str, activate: bool = False) -> None:
+        self.keys[kid] = secret
+        if activate:
+            self.active_kid = kid
+
+    def remove_key(self, kid: str) -> None:
+        if kid == self.active_kid:
+            raise ValueError("Cannot remove the active signing key")
+        self.keys.pop(kid, None)
+        for token in [t for t, claims in self._cache.items() if claims["_kid"] == kid]:
+            del self._cache[token]
+
+    # ------------------------------------------------------------
+    # Tokens
+    # ------------------------------------------------------------
+    def issue(self, user_type: str, user_id: int, email: Optional[str] = None) -> Tuple[str, dict]:
+        now = int(time.time())
+        claims = {
+            "sub": str(user_id),
+            "typ": user_type,
+            "email": email,
+            "iss": self.issuer,
+            "iat": now,
+            "exp": now + self.ttl_seconds,
+            "jti": uuid.uuid4().hex,
+        }
+        token = jwt.encode(
+            claims, self.keys[self.active_kid], algorithm=self.algorithm, headers={"kid": self.active_kid}
+        )
+        return token, claims
+
+    def verify(self, token: str) -> dict:
+        """Claims of a valid token; raises UnauthorizedException otherwise."""
+        now = time.time()
+        claims = self._cache.get(token)
+        if claims is not None:
+            if claims["exp"] > now and claims["_kid"] in self.keys and claims["jti"] not in self._revoked:
+                self._cache.move_to_end(token)
+                return claims
+            del self._cache[token]
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            secret = self.keys.get(kid)
+            if secret is None:
+                raise UnauthorizedException("Unknown signing key")
+            claims = jwt.decode(
+                token, secret, algorithms=[self.algorithm], issuer=self.issuer,
+                options={"require": ["exp", "sub", "jti"]},
+            )
+        except jwt.ExpiredSignatureError:
+            raise UnauthorizedException("Token expired")
+        except jwt.InvalidTokenError as e:
+            raise UnauthorizedException(f"Invalid token: {e}")
+        if claims["jti"] in self._revoked:
+            raise UnauthorizedException("Token revoked")
+
+        claims["_kid"] = kid
+        self._cache[token] = claims
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return claims
+
+    def revoke(self, token: str) -> None:
+        claims = self.verify(token)
+        self._cache.pop(token, None)
+        now = time.time()
+        # Revocations only need to outlive the token
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        self._revoked[claims["jti"]] = claims["exp"]
+
+    def cache_info(self) -> dict:
+        return {"Size": len(self._cache), "MaxSize": self.cache_size, "Revoked": len(self._revoked)}
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """Constant-time check of an X-Admin-Token value; always False when ADMIN_TOKEN is unset."""
+    expected = settings.admin_token
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+
+
+token_service = TokenService(
+    settings.jwt_keys,
+    settings.jwt_active_kid,
+    settings.jwt_algorithm,
+    settings.jwt_ttl_seconds,
+    settings.jwt_issuer,
+    settings.token_cache_size,
+    allow_random_key=settings.app_env.lower() in ("development", "dev"),
+)
@@ -0,0 +1,184 @@
+# app/utils/doctor_schedule.py
+
+import re
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_DAY_INDEX = {name[:3].lower(): i for i, name in enumerate(WEEKDAYS)}
+
+DEFAULT_SLOT_MINUTES = 15
+MINUTES_PER_DAY = 24 * 60
+
+# Doctor hours are copied from map listings: thin / narrow no-break spaces and en dashes
+_UNICODE_FIXES = str.maketrans({
+    "\u2009": " ", "\u202f": " ", "\u00a0": " ",
+    "\u2013": "-", "\u2014": "-", "\u2212": "-",
+})
+_TIME = re.compile(r"(\d{1,2})(?:[:.](\d{2}))?\s*([AaPp])\.?\s*[Mm]?\.?(?![A-Za-z])")
+_TIME_24 = re.compile(r"(\d{1,2})[:.](\d{2})")
+_RANGE = re.compile(
+    r"(\d{1,2}(?:[:.]\d{2})?\s*(?:[AaPp]\.?\s*[Mm]?\.?(?![A-Za-z]))?)\s*(?:-|to)\s*"
+    r"(\d{1,2}(?:[:.]\d{2})?\s*(?:[AaPp]\.?\s*[Mm]?\.?(?![A-Za-z]))?)"
+)
+_DAY_PREFIX = re.compile(r"^\s*([A-Za-z]+)\s*:\s*(.*)$")
+
+
+def _normalize(text: str) -> str:
+    return (text or "").translate(_UNICODE_FIXES)
+
+
+def _day_index(token: str) -> Optional[int]:
+    return _DAY_INDEX.get(token.strip()[:3].lower())
+
+
+def parse_days(available_days: Optional[str]) -> set:
+    """'Monday, Tuesday' / 'Mon-Fri' / 'Mon to Sat' -> {0, 1, ...}"""
+    days = set()
+    for part in re.split(r"[,/|;]", _normalize(available_days)):
+        bounds = [p for p in re.split(r"\s*(?:-|to)\s*", part.strip()) if p]
+        if len(bounds) == 2 and _day_index(bounds[0]) is not None and _day_index(bounds[1]) is not None:
+            start, end = _day_index(bounds[0]), _day_index(bounds[1])
+            days.update((start + i) % 7 for i in range((end - start) % 7 + 1))
+        elif len(bounds) == 1 and _day_index(bounds[0]) is not None:
+            days.add(_day_index(bounds[0]))
+    return days
+
+
+def _clock(hour: int, minute: int, meridian: Optional[str]) -> int:
+    if meridian:
+        hour = hour % 12 + (12 if meridian == "p" else 0)
+    return hour * 60 + minute
+
+
+def _split_time(token: str) -> Tuple[int, int, Optional[str]]:
+    m = re.match(r"\s*(\d{1,2})(?:[:.](\d{2}))?\s*([AaPp])?", token)
+    return int(m.group(1)), int(m.group(2) or 0), (m.group(3) or "").lower() or None
+
+
+def _valid_time(hour: int, minute: int, meridian: Optional[str]) -> bool:
+    return minute < 60 and (1 <= hour <= 12 if meridian else hour <= 24)
+
+
+def parse_time_of_day(text: Optional[str]) -> Optional[int]:
+    """'10:30 AM' / '10:30' / '4 PM' -> minutes since midnight"""
+    text = _normalize(text)
+    m = _TIME.search(text)
+    if m:
+        return _clock(int(m.group(1)), int(m.group(2) or 0), m.group(3).lower())
+    m = _TIME_24.search(text)
+    if m and int(m.group(1)) < 24:
+        return int(m.group(1)) * 60 + int(m.group(2))
+    return None
+
+
+def _parse_range(start_text: str, end_text: str, after: int = 0) -> Optional[Tuple[int, int]]:
+    sh, sm, s_mer = _split_time(start_text)
+    eh, em, e_mer = _split_time(end_text)
+    if not _valid_time(sh, sm, s_mer) or not _valid_time(eh, em, e_mer):
+        return None
+    end = _clock(eh, em, e_mer)
+    if e_mer and not s_mer:
+        # "10:00 - 11:30 AM" / "5:00 - 8:00 PM": start shares the end meridian
+        # unless that puts it after the end ("10:00 - 1:00 PM" is 10 AM)
+        start = _clock(sh, sm, e_mer)
+        if start > end:
+            start = _clock(sh, sm, "a" if e_mer == "p" else "p")
+    else:
+        start = _clock(sh, sm, s_mer)
+        if not s_mer and start < after and sh < 12:
+            # "9 - 1, 4 - 7": a bare range starting before the previous one ended is later in the day
+            start += 12 * 60
+    if end <= start and not e_mer and eh < 12 and end + 12 * 60 > start:
+        # "9 - 5" / "10:00 - 1:00" / "9 AM - 5": a bare end hour is in the afternoon
+        end += 12 * 60
+    if end <= start:
+        # Only an end written as midnight/AM ("6 PM - 12 AM", "22:00 - 00:00")
+        # or an evening start with a morning end ("20:00 - 02:00") runs past midnight
+        if not (e_mer or eh == 0 or (start >= 13 * 60 and eh < 12)):
+            return None
+        end = MINUTES_PER_DAY  # closes at/after midnight
+    return start, min(end, MINUTES_PER_DAY)
+
+
+def parse_ranges(text: str) -> List[Tuple[int, int]]:
+    text = _normalize(text)
+    if "closed" in text.lower():
+        return []
+    if "24 hours" in text.lower():
+        return [(0, MINUTES_PER_DAY)]
+    ranges = []
+    for m in _RANGE.finditer(text):
+        parsed = _parse_range(m.group(1), m.group(2), ranges[-1][1] if ranges else 0)
+        if parsed:
+            ranges.append(parsed)
+    return ranges
+
+
+def parse_available_time(
+    available_days: Optional[str], available_time: Optional[str]
+) -> Dict[int, List[Tuple[int, int]]]:
+    """
+    Weekday (0 = Monday) -> [(start_minute, end_minute), ...]
+    AvailableTime is either per day ("Monday: 10:00 AM - 1:00 PM | Sunday: Closed")
+    or a single set of ranges applied to every AvailableDays entry.
+    """
+    days = parse_days(available_days)
+    per_day: Dict[int, List[Tuple[int, int]]] = {}
+    shared: List[Tuple[int, int]] = []
+
+    for segment in _normalize(available_time).split("|"):
+        m = _DAY_PREFIX.match(segment)
+        if m and _day_index(m.group(1)) is not None:
+            per_day.setdefault(_day_index(m.group(1)), []).extend(parse_ranges(m.group(2)))
+        else:
+            shared.extend(parse_ranges(segment))
+
+    if not per_day:
+        per_day = {d: list(shared) for d in (days or range(7))}
+    elif days:
+        per_day = {d: r for d, r in per_day.items() if d in days}
+    return {d: r for d, r in per_day.items() if r}
+
+
+class DoctorSchedule:
+    """
+    A doctor's weekly schedule materialized as one slot bitmap per weekday.
+    Bit i of a bitmap is the slot starting at i * slot_minutes after midnight.
+    """
+
+    def __init__(self, available_days: Optional[str], available_time: Optional[str],
+                 slot_minutes: Optional[int]):
+        self.slot_minutes = slot_minutes if slot_minutes and slot_minutes > 0 else DEFAULT_SLOT_MINUTES
+        self.weekday_bitmaps = [0] * 7
+        for weekday, ranges in parse_available_time(available_days, available_time).items():
+            bitmap = 0
+            for start, end in ranges:
+                first = -(-start // self.slot_minutes)  # first slot starting inside the range
+                last = end // self.slot_minutes         # slots must end inside the range
+                for i in range(first, last):
+                    bitmap |= 1 << i
+            self.weekday_bitmaps[weekday] = bitmap
+
+    def slot_index(self, minute_of_day: int) -> int:
+        return minute_of_day // self.slot_minutes
+
+    def slot_label(self, index: int) -> str:
+        minute = index * self.slot_minutes
+        return f"{minute // 60:02d}:{minute % 60:02d}"
+
+    def bitmap_for(self, day: date) -> int:
+        return self.weekday_bitmaps[day.weekday()]
+
+    def labels(self, bitmap: int) -> List[str]:
+        labels = []
+        while bitmap:
+            low = bitmap & -bitmap
+            labels.append(self.slot_label(low.bit_length() - 1))
+            bitmap ^= low
+        return labels
+
+
+def date_range(start: date, end: date) -> Iterable[date]:
+    for i in range((end - start).days + 1):
+        yield start + timedelta(days=i)
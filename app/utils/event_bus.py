@@ -0,0 +1,118 @@
+# app/utils/event_bus.py
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from .logger import get_logger
+from .timezone import ist_now
+
+logger = get_logger(__name__)
+
+# Event names: "<entity>.<change>"
+ORDER_CREATED = "order.created"
+ORDER_UPDATED = "order.updated"
+ORDER_STATUS_CHANGED = "order.status_changed"
+ORDER_DELETED = "order.deleted"
+PRESCRIPTION_CREATED = "prescription.created"
+PRESCRIPTION_STATUS_CHANGED = "prescription.status_changed"
+APPOINTMENT_CREATED = "appointment.created"
+APPOINTMENT_UPDATED = "appointment.updated"
+APPOINTMENT_CANCELLED = "appointment.cancelled"
+NOTIFICATION_CREATED = "notification.created"
+
+
+class Event(NamedTuple):
+    name: str
+    payload: dict
+    created_at: datetime
+
+
+Handler = Callable[[Event], Awaitable[None]]
+
+
+class EventBus:
+    """
+    In-process async pub/sub.
+    publish() is synchronous and never waits for subscribers: events go onto a
+    bounded queue and one dispatcher task hands them to every handler
+    subscribed to the exact name, to "<entity>.*" or to "*".
+    A failing handler is logged and does not affect the others.
+    """
+
+    def __init__(self, max_queue_size: int = 10000):
+        self.max_queue_size = max_queue_size
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, pattern: str, handler: Handler) -> None:
+        if handler not in self._handlers[pattern]:
+            self._handlers[pattern].append(handler)
+
+    def unsubscribe(self, pattern: str, handler: Handler) -> None:
+        if handler in self._handlers.get(pattern, []):
+            self._handlers[pattern].remove(handler)
+
+    def publish(self, name: str, **payload) -> None:
+        try:
+            self._ensure_started()
+        except RuntimeError:
+            logger.error(f"❌ Event {name} dropped: no running event loop")
+            return
+        try:
+            self._queue.put_nowait(Event(name, payload, ist_now()))
+        except asyncio.QueueFull:
+            logger.error(f"❌ Event queue full, dropping {name}")
+
+    def start(self) -> None:
+        self._ensure_started()
+
+    async def stop(self) -> None:
+        """Deliver everything already published, then stop the dispatcher."""
+        if self._task is None:
+            return
+        if self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, RuntimeError):
+            pass
+        self._task, self._queue, self._loop = None, None, None
+
+    async def drain(self) -> None:
+        """Wait until every published event has been handled."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and self._loop is loop and not self._task.done():
+            return
+        # First use, or a new loop (tests / scripts calling asyncio.run repeatedly)
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = loop.create_task(self._dispatch())
+
+    def _handlers_for(self, name: str) -> List[Handler]:
+        entity = name.split(".", 1)[0]
+        return self._handlers.get(name, []) + self._handlers.get(f"{entity}.*", []) + self._handlers.get("*", [])
+
+    async def _dispatch(self) -> None:
+        queue = self._queue
+        while True:
+            event = await queue.get()
+            try:
+                for handler in self._handlers_for(event.name):
+                    try:
+                        await handler(event)
+                    except Exception as e:
+                        logger.error(f"❌ Event handler {getattr(handler, '__qualname__', handler)} failed for {event.name}: {e}")
+            finally:
+                queue.task_done()
+
+
+event_bus = EventBus()
@@ -0,0 +1,39 @@
+# app/utils/exporters.py
+
+import csv
+import io
+import json
+from typing import AsyncIterator, Dict, Sequence
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+async def csv_chunks(rows: AsyncIterator[Dict], columns: Sequence[str], rows_per_chunk: int = 500):
+    """Header, then rows_per_chunk rows per yielded string; only one chunk is ever in memory."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    async for row in rows:
+        writer.writerow(["" if row.get(c) is None else row.get(c) for c in columns])
+        count += 1
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+async def ndjson_chunks(rows: AsyncIterator[Dict], columns: Sequence[str], rows_per_chunk: int = 500):
+    """One JSON object per line, in columns order."""
+    lines = []
+    async for row in rows:
+        lines.append(json.dumps({c: row.get(c) for c in columns}, default=str))
+        if len(lines) >= rows_per_chunk:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
@@ -0,0 +1,89 @@
+# app/utils/geo.py
+
+import re
+from math import radians, degrees, sin, cos, sqrt, atan2
+from typing import Any, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371
+
+# GPSLocation has been stored both as "lat lon" and "lat,lon"
+_GPS_SPLIT = re.compile(r"[\s,;]+")
+
+
+def parse_coordinate(value: Any, limit: float = 180.0) -> Optional[float]:
+    """
+    Convert a stored/submitted coordinate (float, int or numeric string)
+    to a float. Returns None for empty or invalid values.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(str(value).strip()) if isinstance(value, str) else float(value)
+    except (TypeError, ValueError):
+        return None
+    if number != number or abs(number) > limit:  # NaN / out of range
+        return None
+    return number
+
+
+def parse_latitude(value: Any) -> Optional[float]:
+    return parse_coordinate(value, 90.0)
+
+
+def parse_longitude(value: Any) -> Optional[float]:
+    return parse_coordinate(value, 180.0)
+
+
+def parse_gps_location(gps_location: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """Parse a "lat lon" / "lat,lon" string into (lat, lon)."""
+    if not gps_location:
+        return None, None
+    parts = [p for p in _GPS_SPLIT.split(gps_location.strip()) if p]
+    if len(parts) != 2:
+        return None, None
+    lat, lon = parse_latitude(parts[0]), parse_longitude(parts[1])
+    if lat is None or lon is None:
+        return None, None
+    return lat, lon
+
+
+def format_gps_location(latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
+    if latitude is None or longitude is None:
+        return None
+    return f"{latitude} {longitude}"
+
+
+def normalize_gps_payload(payload: dict) -> dict:
+    """
+    Keep GPSLocation and the numeric Latitude/Longitude columns in sync on write.
+    GPSLocation wins when both are supplied.
+    """
+    if payload.get("GPSLocation"):
+        payload["Latitude"], payload["Longitude"] = parse_gps_location(payload["GPSLocation"])
+    elif "Latitude" in payload or "Longitude" in payload:
+        payload["Latitude"] = parse_latitude(payload.get("Latitude"))
+        payload["Longitude"] = parse_longitude(payload.get("Longitude"))
+        gps_location = format_gps_location(payload["Latitude"], payload["Longitude"])
+        if gps_location:
+            payload["GPSLocation"] = gps_location
+    return payload
+
+
+# Haversine formula to calculate distance in km
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    (min_lat, max_lat, min_lon, max_lon) enclosing a circle of radius_km.
+    Used as an index-friendly pre-filter before the exact haversine check.
+    """
+    dlat = degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = cos(radians(latitude))
+    dlon = 180.0 if cos_lat < 1e-6 else min(180.0, degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return latitude - dlat, latitude + dlat, longitude - dlon, longitude + dlon
@@ -0,0 +1,112 @@
+# app/utils/id_generator.py
+
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+from ..config import settings
+
+# 64-bit ids: | 41 bits ms since EPOCH_MS | 10 bits node | 12 bits sequence |
+EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE_ID = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+class SnowflakeGenerator:
+    """
+    Time + node + sequence ids, generated in-process without a database
+    round-trip: up to 4096 ids per millisecond per node, strictly increasing
+    within a process and roughly time-ordered across processes.
+    Every worker process must run with its own node id.
+    """
+
+    def __init__(self, node_id: int):
+        if not 0 <= node_id <= MAX_NODE_ID:
+            raise ValueError(f"node_id must be between 0 and {MAX_NODE_ID}")
+        self.node_id = node_id
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_id(self) -> int:
+        with self._lock:
+            # If the clock steps back, keep issuing from the last millisecond
+            now = max(int(time.time() * 1000), self._last_ms)
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    now += 1  # sequence exhausted: borrow the next millisecond
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return ((now - EPOCH_MS) << (NODE_BITS + SEQUENCE_BITS)) | (self.node_id << SEQUENCE_BITS) | self._sequence
+
+    def next_code(self, prefix: str) -> str:
+        """'APPT' -> 'APPT-<id>'"""
+        return f"{prefix}-{self.next_id()}"
+
+    @staticmethod
+    def decode(id_value: int) -> Tuple[int, int, int]:
+        """id -> (unix time in ms, node id, sequence)"""
+        return (
+            (id_value >> (NODE_BITS + SEQUENCE_BITS)) + EPOCH_MS,
+            (id_value >> SEQUENCE_BITS) & MAX_NODE_ID,
+            id_value & MAX_SEQUENCE,
+        )
+
+
+_generator: Optional[SnowflakeGenerator] = None
+# (pid, time.monotonic() deadline) once this process leased a node, see use_node_id()
+_lease: Optional[Tuple[int, float]] = None
+
+
+def default_node_id() -> int:
+    # Only for processes that never lease a node (scripts, tests): app workers
+    # lease one at startup (NodeLeaseManager), since NODE_ID is shared by every
+    # worker of a deployment and pids collide modulo 1024
+    if settings.node_id is not None:
+        return settings.node_id
+    return os.getpid() & MAX_NODE_ID
+
+
+def use_node_id(node_id: int, deadline: float) -> None:
+    """
+    Issue ids from a node this process leased, until `deadline` (time.monotonic()).
+    Renewals call this again with a later deadline; the generator, and with it
+    the sequence within the current millisecond, is kept as long as the node is.
+    """
+    global _generator, _lease
+    if _generator is None or _generator.node_id != node_id or _generator.pid != os.getpid():
+        _generator = SnowflakeGenerator(node_id)
+    _lease = (os.getpid(), deadline)
+
+
+def revoke_node_id() -> None:
+    """The lease was lost or released: no ids until use_node_id() is called again."""
+    global _lease
+    if _lease is not None:
+        _lease = (_lease[0], 0.0)
+
+
+def get_id_generator() -> SnowflakeGenerator:
+    """
+    The leased node's generator once this process leased one; it raises
+    instead of issuing ids after the lease lapsed (another worker may own the
+    node by then) or in a child forked from the process holding the lease.
+    Processes that never lease get a per-process generator on default_node_id().
+    """
+    global _generator
+    if _lease is not None:
+        pid, deadline = _lease
+        if pid != os.getpid():
+            raise RuntimeError("Forked after leasing an id generator node; the child must lease its own")
+        if time.monotonic() >= deadline:
+            raise RuntimeError("Id generator node lease expired or lost; no ids until it is renewed")
+        return _generator
+    if _generator is None or _generator.pid != os.getpid():
+        _generator = SnowflakeGenerator(default_node_id())
+    return _generator
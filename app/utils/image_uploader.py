@@ -1,14 +1,14 @@
 import os
-import logging
 from pathlib import Path
 from uuid import uuid4
 from fastapi import UploadFile
 import aiofiles
+from .logger import get_logger
 
 # ------------------------------------------------------------
 # 🔧 Logger
 # ------------------------------------------------------------
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 # ------------------------------------------------------------
 # 📁 Base directory: Images/
@@ -16,7 +16,7 @@ logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parents[2] / "Images"
 BASE_DIR.mkdir(parents=True, exist_ok=True)
 
-logger.info(f"[FileHandler] BASE_DIR = {BASE_DIR}")
+logger.info("[FileHandler] BASE_DIR = %s", BASE_DIR)
 
 
 # ------------------------------------------------------------
@@ -58,8 +58,8 @@ async def save_picture(file: UploadFile, folder: str) -> str:
 
     file_path = upload_dir / filename
 
-    logger.info(f"[FileHandler] Saving: {original_name}")
-    logger.info(f"[FileHandler] Target Path: {file_path}")
+    logger.info("[FileHandler] Saving: %s", original_name)
+    logger.info("[FileHandler] Target Path: %s", file_path)
 
     # Reset stream pointer
     await file.seek(0)
@@ -75,6 +75,6 @@ async def save_picture(file: UploadFile, folder: str) -> str:
     # Return path used for DB
     # --------------------------
     relative_path = file_path.relative_to(BASE_DIR.parent).as_posix()
-    logger.info(f"[FileHandler] Saved Successfully: {relative_path}")
+    logger.info("[FileHandler] Saved Successfully: %s", relative_path)
 
     return relative_path
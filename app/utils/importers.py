@@ -0,0 +1,54 @@
+# app/utils/importers.py
+
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# (line / row number, record, parse error)
+Record = Tuple[int, Optional[dict], Optional[str]]
+
+
+def detect_format(filename: Optional[str], format: Optional[str] = None) -> Optional[str]:
+    if format:
+        return format.lower() if format.lower() in IMPORT_FORMATS else None
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def iter_records(binary_file: BinaryIO, format: str) -> Iterator[Record]:
+    """
+    Records from an uploaded file, one at a time, without reading the whole
+    file. Blank CSV cells become None; a line that is not valid JSON is
+    reported as an error and skipped.
+    """
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        if format == "csv":
+            reader = csv.DictReader(text)
+            for row_number, row in enumerate(reader, start=2):  # row 1 is the header
+                yield row_number, {
+                    k.strip(): (v.strip() or None) if isinstance(v, str) else v
+                    for k, v in row.items() if k
+                }, None
+        else:
+            for line_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_number, None, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, None, "Each line must be a JSON object"
+                    continue
+                yield line_number, record, None
+    finally:
+        text.detach()  # leave the upload's file open for its owner
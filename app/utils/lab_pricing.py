@@ -0,0 +1,64 @@
+# app/utils/lab_pricing.py
+
+import re
+from typing import Dict, List, Optional
+
+_TEST_ID = re.compile(r"\d+")
+_SEPARATORS = re.compile(r"[\s,;|\[\]\"']+")
+
+
+class SelectedTestsError(ValueError):
+    pass
+
+
+def parse_selected_tests(selected_tests: Optional[str]) -> List[int]:
+    """
+    '1,2,3' / '[1, 2, 3]' / '1|2 3' -> [1, 2, 3]
+    Duplicates are dropped, order is kept. Anything that is not a test id
+    is rejected rather than silently priced at zero.
+    """
+    ids, invalid = [], []
+    for token in _SEPARATORS.split(selected_tests or ""):
+        if not token:
+            continue
+        if _TEST_ID.fullmatch(token):
+            test_id = int(token)
+            if test_id not in ids:
+                ids.append(test_id)
+        else:
+            invalid.append(token)
+    if invalid:
+        raise SelectedTestsError(f"SelectedTests must be test ids, got: {', '.join(invalid)}")
+    return ids
+
+
+def format_selected_tests(test_ids: List[int]) -> str:
+    return ",".join(str(i) for i in test_ids)
+
+
+def price_tests(tests) -> Dict:
+    """
+    Totals for a list of Test rows in a single pass. GST is rounded per
+    line so the stored lines always add up to the appointment totals.
+    """
+    lines, total_amount, total_gst = [], 0.0, 0.0
+    for test in tests:
+        price = round(test.Price or 0.0, 2)
+        gst_percent = test.GstPercent or 0.0
+        gst_amount = round(price * gst_percent / 100, 2)
+        lines.append({
+            "TestId": test.TestId,
+            "TestName": test.Name,
+            "Price": price,
+            "GstPercent": gst_percent,
+            "GstAmount": gst_amount,
+            "NetPrice": round(price + gst_amount, 2),
+        })
+        total_amount += price
+        total_gst += gst_amount
+    return {
+        "Tests": lines,
+        "TotalAmount": round(total_amount, 2),
+        "TotalGst": round(total_gst, 2),
+        "NetPayable": round(total_amount + total_gst, 2),
+    }
@@ -1,13 +1,132 @@
 # app/utils/logger.py
 
+import atexit
+import contextvars
+import json
 import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from ..config import settings
+
+# Set per request by RequestIdMiddleware; "-" outside a request
+request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps the request id while still in the caller's context (the writer thread has none)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of INFO/DEBUG records; warnings and errors always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Drops (and counts) records instead of blocking the event loop when the writer falls behind."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _NonBlockingQueueHandler.dropped += 1
+
+
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_writing = False
+
+
+def _build_formatter() -> logging.Formatter:
+    return JsonFormatter() if settings.log_format == "json" else logging.Formatter(TEXT_FORMAT)
+
+
+def _get_queue_handler() -> QueueHandler:
+    """
+    One queue for the whole process. Callers only format the message and
+    put it on the queue; a QueueListener thread does the stderr writes.
+    """
+    global _queue_handler, _listener, _writing
+    if _queue_handler is None:
+        log_queue = queue.Queue(maxsize=settings.log_queue_size)
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(_build_formatter())
+        _queue_handler = _NonBlockingQueueHandler(log_queue)
+        _queue_handler.addFilter(RequestIdFilter())
+        _queue_handler.addFilter(SamplingFilter(settings.log_info_sample_rate))
+        _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+        _listener.start()
+        _writing = True
+        atexit.register(stop_logging)
+    return _queue_handler
+
+
+def start_logging() -> None:
+    """Start (or restart, after stop_logging()) the writer thread."""
+    global _writing
+    _get_queue_handler()
+    if not _writing:
+        _listener.start()
+        _writing = True
+
+
+def stop_logging() -> None:
+    """
+    Write out whatever is still queued and stop the writer thread (called
+    from the app lifespan shutdown and at exit). Records logged after that
+    stay queued until start_logging() or the next stop_logging().
+    """
+    global _writing
+    if _listener is None:
+        return
+    if not _writing:
+        if _listener.queue.empty():
+            return
+        _listener.start()
+    _listener.stop()
+    _writing = False
+
 
 def get_logger(name: str) -> logging.Logger:
+    """
+    Log with %-style arguments, e.g. logger.info("Order %s created", order_id):
+    the message is only built if the record passes the level and sampling checks.
+    """
     logger = logging.getLogger(name)
     if not logger.handlers:
-        logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        logger.setLevel(settings.log_level)
+        logger.addHandler(_get_queue_handler())
     return logger
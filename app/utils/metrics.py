@@ -0,0 +1,267 @@
+# app/utils/metrics.py
+
+import bisect
+import contextvars
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .query_guard import log_if_slow
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+UNMATCHED = "unmatched"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(v)}" for labels, v in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, list] = {}   # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return series[-1] if series else 0
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, labelnames=()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+http_requests_in_progress = registry.gauge("http_requests_in_progress", "HTTP requests being served")
+db_queries_total = registry.counter("db_queries_total", "SQL statements executed", ("operation",))
+db_query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds", "SQL statement latency", ("operation",)
+)
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request", "Database queries issued by one HTTP request", ("route",), COUNT_BUCKETS
+)
+db_time_per_request_seconds = registry.histogram(
+    "db_time_per_request_seconds", "Time one HTTP request spent in the database", ("route",)
+)
+db_rows_total = registry.counter("db_rows_total", "Rows returned or affected", ("route",))
+mongo_commands_total = registry.counter("mongo_commands_total", "MongoDB commands", ("command", "outcome"))
+mongo_command_duration_seconds = registry.histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ("command",)
+)
+
+
+# ------------------------------------------------------------
+# Per-request database stats
+# ------------------------------------------------------------
+class RequestStats:
+    __slots__ = ("scope", "queries", "rows", "db_seconds")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.queries = 0
+        self.rows = 0
+        self.db_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        """Route template; the router writes it into the shared ASGI scope once matched."""
+        return getattr((self.scope or {}).get("route"), "path", None) or UNMATCHED
+
+
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+
+def record_query(operation: str, seconds: float, rows: int = 0) -> None:
+    db_queries_total.inc(operation)
+    db_query_duration_seconds.observe(seconds, operation)
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += seconds
+        stats.rows += max(rows, 0)
+
+
+def operation_of(statement: str) -> str:
+    return statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+
+
+# ------------------------------------------------------------
+# SQLAlchemy: every Engine, including the sync engines behind async ones
+# ------------------------------------------------------------
+_hooks_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _rows_of(cursor, operation: str) -> Optional[int]:
+    """Rows a statement returned or affected; None when the driver does not say."""
+    if operation != "SELECT":
+        rowcount = getattr(cursor, "rowcount", -1)
+        return rowcount if isinstance(rowcount, int) and rowcount >= 0 else None
+    # SQLAlchemy's async adapters (aiosqlite, asyncpg, aiomysql) buffer the whole
+    # result on execute in the private AsyncAdapt_*_cursor._rows. It is not API:
+    # other drivers, or an adapter that drops it, report the row count as unknown.
+    try:
+        return len(cursor._rows)
+    except (AttributeError, TypeError):
+        return None
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_started_at"].pop()
+    operation = operation_of(statement)
+    rows = _rows_of(cursor, operation)
+    record_query(operation, seconds, rows or 0)
+    stats = current_request.get()
+    log_if_slow(statement, parameters, executemany, seconds, rows, stats.route if stats else "-")
+
+
+def install_sqlalchemy_hooks() -> None:
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _hooks_installed = True
+
+
+# ------------------------------------------------------------
+# MongoDB command monitoring (pymongo / motor event listener)
+# ------------------------------------------------------------
+try:
+    from pymongo import monitoring
+
+    class MongoCommandMetrics(monitoring.CommandListener):
+        def started(self, event):
+            pass
+
+        def succeeded(self, event):
+            seconds = event.duration_micros / 1_000_000
+            mongo_commands_total.inc(event.command_name, "succeeded")
+            mongo_command_duration_seconds.observe(seconds, event.command_name)
+            batch = (event.reply or {}).get("cursor", {})
+            rows = len(batch.get("firstBatch") or batch.get("nextBatch") or [])
+            record_query(f"MONGO_{event.command_name.upper()}", seconds, rows)
+            stats = current_request.get()
+            log_if_slow(f"{event.database_name}.{event.command_name}", {}, False, seconds, rows,
+                        stats.route if stats else "-")
+
+        def failed(self, event):
+            mongo_commands_total.inc(event.command_name, "failed")
+            mongo_command_duration_seconds.observe(event.duration_micros / 1_000_000, event.command_name)
+
+except ImportError:  # pragma: no cover - pymongo ships with motor
+    MongoCommandMetrics = None
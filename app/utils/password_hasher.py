@@ -0,0 +1,80 @@
+# app/utils/password_hasher.py
+
+import asyncio
+import hashlib
+import hmac
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+import bcrypt
+
+from ..config import settings
+
+_BCRYPT = re.compile(r"^\$2[aby]\$(\d\d)\$")
+_SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+class Verification(NamedTuple):
+    valid: bool
+    new_hash: Optional[str] = None   # set when the stored hash should be replaced
+
+
+def legacy_sha256(password: str) -> str:
+    """The unsalted SHA-256 RetailerManager used to store."""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing and verification on a bounded thread pool, so a ~100 ms
+    hash never blocks the event loop. bcrypt releases the GIL, so the pool
+    scales with cores; `workers` caps how many hashes run at once.
+
+    verify() also accepts the legacy formats still in the tables (unsalted
+    SHA-256 for retailers, plain text for customers) and bcrypt hashes below
+    the configured cost, and returns the replacement hash for them so the
+    caller can upgrade the row on a successful login.
+    """
+
+    def __init__(self, rounds: int = 12, workers: int = 4):
+        self.rounds = rounds
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _run(self, fn, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def hash_sync(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds)).decode()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hash_sync, password)
+
+    async def verify(self, password: str, stored_hash: Optional[str]) -> Verification:
+        if not password or not stored_hash:
+            return Verification(False)
+
+        match = _BCRYPT.match(stored_hash)
+        if match:
+            valid = await self._run(bcrypt.checkpw, password.encode(), stored_hash.encode())
+            if valid and int(match.group(1)) < self.rounds:
+                return Verification(True, await self.hash(password))
+            return Verification(valid)
+
+        # Legacy rows: cheap constant-time comparison, then upgrade to bcrypt
+        if _SHA256_HEX.match(stored_hash):
+            valid = hmac.compare_digest(legacy_sha256(password), stored_hash)
+        else:
+            valid = hmac.compare_digest(password.encode(), stored_hash.encode())
+        return Verification(True, await self.hash(password)) if valid else Verification(False)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.password_hash_rounds, settings.password_hash_workers)
@@ -0,0 +1,143 @@
+# app/utils/profiler.py
+
+import asyncio
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MAX_DEPTH = 128
+
+
+def frame_label(code) -> str:
+    """'app/crud/customer/order_manager.py:OrderManager.get_order'"""
+    filename = code.co_filename
+    if filename.startswith(_ROOT):
+        filename = os.path.relpath(filename, _ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def thread_stack(frame) -> List[str]:
+    labels = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def task_stack(task: asyncio.Task) -> List[str]:
+    """The await chain of a task, outermost coroutine first, whether it is running or suspended."""
+    labels = []
+    coro = task.get_coro()
+    while coro is not None and len(labels) < MAX_DEPTH:
+        code = getattr(coro, "cr_code", None) or getattr(coro, "gi_code", None) or getattr(coro, "ag_code", None)
+        if code is None:
+            break
+        labels.append(frame_label(code))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return labels
+
+
+class SamplingProfiler:
+    """
+    Samples the running process from a background thread every `interval`
+    seconds, so it can be attached to a live worker without restarting it:
+
+    - cpu: what every thread is executing (the event loop thread included)
+    - tasks: the await chain of every asyncio task on `loop`, including
+      suspended ones, i.e. where requests spend wall-clock time (a manager
+      method waiting on the database shows up here, not under cpu)
+
+    Stacks are kept in collapsed form ("a;b;c" -> samples) for flame graphs.
+    """
+
+    def __init__(self, interval: float = 0.005, loop: asyncio.AbstractEventLoop = None,
+                 exclude_task: Optional[asyncio.Task] = None):
+        self.interval = interval
+        self.loop = loop
+        self.exclude_task = exclude_task
+        self.cpu: Counter = Counter()
+        self.tasks: Counter = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._started
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        me = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident != me:
+                self.cpu[";".join([names.get(ident, str(ident))] + thread_stack(frame))] += 1
+        if self.loop is not None:
+            for task in asyncio.all_tasks(self.loop):
+                stack = task_stack(task)
+                if task is not self.exclude_task and stack:
+                    self.tasks[";".join(stack)] += 1
+        self.samples += 1
+
+    # ------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------
+    @staticmethod
+    def collapsed(stacks: Counter) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    def top(self, stacks: Counter, limit: int = 30) -> List[Dict]:
+        """Inclusive time per function, estimated as samples x interval."""
+        inclusive: Counter = Counter()
+        for stack, count in stacks.items():
+            for label in set(stack.split(";")):
+                inclusive[label] += count
+        return [
+            {"Function": label, "Samples": count, "Seconds": round(count * self.interval, 3)}
+            for label, count in inclusive.most_common(limit)
+        ]
+
+    def summary(self, limit: int = 30) -> Dict:
+        return {
+            "Samples": self.samples,
+            "IntervalMs": self.interval * 1000,
+            "DurationSeconds": round(self.duration, 3),
+            "Cpu": self.top(self.cpu, limit),
+            "Tasks": self.top(self.tasks, limit),
+        }
+
+
+def pstats_report(profile: cProfile.Profile, sort: str = "cumulative", limit: int = 50) -> str:
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def pstats_dump(profile: cProfile.Profile) -> bytes:
+    """Same bytes as Profile.dump_stats(); loadable with pstats.Stats(path) or snakeviz."""
+    profile.create_stats()
+    return marshal.dumps(profile.stats)
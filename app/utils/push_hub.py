@@ -0,0 +1,106 @@
+# app/utils/push_hub.py
+
+import asyncio
+import itertools
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+from ..config import settings
+from .event_bus import Event, EventBus
+
+
+def customer_topic(customer_id: int) -> str:
+    return f"customer:{customer_id}"
+
+
+def retailer_topic(retailer_id: int) -> str:
+    return f"retailer:{retailer_id}"
+
+
+class Subscription:
+    """
+    One live connection. Messages wait in a bounded queue; when a slow client
+    lets it fill up the oldest message is dropped, so a stalled connection
+    costs a fixed amount of memory and never slows down publishers.
+    """
+
+    def __init__(self, topic: str, max_queue_size: int):
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+
+    def offer(self, message: dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def next(self, timeout: float) -> Optional[dict]:
+        """Next message, or None after `timeout` seconds (time for a heartbeat)."""
+        if self.dropped:
+            # Tell the client it missed updates and should reload over REST
+            dropped, self.dropped = self.dropped, 0
+            return {"id": None, "event": "resync", "data": {"Dropped": dropped}}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PushHub:
+    """
+    Routes event bus events to live connections: events carrying a
+    CustomerId go to "customer:<id>", events carrying a RetailerId go
+    to "retailer:<id>".
+
+    The hub and the event bus are in-process: a connection only receives
+    events raised by writes on the worker that holds it. With several
+    workers, run live updates on a single worker (route /live/ there) or
+    have clients reload over REST on reconnect, as they do on "resync".
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._ids = itertools.count(1)
+
+    def register(self, bus: EventBus) -> None:
+        bus.subscribe("order.*", self.handle)
+        bus.subscribe("notification.*", self.handle)
+
+    def subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription(topic, self.max_queue_size)
+        self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscriptions.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[subscription.topic]
+
+    def connection_count(self) -> int:
+        return sum(len(s) for s in self._subscriptions.values())
+
+    async def handle(self, event: Event) -> None:
+        topics = []
+        if event.payload.get("CustomerId"):
+            topics.append(customer_topic(event.payload["CustomerId"]))
+        if event.payload.get("RetailerId"):
+            topics.append(retailer_topic(event.payload["RetailerId"]))
+
+        message = None
+        for topic in topics:
+            for subscription in self._subscriptions.get(topic, ()):
+                if message is None:
+                    message = {
+                        "id": next(self._ids),
+                        "event": event.name,
+                        "data": event.payload,
+                        "at": event.created_at.isoformat(),
+                    }
+                subscription.offer(message)
+
+
+push_hub = PushHub(settings.push_queue_size)
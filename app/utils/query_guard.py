@@ -0,0 +1,67 @@
+# app/utils/query_guard.py
+
+from typing import Dict, Optional
+
+from ..config import settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_STATEMENT_CHARS = 500
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def parameters_shape(parameters, executemany: bool = False) -> str:
+    """
+    Types of the bound parameters, never their values (they can be
+    emails, password hashes or addresses):
+        (int, str)   {CustomerId: int}   3 x (int, float)
+    """
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameters[0] if parameters else ()
+        return f"{len(parameters)} x {parameters_shape(first)}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def log_if_slow(statement: str, parameters, executemany: bool, seconds: float,
+                rows: Optional[int], route: str) -> bool:
+    threshold_ms = settings.slow_query_ms
+    if threshold_ms is None or seconds * 1000 < threshold_ms:
+        return False
+    statement = " ".join(statement.split())
+    if len(statement) > MAX_STATEMENT_CHARS:
+        statement = statement[:MAX_STATEMENT_CHARS] + "..."
+    logger.warning(
+        f"🐢 Slow query {seconds * 1000:.1f} ms route={route} rows={rows if rows is not None else '?'} "
+        f"params={parameters_shape(parameters, executemany)} sql={statement}"
+    )
+    return True
+
+
+def budget_for(method: str, route: str, budgets: Dict[str, int] = None) -> int:
+    """"GET /cart/{customer_id}" first, then "/cart/{customer_id}", then the default. 0 = unlimited."""
+    budgets = settings.query_budgets if budgets is None else budgets
+    limit = budgets.get(f"{method} {route}", budgets.get(route))
+    return settings.query_budget_default if limit is None else limit
+
+
+def check_query_budget(method: str, route: str, queries: int) -> None:
+    """
+    Per-route cap on database round trips, so an endpoint that turns into
+    an N+1 is caught by a warning (or, with QUERY_BUDGET_ACTION=raise as in
+    tests, an exception) instead of by production latency.
+    """
+    limit = budget_for(method, route)
+    if not limit or queries <= limit:
+        return
+    message = f"{method} {route} ran {queries} queries, budget is {limit}"
+    if settings.query_budget_action == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(f"⚠️ Query budget exceeded: {message}")
@@ -0,0 +1,61 @@
+# app/utils/slot_keys.py
+
+import re
+from datetime import date
+from typing import Any, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from .doctor_schedule import DEFAULT_SLOT_MINUTES, parse_time_of_day
+
+# Appointments in these states release their slot (SlotKey is set to NULL)
+CANCELLED_STATUSES = {"cancelled", "canceled"}
+
+
+def is_cancelled(status: Optional[str]) -> bool:
+    return (status or "").strip().lower() in CANCELLED_STATUSES
+
+
+def is_slot_conflict(error: IntegrityError) -> bool:
+    """
+    Whether an IntegrityError came from a SlotKey unique index. The column or
+    index name is in the driver message on SQLite ("UNIQUE constraint failed:
+    Appointment.SlotKey"), Postgres and MySQL (ux_<table>_SlotKey).
+    """
+    return "SlotKey" in str(error.orig)
+
+
+def _day(appointment_date: Any) -> Optional[str]:
+    if appointment_date is None:
+        return None
+    if isinstance(appointment_date, date):
+        return appointment_date.isoformat()
+    return str(appointment_date)[:10] or None
+
+
+def doctor_slot_key(doctor_id: int, appointment_date: Any, appointment_time: Optional[str],
+                    appointment_slot: Optional[str] = None,
+                    slot_minutes: Optional[int] = None) -> Optional[str]:
+    """
+    "DR:<doctor>:<yyyy-mm-dd>:<hhmm>" with the time rounded down to the doctor's
+    slot grid, so 10:15 and 10:20 collide on a 15 minute schedule.
+    AppointmentSlot is used when AppointmentTime is missing or unparseable.
+    """
+    day = _day(appointment_date)
+    minute = parse_time_of_day(appointment_time)
+    if minute is None:
+        minute = parse_time_of_day(appointment_slot)
+    if day is None or minute is None:
+        return None
+    slot_minutes = slot_minutes if slot_minutes and slot_minutes > 0 else DEFAULT_SLOT_MINUTES
+    start = minute - minute % slot_minutes
+    return f"DR:{doctor_id}:{day}:{start // 60:02d}{start % 60:02d}"
+
+
+def lab_slot_key(lab_id: int, appointment_date: Any, time_slot: Optional[str]) -> Optional[str]:
+    """"LAB:<lab>:<yyyy-mm-dd>:<slot>" where slot is the normalized TimeSlot text."""
+    day = _day(appointment_date)
+    slot = re.sub(r"\s+", "", (time_slot or "").translate({0x2009: None, 0x202F: None})).lower()
+    if day is None or not slot:
+        return None
+    return f"LAB:{lab_id}:{day}:{slot}"